@@ -12,6 +12,9 @@ class Config(BaseModel):
     MODEL_PATH: Path = MODELS_DIR / "mistral-7b.Q4_K_M.gguf"
     MODEL_CONTEXT_SIZE: int = 4096
     MODEL_TEMPERATURE: float = 0.7
+    MODEL_BATCH_SIZE: int = 512
+    MODEL_THREADS: Optional[int] = None  # None이면 llama.cpp 기본값
+    MODEL_GPU_LAYERS: int = 0  # GPU가 있는 노드에서만 오프로드 (-1이면 전부)
     
     # 에이전트 설정
     MAX_ITERATIONS: int = 5
@@ -29,7 +29,9 @@ def get_llm(
         model_path=str(config.MODEL_PATH),
         temperature=temperature or config.MODEL_TEMPERATURE,
         n_ctx=context_size or config.MODEL_CONTEXT_SIZE,
+        n_batch=config.MODEL_BATCH_SIZE,
+        n_threads=config.MODEL_THREADS,
         callback_manager=callback_manager,
         verbose=True,
-        n_gpu_layers=-1  # GPU 가속 활성화
+        n_gpu_layers=config.MODEL_GPU_LAYERS
     ) 
\ No newline at end of file
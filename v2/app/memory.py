@@ -1,65 +1,79 @@
 import json
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 from pathlib import Path
 from datetime import datetime
 
 from .config import config
+from .storage import FileLock, atomic_write_json, file_signature, read_json
 
 class Memory:
-    """JSON 파일 기반의 메모리 시스템"""
+    """JSON 파일 기반의 메모리 시스템
+    
+    변경은 파일 잠금 안에서 최신 파일 내용에 적용한 뒤 임시 파일 교체로 기록하므로
+    여러 스레드나 프로세스가 같은 파일을 갱신해도 변경이 유실되지 않습니다.
+    """
     
     def __init__(self, memory_file: Optional[str] = None):
         self.memory_file = Path(config.MEMORY_DIR) / (memory_file or config.MEMORY_FILE)
+        self._signature = None
         self.memory: Dict[str, Any] = self._load()
     
     def _load(self) -> Dict[str, Any]:
         """메모리 파일에서 데이터를 로드합니다."""
-        if not self.memory_file.exists():
-            return {
-                "sessions": {},
-                "last_updated": datetime.now().isoformat()
-            }
-        
+        # 읽기 전에 서명을 잡아 두면 그 사이에 바뀐 경우 다음 변경 때 다시 읽음
+        self._signature = file_signature(self.memory_file)
         try:
-            with open(self.memory_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            data = read_json(self.memory_file)
         except json.JSONDecodeError:
+            data = None
+        if data is None:
             return {
                 "sessions": {},
                 "last_updated": datetime.now().isoformat()
             }
+        return data
     
-    def _save(self):
-        """메모리 데이터를 파일에 저장합니다."""
-        self.memory["last_updated"] = datetime.now().isoformat()
-        with open(self.memory_file, 'w', encoding='utf-8') as f:
-            json.dump(self.memory, f, ensure_ascii=False, indent=2)
+    def _update(self, mutate: Callable[[Dict[str, Any]], None]):
+        """최신 파일 내용에 변경을 적용하고 저장합니다."""
+        with FileLock(self.memory_file):
+            if file_signature(self.memory_file) != self._signature:
+                self.memory = self._load()
+            mutate(self.memory)
+            self.memory["version"] = self.memory.get("version", 0) + 1
+            self.memory["last_updated"] = datetime.now().isoformat()
+            atomic_write_json(self.memory_file, self.memory)
+            self._signature = file_signature(self.memory_file)
     
     def get_session(self, session_id: str) -> Dict[str, Any]:
         """특정 세션의 메모리를 가져옵니다."""
+        # 다른 프로세스가 파일을 바꿨으면 다시 읽음 (교체 방식이라 잠금 없이 읽어도 안전)
+        if file_signature(self.memory_file) != self._signature:
+            self.memory = self._load()
         return self.memory["sessions"].get(session_id, {})
     
     def save_session(self, session_id: str, data: Dict[str, Any]):
         """세션 데이터를 저장합니다."""
-        self.memory["sessions"][session_id] = data
-        self._save()
+        def mutate(memory: Dict[str, Any]):
+            memory["sessions"][session_id] = data
+        self._update(mutate)
     
     def update_session(self, session_id: str, data: Dict[str, Any]):
         """세션 데이터를 업데이트합니다."""
-        current = self.get_session(session_id)
-        current.update(data)
-        self.save_session(session_id, current)
+        def mutate(memory: Dict[str, Any]):
+            memory["sessions"].setdefault(session_id, {}).update(data)
+        self._update(mutate)
     
     def delete_session(self, session_id: str):
         """세션을 삭제합니다."""
-        if session_id in self.memory["sessions"]:
-            del self.memory["sessions"][session_id]
-            self._save()
+        def mutate(memory: Dict[str, Any]):
+            memory["sessions"].pop(session_id, None)
+        self._update(mutate)
     
     def clear_all(self):
         """모든 세션을 삭제합니다."""
-        self.memory["sessions"] = {}
-        self._save()
+        def mutate(memory: Dict[str, Any]):
+            memory["sessions"] = {}
+        self._update(mutate)
 
 # 전역 메모리 인스턴스
 memory = Memory() 
\ No newline at end of file
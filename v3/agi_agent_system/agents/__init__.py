@@ -5,11 +5,22 @@
 - PlannerAgent: 목표를 하위 태스크로 분해하는 에이전트
 - DeveloperAgent: 코드를 생성하는 에이전트
 - CriticAgent: 코드를 평가하는 에이전트
+
+하위 모듈은 처음 접근할 때 임포트됩니다 (CLI 시작 시간 단축).
 """
 
-from .base import BaseAgent
-from .planner import PlannerAgent
-from .developer import DeveloperAgent
-from .critic import CriticAgent
+import importlib
+
+_LAZY_ATTRS = {
+    'BaseAgent': '.base',
+    'PlannerAgent': '.planner',
+    'DeveloperAgent': '.developer',
+    'CriticAgent': '.critic',
+}
+
+__all__ = ['BaseAgent', 'PlannerAgent', 'DeveloperAgent', 'CriticAgent']
 
-__all__ = ['BaseAgent', 'PlannerAgent', 'DeveloperAgent', 'CriticAgent'] 
\ No newline at end of file
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        return getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
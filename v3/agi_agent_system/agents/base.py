@@ -4,13 +4,29 @@
 각 에이전트는 이 클래스를 상속받아 구현됩니다.
 """
 
+import time
+from datetime import datetime
 from typing import Dict, Any, Optional
-from langchain.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
+from langchain.schema import OutputParserException
 from pydantic import BaseModel
 
-from ..core.llm import get_llm
+from ..core.blobs import get_blob_store
+from ..core.config import config
+from ..core.llm import engine_timings, get_llm, model_lock, reset_engine_timings
 from ..core.memory import MemoryManager
+from ..core.metrics import metrics
+from ..core.prompts import compile_prompt
+from ..core.repair import repair_json
+from ..core.usage import usage_entry
+
+# 결정적 복구로 고치지 못한 응답에서 JSON만 다시 내보내게 하는 짧은 프롬프트
+REPAIR_PROMPT = """다음 응답은 JSON 형식이 깨져 있습니다. 내용은 바꾸지 말고 형식만 고쳐 JSON 객체 하나만 출력하세요.
+필드: {fields}
+
+응답:
+{text}
+
+수정된 JSON:"""
 
 class BaseAgent:
     """에이전트의 공통 동작을 담당하는 베이스 클래스
@@ -18,10 +34,14 @@ class BaseAgent:
     Attributes:
         llm: LLM 모델 인스턴스
         memory: 메모리 관리자 인스턴스
-        prompt_template: 프롬프트 템플릿
-        output_parser: 출력 파서
+        prompt_template: 컴파일된 프롬프트 템플릿 (같은 템플릿과 출력 모델을 쓰는 에이전트끼리 공유)
+        output_parser: 출력 파서 (공유)
+        blobs: 긴 출력(코드, 설명, 피드백)을 저장하는 블롭 저장소
+        role: 에이전트 역할 이름 (메모리 기록과 메트릭에 사용)
     """
     
+    role = "agent"
+    
     def __init__(
         self,
         memory: MemoryManager,
@@ -38,25 +58,157 @@ class BaseAgent:
             llm: LLM 모델 인스턴스 (기본값: None)
         """
         self.memory = memory
-        self.llm = llm or get_llm()
-        self.prompt_template = PromptTemplate(
-            template=prompt_template,
-            input_variables=self._get_input_variables(prompt_template),
-            partial_variables={"format_instructions": PydanticOutputParser(pydantic_object=output_model).get_format_instructions()}
-        )
-        self.output_parser = PydanticOutputParser(pydantic_object=output_model)
+        self.llm = llm or get_llm(role=self.role)
+        # 파서와 형식 지침은 (템플릿, 출력 모델)마다 한 번만 만듦
+        self.prompt_template = compile_prompt(prompt_template, output_model)
+        self.output_parser = self.prompt_template.parser
+        self.blobs = get_blob_store(str(memory.memory_dir))
+    
+    def _count_tokens(self, text: str, llm: Optional[Any] = None) -> int:
+        """모델 토크나이저로 토큰 수를 계산 (지원하지 않으면 공백 기준으로 근사)
+        
+        공유 모델이면 model_lock을 보유한 상태에서 호출해야 합니다.
+        
+        Args:
+            text: 텍스트
+            llm: 토크나이저를 쓸 모델 (기본값: None, 에이전트의 모델)
+            
+        Returns:
+            int: 토큰 수
+        """
+        try:
+            return int((llm or self.llm).get_num_tokens(text))
+        except Exception:
+            return len(text.split())
     
-    def _get_input_variables(self, template: str) -> list[str]:
-        """프롬프트 템플릿에서 입력 변수 목록을 추출
+    def _invoke_llm(self, prompt: str, llm: Optional[Any] = None, state: Optional[Dict[str, Any]] = None) -> str:
+        """LLM을 호출하고 토큰 수와 지연 시간을 메트릭과 세션 사용량 원장에 기록
+        
+        공유 모델은 model_lock으로 호출과 토큰 계산을 직렬화합니다.
         
         Args:
-            template: 프롬프트 템플릿 문자열
+            prompt: 완성된 프롬프트
+            llm: 호출할 모델 (기본값: None, 에이전트의 모델)
+            state: 원장 항목의 태스크와 반복 번호를 정할 현재 상태 (기본값: None, 계획 단계)
             
         Returns:
-            list[str]: 입력 변수 목록
+            str: 모델 응답
         """
-        import re
-        return re.findall(r'\{([^}]+)\}', template)
+        llm = llm or self.llm
+        with model_lock(llm):
+            reset_engine_timings(llm)
+            start = time.perf_counter()
+            response = llm.invoke(prompt)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            timings = engine_timings(llm) or {"prompt_eval_ms": 0.0, "generation_ms": elapsed_ms}
+            # 실제로 호출한 모델(캐스케이드의 작은 모델, 복구 모델)의 토크나이저로 계산
+            prompt_tokens = self._count_tokens(prompt, llm)
+            completion_tokens = self._count_tokens(response, llm)
+        metrics.increment("llm.calls")
+        metrics.increment("llm.prompt_tokens", prompt_tokens)
+        metrics.increment("llm.completion_tokens", completion_tokens)
+        metrics.increment("llm.generation_ms", elapsed_ms)
+        metrics.increment(f"llm.calls.{self.role}")
+        metrics.increment(f"llm.completion_tokens.{self.role}", completion_tokens)
+        metrics.observe(f"llm.latency_ms.{self.role}", elapsed_ms)
+        if config.usage_ledger_enabled:
+            self._record_usage(state, prompt_tokens, completion_tokens, timings)
+        return response
+    
+    def _record_usage(
+        self,
+        state: Optional[Dict[str, Any]],
+        prompt_tokens: int,
+        completion_tokens: int,
+        timings: Dict[str, float]
+    ) -> None:
+        """호출 하나의 사용량을 세션 메모리의 원장에 추가
+        
+        Args:
+            state: 현재 상태 (None이면 태스크와 반복 번호 없이 기록)
+            prompt_tokens: 프롬프트 토큰 수
+            completion_tokens: 생성 토큰 수
+            timings: {"prompt_eval_ms", "generation_ms"}
+        """
+        task_id, iteration = None, None
+        if state is not None:
+            tasks = state.get("tasks", [])
+            index = state.get("current_task_index", 0)
+            if index < len(tasks):
+                task_id = tasks[index].task_id
+                iteration = state.get("iterations", 0)
+        self.memory.append("usage", usage_entry(
+            self.role,
+            prompt_tokens,
+            completion_tokens,
+            timings["prompt_eval_ms"],
+            timings["generation_ms"],
+            task_id=task_id,
+            iteration=iteration,
+            timestamp=datetime.now().isoformat()
+        ))
+    
+    def _parse_output(self, response: str, llm: Optional[Any] = None, state: Optional[Dict[str, Any]] = None) -> BaseModel:
+        """응답을 출력 모델로 파싱하고, 실패하면 다시 생성하기 전에 복구를 시도
+        
+        Args:
+            response: 모델 응답
+            llm: 복구 호출에 쓸 모델 (기본값: None, 에이전트의 모델)
+            state: 복구 호출을 원장에 기록할 현재 상태 (기본값: None)
+            
+        Returns:
+            BaseModel: 파싱된 출력
+            
+        Raises:
+            OutputParserException: 복구해도 파싱할 수 없는 경우 (원래 오류)
+        """
+        try:
+            return self.output_parser.parse(response)
+        except OutputParserException:
+            repaired = self._repair_output(response, llm=llm, state=state)
+            if repaired is None:
+                raise
+            return repaired
+    
+    def _try_parse(self, text: Optional[str]) -> Optional[BaseModel]:
+        """파싱에 실패하면 None을 반환"""
+        if text is None:
+            return None
+        try:
+            return self.output_parser.parse(text)
+        except OutputParserException:
+            return None
+    
+    def _repair_output(self, response: str, llm: Optional[Any] = None, state: Optional[Dict[str, Any]] = None) -> Optional[BaseModel]:
+        """파싱에 실패한 응답을 복구
+        
+        1. 결정적 복구 (코드 펜스, 쉼표, 괄호, ID 목록; repair_json)
+        2. 그래도 실패하면 응답의 JSON만 다시 내보내게 하는 짧은 LLM 호출
+           (응답에 JSON 객체가 없거나 OUTPUT_REPAIR_MAX_CHARS보다 길면 생략)
+        
+        Args:
+            response: 파싱에 실패한 모델 응답
+            llm: 복구 호출에 쓸 모델 (기본값: None, 에이전트의 모델)
+            state: 복구 호출을 원장에 기록할 현재 상태 (기본값: None)
+            
+        Returns:
+            Optional[BaseModel]: 복구된 출력 (복구하지 못했거나 복구를 끈 경우 None)
+        """
+        if not config.output_repair_enabled:
+            return None
+        repaired = self._try_parse(repair_json(response))
+        if repaired is not None:
+            metrics.increment(f"repair.deterministic.{self.role}")
+            return repaired
+        if config.output_repair_llm and "{" in response and len(response) <= config.output_repair_max_chars:
+            fields = ", ".join(self.output_parser.pydantic_object.model_fields)
+            reemitted = self._invoke_llm(REPAIR_PROMPT.format(fields=fields, text=response), llm=llm, state=state)
+            repaired = self._try_parse(reemitted) or self._try_parse(repair_json(reemitted))
+            if repaired is not None:
+                metrics.increment(f"repair.llm.{self.role}")
+                return repaired
+        metrics.increment(f"repair.failed.{self.role}")
+        return None
     
     def append_conversation(self, role: str, content: Dict[str, Any]) -> None:
         """대화 내용을 메모리에 기록
@@ -67,6 +219,31 @@ class BaseAgent:
         """
         self.memory.append("conversations", {"role": role, "content": content})
 
+    def _store_payload(self, value: Dict[str, Any], base: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """출력의 긴 문자열을 블롭 참조로 바꿈 (블롭 저장소를 끈 경우 그대로 반환)
+        
+        Args:
+            value: 에이전트 출력
+            base: 같은 태스크의 이전 출력 (델타 압축 기준, 기본값: None)
+            
+        Returns:
+            Dict[str, Any]: 상태와 메모리에 기록할 출력
+        """
+        if not config.blob_store_enabled:
+            return value
+        return self.blobs.externalize(value, base)
+    
+    def _load_payload(self, value: Any) -> Any:
+        """상태나 메모리에 기록된 출력의 블롭 참조를 원래 문자열로 바꿈
+        
+        Args:
+            value: 기록된 출력
+            
+        Returns:
+            Any: 참조가 풀린 출력
+        """
+        return self.blobs.resolve(value)
+
     def _compile_previous_results(self, state: Dict[str, Any]) -> str:
         """이전 태스크들의 결과를 문자열로 컴파일
         
@@ -84,7 +261,7 @@ class BaseAgent:
             # so previous results are for tasks from index 0 up to current_task_index - 1.
             for i in range(min(state.get("current_task_index", 0), len(state["results"]))):
                 # Ensure the result at index i is not None (it could be if padded or due to prior errors)
-                result_item = state["results"][i]
+                result_item = self._load_payload(state["results"][i])
                 if result_item is not None:
                     # Assuming result_item is CodeSolution.dict()
                     # A more concise summary than the full dict string might be:
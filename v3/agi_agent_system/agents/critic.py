@@ -3,14 +3,17 @@
 이 모듈은 생성된 코드를 평가하는 CriticAgent 클래스를 정의합니다.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
-from langchain.output_parsers import OutputParserException # Import for specific exception
+from langchain.schema import OutputParserException # Import for specific exception
 import requests # Assuming LLM might use requests, for RequestException
 
 from .base import BaseAgent
 from ..core.memory import MemoryManager
 from ..core.config import config
+from ..core.metrics import metrics
+from ..core.plan_cache import PlanCache, get_plan_cache
+from ..core.solution_index import SolutionIndex, get_solution_index
 
 class CodeEvaluation(BaseModel):
     """코드 평가 결과를 정의하는 모델"""
@@ -48,17 +51,39 @@ CRITIC_PROMPT = """당신은 생성된 코드를 평가하고 피드백을 제
 class CriticAgent(BaseAgent):
     """생성된 코드를 평가하는 에이전트"""
     
-    def __init__(self, memory: MemoryManager):
+    role = "critic"
+    
+    def __init__(
+        self,
+        memory: MemoryManager,
+        solution_index: Optional[SolutionIndex] = None,
+        plan_cache: Optional[PlanCache] = None
+    ):
         """CriticAgent 초기화
         
         Args:
             memory: 메모리 관리자 인스턴스
+            solution_index: 솔루션 색인 (기본값: None, 메모리 디렉토리의 공유 색인 사용)
+            plan_cache: 플랜 캐시 (기본값: None, 메모리 디렉토리의 공유 캐시 사용)
         """
         super().__init__(
             memory=memory,
             prompt_template=CRITIC_PROMPT,
             output_model=CodeEvaluation
         )
+        self.solution_index = solution_index if solution_index is not None else get_solution_index(str(memory.memory_dir))
+        self.plan_cache = plan_cache if plan_cache is not None else get_plan_cache(str(memory.memory_dir))
+    
+    def _plan_accepted(self, state: Dict[str, Any]) -> bool:
+        """마지막 태스크까지 모든 태스크가 수락되었는지 확인
+        
+        수락되면 바로 다음 태스크로 넘어가므로 태스크마다 수락된 평가는 최대 하나입니다.
+        """
+        accepted = sum(
+            1 for evaluation in state["evaluations"]
+            if isinstance(evaluation, dict) and evaluation.get("is_success")
+        )
+        return state["current_task_index"] == len(state["tasks"]) - 1 and accepted == len(state["tasks"])
     
     def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """생성된 코드 평가
@@ -71,7 +96,7 @@ class CriticAgent(BaseAgent):
         """
         # 현재 태스크와 결과 가져오기
         current_task = state["tasks"][state["current_task_index"]]
-        current_result = state["results"][state["current_task_index"]]
+        current_result = self._load_payload(state["results"][state["current_task_index"]])
         
         # 이전 태스크들의 결과 수집 (Refactored to BaseAgent)
         previous_results_str = self._compile_previous_results(state)
@@ -79,17 +104,17 @@ class CriticAgent(BaseAgent):
         evaluation_dict = {}
         try:
             # LLM 호출
-            response_content = self.llm(self.prompt_template.format(
+            response_content = self._invoke_llm(self.prompt_template.format(
                 task_description=current_task.description,
                 code=current_result.get("code", "# CODE MISSING OR ERROR IN PREVIOUS STEP"), # Handle potential missing code
                 explanation=current_result.get("explanation", "# EXPLANATION MISSING OR ERROR IN PREVIOUS STEP"),
                 test_cases="\n".join(current_result.get("test_cases", [])),
                 previous_results=previous_results_str,
                 success_threshold=config.success_threshold
-            ))
+            ), state=state)
             
             # 응답 파싱
-            evaluation = self.output_parser.parse(response_content)
+            evaluation = self._parse_output(response_content, state=state)
             evaluation_dict = evaluation.dict()
 
         except OutputParserException as e:
@@ -121,15 +146,32 @@ class CriticAgent(BaseAgent):
             }
 
         # 메모리에 평가 결과 저장 (even if it's an error response)
+        stored = self._store_payload(evaluation_dict)
         self.append_conversation("critic", {
             "task_id": current_task.task_id,
-            "content": evaluation_dict
+            "content": stored
         })
         
+        # 수락된 결과를 생성한 캐스케이드 티어 집계
+        if evaluation_dict["is_success"] and current_result.get("tier"):
+            metrics.increment(f"cascade.accepted.{current_result['tier']}")
+        
+        # 수락된 솔루션을 세션 간 색인에 추가 (색인에서 재사용한 솔루션은 제외)
+        if (
+            evaluation_dict["is_success"]
+            and self.solution_index is not None
+            and current_result.get("source") != "solution_index"
+        ):
+            self.solution_index.add(current_task.description, current_result, evaluation_dict["score"])
+        
         # 상태 업데이트
         if "evaluations" not in state:
             state["evaluations"] = []
-        state["evaluations"].append(evaluation_dict)
+        state["evaluations"].append(stored)
+        
+        # 모든 태스크가 수락된 계획만 플랜 캐시에 추가 (파싱만 된 계획은 재사용하지 않음)
+        if evaluation_dict["is_success"] and self.plan_cache is not None and state.get("goal") and self._plan_accepted(state):
+            self.plan_cache.add(state["goal"], {"tasks": [task.dict() for task in state["tasks"]]})
         
         # 반복 횟수 업데이트 (always increment iterations as an attempt was made)
         state["iterations"] = state.get("iterations", 0) + 1
@@ -1,15 +1,28 @@
 """개발자 에이전트 모듈
 
 이 모듈은 태스크에 맞는 코드를 생성하는 DeveloperAgent 클래스를 정의합니다.
+
+캐스케이드 정책이 켜져 있으면 태스크마다 작은 모델("small" 티어)로 먼저
+생성하고, 응답 파싱에 실패하거나 비평가 점수가 기준보다 낮으면 큰 모델
+("large" 티어)로 올립니다. 결과에는 생성한 티어가 기록됩니다.
+
+같은 태스크를 다시 시도할 때는 코드 전체를 다시 생성하지 않고 기존 코드와
+비평가의 피드백을 주고 바꿀 부분만 편집 블록(또는 unified diff)으로 받아
+적용합니다 (수정 모드). 수정 내용을 적용할 수 없으면 전체를 다시 생성합니다.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
-from langchain.output_parsers import OutputParserException # Import for specific exception
+from langchain.schema import OutputParserException # Import for specific exception
 import requests # Assuming LLM might use requests, for RequestException
 
 from .base import BaseAgent
+from ..core.llm import get_llm
 from ..core.memory import MemoryManager
+from ..core.config import config
+from ..core.metrics import metrics
+from ..core.revision import PatchError, apply_revision
+from ..core.solution_index import SolutionIndex, SolutionMatch, get_solution_index
 
 class CodeSolution(BaseModel):
     """코드 솔루션을 정의하는 모델"""
@@ -24,6 +37,9 @@ DEVELOPER_PROMPT = """당신은 주어진 태스크를 해결하는 코드를 
 이전 태스크들의 결과:
 {previous_results}
 
+유사한 태스크에 대해 이전에 수락된 솔루션 (참고용):
+{examples}
+
 위 태스크를 해결하기 위한 코드를 생성해주세요.
 코드는 다음 정보를 포함해야 합니다:
 - code: 실제 구현 코드
@@ -34,20 +50,130 @@ DEVELOPER_PROMPT = """당신은 주어진 태스크를 해결하는 코드를 
 
 코드 솔루션:"""
 
+REVISION_PROMPT = """당신은 비평가의 피드백에 따라 기존 코드를 고치는 개발자입니다.
+
+현재 태스크: {task_description}
+
+기존 코드:
+{code}
+
+비평가 피드백:
+{feedback}
+
+개선 사항:
+{improvements}
+
+코드 전체를 다시 쓰지 말고 바꿀 부분만 다음 형식의 편집 블록으로 출력하세요 (unified diff도 허용).
+SEARCH에는 기존 코드에서 한 번만 나오는 줄들을 그대로 적고, 여러 곳을 고치면 블록을 여러 개 쓰세요.
+
+<<<<<<< SEARCH
+바꿀 기존 줄
+=======
+새 줄
+>>>>>>> REPLACE
+
+마지막에 "설명: <고친 내용 한 줄>"을 덧붙이세요.
+
+수정 내용:"""
+
+# 참고 솔루션 하나에 포함할 코드의 최대 길이
+EXEMPLAR_CODE_CHARS = 1500
+
+def cascade_policy(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """목표별 캐스케이드 정책을 설정값으로 채워 반환
+    
+    Args:
+        overrides: 목표별 정책 ({"enabled", "escalation_score", "max_small_attempts"} 중 일부, 기본값: None)
+        
+    Returns:
+        Dict[str, Any]: 캐스케이드 정책 (작은 모델 경로가 없으면 항상 비활성화)
+    """
+    overrides = {key: value for key, value in (overrides or {}).items() if value is not None}
+    return {
+        "enabled": bool(overrides.get("enabled", config.cascade_enabled)) and bool(config.cascade_model_path),
+        "escalation_score": float(overrides.get("escalation_score", config.cascade_escalation_score)),
+        "max_small_attempts": int(overrides.get("max_small_attempts", config.cascade_max_small_attempts)),
+    }
+
+def format_exemplars(matches: List[SolutionMatch]) -> str:
+    """참고 솔루션을 프롬프트에 넣을 간결한 문자열로 변환
+    
+    Args:
+        matches: 솔루션 색인 검색 결과
+        
+    Returns:
+        str: 참고 솔루션 문자열 (없으면 "없음")
+    """
+    if not matches:
+        return "없음"
+    blocks = []
+    for i, match in enumerate(matches, 1):
+        code = match.solution.get("code", "")
+        if len(code) > EXEMPLAR_CODE_CHARS:
+            code = code[:EXEMPLAR_CODE_CHARS] + "\n# ... (생략)"
+        blocks.append(f"예시 {i} (태스크: {match.description}):\n{code}")
+    return "\n\n".join(blocks)
+
 class DeveloperAgent(BaseAgent):
     """태스크에 맞는 코드를 생성하는 에이전트"""
     
-    def __init__(self, memory: MemoryManager):
+    role = "developer"
+    
+    def __init__(
+        self,
+        memory: MemoryManager,
+        solution_index: Optional[SolutionIndex] = None,
+        small_llm: Optional[Any] = None
+    ):
         """DeveloperAgent 초기화
         
         Args:
             memory: 메모리 관리자 인스턴스
+            solution_index: 솔루션 색인 (기본값: None, 메모리 디렉토리의 공유 색인 사용)
+            small_llm: 캐스케이드의 작은 모델 (기본값: None, 처음 필요할 때 config.cascade_model_path로 로드)
         """
         super().__init__(
             memory=memory,
             prompt_template=DEVELOPER_PROMPT,
             output_model=CodeSolution
         )
+        self.solution_index = solution_index if solution_index is not None else get_solution_index(str(memory.memory_dir))
+        self._small_llm = small_llm
+    
+    def _tier_llm(self, tier: str) -> Any:
+        """티어에 해당하는 모델 (작은 모델은 처음 필요할 때 레지스트리에서 가져옴)"""
+        if tier == "large":
+            return self.llm
+        if self._small_llm is None:
+            self._small_llm = get_llm(model_path=config.cascade_model_path, role=self.role)
+        return self._small_llm
+    
+    def _select_tier(self, state: Dict[str, Any], policy: Dict[str, Any]) -> str:
+        """이번 시도에 사용할 티어를 결정
+        
+        Args:
+            state: 현재 상태
+            policy: 캐스케이드 정책
+            
+        Returns:
+            str: "small" 또는 "large"
+        """
+        if not policy["enabled"]:
+            return "large"
+        results = state.get("results", [])
+        index = state["current_task_index"]
+        previous = results[index] if index < len(results) else None
+        if previous is None or previous.get("tier") is None:
+            return "small"
+        if previous["tier"] == "large":
+            return "large"
+        # 직전 시도는 작은 모델이었고 비평가가 그 결과를 방금 평가함
+        evaluations = state.get("evaluations", [])
+        score = evaluations[-1].get("score", 0.0) if evaluations else 0.0
+        if score < policy["escalation_score"] or previous.get("small_attempts", 1) >= policy["max_small_attempts"]:
+            metrics.increment("cascade.escalations")
+            return "large"
+        return "small"
     
     def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """태스크에 맞는 코드 생성
@@ -64,17 +190,53 @@ class DeveloperAgent(BaseAgent):
         # 이전 태스크들의 결과 수집 (Refactored to BaseAgent)
         previous_results_str = self._compile_previous_results(state)
         
+        # 색인에서 유사한 수락된 솔루션 검색
+        matches = []
+        if self.solution_index is not None:
+            matches = [
+                match for match in self.solution_index.search(current_task.description, k=config.solution_index_top_k)
+                if match.similarity >= config.solution_index_min_similarity
+            ]
+        
+        # 이 태스크의 첫 시도이고 같은 태스크(정규화한 설명이 같음)가 있으면 생성 없이 재사용
+        results = state.get("results", [])
+        first_attempt = state["current_task_index"] >= len(results) or results[state["current_task_index"]] is None
+        exact = next((match for match in matches if match.exact), None)
+        if first_attempt and exact is not None:
+            current_solution_dict = {
+                key: value for key, value in exact.solution.items() if key not in ("tier", "small_attempts")
+            }
+            current_solution_dict["source"] = "solution_index"
+            return self._record_solution(state, current_task, current_solution_dict)
+        
+        policy = cascade_policy(state.get("cascade"))
+        tier = self._select_tier(state, policy)
         current_solution_dict = {}
         try:
-            # LLM 호출
-            response_content = self.llm(self.prompt_template.format(
+            # 다시 시도하는 태스크는 기존 코드를 고치는 것부터 시도
+            if not first_attempt:
+                current_solution_dict = self._revise(state, current_task, tier) or {}
+            prompt = self.prompt_template.format(
                 task_description=current_task.description,
-                previous_results=previous_results_str
-            ))
-            
-            # 응답 파싱
-            solution = self.output_parser.parse(response_content)
-            current_solution_dict = solution.dict()
+                previous_results=previous_results_str,
+                examples=format_exemplars(matches)
+            )
+            while not current_solution_dict:
+                metrics.increment(f"cascade.attempts.{tier}")
+                # LLM 호출
+                response_content = self._invoke_llm(prompt, llm=self._tier_llm(tier), state=state)
+                
+                # 응답 파싱 (복구해도 작은 모델의 응답을 파싱하지 못하면 같은 프롬프트로 큰 모델에 다시 요청)
+                try:
+                    solution = self._parse_output(response_content, llm=self._tier_llm(tier), state=state)
+                except OutputParserException:
+                    if tier != "small":
+                        raise
+                    metrics.increment("cascade.escalations")
+                    tier = "large"
+                    continue
+                current_solution_dict = solution.dict()
+                break
 
         except OutputParserException as e:
             error_message = f"DeveloperAgent: Error parsing LLM response for task {current_task.task_id}. Details: {str(e)}"
@@ -101,12 +263,66 @@ class DeveloperAgent(BaseAgent):
                 "test_cases": []
             }
         
-        # 메모리에 결과 저장 (even if it's an error response)
-        self.append_conversation("developer", {
-            "task_id": current_task.task_id,
-            "content": current_solution_dict # Log the error or success
-        })
+        if policy["enabled"]:
+            current_solution_dict["tier"] = tier
+            previous = state.get("results", [])[state["current_task_index"]] if not first_attempt else None
+            small_attempts = (previous or {}).get("small_attempts", 0)
+            current_solution_dict["small_attempts"] = small_attempts + (1 if tier == "small" else 0)
+        return self._record_solution(state, current_task, current_solution_dict)
+    
+    def _revise(self, state: Dict[str, Any], current_task: Any, tier: str) -> Optional[Dict[str, Any]]:
+        """이전 시도의 코드를 비평가 피드백에 따라 편집 블록으로 수정
         
+        Args:
+            state: 현재 상태 (이 태스크의 이전 결과와 마지막 평가 포함)
+            current_task: 현재 태스크
+            tier: 사용할 캐스케이드 티어
+            
+        Returns:
+            Optional[Dict[str, Any]]: 수정된 솔루션 (수정 모드를 쓰지 않거나 수정 내용을 적용할 수 없으면 None)
+        """
+        if not config.revision_enabled:
+            return None
+        previous = self._load_payload(state["results"][state["current_task_index"]]) or {}
+        code = previous.get("code", "")
+        if len(code) < config.revision_min_chars or code.startswith("# ERROR"):
+            return None
+        evaluations = state.get("evaluations", [])
+        evaluation = self._load_payload(evaluations[-1]) if evaluations else {}
+        improvements = evaluation.get("improvements") or []
+        prompt = REVISION_PROMPT.format(
+            task_description=current_task.description,
+            code=code,
+            feedback=evaluation.get("feedback") or "없음",
+            improvements="\n".join(f"- {item}" for item in improvements) or "없음"
+        )
+        metrics.increment("revision.attempts")
+        response = self._invoke_llm(prompt, llm=self._tier_llm(tier), state=state)
+        try:
+            revised_code, explanation = apply_revision(code, response)
+        except PatchError as e:
+            print(f"DeveloperAgent: 수정 내용을 적용할 수 없어 코드 전체를 다시 생성합니다 (태스크 {current_task.task_id}): {e}")
+            metrics.increment("revision.fallbacks")
+            return None
+        metrics.increment("revision.applied")
+        return {
+            "code": revised_code,
+            "explanation": explanation or previous.get("explanation", ""),
+            "test_cases": previous.get("test_cases", []),
+            "source": "revision"
+        }
+    
+    def _record_solution(self, state: Dict[str, Any], current_task: Any, current_solution_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """솔루션을 메모리에 기록하고 상태에 반영
+        
+        Args:
+            state: 현재 상태
+            current_task: 현재 태스크
+            current_solution_dict: 솔루션 (또는 오류 응답, 캐스케이드 사용 시 tier 포함)
+            
+        Returns:
+            Dict[str, Any]: 업데이트된 상태
+        """
         # 상태 업데이트
         if "results" not in state:
             state["results"] = []
@@ -115,7 +331,16 @@ class DeveloperAgent(BaseAgent):
         while len(state["results"]) <= state["current_task_index"]:
             state["results"].append(None)
         
+        # 긴 코드/설명은 블롭으로 한 번만 저장하고, 같은 태스크의 이전 시도를 델타 기준으로 사용
+        stored = self._store_payload(current_solution_dict, base=state["results"][state["current_task_index"]])
+        
+        # 메모리에 결과 저장 (even if it's an error response)
+        self.append_conversation("developer", {
+            "task_id": current_task.task_id,
+            "content": stored # Log the error or success
+        })
+        
         # Overwrite or set the result for the current task index
-        state["results"][state["current_task_index"]] = current_solution_dict
+        state["results"][state["current_task_index"]] = stored
         
         return state 
\ No newline at end of file
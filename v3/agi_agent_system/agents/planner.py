@@ -3,13 +3,15 @@
 이 모듈은 목표를 하위 태스크로 분해하는 PlannerAgent 클래스를 정의합니다.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 import json
 import re
 
 from .base import BaseAgent
 from ..core.memory import MemoryManager
+from ..core.plan_cache import PlanCache, get_plan_cache
+from ..core.repair import coerce_ids
 
 class SubTask(BaseModel):
     """하위 태스크를 정의하는 모델"""
@@ -37,6 +39,9 @@ PLANNER_PROMPT = """목표를 하위 태스크로 분해해주세요.
 2. dependencies는 반드시 정수 배열이어야 합니다. 예: [1, 2, 3]
 3. 각 태스크는 명확하고 구체적인 설명을 가져야 합니다.
 
+유사한 목표에 대해 이전에 수락된 계획 (참고용, 목표에 맞게 수정하세요):
+{reference_plan}
+
 {format_instructions}
 
 태스크 계획:"""
@@ -50,15 +55,14 @@ def extract_json(text: str) -> str:
     Returns:
         str: 추출된 JSON 문자열
     """
-    # JSON 객체를 찾는 정규식 패턴 (더 정확한 버전)
-    pattern = r'\{(?:[^{}]|(?R))*\}'
-    match = re.search(pattern, text)
-    if match:
-        json_str = match.group(0)
+    # 첫 번째 '{'부터 괄호 균형이 맞는 JSON 객체를 찾음
+    # (re 모듈은 재귀 패턴 (?R)을 지원하지 않음)
+    start = text.find('{')
+    if start != -1:
         try:
-            # JSON 유효성 검사
-            json.loads(json_str)
-            return json_str
+            # 파싱에 성공한 구간만 반환 (JSON 유효성 검사 겸용)
+            _, end = json.JSONDecoder().raw_decode(text, start)
+            return text[start:end]
         except json.JSONDecodeError:
             pass
     
@@ -78,33 +82,27 @@ def parse_dependencies(deps: List[Any]) -> List[int]:
     Returns:
         List[int]: 정수로 변환된 의존성 목록
     """
-    result = []
-    for dep in deps:
-        if isinstance(dep, int):
-            result.append(dep)
-        elif isinstance(dep, str):
-            # "tasks.1" 형식의 문자열에서 숫자만 추출
-            try:
-                num = int(''.join(filter(str.isdigit, dep)))
-                result.append(num)
-            except ValueError:
-                continue
-    return result
+    # "tasks.1" 형식의 문자열에서 숫자만 추출
+    return coerce_ids(deps)
 
 class PlannerAgent(BaseAgent):
     """목표를 하위 태스크로 분해하는 에이전트"""
     
-    def __init__(self, memory: MemoryManager):
+    role = "planner"
+    
+    def __init__(self, memory: MemoryManager, plan_cache: Optional[PlanCache] = None):
         """PlannerAgent 초기화
         
         Args:
             memory: 메모리 관리자 인스턴스
+            plan_cache: 플랜 캐시 (기본값: None, 메모리 디렉토리의 공유 캐시 사용)
         """
         super().__init__(
             memory=memory,
             prompt_template=PLANNER_PROMPT,
             output_model=TaskPlan
         )
+        self.plan_cache = plan_cache if plan_cache is not None else get_plan_cache(str(memory.memory_dir))
     
     def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """목표를 하위 태스크로 분해
@@ -115,20 +113,42 @@ class PlannerAgent(BaseAgent):
         Returns:
             Dict[str, Any]: 업데이트된 상태
         """
+        # 같은 목표의 계획이 캐시에 있으면 재사용하고, 유사한 목표의 계획은 참고 예시로 제공
+        # (계획은 모든 태스크가 수락된 뒤 CriticAgent가 캐시에 추가)
+        match = self.plan_cache.lookup(state["goal"]) if self.plan_cache is not None else None
+        if match and match.is_hit:
+            task_plan = TaskPlan(**match.plan)
+            for task in task_plan.tasks:
+                self.append_conversation("planner", task.dict())
+            state["tasks"] = task_plan.tasks
+            state["current_task_index"] = 0
+            return state
+        
+        reference_plan = json.dumps(match.plan, ensure_ascii=False) if match else "없음"
+        
         # LLM 호출
-        response = self.llm.invoke(self.prompt_template.format(goal=state["goal"]))
+        response = self._invoke_llm(self.prompt_template.format(
+            goal=state["goal"],
+            reference_plan=reference_plan
+        ))
         
         try:
-            # JSON 추출 및 파싱
-            json_str = extract_json(response)
-            response_dict = json.loads(json_str)
-            
-            # 의존성 파싱 및 변환
-            for task in response_dict["tasks"]:
-                task["dependencies"] = parse_dependencies(task["dependencies"])
-            
-            # Pydantic 모델로 변환
-            task_plan = TaskPlan(**response_dict)
+            try:
+                # JSON 추출 및 파싱
+                json_str = extract_json(response)
+                response_dict = json.loads(json_str)
+                
+                # 의존성 파싱 및 변환
+                for task in response_dict["tasks"]:
+                    task["dependencies"] = parse_dependencies(task["dependencies"])
+                
+                # Pydantic 모델로 변환
+                task_plan = TaskPlan(**response_dict)
+            except Exception:
+                # 다시 계획하기 전에 응답 복구 시도
+                task_plan = self._repair_output(response)
+                if task_plan is None:
+                    raise
             
             # 메모리에 태스크 저장
             for task in task_plan.tasks:
@@ -0,0 +1,7 @@
+"""벤치마크 패키지
+
+이 패키지는 시스템 성능을 측정하는 벤치마크 스크립트들을 포함합니다:
+- importtime: CLI 시작 시 임포트 비용 측정
+- tune: llama.cpp 스레드 수/배치 크기 자동 튜닝
+- load: API 부하 테스트
+"""
@@ -0,0 +1,152 @@
+"""시작 시간 벤치마크 모듈
+
+이 모듈은 `python -X importtime`으로 CLI 진입점의 임포트 비용을 측정합니다.
+CI에서 --budget-ms와 함께 실행하면 시작 시간이 예산을 넘거나 무거운 스택
+(LangChain, FastAPI 등)이 시작 시 임포트될 때 0이 아닌 코드로 종료합니다.
+
+사용 예:
+    python -m agi_agent_system.benchmarks.importtime --budget-ms 300 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 패키지 상위 디렉토리 (서브프로세스의 PYTHONPATH)
+PACKAGE_PARENT = Path(__file__).resolve().parents[2]
+
+# CLI 시작 시 임포트되면 안 되는 모듈
+HEAVY_MODULES = (
+    "langchain", "langchain_community", "langchain_core", "langgraph",
+    "fastapi", "uvicorn", "pydantic", "numpy", "llama_cpp",
+)
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    """패키지를 임포트할 수 있는 환경에서 파이썬 서브프로세스 실행"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PACKAGE_PARENT), env.get("PYTHONPATH")]))
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+
+def parse_importtime(stderr: str) -> Dict[str, Dict[str, int]]:
+    """-X importtime 출력을 모듈별 self/cumulative 시간(us)으로 변환
+
+    Args:
+        stderr: -X importtime 출력
+
+    Returns:
+        Dict[str, Dict[str, int]]: 모듈 이름별 {"self_us", "cumulative_us"}
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        modules[parts[2].strip()] = {
+            "self_us": int(parts[0]),
+            "cumulative_us": int(parts[1]),
+        }
+    return modules
+
+def measure_import(module: str, runs: int = 5) -> Dict[str, Dict[str, int]]:
+    """모듈 임포트 비용을 여러 번 측정해 가장 빠른 실행을 반환
+
+    Args:
+        module: 측정할 모듈 이름
+        runs: 측정 횟수 (기본값: 5)
+
+    Returns:
+        Dict[str, Dict[str, int]]: 가장 빠른 실행의 모듈별 임포트 시간
+    """
+    best = None
+    for _ in range(runs):
+        modules = parse_importtime(_run(["-X", "importtime", "-c", f"import {module}"]).stderr)
+        if best is None or modules[module]["cumulative_us"] < best[module]["cumulative_us"]:
+            best = modules
+    return best
+
+def measure_command(args: List[str], runs: int = 5) -> float:
+    """명령 실행의 최소 벽시계 시간(ms) 측정
+
+    Args:
+        args: 파이썬 인자 목록 (예: ["-m", "agi_agent_system.main", "--help"])
+        runs: 측정 횟수 (기본값: 5)
+
+    Returns:
+        float: 최소 실행 시간 (ms)
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run(args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+def run_benchmark(module: str = "agi_agent_system.main", runs: int = 5, top: int = 10) -> Dict[str, Any]:
+    """시작 시간 벤치마크 실행
+
+    Args:
+        module: 측정할 진입점 모듈 (기본값: agi_agent_system.main)
+        runs: 측정 횟수 (기본값: 5)
+        top: 보고할 가장 느린 모듈 수 (기본값: 10)
+
+    Returns:
+        Dict[str, Any]: 임포트 시간, --help 실행 시간, 느린 모듈, 임포트된 무거운 모듈
+    """
+    modules = measure_import(module, runs)
+    slowest = sorted(modules.items(), key=lambda item: item[1]["self_us"], reverse=True)[:top]
+    return {
+        "module": module,
+        "import_ms": modules[module]["cumulative_us"] / 1000,
+        "help_ms": measure_command(["-m", module, "--help"], runs),
+        "slowest_modules": [{"module": name, **timing} for name, timing in slowest],
+        "heavy_modules": sorted({
+            name.split(".")[0] for name in modules if name.split(".")[0] in HEAVY_MODULES
+        }),
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """벤치마크 명령 진입점
+
+    Args:
+        argv: 명령줄 인자 (기본값: sys.argv)
+
+    Returns:
+        int: 종료 코드 (예산 초과 또는 무거운 모듈 임포트 시 1)
+    """
+    parser = argparse.ArgumentParser(description="CLI 시작 시간 벤치마크")
+    parser.add_argument("--module", default="agi_agent_system.main", help="측정할 진입점 모듈")
+    parser.add_argument("--runs", type=int, default=5, help="측정 횟수 (기본값: 5)")
+    parser.add_argument("--top", type=int, default=10, help="보고할 느린 모듈 수 (기본값: 10)")
+    parser.add_argument("--budget-ms", type=float, help="임포트 시간 예산 (초과 시 실패)")
+    parser.add_argument("--json", type=str, help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.module, args.runs, args.top)
+    print(f"import {report['module']}: {report['import_ms']:.1f} ms")
+    print(f"{report['module']} --help: {report['help_ms']:.1f} ms")
+    for entry in report["slowest_modules"]:
+        print(f"  {entry['self_us'] / 1000:8.2f} ms  {entry['module']}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    failed = False
+    if report["heavy_modules"]:
+        print(f"시작 시 무거운 모듈이 임포트됨: {', '.join(report['heavy_modules'])}")
+        failed = True
+    if args.budget_ms is not None and report["import_ms"] > args.budget_ms:
+        print(f"임포트 시간 예산 초과: {report['import_ms']:.1f} ms > {args.budget_ms:.1f} ms")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
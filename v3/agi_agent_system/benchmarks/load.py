@@ -0,0 +1,419 @@
+"""API 부하 테스트 모듈
+
+이 모듈은 FastAPI 서비스에 POST /run과 세션 엔드포인트(GET /sessions/{id}/usage)를
+호출하는 시나리오를 반복해 포화 지점을 찾기 위한 부하를 만듭니다.
+
+- closed-loop: concurrency개의 가상 사용자가 응답을 받자마자 다음 요청을 보냄
+- open-loop: 응답과 무관하게 초당 rate개의 시나리오가 포아송 과정으로 도착
+
+--url을 지정하지 않으면 같은 프로세스의 앱을 가짜 백엔드(또는 --transcripts로
+기록된 응답을 재생하는 replay 백엔드)로 호출합니다. 결과는 릴리스 간에 비교할 수
+있는 JSON 보고서(처리량, 엔드포인트별 지연 시간 백분위수, 오류율, 서버 측
+/metrics의 변화량)로 기록됩니다.
+
+사용 예:
+    python -m agi_agent_system.main --mode loadtest --arrival open --rate 5 --duration 60 --report load.json
+    python -m agi_agent_system.benchmarks.load --url http://localhost:8000 --concurrency 8 --requests 200
+    python -m agi_agent_system.benchmarks.load --record memory --output transcripts.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import config
+from ..core.metrics import summarize
+
+DEFAULT_GOALS = (
+    ("할 일 목록 앱 만들기", 3.0),
+    ("CSV 파일을 읽어 열별 평균을 계산하는 스크립트 작성", 2.0),
+    ("간단한 URL 단축 서비스 설계", 1.0),
+)
+ARRIVALS = ("closed", "open")
+
+def load_goal_mix(path: Optional[str] = None) -> List[Tuple[str, float]]:
+    """목표 구성(목표, 가중치)을 읽음
+
+    Args:
+        path: .jsonl({"goal", "weight"}) 또는 한 줄에 목표 하나인 텍스트 파일 (기본값: 내장 목표)
+
+    Returns:
+        List[Tuple[str, float]]: (목표, 가중치) 목록
+    """
+    if path is None:
+        return list(DEFAULT_GOALS)
+    mix = []
+    is_jsonl = Path(path).suffix == ".jsonl"
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or (not is_jsonl and line.startswith("#")):
+                continue
+            item = json.loads(line) if is_jsonl else {"goal": line}
+            mix.append((item["goal"], float(item.get("weight", 1.0))))
+    if not mix:
+        raise ValueError(f"목표가 없습니다: {path}")
+    return mix
+
+def record_transcripts(memory_dir: str, output_path: str) -> int:
+    """세션 메모리에 기록된 에이전트 출력을 replay 백엔드용 transcript로 저장
+
+    압축되어 콜드 아카이브로 옮겨진 대화도 포함하며, 오류 응답은 제외합니다.
+
+    Args:
+        memory_dir: 세션 메모리 디렉토리
+        output_path: transcript 파일 경로 (JSONL)
+
+    Returns:
+        int: 기록한 응답 수
+    """
+    from ..core.blobs import get_blob_store
+    from ..core.memory import MemoryManager
+
+    blobs = get_blob_store(memory_dir)
+    records = []
+    for path in sorted(Path(memory_dir).glob("*.json")):
+        memory = MemoryManager(session_id=path.stem, memory_dir=memory_dir)
+        entries = [*memory.load_archive(), *memory.get("conversations")]
+        tasks = [entry["content"] for entry in entries if entry.get("role") == "planner"]
+        if tasks:
+            records.append({"kind": "plan", "response": json.dumps({"tasks": tasks}, ensure_ascii=False)})
+        for entry in entries:
+            kind = {"developer": "code", "critic": "evaluation"}.get(entry.get("role"))
+            content = blobs.resolve((entry.get("content") or {}).get("content"))
+            if kind is None or not isinstance(content, dict) or "error" in content:
+                continue
+            content = {key: value for key, value in content.items() if key not in ("tier", "small_attempts", "source")}
+            records.append({"kind": kind, "response": json.dumps(content, ensure_ascii=False)})
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return len(records)
+
+class LoadRecorder:
+    """요청별 지연 시간과 결과를 엔드포인트별로 모음"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+        self.scenarios = 0
+        self.completed_goals = 0
+
+    def record(self, endpoint: str, latency_ms: float, error: Optional[str] = None) -> None:
+        self.latencies.setdefault(endpoint, []).append(latency_ms)
+        errors = self.errors.setdefault(endpoint, {})
+        if error is not None:
+            errors[error] = errors.get(error, 0) + 1
+
+    def endpoints(self) -> Dict[str, Any]:
+        report = {}
+        for endpoint, latencies in self.latencies.items():
+            errors = sum(self.errors.get(endpoint, {}).values())
+            report[endpoint] = {
+                "count": len(latencies),
+                "errors": errors,
+                "error_rate": errors / len(latencies),
+                "error_kinds": self.errors.get(endpoint, {}),
+                "latency_ms": summarize(latencies),
+            }
+        return report
+
+async def _call(client: Any, recorder: LoadRecorder, endpoint: str, method: str, url: str, **kwargs) -> Optional[Any]:
+    """요청 하나를 보내고 결과를 기록 (성공하면 응답, 실패하면 None)"""
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except Exception as e:
+        recorder.record(endpoint, (time.perf_counter() - start) * 1000, f"exception:{type(e).__name__}")
+        return None
+    latency_ms = (time.perf_counter() - start) * 1000
+    if response.status_code >= 400:
+        recorder.record(endpoint, latency_ms, str(response.status_code))
+        return None
+    recorder.record(endpoint, latency_ms)
+    return response
+
+async def _scenario(
+    client: Any, recorder: LoadRecorder, goal: str, memory_dir: str, session_ratio: float, lane: str, rng: random.Random
+) -> None:
+    """목표 하나를 실행하고 (비율에 따라) 세션 사용량을 조회
+
+    batch 레인 요청은 "POST /run (batch)"로 따로 집계해 interactive 지연 시간과 비교합니다.
+    """
+    recorder.scenarios += 1
+    endpoint = "POST /run" if lane == "interactive" else f"POST /run ({lane})"
+    response = await _call(
+        client, recorder, endpoint, "POST", "/run",
+        json={"goal": goal, "memory_dir": memory_dir}, headers={"X-Priority": lane}
+    )
+    if response is None:
+        return
+    recorder.completed_goals += 1
+    if rng.random() < session_ratio:
+        session_id = response.json()["session_id"]
+        await _call(
+            client, recorder, "GET /sessions/{session_id}/usage", "GET",
+            f"/sessions/{session_id}/usage", params={"memory_dir": memory_dir}
+        )
+
+async def _server_metrics(client: Any) -> Optional[Dict[str, Any]]:
+    """서버의 /metrics (없으면 None)"""
+    try:
+        response = await client.get("/metrics")
+        return response.json() if response.status_code == 200 else None
+    except Exception:
+        return None
+
+def server_delta(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """부하 전후의 서버 메트릭 비교
+
+    Args:
+        before: 부하 전 /metrics
+        after: 부하 후 /metrics
+
+    Returns:
+        Optional[Dict[str, Any]]: {"counters": 변화량, "gauges": 부하 후 값, "histograms": api/큐 분포}
+    """
+    if before is None or after is None:
+        return None
+    counters = {
+        name: value - before["counters"].get(name, 0)
+        for name, value in after["counters"].items()
+        if value != before["counters"].get(name, 0)
+    }
+    histograms = {
+        name: values for name, values in after.get("histograms", {}).items()
+        if name.startswith("api.") or "queue" in name
+    }
+    return {"counters": counters, "gauges": after.get("gauges", {}), "histograms": histograms}
+
+async def run_load(
+    client: Any,
+    mix: List[Tuple[str, float]],
+    arrival: str = "closed",
+    concurrency: int = 4,
+    rate: float = 1.0,
+    requests: Optional[int] = None,
+    duration: Optional[float] = None,
+    memory_dir: str = "memory",
+    session_ratio: float = 1.0,
+    batch_ratio: float = 0.0,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """부하를 만들고 보고서를 반환
+
+    Args:
+        client: base_url이 지정된 httpx.AsyncClient
+        mix: (목표, 가중치) 목록
+        arrival: "closed" 또는 "open" (기본값: "closed")
+        concurrency: closed-loop의 가상 사용자 수 (기본값: 4)
+        rate: open-loop의 초당 시나리오 도착 수 (기본값: 1)
+        requests: 실행할 시나리오 수 (기본값: None, duration까지)
+        duration: 실행 시간 (초, 기본값: None, requests만큼)
+        memory_dir: 서버가 사용할 메모리 디렉토리 (기본값: "memory")
+        session_ratio: 세션 사용량을 함께 조회할 시나리오 비율 (기본값: 1)
+        batch_ratio: X-Priority: batch로 보낼 시나리오 비율 (기본값: 0)
+        seed: 목표 선택과 도착 간격의 난수 시드 (기본값: 0)
+
+    Returns:
+        Dict[str, Any]: 부하 테스트 보고서
+
+    Raises:
+        ValueError: 인자가 잘못된 경우
+    """
+    if arrival not in ARRIVALS:
+        raise ValueError(f"알 수 없는 도착 방식: {arrival} (사용 가능: {', '.join(ARRIVALS)})")
+    if requests is None and duration is None:
+        raise ValueError("requests 또는 duration 중 하나는 지정해야 합니다.")
+    rng = random.Random(seed)
+    goals, weights = [goal for goal, _ in mix], [weight for _, weight in mix]
+    recorder = LoadRecorder()
+    before = await _server_metrics(client)
+    start = time.perf_counter()
+    deadline = None if duration is None else start + duration
+    issued = 0
+
+    def more() -> bool:
+        nonlocal issued
+        if requests is not None and issued >= requests:
+            return False
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        issued += 1
+        return True
+
+    def scenario() -> Any:
+        lane = "batch" if rng.random() < batch_ratio else "interactive"
+        return _scenario(client, recorder, rng.choices(goals, weights)[0], memory_dir, session_ratio, lane, rng)
+
+    if arrival == "closed":
+        async def user() -> None:
+            while more():
+                await scenario()
+        await asyncio.gather(*(user() for _ in range(max(1, concurrency))))
+    else:
+        if rate <= 0:
+            raise ValueError("open-loop에서는 rate가 0보다 커야 합니다.")
+        pending = []
+        while more():
+            pending.append(asyncio.create_task(scenario()))
+            await asyncio.sleep(rng.expovariate(rate))
+        await asyncio.gather(*pending)
+
+    elapsed = time.perf_counter() - start
+    after = await _server_metrics(client)
+    endpoints = recorder.endpoints()
+    total = sum(item["count"] for item in endpoints.values())
+    errors = sum(item["errors"] for item in endpoints.values())
+    return {
+        "created_at": datetime.now().isoformat(),
+        "arrival": arrival,
+        "concurrency": concurrency if arrival == "closed" else None,
+        "rate": rate if arrival == "open" else None,
+        "duration_s": elapsed,
+        "scenarios": recorder.scenarios,
+        "requests": total,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "goals_per_s": recorder.completed_goals / elapsed if elapsed else 0.0,
+        "error_rate": errors / total if total else 0.0,
+        "endpoints": endpoints,
+        "server": server_delta(before, after),
+    }
+
+def run_loadtest(
+    url: Optional[str] = None,
+    report_path: Optional[str] = None,
+    goals_path: Optional[str] = None,
+    transcripts: Optional[str] = None,
+    memory_dir: Optional[str] = None,
+    **options: Any
+) -> Dict[str, Any]:
+    """부하 테스트를 실행하고 보고서를 출력/저장 (loadtest 모드)
+
+    Args:
+        url: 대상 서버 주소 (기본값: None, 같은 프로세스의 앱을 가짜/replay 백엔드로 호출)
+        report_path: 보고서를 저장할 JSON 파일 (기본값: None)
+        goals_path: 목표 구성 파일 (기본값: 내장 목표)
+        transcripts: replay 백엔드가 재생할 transcript 파일 (같은 프로세스에서만 사용)
+        memory_dir: 서버가 사용할 메모리 디렉토리 (기본값: 원격은 "memory", 같은 프로세스는 임시 디렉토리)
+        **options: run_load 인자 (arrival, concurrency, rate, requests, duration, session_ratio, batch_ratio, seed)
+
+    Returns:
+        Dict[str, Any]: 부하 테스트 보고서
+    """
+    import httpx
+
+    mix = load_goal_mix(goals_path)
+
+    async def drive(client: Any, directory: str) -> Dict[str, Any]:
+        async with client:
+            return await run_load(client, mix, memory_dir=directory, **options)
+
+    if url:
+        report = asyncio.run(drive(httpx.AsyncClient(base_url=url, timeout=None), memory_dir or "memory"))
+        report["target"] = url
+    else:
+        from ..core.llm import clear_llm_registry
+        from ..interface.api import app
+
+        backend = ("replay", transcripts) if transcripts else ("fake", config.replay_transcripts)
+        previous = (config.llm_backend, config.replay_transcripts)
+        config.llm_backend, config.replay_transcripts = backend
+        clear_llm_registry()
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=None)
+                report = asyncio.run(drive(client, memory_dir or tmp))
+        finally:
+            config.llm_backend, config.replay_transcripts = previous
+            clear_llm_registry()
+        report["target"] = f"in-process ({backend[0]})"
+
+    print_report(report)
+    if report_path:
+        Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+def print_report(report: Dict[str, Any]) -> None:
+    """보고서 요약 출력
+
+    Args:
+        report: run_load가 반환한 보고서
+    """
+    print(
+        f"{report['scenarios']}개 시나리오, {report['requests']}개 요청 / {report['duration_s']:.1f}초: "
+        f"{report['throughput_rps']:.2f} req/s, {report['goals_per_s']:.2f} goals/s, "
+        f"오류율 {report['error_rate']:.1%}"
+    )
+    for endpoint, item in report["endpoints"].items():
+        latency = item["latency_ms"]
+        print(
+            f"  {endpoint:<36} n={item['count']:<6d} p50={latency['p50']:8.1f}ms "
+            f"p95={latency['p95']:8.1f}ms p99={latency['p99']:8.1f}ms 오류 {item['errors']}"
+        )
+    server = report.get("server")
+    if server:
+        print(f"  서버 최대 동시 처리 요청 수: {server['gauges'].get('api.in_flight.max', 0):.0f}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """부하 테스트 명령 진입점
+
+    Args:
+        argv: 명령줄 인자 (기본값: sys.argv)
+
+    Returns:
+        int: 종료 코드 (오류가 있으면 1)
+    """
+    parser = argparse.ArgumentParser(description="API 부하 테스트")
+    parser.add_argument("--url", type=str, help="대상 서버 주소 (기본값: 같은 프로세스의 앱)")
+    parser.add_argument("--arrival", choices=ARRIVALS, default="closed", help="도착 방식 (기본값: closed)")
+    parser.add_argument("--concurrency", type=int, default=4, help="closed-loop 가상 사용자 수 (기본값: 4)")
+    parser.add_argument("--rate", type=float, default=1.0, help="open-loop 초당 시나리오 수 (기본값: 1)")
+    parser.add_argument("--requests", type=int, help="실행할 시나리오 수")
+    parser.add_argument("--duration", type=float, help="실행 시간 (초)")
+    parser.add_argument("--goals", type=str, help="목표 구성 파일 (.jsonl {goal, weight} 또는 텍스트)")
+    parser.add_argument("--transcripts", type=str, help="replay 백엔드로 재생할 transcript 파일")
+    parser.add_argument("--memory-dir", type=str, help="서버가 사용할 메모리 디렉토리")
+    parser.add_argument("--session-ratio", type=float, default=1.0, help="세션 사용량을 조회할 시나리오 비율 (기본값: 1)")
+    parser.add_argument("--batch-ratio", type=float, default=0.0, help="batch 레인으로 보낼 시나리오 비율 (기본값: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드 (기본값: 0)")
+    parser.add_argument("--report", type=str, help="보고서를 저장할 JSON 파일")
+    parser.add_argument("--record", type=str, metavar="MEMORY_DIR", help="세션 메모리에서 transcript를 만들어 --output에 저장")
+    parser.add_argument("--output", type=str, help="--record 결과 파일")
+    args = parser.parse_args(argv)
+    if args.record:
+        if not args.output:
+            parser.error("--record에는 --output이 필요합니다.")
+        print(f"{record_transcripts(args.record, args.output)}개 응답을 {args.output}에 기록했습니다.")
+        return 0
+    if args.requests is None and args.duration is None:
+        args.requests = 20
+    report = run_loadtest(
+        url=args.url,
+        report_path=args.report,
+        goals_path=args.goals,
+        transcripts=args.transcripts,
+        memory_dir=args.memory_dir,
+        arrival=args.arrival,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        requests=args.requests,
+        duration=args.duration,
+        session_ratio=args.session_ratio,
+        batch_ratio=args.batch_ratio,
+        seed=args.seed
+    )
+    return 1 if report["error_rate"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
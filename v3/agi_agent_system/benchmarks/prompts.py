@@ -0,0 +1,114 @@
+"""프롬프트 렌더링 마이크로 벤치마크 모듈
+
+이 모듈은 에이전트 프롬프트를 준비하고 렌더링하는 호출당 비용을 측정합니다.
+각 템플릿마다 다음을 비교합니다:
+
+- setup: 에이전트를 만들 때마다 파서 두 개, 형식 지침, PromptTemplate을 새로 만드는
+  방식(uncached)과 프롬프트 레지스트리에서 가져오는 방식(cached)
+- render: LangChain PromptTemplate.format과 컴파일된 프롬프트의 format
+
+사용 예:
+    python -m agi_agent_system.benchmarks.prompts --number 2000 --json prompts.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain.output_parsers import PydanticOutputParser
+from langchain.prompts import PromptTemplate
+
+from ..agents.critic import CRITIC_PROMPT, CodeEvaluation
+from ..agents.developer import DEVELOPER_PROMPT, CodeSolution
+from ..agents.planner import PLANNER_PROMPT, TaskPlan
+from ..core.prompts import compile_prompt
+
+# 템플릿 이름 -> (템플릿, 출력 모델, 렌더링 입력)
+TEMPLATES = {
+    "planner": (PLANNER_PROMPT, TaskPlan, {"goal": "할 일 관리 앱 만들기", "reference_plan": "없음"}),
+    "developer": (DEVELOPER_PROMPT, CodeSolution, {
+        "task_description": "할 일 추가 API 구현",
+        "previous_results": "태스크 1 결과: " + "x" * 2000,
+        "examples": "없음",
+    }),
+    "critic": (CRITIC_PROMPT, CodeEvaluation, {
+        "task_description": "할 일 추가 API 구현",
+        "code": "def add(item):\n    return item\n" * 40,
+        "explanation": "항목을 추가합니다.",
+        "test_cases": "assert add(1) == 1",
+        "previous_results": "없음",
+        "success_threshold": 0.8,
+    }),
+}
+
+def uncached_setup(template: str, output_model: type) -> PromptTemplate:
+    """레지스트리 이전에 BaseAgent.__init__이 하던 준비 과정"""
+    prompt = PromptTemplate(
+        template=template,
+        input_variables=re.findall(r'\{([^}]+)\}', template),
+        partial_variables={"format_instructions": PydanticOutputParser(pydantic_object=output_model).get_format_instructions()}
+    )
+    PydanticOutputParser(pydantic_object=output_model)
+    return prompt
+
+def _best_us(func: Callable[[], Any], number: int, repeat: int) -> float:
+    """가장 빠른 반복의 호출당 시간 (us)"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+def run_benchmark(number: int = 1000, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """템플릿별 준비/렌더링 비용 측정
+
+    Args:
+        number: 반복당 호출 횟수 (기본값: 1000)
+        repeat: 반복 횟수 (기본값: 5, 가장 빠른 반복을 사용)
+
+    Returns:
+        Dict[str, Dict[str, float]]: 템플릿 이름별 {"setup_uncached_us", "setup_cached_us",
+        "render_langchain_us", "render_compiled_us"}
+    """
+    report = {}
+    for name, (template, output_model, inputs) in TEMPLATES.items():
+        langchain_prompt = uncached_setup(template, output_model)
+        compiled = compile_prompt(template, output_model)
+        if langchain_prompt.format(**inputs) != compiled.format(**inputs):
+            raise AssertionError(f"{name}: 렌더링 결과가 다릅니다.")
+        report[name] = {
+            "setup_uncached_us": _best_us(lambda: uncached_setup(template, output_model), max(1, number // 10), repeat),
+            "setup_cached_us": _best_us(lambda: compile_prompt(template, output_model), number, repeat),
+            "render_langchain_us": _best_us(lambda: langchain_prompt.format(**inputs), number, repeat),
+            "render_compiled_us": _best_us(lambda: compiled.format(**inputs), number, repeat),
+        }
+    return report
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """벤치마크 명령 진입점
+
+    Args:
+        argv: 명령줄 인자 (기본값: sys.argv)
+
+    Returns:
+        int: 종료 코드
+    """
+    parser = argparse.ArgumentParser(description="프롬프트 렌더링 마이크로 벤치마크")
+    parser.add_argument("--number", type=int, default=1000, help="반복당 호출 횟수 (기본값: 1000)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (기본값: 5)")
+    parser.add_argument("--json", type=str, help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.number, args.repeat)
+    print(f"{'템플릿':<10} {'준비(기존)':>12} {'준비(캐시)':>12} {'렌더(LangChain)':>16} {'렌더(컴파일)':>14}")
+    for name, timing in report.items():
+        print(
+            f"{name:<10} {timing['setup_uncached_us']:>10.1f}us {timing['setup_cached_us']:>10.2f}us "
+            f"{timing['render_langchain_us']:>14.2f}us {timing['render_compiled_us']:>12.2f}us"
+        )
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""llama.cpp 자동 튜닝 모듈
+
+이 모듈은 현재 머신에서 스레드 수와 배치 크기에 따른 프롬프트 평가/생성
+처리량을 측정하고, 가장 빠른 설정을 머신별 프로파일(LLM_PROFILE)에 기록합니다.
+이후 load_config는 이 프로파일을 성능 설정의 기본값으로 사용합니다.
+
+측정은 두 단계로 이루어집니다:
+1. 스레드 수 후보마다 (배치 크기는 현재 설정) 생성과 프롬프트 평가 처리량 측정
+   → 생성이 가장 빠른 n_threads, 프롬프트 평가가 가장 빠른 n_threads_batch 선택
+2. 선택한 n_threads_batch로 배치 크기 후보마다 프롬프트 평가 처리량 측정
+   → 가장 빠른 n_batch 선택
+
+사용 예:
+    python -m agi_agent_system.main --mode tune
+    python -m agi_agent_system.benchmarks.tune --threads 4 8 16 --batch-sizes 256 512
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..core.config import config
+
+DEFAULT_BATCH_SIZES = (128, 256, 512, 1024)
+
+# (n_threads, n_threads_batch, n_batch) -> {"prompt_tps", "gen_tps"}
+Measure = Callable[[int, int, int], Dict[str, float]]
+
+def candidate_threads(cpu_count: Optional[int] = None) -> List[int]:
+    """측정할 스레드 수 후보 (2의 거듭제곱, 코어 수의 절반, 코어 수)
+
+    Args:
+        cpu_count: 논리 코어 수 (기본값: os.cpu_count())
+
+    Returns:
+        List[int]: 오름차순 스레드 수 목록
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    candidates = {cpu_count, max(1, cpu_count // 2)}
+    threads = 1
+    while threads < cpu_count:
+        candidates.add(threads)
+        threads *= 2
+    return sorted(candidates)
+
+def llama_measure(model_path: str, prompt_tokens: int = 256, gen_tokens: int = 32) -> Measure:
+    """llama_cpp로 실제 모델 처리량을 측정하는 함수를 반환
+
+    Args:
+        model_path: 모델 파일 경로
+        prompt_tokens: 프롬프트 평가에 사용할 토큰 수 (기본값: 256)
+        gen_tokens: 생성할 토큰 수 (기본값: 32)
+
+    Returns:
+        Measure: (n_threads, n_threads_batch, n_batch)로 처리량을 측정하는 함수
+    """
+    from llama_cpp import Llama
+    from ..core.llm import llama_params
+
+    def measure(n_threads: int, n_threads_batch: int, n_batch: int) -> Dict[str, float]:
+        params = llama_params()
+        params.update(
+            n_ctx=max(params["n_ctx"], prompt_tokens + gen_tokens + 8),
+            n_threads=n_threads,
+            n_threads_batch=n_threads_batch,
+            n_batch=n_batch
+        )
+        llm = Llama(model_path=model_path, verbose=False, **params)
+        try:
+            text = "def solve(values):\n    return sorted(set(values))\n" * prompt_tokens
+            tokens = llm.tokenize(text.encode("utf-8"))[:prompt_tokens]
+            start = time.perf_counter()
+            llm.eval(tokens)
+            prompt_s = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(gen_tokens):
+                llm.eval([llm.sample()])
+            gen_s = time.perf_counter() - start
+        finally:
+            if hasattr(llm, "close"):
+                llm.close()
+        return {"prompt_tps": len(tokens) / prompt_s, "gen_tps": gen_tokens / gen_s}
+
+    return measure
+
+def tune(
+    measure: Measure,
+    thread_counts: List[int],
+    batch_sizes: List[int],
+    n_batch: Optional[int] = None
+) -> Dict[str, Any]:
+    """스레드 수와 배치 크기 후보를 측정해 가장 빠른 설정을 선택
+
+    Args:
+        measure: 처리량 측정 함수
+        thread_counts: 스레드 수 후보
+        batch_sizes: 배치 크기 후보
+        n_batch: 1단계에서 사용할 배치 크기 (기본값: config.n_batch)
+
+    Returns:
+        Dict[str, Any]: {"settings": 선택한 설정, "results": 측정 결과 목록}
+    """
+    n_batch = n_batch or config.n_batch
+    results = []
+    for threads in thread_counts:
+        result = measure(threads, threads, n_batch)
+        results.append({"n_threads": threads, "n_threads_batch": threads, "n_batch": n_batch, **result})
+        print(f"threads={threads:3d} batch={n_batch:5d}  prompt {result['prompt_tps']:8.1f} tok/s  gen {result['gen_tps']:7.1f} tok/s")
+    n_threads = max(results, key=lambda r: r["gen_tps"])["n_threads"]
+    n_threads_batch = max(results, key=lambda r: r["prompt_tps"])["n_threads_batch"]
+
+    best_batch = max(
+        (r for r in results if r["n_threads_batch"] == n_threads_batch),
+        key=lambda r: r["prompt_tps"]
+    )
+    for size in batch_sizes:
+        if size == n_batch:
+            continue
+        result = measure(n_threads, n_threads_batch, size)
+        entry = {"n_threads": n_threads, "n_threads_batch": n_threads_batch, "n_batch": size, **result}
+        results.append(entry)
+        print(f"threads={n_threads_batch:3d} batch={size:5d}  prompt {result['prompt_tps']:8.1f} tok/s")
+        if entry["prompt_tps"] > best_batch["prompt_tps"]:
+            best_batch = entry
+    return {
+        "settings": {
+            "n_threads": n_threads,
+            "n_threads_batch": n_threads_batch,
+            "n_batch": best_batch["n_batch"],
+        },
+        "results": results,
+    }
+
+def write_profile(path: str, report: Dict[str, Any]) -> None:
+    """튜닝 결과를 머신 정보와 함께 프로파일로 저장
+
+    Args:
+        path: 프로파일 파일 경로
+        report: tune이 반환한 결과
+    """
+    profile = {
+        "created_at": datetime.now().isoformat(),
+        "machine": {
+            "hostname": platform.node(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+        },
+        "model_path": config.model_path,
+        **report,
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
+
+def run_tune(
+    profile_path: Optional[str] = None,
+    thread_counts: Optional[List[int]] = None,
+    batch_sizes: Optional[List[int]] = None,
+    measure: Optional[Measure] = None
+) -> Dict[str, Any]:
+    """현재 머신에서 튜닝하고 프로파일을 기록 (tune 모드)
+
+    Args:
+        profile_path: 프로파일 파일 경로 (기본값: config.llm_profile)
+        thread_counts: 스레드 수 후보 (기본값: candidate_threads())
+        batch_sizes: 배치 크기 후보 (기본값: DEFAULT_BATCH_SIZES)
+        measure: 처리량 측정 함수 (기본값: config.model_path 모델로 측정)
+
+    Returns:
+        Dict[str, Any]: 튜닝 결과
+    """
+    profile_path = profile_path or config.llm_profile
+    report = tune(
+        measure or llama_measure(config.model_path),
+        thread_counts or candidate_threads(),
+        list(batch_sizes or DEFAULT_BATCH_SIZES)
+    )
+    write_profile(profile_path, report)
+    settings = report["settings"]
+    print(
+        f"선택한 설정: n_threads={settings['n_threads']}, "
+        f"n_threads_batch={settings['n_threads_batch']}, n_batch={settings['n_batch']} → {profile_path}"
+    )
+    return report
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """튜닝 명령 진입점
+
+    Args:
+        argv: 명령줄 인자 (기본값: sys.argv)
+
+    Returns:
+        int: 종료 코드
+    """
+    parser = argparse.ArgumentParser(description="llama.cpp 스레드/배치 크기 자동 튜닝")
+    parser.add_argument("--profile", type=str, help="프로파일 파일 경로 (기본값: LLM_PROFILE)")
+    parser.add_argument("--threads", type=int, nargs="+", help="스레드 수 후보 (기본값: 코어 수 기준)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", help="배치 크기 후보 (기본값: 128 256 512 1024)")
+    args = parser.parse_args(argv)
+    run_tune(args.profile, args.threads, args.batch_sizes)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
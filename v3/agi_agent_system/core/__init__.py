@@ -4,10 +4,21 @@
 - config: 시스템 설정 관리
 - llm: LLM 모델 래퍼
 - memory: 세션별 메모리 관리
+
+하위 모듈은 처음 접근할 때 임포트됩니다 (CLI 시작 시간 단축).
 """
 
-from .config import config
-from .llm import get_llm
-from .memory import MemoryManager
+import importlib
+
+_LAZY_ATTRS = {
+    'config': '.config',
+    'get_llm': '.llm',
+    'MemoryManager': '.memory',
+}
+
+__all__ = ['config', 'get_llm', 'MemoryManager']
 
-__all__ = ['config', 'get_llm', 'MemoryManager'] 
\ No newline at end of file
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        return getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,227 @@
+"""블롭 저장소 모듈
+
+이 모듈은 생성된 코드, 설명, 피드백 같은 큰 문자열을 내용 해시(SHA-256)로
+한 번만 저장하는 BlobStore 클래스를 정의합니다.
+
+워크플로우 상태와 세션 메모리 항목은 큰 문자열 대신 {"$blob": <해시>} 참조를
+담습니다. 같은 내용은 몇 번 기록해도 파일 하나만 남습니다. 같은 태스크의
+다음 시도처럼 거의 같은 내용은 이전 내용을 zlib 사전(zdict)으로 삼아 차이만
+압축해 저장할 수 있습니다 (델타 압축).
+
+블롭 파일(blobs/<해시 앞 2자리>/<해시>) 형식:
+- b"z" + zlib 압축 데이터
+- b"d" + 체인 깊이 1바이트 + 기준 블롭 해시(64자) + 기준 내용을 사전으로 쓴 zlib 압축 데이터
+"""
+
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .config import config
+from .metrics import metrics
+
+# 델타 체인 최대 길이 (읽을 때 풀어야 하는 기준 블롭 수 제한)
+MAX_DELTA_DEPTH = 8
+
+_REF_KEY = "$blob"
+
+def is_blob_ref(value: Any) -> bool:
+    """블롭 참조인지 확인
+
+    Args:
+        value: 확인할 값
+
+    Returns:
+        bool: {"$blob": <해시>} 형식이면 True
+    """
+    return isinstance(value, dict) and len(value) == 1 and isinstance(value.get(_REF_KEY), str)
+
+class BlobStore:
+    """내용 주소 방식의 문자열 저장소
+
+    Attributes:
+        path: 블롭 디렉토리
+        min_chars: 이 길이 이상의 문자열만 블롭으로 저장
+        delta: 이전 내용과의 델타 압축 사용 여부
+    """
+
+    def __init__(
+        self,
+        path: str,
+        min_chars: Optional[int] = None,
+        delta: Optional[bool] = None,
+        cache_size: int = 256
+    ):
+        """BlobStore 초기화
+
+        Args:
+            path: 블롭 디렉토리
+            min_chars: 블롭으로 저장할 최소 문자열 길이 (기본값: config.blob_min_chars)
+            delta: 델타 압축 사용 여부 (기본값: config.blob_delta_enabled)
+            cache_size: 프로세스에 유지할 최근 블롭 수 (기본값: 256)
+        """
+        self.path = Path(path)
+        self.min_chars = config.blob_min_chars if min_chars is None else min_chars
+        self.delta = config.blob_delta_enabled if delta is None else delta
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _file(self, digest: str) -> Path:
+        return self.path / digest[:2] / digest
+
+    def _remember(self, digest: str, text: str) -> None:
+        """최근 블롭 캐시에 추가 (오래된 항목부터 제거)"""
+        with self._lock:
+            self._cache[digest] = text
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def _depth(self, digest: str) -> int:
+        """블롭의 델타 체인 깊이 (일반 블롭이면 0)"""
+        with open(self._file(digest), 'rb') as f:
+            header = f.read(2)
+        return header[1] if header[:1] == b"d" else 0
+
+    def _encode(self, data: bytes, base: Optional[str]) -> bytes:
+        """블롭 파일 내용 생성 (델타가 더 작을 때만 델타 사용)"""
+        encoded = b"z" + zlib.compress(data, 6)
+        if not self.delta or base is None or not self._file(base).exists():
+            return encoded
+        depth = self._depth(base) + 1
+        if depth > MAX_DELTA_DEPTH:
+            return encoded
+        compressor = zlib.compressobj(6, zdict=self.get({_REF_KEY: base}).encode("utf-8"))
+        delta = b"d" + bytes([depth]) + base.encode("ascii") + compressor.compress(data) + compressor.flush()
+        if len(delta) < len(encoded):
+            metrics.increment("blobs.delta_writes")
+            return delta
+        return encoded
+
+    def put(self, text: str, base: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """문자열을 저장하고 참조를 반환
+
+        Args:
+            text: 저장할 문자열
+            base: 델타 압축 기준이 될 이전 블롭 참조 (기본값: None)
+
+        Returns:
+            Dict[str, str]: 블롭 참조 {"$blob": <해시>}
+        """
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._file(digest)
+        if path.exists():
+            metrics.increment("blobs.dedup_hits")
+        else:
+            base_digest = base[_REF_KEY] if is_blob_ref(base) and base[_REF_KEY] != digest else None
+            encoded = self._encode(data, base_digest)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(encoded)
+                if config.memory_durability == "sync":
+                    f.flush()
+                    os.fsync(f.fileno())
+            # 같은 내용이면 같은 파일이므로 동시에 기록해도 안전
+            os.replace(tmp_path, path)
+            metrics.increment("blobs.writes")
+            metrics.increment("blobs.bytes_written", len(encoded))
+        self._remember(digest, text)
+        return {_REF_KEY: digest}
+
+    def get(self, ref: Dict[str, str]) -> str:
+        """참조가 가리키는 문자열을 반환
+
+        Args:
+            ref: 블롭 참조
+
+        Returns:
+            str: 저장된 문자열
+
+        Raises:
+            LookupError: 블롭 파일이 없는 경우
+        """
+        digest = ref[_REF_KEY]
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return self._cache[digest]
+        try:
+            with open(self._file(digest), 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raise LookupError(f"블롭 {digest}을(를) 찾을 수 없습니다.")
+        if raw[:1] == b"d":
+            base = raw[2:66].decode("ascii")
+            decompressor = zlib.decompressobj(zdict=self.get({_REF_KEY: base}).encode("utf-8"))
+            data = decompressor.decompress(raw[66:]) + decompressor.flush()
+        else:
+            data = zlib.decompress(raw[1:])
+        text = data.decode("utf-8")
+        self._remember(digest, text)
+        return text
+
+    def externalize(self, value: Any, base: Any = None) -> Any:
+        """값 안의 긴 문자열을 블롭 참조로 바꾼 사본을 반환
+
+        Args:
+            value: 딕셔너리/리스트/문자열
+            base: 같은 모양의 이전 값 (같은 위치의 블롭을 델타 기준으로 사용, 기본값: None)
+
+        Returns:
+            Any: 긴 문자열이 참조로 바뀐 값
+        """
+        if isinstance(value, str):
+            if len(value) < self.min_chars:
+                return value
+            return self.put(value, base if is_blob_ref(base) else None)
+        if isinstance(value, dict) and not is_blob_ref(value):
+            base = base if isinstance(base, dict) else {}
+            return {key: self.externalize(item, base.get(key)) for key, item in value.items()}
+        if isinstance(value, list):
+            base = base if isinstance(base, list) else []
+            return [self.externalize(item, base[i] if i < len(base) else None) for i, item in enumerate(value)]
+        return value
+
+    def resolve(self, value: Any) -> Any:
+        """값 안의 블롭 참조를 원래 문자열로 바꾼 사본을 반환
+
+        Args:
+            value: 블롭 참조를 담은 값
+
+        Returns:
+            Any: 참조가 풀린 값
+        """
+        if is_blob_ref(value):
+            return self.get(value)
+        if isinstance(value, dict):
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        return value
+
+_blob_stores: Dict[str, BlobStore] = {}
+_blob_stores_lock = threading.Lock()
+
+def get_blob_store(memory_dir: Optional[str] = None) -> BlobStore:
+    """메모리 디렉토리별 공유 블롭 저장소를 반환
+
+    블롭 저장소를 끈 경우에도 이미 기록된 참조를 풀 수 있도록 항상 반환합니다.
+
+    Args:
+        memory_dir: 메모리 파일 디렉토리 (기본값: config.memory_dir)
+
+    Returns:
+        BlobStore: 블롭 저장소
+    """
+    path = str(Path(memory_dir or config.memory_dir) / "blobs")
+    with _blob_stores_lock:
+        if path not in _blob_stores:
+            _blob_stores[path] = BlobStore(path)
+        return _blob_stores[path]
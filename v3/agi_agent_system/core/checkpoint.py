@@ -0,0 +1,319 @@
+"""체크포인트 모듈
+
+이 모듈은 워크플로우 상태를 노드마다 로컬 디스크에 기록하는 LangGraph 호환
+체크포인터를 정의합니다. 세션(thread)마다 추가 전용 JSONL 로그 하나를 쓰며,
+각 레코드에는 해당 단계에서 버전이 바뀐 채널만 담깁니다. 리스트 채널
+(tasks, results, evaluations)은 이전 버전과 달라진 원소만 기록하므로
+태스크가 늘어나도 한 단계의 쓰기 크기는 일정하게 유지됩니다.
+"""
+
+import base64
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+from .config import config
+from .storage import safe_file_name
+
+def _encode(typed: Tuple[str, bytes]) -> List[str]:
+    """직렬화된 (타입, 바이트)를 JSON에 담을 수 있는 형태로 변환"""
+    return [typed[0], base64.b64encode(typed[1]).decode("ascii")]
+
+def _decode(item: List[str]) -> Tuple[str, bytes]:
+    """_encode의 역변환"""
+    return item[0], base64.b64decode(item[1])
+
+class FileCheckpointSaver(MemorySaver):
+    """세션별 JSONL 로그에 증분 기록하는 체크포인터
+
+    조회는 MemorySaver의 메모리 내 저장소를 그대로 사용하고, 처음 조회하는
+    세션은 로그를 재생해 복원합니다.
+
+    Attributes:
+        path: 체크포인트 로그 디렉토리
+    """
+
+    def __init__(self, path: str):
+        """FileCheckpointSaver 초기화
+
+        Args:
+            path: 체크포인트 로그 디렉토리
+        """
+        super().__init__()
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._loaded = set()
+        # (thread_id, checkpoint_ns, 채널) -> 마지막으로 기록한 리스트 원소 직렬화 값
+        self._elements: Dict[Tuple[str, str, str], List[Tuple[str, bytes]]] = {}
+
+    def _log_file(self, thread_id: str) -> Path:
+        """세션의 로그 파일 경로 (파일 이름으로 쓸 수 없는 ID는 해시 사용)"""
+        return self.path / f"{safe_file_name(thread_id)}.jsonl"
+
+    def _append(self, thread_id: str, record: Dict[str, Any]) -> None:
+        """레코드 한 줄을 로그에 추가하고 디스크에 내림"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self._log_file(thread_id), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _encode_value(self, key: Tuple[str, str, str], value: Any) -> Tuple[Dict[str, Any], Optional[list]]:
+        """채널 값을 로그 형식으로 변환
+
+        리스트는 마지막으로 기록한 같은 채널의 원소와 비교해 바뀐 원소만 담습니다.
+
+        Returns:
+            Tuple[Dict[str, Any], Optional[list]]: (레코드 조각, 새 원소 목록 또는 None)
+        """
+        if not isinstance(value, list):
+            return {"value": _encode(self.serde.dumps_typed(value))}, None
+        elements = [self.serde.dumps_typed(item) for item in value]
+        previous = self._elements.get(key, [])
+        changed = {
+            str(index): _encode(element)
+            for index, element in enumerate(elements)
+            if index >= len(previous) or previous[index] != element
+        }
+        return {"length": len(elements), "items": changed}, elements
+
+    def _decode_value(self, key: Tuple[str, str, str], data: Dict[str, Any]) -> Tuple[Tuple[str, bytes], Optional[list]]:
+        """_encode_value의 역변환
+
+        Returns:
+            Tuple[Tuple[str, bytes], Optional[list]]: (직렬화된 전체 값, 원소 목록 또는 None)
+        """
+        if "value" in data:
+            return _decode(data["value"]), None
+        elements = list(self._elements.get(key, []))[:data["length"]]
+        elements.extend([None] * (data["length"] - len(elements)))
+        for index, item in data["items"].items():
+            elements[int(index)] = _decode(item)
+        value = [self.serde.loads_typed(element) for element in elements]
+        return self.serde.dumps_typed(value), elements
+
+    def _apply_put(self, record: Dict[str, Any]) -> None:
+        """put 레코드를 메모리 내 저장소에 반영 (로그 재생용)"""
+        thread_id, checkpoint_ns = record["thread_id"], record["checkpoint_ns"]
+        for channel, version, data in record["blobs"]:
+            key = (thread_id, checkpoint_ns, channel)
+            if data is None:
+                self.blobs[(thread_id, checkpoint_ns, channel, version)] = ("empty", b"")
+                continue
+            typed, elements = self._decode_value(key, data)
+            self.blobs[(thread_id, checkpoint_ns, channel, version)] = typed
+            if elements is None:
+                self._elements.pop(key, None)
+            else:
+                self._elements[key] = elements
+        self.storage[thread_id][checkpoint_ns][record["checkpoint_id"]] = (
+            _decode(record["checkpoint"]),
+            _decode(record["metadata"]),
+            record["parent_id"],
+        )
+
+    def _apply_writes(self, record: Dict[str, Any]) -> None:
+        """writes 레코드를 메모리 내 저장소에 반영 (로그 재생용)"""
+        thread_id, checkpoint_ns = record["thread_id"], record["checkpoint_ns"]
+        outer_key = (thread_id, checkpoint_ns, record["checkpoint_id"])
+        for index, channel, data in record["writes"]:
+            typed, _ = self._decode_value((thread_id, checkpoint_ns, channel), data)
+            self.writes[outer_key][(record["task_id"], index)] = (
+                record["task_id"], channel, typed, record["task_path"]
+            )
+
+    def _ensure_loaded(self, thread_id: str) -> None:
+        """세션 로그를 아직 읽지 않았으면 재생해 메모리 내 저장소를 복원"""
+        if thread_id in self._loaded:
+            return
+        self._loaded.add(thread_id)
+        log_file = self._log_file(thread_id)
+        if not log_file.exists():
+            return
+        with open(log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 기록 도중 중단된 마지막 줄은 버림
+                    break
+                if record["op"] == "put":
+                    self._apply_put(record)
+                else:
+                    self._apply_writes(record)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """체크포인트 저장 (버전이 바뀐 채널만 기록)"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        c = checkpoint.copy()
+        values = c.pop("channel_values")
+        with self._lock:
+            self._ensure_loaded(thread_id)
+            blobs = []
+            for channel, version in new_versions.items():
+                key = (thread_id, checkpoint_ns, channel)
+                if channel not in values:
+                    self.blobs[(thread_id, checkpoint_ns, channel, version)] = ("empty", b"")
+                    blobs.append([channel, version, None])
+                    continue
+                data, elements = self._encode_value(key, values[channel])
+                self.blobs[(thread_id, checkpoint_ns, channel, version)] = self.serde.dumps_typed(values[channel])
+                if elements is None:
+                    self._elements.pop(key, None)
+                else:
+                    self._elements[key] = elements
+                blobs.append([channel, version, data])
+            # metadata의 writes는 노드 출력 전체의 사본이므로 증분 기록을 위해 제외
+            metadata = {
+                key: value for key, value in get_checkpoint_metadata(config, metadata).items()
+                if key != "writes"
+            }
+            saved = (
+                self.serde.dumps_typed(c),
+                self.serde.dumps_typed(metadata),
+                config["configurable"].get("checkpoint_id"),
+            )
+            self.storage[thread_id][checkpoint_ns][checkpoint["id"]] = saved
+            self._append(thread_id, {
+                "op": "put",
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+                "parent_id": saved[2],
+                "checkpoint": _encode(saved[0]),
+                "metadata": _encode(saved[1]),
+                "blobs": blobs,
+            })
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """노드가 끝났지만 아직 체크포인트에 반영되지 않은 쓰기 저장"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        outer_key = (thread_id, checkpoint_ns, checkpoint_id)
+        with self._lock:
+            self._ensure_loaded(thread_id)
+            existing = self.writes.get(outer_key)
+            recorded = []
+            for idx, (channel, value) in enumerate(writes):
+                inner_key = (task_id, WRITES_IDX_MAP.get(channel, idx))
+                if inner_key[1] >= 0 and existing and inner_key in existing:
+                    continue
+                self.writes[outer_key][inner_key] = (task_id, channel, self.serde.dumps_typed(value), task_path)
+                data, _ = self._encode_value((thread_id, checkpoint_ns, channel), value)
+                recorded.append([inner_key[1], channel, data])
+            if recorded:
+                self._append(thread_id, {
+                    "op": "writes",
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                    "task_id": task_id,
+                    "task_path": task_path,
+                    "writes": recorded,
+                })
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """체크포인트 조회 (세션 로그를 처음 조회하면 재생)"""
+        with self._lock:
+            self._ensure_loaded(config["configurable"]["thread_id"])
+            return super().get_tuple(config)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """체크포인트 목록 조회 (config가 없으면 디렉토리의 모든 세션)"""
+        with self._lock:
+            if config:
+                self._ensure_loaded(config["configurable"]["thread_id"])
+            elif self.path.exists():
+                for log_file in self.path.glob("*.jsonl"):
+                    self._ensure_loaded(log_file.stem)
+            items = list(super().list(config, filter=filter, before=before, limit=limit))
+        yield from items
+
+    def release(self, thread_id: str) -> None:
+        """세션의 메모리 내 상태를 비움 (다음 조회 때 로그에서 다시 읽음)
+
+        Args:
+            thread_id: 세션 ID
+        """
+        with self._lock:
+            self.storage.pop(thread_id, None)
+            for key in [key for key in self.writes if key[0] == thread_id]:
+                del self.writes[key]
+            for key in [key for key in self.blobs if key[0] == thread_id]:
+                del self.blobs[key]
+            for key in [key for key in self._elements if key[0] == thread_id]:
+                del self._elements[key]
+            self._loaded.discard(thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """세션의 체크포인트와 로그 파일 삭제
+
+        Args:
+            thread_id: 세션 ID
+        """
+        with self._lock:
+            self.release(thread_id)
+            log_file = self._log_file(thread_id)
+            if log_file.exists():
+                log_file.unlink()
+
+_checkpointers: Dict[str, FileCheckpointSaver] = {}
+_checkpointers_lock = threading.Lock()
+
+def get_checkpointer(memory_dir: Optional[str] = None) -> Optional[FileCheckpointSaver]:
+    """메모리 디렉토리별 공유 체크포인터를 반환
+
+    Args:
+        memory_dir: 메모리 파일 디렉토리 (기본값: config.memory_dir)
+
+    Returns:
+        Optional[FileCheckpointSaver]: 체크포인터 (config.checkpoint_enabled가 False이면 None)
+    """
+    if not config.checkpoint_enabled:
+        return None
+    path = str(Path(memory_dir or config.memory_dir) / "checkpoints")
+    with _checkpointers_lock:
+        if path not in _checkpointers:
+            _checkpointers[path] = FileCheckpointSaver(path)
+        return _checkpointers[path]
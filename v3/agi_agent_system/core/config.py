@@ -1,13 +1,60 @@
 """설정 관리 모듈
 
 이 모듈은 시스템의 설정을 관리합니다.
+llama.cpp 성능 설정은 `--mode tune`이 기록한 머신별 프로파일(LLM_PROFILE)을
+기본값으로 사용하며, 환경 변수가 있으면 환경 변수가 우선합니다.
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional
+import json
 import os
 from pathlib import Path
 
+# tune 모드가 성능 설정을 기록하는 기본 프로파일 경로
+DEFAULT_LLM_PROFILE = str(Path.home() / ".config" / "agi-agent" / "llm_profile.json")
+
+# 모델과 샘플링 설정을 따로 지정할 수 있는 에이전트 역할
+ROLES = ("planner", "developer", "critic")
+
+@dataclass
+class RoleProfile:
+    """역할별 모델과 생성 설정 (비어 있는 값은 전역 설정 또는 엔진 기본값을 따름)
+    
+    Attributes:
+        model_path: 역할이 사용할 모델 파일 경로
+        temperature: 생성 온도
+        max_tokens: 최대 토큰 수
+        top_p: nucleus 샘플링 확률 합
+        repeat_penalty: 반복 패널티
+        seed: 샘플링 시드 (같은 프롬프트에 같은 출력)
+        stop: 생성을 멈출 문자열 목록
+        stop_at_json_end: 최상위 JSON 객체가 닫히면 생성을 멈출지 여부 (llama.cpp 엔진에서 적용)
+    """
+    model_path: str = ""
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+    top_p: Optional[float] = None
+    repeat_penalty: Optional[float] = None
+    seed: Optional[int] = None
+    stop: Optional[List[str]] = None
+    stop_at_json_end: bool = False
+
+# 역할별 기본 생성 설정 (환경 변수가 있으면 환경 변수가 우선)
+# 플래너와 비평가는 JSON 하나만 출력하므로 길이를 제한하고, JSON이 끝나거나
+# 프롬프트를 이어 쓰기 시작하면 멈추며, 낮은 온도로 샘플링합니다.
+ROLE_PRESETS: Dict[str, RoleProfile] = {
+    "planner": RoleProfile(
+        temperature=0.2, top_p=0.9, max_tokens=1024, repeat_penalty=1.1,
+        stop=["\n\n\n", "\n목표:"], stop_at_json_end=True
+    ),
+    "developer": RoleProfile(),
+    "critic": RoleProfile(
+        temperature=0.1, top_p=0.9, max_tokens=512, repeat_penalty=1.1,
+        stop=["\n\n\n", "\n현재 태스크:"], stop_at_json_end=True
+    ),
+}
+
 @dataclass
 class Config:
     """시스템 설정
@@ -19,6 +66,65 @@ class Config:
         success_threshold: 성공 기준 점수
         memory_dir: 메모리 파일 디렉토리
         max_iterations: 최대 반복 횟수
+        plan_cache_size: 플랜 캐시 최대 항목 수 (0이면 비활성화)
+        plan_cache_seed_threshold: 캐시된 계획을 플래너 참고 예시로 제공할 유사도 기준
+        solution_index_enabled: 세션 간 솔루션 색인 사용 여부
+        solution_index_top_k: 개발자에게 제공할 참고 솔루션 수
+        solution_index_min_similarity: 참고 솔루션으로 제공할 최소 유사도
+        llm_backend: LLM 백엔드 ("llama_cpp" 또는 테스트/부하 측정용 "fake", "replay")
+        fake_llm_latency_ms: 가짜 백엔드가 호출마다 흉내 낼 지연 시간 (ms)
+        replay_transcripts: replay 백엔드가 재생할 기록된 응답 파일 (JSONL)
+        daemon_socket: 데몬 모드 유닉스 소켓 경로
+        daemon_idle_timeout: 데몬이 유휴 상태로 대기하다 종료할 시간 (초, 0이면 종료하지 않음)
+        checkpoint_enabled: 노드마다 워크플로우 상태를 디스크에 기록할지 여부 (재개에 필요)
+        memory_keep_raw: 세션 메모리에서 태스크별로 원본으로 유지할 최근 대화 항목 수 (0이면 압축하지 않음)
+        memory_durability: 세션 메모리 기록 시점 ("sync", "buffered", "manual")
+        memory_flush_entries: buffered 수준에서 이만큼 변경이 쌓이면 기록
+        memory_flush_interval: buffered 수준에서 첫 변경 후 기록까지 기다릴 최대 시간 (초)
+        session_ttl: 이 시간(초) 동안 바뀌지 않은 세션을 압축 아카이브로 옮김 (0이면 비활성화)
+        session_archive_interval: API 서버가 유휴 세션을 아카이브하는 주기 (초, 0이면 비활성화)
+        session_archive_codec: 세션 아카이브 압축 방식 ("auto", "zstd", "gzip")
+        blob_store_enabled: 긴 에이전트 출력을 블롭 저장소에 한 번만 저장하고 참조로 기록할지 여부
+        blob_min_chars: 블롭으로 저장할 최소 문자열 길이
+        blob_delta_enabled: 같은 태스크의 이전 시도를 기준으로 델타 압축할지 여부
+        llm_profile: 머신별 llama.cpp 성능 프로파일 경로 (tune 모드가 기록)
+        n_ctx: llama.cpp 컨텍스트 창 크기 (토큰)
+        n_batch: 프롬프트 평가 배치 크기 (토큰)
+        n_threads: 생성에 사용할 스레드 수 (0이면 llama.cpp 기본값)
+        n_threads_batch: 프롬프트 평가에 사용할 스레드 수 (0이면 llama.cpp 기본값)
+        n_gpu_layers: GPU로 오프로드할 레이어 수 (0이면 CPU만 사용, -1이면 전부)
+        use_mmap: 모델 파일을 메모리 매핑으로 로드할지 여부
+        use_mlock: 모델 가중치를 RAM에 고정할지 여부 (스왑 방지)
+        numa: NUMA 노드에 맞춰 스레드와 메모리를 배치할지 여부
+        flash_attn: flash attention 사용 여부
+        roles: 역할별 모델과 생성 설정 (기본값: ROLE_PRESETS, 예: 비평가/플래너는 작은 모델)
+        llm_registry_size: 프로세스에 동시에 올려 둘 최대 모델 수 (넘으면 가장 오래 쓰지 않은 모델 해제, 0이면 역할과 캐스케이드가 쓰는 모델 파일 수)
+        cascade_enabled: 개발자가 작은 모델로 먼저 생성하고 실패 시 큰 모델로 올릴지 여부 (목표별로 덮어쓸 수 있음)
+        cascade_model_path: 캐스케이드의 작은 모델 파일 경로 (비어 있으면 캐스케이드 비활성화)
+        cascade_escalation_score: 작은 모델 결과의 비평가 점수가 이보다 낮으면 큰 모델로 올림
+        cascade_max_small_attempts: 태스크별로 작은 모델을 시도할 최대 횟수
+        usage_ledger_enabled: LLM 호출별 토큰 수와 시간을 세션 메모리의 사용량 원장에 기록할지 여부
+        admin_token: 관리자 API(프로파일러) 인증 토큰 (비어 있으면 관리자 API 비활성화)
+        profiler_interval: 샘플링 프로파일러의 기본 샘플링 간격 (초)
+        profiler_max_seconds: 샘플링 프로파일러를 한 번에 실행할 수 있는 최대 시간 (초)
+        profile_keep: 보관할 요청별 cProfile 결과 수
+        coalesce_enabled: API에서 같은 목표의 동시 요청을 하나의 실행으로 병합할지 여부
+        coalesce_window: 병합 시 막 끝난 결과를 재사용할 시간 (초, 0이면 진행 중인 실행에만 붙음)
+        scheduler_enabled: 워크플로우 노드 실행을 우선순위 레인과 테넌트 공정 큐로 스케줄링할지 여부
+        scheduler_slots: 동시에 실행할 수 있는 전체 노드 수
+        scheduler_interactive_slots: interactive 레인의 동시 실행 상한
+        scheduler_batch_slots: batch 레인의 동시 실행 상한 (slots보다 작으면 interactive 몫이 항상 남음)
+        scheduler_tenant_weights: 테넌트별 공정 분배 가중치 ("tenant=weight,..." 형식, 없는 테넌트는 1)
+        job_queue_url: 워커가 실행할 작업 큐 주소 (sqlite:///경로 또는 redis://..., 비어 있으면 API가 직접 실행)
+        job_lease: 워커가 작업을 임대하는 시간 (초, 실행 중에는 주기적으로 연장)
+        job_max_attempts: 작업별 최대 시도 횟수 (임대 만료 포함)
+        job_poll_interval: 워커와 API가 작업 큐를 확인하는 간격 (초)
+        job_wait_timeout: API가 큐에 넣은 작업의 결과를 기다리는 최대 시간 (초)
+        output_repair_enabled: 파싱에 실패한 응답을 다시 생성하기 전에 복구할지 여부
+        output_repair_llm: 결정적 복구가 실패하면 JSON만 다시 내보내는 짧은 LLM 호출을 시도할지 여부
+        output_repair_max_chars: LLM 복구를 시도할 응답의 최대 길이 (더 길면 다시 생성하는 것과 비용이 비슷함)
+        revision_enabled: 다시 시도하는 태스크에서 기존 코드를 편집 블록/diff로 수정할지 여부 (적용 실패 시 전체 재생성)
+        revision_min_chars: 수정 모드를 쓸 기존 코드의 최소 길이 (짧은 코드는 전체를 다시 생성하는 편이 쌈)
     """
     model_path: str
     temperature: float = 0.7
@@ -26,6 +132,145 @@ class Config:
     success_threshold: float = 0.8
     memory_dir: str = "memory"
     max_iterations: int = 10
+    plan_cache_size: int = 256
+    plan_cache_seed_threshold: float = 0.75
+    solution_index_enabled: bool = True
+    solution_index_top_k: int = 2
+    solution_index_min_similarity: float = 0.6
+    llm_backend: str = "llama_cpp"
+    fake_llm_latency_ms: float = 0.0
+    replay_transcripts: str = ""
+    daemon_socket: str = ""
+    daemon_idle_timeout: float = 600.0
+    checkpoint_enabled: bool = True
+    memory_keep_raw: int = 4
+    memory_durability: str = "buffered"
+    memory_flush_entries: int = 64
+    memory_flush_interval: float = 1.0
+    session_ttl: float = 604800.0
+    session_archive_interval: float = 3600.0
+    session_archive_codec: str = "auto"
+    blob_store_enabled: bool = True
+    blob_min_chars: int = 256
+    blob_delta_enabled: bool = True
+    llm_profile: str = DEFAULT_LLM_PROFILE
+    n_ctx: int = 4096
+    n_batch: int = 512
+    n_threads: int = 0
+    n_threads_batch: int = 0
+    n_gpu_layers: int = 0
+    use_mmap: bool = True
+    use_mlock: bool = False
+    numa: bool = False
+    flash_attn: bool = False
+    roles: Dict[str, RoleProfile] = field(default_factory=dict)
+    llm_registry_size: int = 0
+    cascade_enabled: bool = False
+    cascade_model_path: str = ""
+    cascade_escalation_score: float = 0.8
+    cascade_max_small_attempts: int = 1
+    usage_ledger_enabled: bool = True
+    admin_token: str = ""
+    profiler_interval: float = 0.005
+    profiler_max_seconds: float = 300.0
+    profile_keep: int = 32
+    coalesce_enabled: bool = True
+    coalesce_window: float = 10.0
+    scheduler_enabled: bool = True
+    scheduler_slots: int = 4
+    scheduler_interactive_slots: int = 4
+    scheduler_batch_slots: int = 3
+    scheduler_tenant_weights: str = ""
+    job_queue_url: str = ""
+    job_lease: float = 60.0
+    job_max_attempts: int = 3
+    job_poll_interval: float = 0.5
+    job_wait_timeout: float = 600.0
+    output_repair_enabled: bool = True
+    output_repair_llm: bool = True
+    output_repair_max_chars: int = 4000
+    revision_enabled: bool = True
+    revision_min_chars: int = 400
+    
+    def role_profile(self, role: str) -> RoleProfile:
+        """역할의 모델과 생성 설정을 전역 설정으로 채워 반환
+        
+        Args:
+            role: 에이전트 역할 (예: "critic")
+            
+        Returns:
+            RoleProfile: 모델 경로, 온도, 최대 토큰 수가 채워진 역할 설정 (나머지 빈 값은 엔진 기본값)
+        """
+        profile = self.roles.get(role) or RoleProfile()
+        return replace(
+            profile,
+            model_path=profile.model_path or self.model_path,
+            temperature=self.temperature if profile.temperature is None else profile.temperature,
+            max_tokens=self.max_tokens if profile.max_tokens is None else profile.max_tokens
+        )
+    
+    def model_paths(self) -> List[str]:
+        """역할과 캐스케이드가 사용하는 모델 파일 경로 (중복 제거, 정렬)
+        
+        캐스케이드는 목표별로 켤 수 있으므로 cascade_model_path가 있으면 포함합니다.
+        
+        Returns:
+            List[str]: 모델 파일 경로 목록
+        """
+        paths = [self.role_profile(role).model_path for role in ROLES]
+        if self.cascade_model_path:
+            paths.append(self.cascade_model_path)
+        return sorted({path for path in paths if path})
+    
+    def registry_capacity(self) -> int:
+        """모델 레지스트리가 보관할 모델 수 (llm_registry_size가 0이면 사용하는 모델 파일 수)
+        
+        Returns:
+            int: 1 이상의 모델 수
+        """
+        if self.llm_registry_size > 0:
+            return self.llm_registry_size
+        return max(1, len(self.model_paths()))
+
+def _load_role_profile(role: str) -> RoleProfile:
+    """역할 기본 설정(ROLE_PRESETS)에 <역할>_* 환경 변수를 덮어써 역할 설정을 로드
+    
+    환경 변수: <역할>_MODEL_PATH, _TEMPERATURE, _MAX_TOKENS, _TOP_P, _REPEAT_PENALTY, _SEED,
+    _STOP (JSON 문자열 배열, "[]"이면 정지 문자열 없음), _STOP_AT_JSON_END
+    """
+    prefix = role.upper()
+    profile = ROLE_PRESETS.get(role) or RoleProfile()
+    numbers = {"temperature": float, "max_tokens": int, "top_p": float, "repeat_penalty": float, "seed": int}
+    overrides: Dict[str, Any] = {
+        "model_path": os.getenv(f"{prefix}_MODEL_PATH", ""),
+        "stop": list(profile.stop) if profile.stop is not None else None
+    }
+    for name, cast in numbers.items():
+        value = os.getenv(f"{prefix}_{name.upper()}")
+        if value:
+            overrides[name] = cast(value)
+    stop = os.getenv(f"{prefix}_STOP")
+    if stop is not None:
+        overrides["stop"] = [str(item) for item in json.loads(stop)] if stop.strip() else []
+    stop_at_json_end = os.getenv(f"{prefix}_STOP_AT_JSON_END")
+    if stop_at_json_end is not None:
+        overrides["stop_at_json_end"] = stop_at_json_end.lower() == "true"
+    return replace(profile, **overrides)
+
+def load_llm_profile(path: str) -> Dict[str, Any]:
+    """tune 모드가 기록한 프로파일에서 성능 설정을 읽음
+    
+    Args:
+        path: 프로파일 파일 경로
+        
+    Returns:
+        Dict[str, Any]: 설정 이름별 값 (파일이 없거나 읽을 수 없으면 빈 딕셔너리)
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return dict(json.load(f).get("settings", {}))
+    except (OSError, ValueError, AttributeError):
+        return {}
 
 def load_config() -> Config:
     """환경 변수에서 설정을 로드
@@ -33,14 +278,78 @@ def load_config() -> Config:
     Returns:
         Config: 로드된 설정
     """
+    llm_profile = os.getenv("LLM_PROFILE", DEFAULT_LLM_PROFILE)
+    profile = load_llm_profile(llm_profile)
     return Config(
         model_path=os.getenv("MODEL_PATH", "models/mistral-7b-instruct-v0.2.Q4_K_M.gguf"),
         temperature=float(os.getenv("TEMPERATURE", "0.7")),
         max_tokens=int(os.getenv("MAX_TOKENS", "2000")),
         success_threshold=float(os.getenv("SUCCESS_THRESHOLD", "0.8")),
         memory_dir=os.getenv("MEMORY_DIR", "memory"),
-        max_iterations=int(os.getenv("MAX_ITERATIONS", "10"))
+        max_iterations=int(os.getenv("MAX_ITERATIONS", "10")),
+        plan_cache_size=int(os.getenv("PLAN_CACHE_SIZE", "256")),
+        plan_cache_seed_threshold=float(os.getenv("PLAN_CACHE_SEED_THRESHOLD", "0.75")),
+        solution_index_enabled=os.getenv("SOLUTION_INDEX_ENABLED", "true").lower() == "true",
+        solution_index_top_k=int(os.getenv("SOLUTION_INDEX_TOP_K", "2")),
+        solution_index_min_similarity=float(os.getenv("SOLUTION_INDEX_MIN_SIMILARITY", "0.6")),
+        llm_backend=os.getenv("LLM_BACKEND", "llama_cpp"),
+        fake_llm_latency_ms=float(os.getenv("FAKE_LLM_LATENCY_MS", "0")),
+        replay_transcripts=os.getenv("REPLAY_TRANSCRIPTS", ""),
+        daemon_socket=os.getenv(
+            "DAEMON_SOCKET",
+            str(Path(os.getenv("TMPDIR", "/tmp")) / f"agi-agent-{os.getuid() if hasattr(os, 'getuid') else 0}.sock")
+        ),
+        daemon_idle_timeout=float(os.getenv("DAEMON_IDLE_TIMEOUT", "600")),
+        checkpoint_enabled=os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true",
+        memory_keep_raw=int(os.getenv("MEMORY_KEEP_RAW", "4")),
+        memory_durability=os.getenv("MEMORY_DURABILITY", "buffered"),
+        memory_flush_entries=int(os.getenv("MEMORY_FLUSH_ENTRIES", "64")),
+        memory_flush_interval=float(os.getenv("MEMORY_FLUSH_INTERVAL", "1.0")),
+        session_ttl=float(os.getenv("SESSION_TTL", "604800")),
+        session_archive_interval=float(os.getenv("SESSION_ARCHIVE_INTERVAL", "3600")),
+        session_archive_codec=os.getenv("SESSION_ARCHIVE_CODEC", "auto"),
+        blob_store_enabled=os.getenv("BLOB_STORE_ENABLED", "true").lower() == "true",
+        blob_min_chars=int(os.getenv("BLOB_MIN_CHARS", "256")),
+        blob_delta_enabled=os.getenv("BLOB_DELTA_ENABLED", "true").lower() == "true",
+        llm_profile=llm_profile,
+        n_ctx=int(os.getenv("LLM_N_CTX", profile.get("n_ctx", 4096))),
+        n_batch=int(os.getenv("LLM_N_BATCH", profile.get("n_batch", 512))),
+        n_threads=int(os.getenv("LLM_N_THREADS", profile.get("n_threads", 0))),
+        n_threads_batch=int(os.getenv("LLM_N_THREADS_BATCH", profile.get("n_threads_batch", 0))),
+        n_gpu_layers=int(os.getenv("LLM_N_GPU_LAYERS", profile.get("n_gpu_layers", 0))),
+        use_mmap=os.getenv("LLM_USE_MMAP", str(profile.get("use_mmap", True))).lower() == "true",
+        use_mlock=os.getenv("LLM_USE_MLOCK", str(profile.get("use_mlock", False))).lower() == "true",
+        numa=os.getenv("LLM_NUMA", str(profile.get("numa", False))).lower() == "true",
+        flash_attn=os.getenv("LLM_FLASH_ATTN", str(profile.get("flash_attn", False))).lower() == "true",
+        roles={role: _load_role_profile(role) for role in ROLES},
+        llm_registry_size=int(os.getenv("LLM_REGISTRY_SIZE", "0")),
+        cascade_enabled=os.getenv("CASCADE_ENABLED", "false").lower() == "true",
+        cascade_model_path=os.getenv("CASCADE_MODEL_PATH", ""),
+        cascade_escalation_score=float(os.getenv("CASCADE_ESCALATION_SCORE", "0.8")),
+        cascade_max_small_attempts=int(os.getenv("CASCADE_MAX_SMALL_ATTEMPTS", "1")),
+        usage_ledger_enabled=os.getenv("USAGE_LEDGER_ENABLED", "true").lower() == "true",
+        admin_token=os.getenv("ADMIN_TOKEN", ""),
+        profiler_interval=float(os.getenv("PROFILER_INTERVAL", "0.005")),
+        profiler_max_seconds=float(os.getenv("PROFILER_MAX_SECONDS", "300")),
+        profile_keep=int(os.getenv("PROFILE_KEEP", "32")),
+        coalesce_enabled=os.getenv("COALESCE_ENABLED", "true").lower() == "true",
+        coalesce_window=float(os.getenv("COALESCE_WINDOW", "10")),
+        scheduler_enabled=os.getenv("SCHEDULER_ENABLED", "true").lower() == "true",
+        scheduler_slots=int(os.getenv("SCHEDULER_SLOTS", "4")),
+        scheduler_interactive_slots=int(os.getenv("SCHEDULER_INTERACTIVE_SLOTS", "4")),
+        scheduler_batch_slots=int(os.getenv("SCHEDULER_BATCH_SLOTS", "3")),
+        scheduler_tenant_weights=os.getenv("SCHEDULER_TENANT_WEIGHTS", ""),
+        job_queue_url=os.getenv("JOB_QUEUE_URL", ""),
+        job_lease=float(os.getenv("JOB_LEASE", "60")),
+        job_max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+        job_poll_interval=float(os.getenv("JOB_POLL_INTERVAL", "0.5")),
+        job_wait_timeout=float(os.getenv("JOB_WAIT_TIMEOUT", "600")),
+        output_repair_enabled=os.getenv("OUTPUT_REPAIR_ENABLED", "true").lower() == "true",
+        output_repair_llm=os.getenv("OUTPUT_REPAIR_LLM", "true").lower() == "true",
+        output_repair_max_chars=int(os.getenv("OUTPUT_REPAIR_MAX_CHARS", "4000")),
+        revision_enabled=os.getenv("REVISION_ENABLED", "true").lower() == "true",
+        revision_min_chars=int(os.getenv("REVISION_MIN_CHARS", "400"))
     )
 
-# 전역 설정 인스턴스
-config = load_config() 
\ No newline at end of file
+# 전역 설정 인스턴스 (환경 변수와 작은 프로파일 파일만 읽어 비용이 작으므로 임포트할 때 만듦)
+config = load_config()
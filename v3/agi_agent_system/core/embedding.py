@@ -0,0 +1,142 @@
+"""텍스트 임베딩 모듈
+
+이 모듈은 목표/태스크 설명을 고정 길이 벡터로 변환하는 임베더를 정의합니다.
+외부 모델 없이 동작하는 해시 기반 n-gram 벡터라이저를 기본으로 사용합니다.
+단어 bigram을 함께 해싱하므로 같은 단어를 다른 순서로 쓴 문장
+("convert celsius to fahrenheit"와 "convert fahrenheit to celsius")은 같은
+벡터가 되지 않습니다. 그대로 재사용해도 되는지는 유사도가 아니라 normalize()로
+만든 정규화 키가 같은지로 판단합니다.
+"""
+
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# 목표 문장에서 의미 구분에 기여하지 않는 단어
+_STOP_WORDS = frozenset({
+    "a", "an", "the", "for", "of", "to", "in", "on", "with", "and", "or",
+    "that", "which", "using", "please", "simple", "basic",
+})
+
+# 정규화 키에서만 버리는 단어 (의미를 바꾸지 않는 관사와 인사말)
+_FILLER_WORDS = frozenset({"a", "an", "the", "please"})
+
+# 같은 의도를 나타내는 동사를 하나의 표기로 통일
+_SYNONYMS = {
+    "build": "make", "create": "make", "write": "make", "implement": "make",
+    "develop": "make", "generate": "make", "construct": "make",
+}
+
+class HashingEmbedder:
+    """해시 기반 n-gram 벡터라이저
+
+    단어 unigram, 단어 bigram, 문자 n-gram을 고정 차원 버킷에 해싱한 뒤
+    L2 정규화된 벡터를 반환합니다. 같은 입력은 프로세스와 무관하게
+    같은 벡터가 됩니다 (내장 hash() 대신 blake2b 사용).
+
+    Attributes:
+        dim: 벡터 차원
+        char_ngram: 문자 n-gram 길이
+    """
+
+    def __init__(self, dim: int = 1024, char_ngram: int = 3):
+        """HashingEmbedder 초기화
+
+        Args:
+            dim: 벡터 차원 (기본값: 1024)
+            char_ngram: 문자 n-gram 길이 (기본값: 3)
+        """
+        self.dim = dim
+        self.char_ngram = char_ngram
+
+    def _words(self, text: str, skip: frozenset) -> List[str]:
+        """텍스트를 소문자, 단수형, 대표 동사로 정규화한 단어 목록 (skip의 단어 제외)"""
+        words = []
+        for token in _TOKEN_PATTERN.findall(text.lower()):
+            # 간단한 복수형 정규화 ("todos" -> "todo")
+            if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+                token = token[:-1]
+            if token in skip:
+                continue
+            words.append(_SYNONYMS.get(token, token))
+        return words
+
+    def _tokens(self, text: str) -> List[str]:
+        """텍스트를 정규화된 토큰 목록으로 분리 (불용어 제외)
+
+        Args:
+            text: 원본 텍스트
+
+        Returns:
+            List[str]: 토큰 목록
+        """
+        return self._words(text, _STOP_WORDS)
+
+    def normalize(self, text: str) -> str:
+        """순서를 유지한 정규화 키 (관사와 인사말만 버리고 "to", "using" 같은 방향어는 유지)
+
+        Args:
+            text: 원본 텍스트
+
+        Returns:
+            str: 정규화된 토큰을 공백으로 이은 문자열
+        """
+        return " ".join(self._words(text, _FILLER_WORDS))
+
+    def _features(self, text: str) -> List[str]:
+        """텍스트에서 해싱할 특징 목록을 추출
+
+        Args:
+            text: 원본 텍스트
+
+        Returns:
+            List[str]: 특징 문자열 목록
+        """
+        tokens = self._tokens(text)
+        features = [f"w:{token}" for token in tokens]
+        # 단어 순서를 반영하는 bigram
+        features.extend(f"b:{first} {second}" for first, second in zip(tokens, tokens[1:]))
+        for token in tokens:
+            padded = f"<{token}>"
+            for i in range(max(len(padded) - self.char_ngram + 1, 1)):
+                features.append(f"c:{padded[i:i + self.char_ngram]}")
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        """텍스트를 정규화된 벡터로 변환
+
+        Args:
+            text: 원본 텍스트
+
+        Returns:
+            np.ndarray: (dim,) 크기의 float32 단위 벡터 (빈 입력이면 영벡터)
+        """
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            # 상위 비트로 부호를 정해 해시 충돌의 편향을 줄임
+            sign = 1.0 if value >> 63 else -1.0
+            weight = 1.0 if feature.startswith("c:") else 2.0
+            vector[value % self.dim] += sign * weight
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        """여러 텍스트를 한 번에 변환
+
+        Args:
+            texts: 원본 텍스트 목록
+
+        Returns:
+            np.ndarray: (len(texts), dim) 크기의 행렬
+        """
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack([self.embed(text) for text in texts])
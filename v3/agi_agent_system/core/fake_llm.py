@@ -0,0 +1,150 @@
+"""가짜 LLM 모듈
+
+이 모듈은 모델 파일 없이 워크플로우 전체를 실행할 수 있도록 결정적인 응답을
+돌려주는 FakeLLM을 정의합니다. 테스트, 데몬/배치 모드 점검, 부하 측정에
+사용합니다 (LLM_BACKEND=fake).
+
+ReplayLLM은 기록된 실제 모델 응답(transcript)을 종류별로 돌아가며 재생하므로
+모델 없이도 실제 출력 크기와 생성 시간에 가까운 부하를 만들 수 있습니다
+(LLM_BACKEND=replay, REPLAY_TRANSCRIPTS).
+"""
+
+import itertools
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from .repair import repair_json
+
+# 에이전트 프롬프트 끝의 출력 표식 -> 응답 종류
+PROMPT_KINDS = (
+    ("태스크 계획:", "plan"), ("코드 솔루션:", "code"), ("수정된 JSON:", "repair"), ("수정 내용:", "revision")
+)
+
+def prompt_kind(prompt: str) -> str:
+    """프롬프트가 요구하는 응답 종류
+
+    Args:
+        prompt: 에이전트 프롬프트
+
+    Returns:
+        str: "plan", "code", "repair", "revision" 또는 "evaluation"
+    """
+    tail = prompt.rstrip()
+    for marker, kind in PROMPT_KINDS:
+        if tail.endswith(marker):
+            return kind
+    return "evaluation"
+
+class FakeLLM:
+    """프롬프트 종류에 맞는 고정 JSON 응답을 돌려주는 LLM
+
+    Attributes:
+        latency_ms: 호출마다 흉내 낼 생성 지연 시간 (ms)
+        calls: 지금까지 호출된 횟수
+    """
+
+    # 응답이 프롬프트에만 의존하므로 여러 스레드가 잠금 없이 동시에 호출해도 됨
+    thread_safe = True
+
+    def __init__(self, latency_ms: float = 0.0):
+        """FakeLLM 초기화
+
+        Args:
+            latency_ms: 호출마다 흉내 낼 생성 지연 시간 (기본값: 0)
+        """
+        self.latency_ms = latency_ms
+        self.calls = 0
+
+    def _respond(self, prompt: str) -> str:
+        """프롬프트 끝의 출력 표식으로 에이전트를 구분해 응답 생성"""
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        kind = prompt_kind(prompt)
+        if kind == "plan":
+            match = re.search(r"목표: (.*)", prompt)
+            goal = match.group(1).strip() if match else "목표"
+            return json.dumps({"tasks": [
+                {"task_id": 1, "description": f"{goal} - 설계", "priority": 5, "dependencies": []},
+                {"task_id": 2, "description": f"{goal} - 구현", "priority": 4, "dependencies": [1]},
+            ]}, ensure_ascii=False)
+        if kind == "repair":
+            # 복구 프롬프트의 응답 부분을 결정적으로 고쳐 그대로 다시 내보냄
+            match = re.search(r"응답:\n(.*)\n\n수정된 JSON:", prompt, re.DOTALL)
+            return repair_json(match.group(1) if match else "") or "{}"
+        if kind == "revision":
+            # 기존 코드의 마지막 줄 뒤에 주석 한 줄을 추가하는 편집 블록
+            match = re.search(r"기존 코드:\n(.*?)\n\n비평가 피드백:", prompt, re.DOTALL)
+            last_line = (match.group(1) if match else "").rstrip().splitlines()[-1:] or [""]
+            return (
+                f"<<<<<<< SEARCH\n{last_line[0]}\n=======\n{last_line[0]}\n# 피드백 반영\n>>>>>>> REPLACE\n"
+                "설명: 가짜 백엔드가 피드백을 반영했습니다."
+            )
+        if kind == "code":
+            return json.dumps({
+                "code": "def solve():\n    return True",
+                "explanation": "가짜 백엔드가 생성한 코드입니다.",
+                "test_cases": ["assert solve() is True"],
+            }, ensure_ascii=False)
+        return json.dumps({
+            "score": 0.9,
+            "feedback": "가짜 백엔드의 평가입니다.",
+            "improvements": [],
+            "is_success": True,
+        }, ensure_ascii=False)
+
+    def invoke(self, prompt: str, stop: Optional[List[str]] = None, **kwargs) -> str:
+        """응답을 생성하고 엔진처럼 첫 정지 문자열 앞에서 자름"""
+        response = self._respond(prompt)
+        for marker in stop or []:
+            if marker and marker in response:
+                response = response[:response.index(marker)]
+        return response
+
+    def __call__(self, prompt: str, **kwargs) -> str:
+        return self._respond(prompt)
+
+    def get_num_tokens(self, text: str) -> int:
+        """공백 기준으로 토큰 수를 근사"""
+        return len(text.split())
+
+class ReplayLLM(FakeLLM):
+    """기록된 응답을 종류별로 순서대로(끝나면 처음부터) 돌려주는 LLM
+
+    transcript 파일은 한 줄에 {"kind": "plan"|"code"|"evaluation", "response": 응답 문자열,
+    "latency_ms": 선택} 하나인 JSONL입니다. 기록이 없는 종류는 FakeLLM 응답을 사용합니다.
+    """
+
+    def __init__(self, path: str, latency_ms: float = 0.0):
+        """ReplayLLM 초기화
+
+        Args:
+            path: transcript 파일 경로
+            latency_ms: 기록에 지연 시간이 없을 때 흉내 낼 지연 시간 (기본값: 0)
+        """
+        super().__init__(latency_ms=latency_ms)
+        records: Dict[str, List[Dict[str, Any]]] = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    records.setdefault(record["kind"], []).append(record)
+        self._records: Dict[str, Iterator[Dict[str, Any]]] = {
+            kind: itertools.cycle(items) for kind, items in records.items()
+        }
+        self._lock = threading.Lock()
+
+    def _respond(self, prompt: str) -> str:
+        kind = prompt_kind(prompt)
+        if kind not in self._records:
+            return super()._respond(prompt)
+        with self._lock:
+            record = next(self._records[kind])
+            self.calls += 1
+        latency_ms = record.get("latency_ms", self.latency_ms)
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+        return record["response"]
@@ -0,0 +1,498 @@
+"""작업 큐 모듈
+
+이 모듈은 API 노드가 워크플로우 작업을 넣고 워커(`--mode worker`)가 꺼내 실행하는
+공유 작업 큐를 정의합니다. 구현은 JOB_QUEUE_URL로 고릅니다.
+
+- sqlite:///jobs.db, sqlite:////var/lib/agi/jobs.db (또는 파일 경로): 한 호스트의 여러 프로세스가 공유하는 SQLite 큐
+- redis://host:port/db: Redis 호환 서버(또는 core.resp.RespServer)를 쓰는 여러 호스트용 큐
+
+워커는 작업을 임대(lease)로 가져가고 실행하는 동안 임대를 연장합니다. 워커가
+죽어 임대가 만료되면 다음 claim에서 작업이 큐로 돌아가고, max_attempts번 시도한
+작업은 failed가 됩니다. 따라서 작업은 최소 한 번(at-least-once) 실행됩니다.
+
+작업 상태: queued -> running -> done | failed (재시도하면 다시 queued)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .metrics import metrics
+from .resp import RespClient
+
+JOB_STATES = ("queued", "running", "done", "failed")
+
+class JobQueue:
+    """작업 큐 공통 인터페이스
+
+    작업 기록은 {"id", "status", "payload", "attempts", "worker", "result",
+    "error", "error_type", "created", "updated"} 딕셔너리입니다.
+
+    Attributes:
+        max_attempts: 작업별 최대 시도 횟수 (임대 만료도 한 번으로 셈)
+    """
+
+    def __init__(self, max_attempts: int = 3):
+        """JobQueue 초기화
+
+        Args:
+            max_attempts: 작업별 최대 시도 횟수 (기본값: 3)
+        """
+        self.max_attempts = max(1, max_attempts)
+
+    def enqueue(self, payload: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        """작업을 큐에 넣음 (같은 job_id가 이미 있으면 그대로 둠)
+
+        Args:
+            payload: 워커에 전달할 작업 내용
+            job_id: 작업 ID (기본값: None, 자동 생성)
+
+        Returns:
+            str: 작업 ID
+        """
+        raise NotImplementedError
+
+    def claim(self, worker: str, lease: float) -> Optional[Dict[str, Any]]:
+        """가장 오래 기다린 작업을 임대로 가져옴 (만료된 임대를 먼저 회수)
+
+        Args:
+            worker: 워커 ID
+            lease: 임대 시간 (초)
+
+        Returns:
+            Optional[Dict[str, Any]]: 작업 기록 (없으면 None)
+        """
+        raise NotImplementedError
+
+    def extend(self, job_id: str, worker: str, lease: float) -> bool:
+        """실행 중인 작업의 임대를 연장
+
+        Returns:
+            bool: 아직 이 워커가 임대하고 있으면 True
+        """
+        raise NotImplementedError
+
+    def complete(self, job_id: str, worker: str, result: Any) -> bool:
+        """작업을 완료로 기록
+
+        Returns:
+            bool: 이 워커가 임대하고 있어 기록했으면 True
+        """
+        raise NotImplementedError
+
+    def fail(self, job_id: str, worker: str, error: str, error_type: str = "", retry: bool = True) -> Optional[str]:
+        """실패한 작업을 재시도 대기열로 돌려보내거나 failed로 기록
+
+        Args:
+            job_id: 작업 ID
+            worker: 워커 ID
+            error: 오류 메시지
+            error_type: 오류 종류 (예: 예외 클래스 이름)
+            retry: 시도 횟수가 남았을 때 재시도할지 여부 (기본값: True)
+
+        Returns:
+            Optional[str]: 바뀐 상태 ("queued" 또는 "failed", 임대를 잃었으면 None)
+        """
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 기록을 조회 (없으면 None)"""
+        raise NotImplementedError
+
+    def depth(self) -> int:
+        """실행을 기다리는 작업 수"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """연결을 닫음"""
+
+    def _next_status(self, attempts: int, retry: bool) -> str:
+        return "queued" if retry and attempts < self.max_attempts else "failed"
+
+    def _retry_status(self, attempts: int, retry: bool) -> str:
+        status = self._next_status(attempts, retry)
+        metrics.increment("jobs.retried" if status == "queued" else "jobs.failed")
+        return status
+
+def _hash_fields(values: Optional[List[str]]) -> Dict[str, str]:
+    """HGETALL 응답 [필드, 값, ...]을 딕셔너리로 변환"""
+    values = values or []
+    return dict(zip(values[::2], values[1::2]))
+
+def _decode(record: Dict[str, Any]) -> Dict[str, Any]:
+    """저장된 문자열 필드를 작업 기록으로 변환"""
+    return {
+        "id": record["id"],
+        "status": record["status"],
+        "payload": json.loads(record["payload"]),
+        "attempts": int(record.get("attempts") or 0),
+        "worker": record.get("worker") or None,
+        "result": json.loads(record["result"]) if record.get("result") else None,
+        "error": record.get("error") or None,
+        "error_type": record.get("error_type") or None,
+        "created": float(record["created"]),
+        "updated": float(record["updated"])
+    }
+
+class SQLiteJobQueue(JobQueue):
+    """SQLite 파일 하나를 여러 프로세스가 공유하는 작업 큐 (단일 호스트용)
+
+    claim은 BEGIN IMMEDIATE 트랜잭션 안에서 만료된 임대 회수와 작업 선택을 함께
+    하므로 여러 워커 프로세스가 같은 작업을 동시에 가져가지 않습니다.
+
+    Attributes:
+        path: 데이터베이스 파일 경로
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        """SQLiteJobQueue 초기화 (테이블이 없으면 생성)
+
+        Args:
+            path: 데이터베이스 파일 경로
+            max_attempts: 작업별 최대 시도 횟수 (기본값: 3)
+        """
+        super().__init__(max_attempts)
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, payload TEXT NOT NULL, status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, lease_until REAL, "
+            "result TEXT, error TEXT, error_type TEXT, created REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)")
+
+    def _transaction(self, fn: Any) -> Any:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def enqueue(self, payload: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+
+        def insert(conn: sqlite3.Connection) -> None:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (id, payload, status, created, updated) VALUES (?, ?, 'queued', ?, ?)",
+                (job_id, json.dumps(payload, ensure_ascii=False), now, now)
+            )
+            if cursor.rowcount:
+                metrics.increment("jobs.enqueued")
+
+        self._transaction(insert)
+        return job_id
+
+    def _reap(self, conn: sqlite3.Connection, now: float) -> None:
+        """임대가 만료된 실행 중 작업을 큐로 돌려보내거나 failed로 기록"""
+        expired = conn.execute(
+            "SELECT id, attempts FROM jobs WHERE status = 'running' AND lease_until < ?", (now,)
+        ).fetchall()
+        for row in expired:
+            metrics.increment("jobs.lease_expired")
+            status = self._retry_status(row["attempts"], True)
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_until = NULL, error = ?, error_type = ?, updated = ? WHERE id = ?",
+                (status, "임대가 만료되었습니다 (워커 중단)", "LeaseExpired", now, row["id"])
+            )
+
+    def claim(self, worker: str, lease: float) -> Optional[Dict[str, Any]]:
+        now = time.time()
+
+        def select(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+            self._reap(conn, now)
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created, rowid LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, lease_until = ?, attempts = attempts + 1, updated = ? WHERE id = ?",
+                (worker, now + lease, now, row["id"])
+            )
+            return dict(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+        record = self._transaction(select)
+        if record is None:
+            return None
+        metrics.increment("jobs.claimed")
+        return _decode(record)
+
+    def _update_owned(self, job_id: str, worker: str, sql: str, params: tuple) -> bool:
+        return self._transaction(
+            lambda conn: conn.execute(
+                f"{sql} WHERE id = ? AND worker = ? AND status = 'running'", (*params, job_id, worker)
+            ).rowcount == 1
+        )
+
+    def extend(self, job_id: str, worker: str, lease: float) -> bool:
+        return self._update_owned(job_id, worker, "UPDATE jobs SET lease_until = ?", (time.time() + lease,))
+
+    def complete(self, job_id: str, worker: str, result: Any) -> bool:
+        done = self._update_owned(
+            job_id, worker,
+            "UPDATE jobs SET status = 'done', lease_until = NULL, result = ?, error = NULL, error_type = NULL, updated = ?",
+            (json.dumps(result, ensure_ascii=False), time.time())
+        )
+        if done:
+            metrics.increment("jobs.completed")
+        return done
+
+    def fail(self, job_id: str, worker: str, error: str, error_type: str = "", retry: bool = True) -> Optional[str]:
+        def update(conn: sqlite3.Connection) -> Optional[str]:
+            row = conn.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND status = 'running'", (job_id, worker)
+            ).fetchone()
+            if row is None:
+                return None
+            status = self._retry_status(row["attempts"], retry)
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_until = NULL, error = ?, error_type = ?, updated = ? WHERE id = ?",
+                (status, error, error_type, time.time(), job_id)
+            )
+            return status
+
+        return self._transaction(update)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _decode(dict(row)) if row is not None else None
+
+    def depth(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class RedisJobQueue(JobQueue):
+    """Redis 호환 서버를 쓰는 작업 큐 (여러 호스트용)
+
+    키 구성 (prefix 기본값 "agi:jobs"):
+    - <prefix>:job:<id>: 작업 기록 해시
+    - <prefix>:queue: 기다리는 작업 ID 리스트
+    - <prefix>:processing: 임대된 작업 ID 리스트 (LMOVE로 queue에서 원자적으로 옮김)
+    - <prefix>:leases: 작업 ID -> 임대 만료 시각 정렬 집합
+
+    임대를 반납하거나 회수하는 쪽은 작업 해시와 임대 집합을 WATCH하고 상태를 확인한 뒤
+    MULTI/EXEC로 한꺼번에 바꾸므로, 그사이 다른 워커가 작업을 끝내거나 임대를 연장하면
+    다시 확인합니다. 끝난 작업은 큐로 돌아가지 않고, 여러 워커가 동시에 회수해도 작업이
+    한 번만 큐로 돌아갑니다. LMOVE 직후 워커가 죽어 임대가 기록되지 않은 작업은 회수할 때
+    새 임대를 주어 다음 만료 때 돌려보냅니다. 회수는 claim마다가 아니라 reap_interval마다
+    (임대가 더 짧으면 임대마다) 한 번 합니다.
+    """
+
+    def __init__(self, url: str, max_attempts: int = 3, prefix: str = "agi:jobs", reap_interval: float = 1.0):
+        """RedisJobQueue 초기화
+
+        Args:
+            url: redis://host:port/db 형식 주소
+            max_attempts: 작업별 최대 시도 횟수 (기본값: 3)
+            prefix: 키 접두사 (기본값: "agi:jobs")
+            reap_interval: 만료된 임대를 회수하는 최소 간격 (초, 기본값: 1)
+        """
+        super().__init__(max_attempts)
+        self.client = RespClient(url)
+        self.prefix = prefix
+        self.reap_interval = reap_interval
+        self._queue = f"{prefix}:queue"
+        self._processing = f"{prefix}:processing"
+        self._leases = f"{prefix}:leases"
+        self._next_reap = 0.0
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    def _fields(self, job_id: str) -> Dict[str, str]:
+        return _hash_fields(self.client.execute("HGETALL", self._key(job_id)))
+
+    def enqueue(self, payload: Dict[str, Any], job_id: Optional[str] = None) -> str:
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+        # 이미 있는 작업이면 그대로 둠 (HSET이 새로 만든 필드 수가 0)
+        if self.client.execute("HSET", self._key(job_id), "id", job_id):
+            self.client.execute(
+                "HSET", self._key(job_id), "payload", json.dumps(payload, ensure_ascii=False),
+                "status", "queued", "attempts", 0, "created", now, "updated", now
+            )
+            self.client.execute("RPUSH", self._queue, job_id)
+            metrics.increment("jobs.enqueued")
+        return job_id
+
+    def _reap(self, now: float, lease: float) -> None:
+        """임대 기록이 없는 임대 작업에 임대를 주고, 만료된 임대를 회수"""
+        def grant(call: Callable[..., Any]) -> List[tuple]:
+            orphans = call("LRANGE", self._processing, 0, -1) or []
+            if not orphans:
+                return []
+            return [("ZADD", self._leases, "NX", *(value for job_id in orphans for value in (now + lease, job_id)))]
+
+        # processing이 바뀌면(claim, 반납) 다시 읽으므로 방금 끝난 작업에 임대를 주지 않음
+        self.client.transaction([self._processing], grant)
+        for job_id in self.client.execute("ZRANGEBYSCORE", self._leases, "-inf", now) or []:
+            self._expire(job_id, now)
+
+    def _expire(self, job_id: str, now: float) -> None:
+        """만료된 임대 하나를 회수 (그사이 반납되었거나 연장된 임대는 그대로 둠)"""
+        key = self._key(job_id)
+        expired: Dict[str, str] = {}
+
+        def release(call: Callable[..., Any]) -> Optional[List[tuple]]:
+            expired.clear()
+            score = call("ZSCORE", self._leases, job_id)
+            if score is None or float(score) > now:
+                return None  # 다른 워커가 먼저 회수했거나 임대가 연장됨
+            fields = _hash_fields(call("HGETALL", key))
+            # running이면 임대한 워커가 죽은 것이고, queued면 LMOVE 직후 죽어 상태를 못 바꾼 것
+            if fields.get("status") not in ("running", "queued"):
+                return self._drop_lease(job_id)  # 끝난 작업에 남은 임대만 정리
+            expired.update(fields)
+            return self._release(job_id, fields, "임대가 만료되었습니다 (워커 중단)", "LeaseExpired", True, now)
+
+        if self.client.transaction([key, self._leases], release) is not None and expired:
+            metrics.increment("jobs.lease_expired")
+            self._retry_status(int(expired.get("attempts") or 0), True)
+
+    def _drop_lease(self, job_id: str) -> List[tuple]:
+        return [("ZREM", self._leases, job_id), ("LREM", self._processing, 1, job_id)]
+
+    def _release(self, job_id: str, fields: Dict[str, str], error: str, error_type: str, retry: bool, now: float) -> List[tuple]:
+        """임대를 반납하고 작업을 다시 큐에 넣거나 실패로 기록하는 명령"""
+        status = self._next_status(int(fields.get("attempts") or 0), retry)
+        commands = self._drop_lease(job_id) + [(
+            "HSET", self._key(job_id), "status", status, "worker", "",
+            "error", error, "error_type", error_type, "updated", now
+        )]
+        if status == "queued":
+            commands.append(("RPUSH", self._queue, job_id))
+        return commands
+
+    def claim(self, worker: str, lease: float) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        if now >= self._next_reap:
+            self._next_reap = now + min(self.reap_interval, lease)
+            self._reap(now, lease)
+        job_id = self.client.execute("LMOVE", self._queue, self._processing, "LEFT", "RIGHT")
+        if job_id is None:
+            return None
+        key = self._key(job_id)
+        self.client.transaction([], lambda call: [
+            ("ZADD", self._leases, now + lease, job_id),
+            ("HINCRBY", key, "attempts", 1),
+            ("HSET", key, "status", "running", "worker", worker, "updated", now),
+        ])
+        metrics.increment("jobs.claimed")
+        return _decode(self._fields(job_id))
+
+    def _settle(self, job_id: str, worker: str,
+                commands: Callable[[Dict[str, str]], List[tuple]]) -> Optional[Dict[str, str]]:
+        """이 워커가 임대하고 있을 때만 명령들을 원자적으로 실행
+
+        Returns:
+            Optional[Dict[str, str]]: 실행 직전의 작업 기록 (임대하고 있지 않으면 None)
+        """
+        key = self._key(job_id)
+        settled: Dict[str, str] = {}
+
+        def prepare(call: Callable[..., Any]) -> Optional[List[tuple]]:
+            fields = _hash_fields(call("HGETALL", key))
+            if fields.get("status") != "running" or fields.get("worker") != worker:
+                return None
+            if call("ZSCORE", self._leases, job_id) is None:
+                return None
+            settled.clear()
+            settled.update(fields)
+            return commands(fields)
+
+        return settled if self.client.transaction([key, self._leases], prepare) is not None else None
+
+    def extend(self, job_id: str, worker: str, lease: float) -> bool:
+        return self._settle(job_id, worker, lambda fields: [("ZADD", self._leases, time.time() + lease, job_id)]) is not None
+
+    def complete(self, job_id: str, worker: str, result: Any) -> bool:
+        def done(fields: Dict[str, str]) -> List[tuple]:
+            return self._drop_lease(job_id) + [(
+                "HSET", self._key(job_id), "status", "done", "result", json.dumps(result, ensure_ascii=False),
+                "error", "", "error_type", "", "updated", time.time()
+            )]
+
+        if self._settle(job_id, worker, done) is None:
+            return False
+        metrics.increment("jobs.completed")
+        return True
+
+    def fail(self, job_id: str, worker: str, error: str, error_type: str = "", retry: bool = True) -> Optional[str]:
+        fields = self._settle(job_id, worker, lambda fields: self._release(job_id, fields, error, error_type, retry, time.time()))
+        if fields is None:
+            return None
+        return self._retry_status(int(fields.get("attempts") or 0), retry)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        fields = self._fields(job_id)
+        return _decode(fields) if "payload" in fields else None
+
+    def depth(self) -> int:
+        return int(self.client.execute("LLEN", self._queue))
+
+    def close(self) -> None:
+        self.client.close()
+
+def open_job_queue(url: str, max_attempts: int = 3) -> JobQueue:
+    """주소에 맞는 작업 큐를 엶
+
+    Args:
+        url: redis://..., sqlite:///경로 또는 SQLite 파일 경로
+        max_attempts: 작업별 최대 시도 횟수 (기본값: 3)
+
+    Returns:
+        JobQueue: 작업 큐
+
+    Raises:
+        ValueError: 주소가 비어 있거나 지원하지 않는 형식인 경우
+    """
+    if not url:
+        raise ValueError("작업 큐 주소가 비어 있습니다 (JOB_QUEUE_URL).")
+    if url.startswith(("redis://", "rediss://")):
+        if url.startswith("rediss://"):
+            raise ValueError("TLS(rediss://)는 지원하지 않습니다.")
+        return RedisJobQueue(url, max_attempts)
+    if url.startswith("sqlite:///"):
+        # SQLAlchemy와 같은 형식 (sqlite:///상대경로, sqlite:////절대경로)
+        return SQLiteJobQueue(url[len("sqlite:///"):], max_attempts)
+    if "://" in url:
+        raise ValueError(f"지원하지 않는 작업 큐 주소입니다: {url}")
+    return SQLiteJobQueue(url, max_attempts)
+
+_queues: Dict[str, JobQueue] = {}
+_queues_lock = threading.Lock()
+
+def get_job_queue(url: Optional[str] = None) -> JobQueue:
+    """주소별로 하나씩 공유하는 작업 큐 (기본값: config.job_queue_url)
+
+    Args:
+        url: 작업 큐 주소 (기본값: None, JOB_QUEUE_URL)
+
+    Returns:
+        JobQueue: 작업 큐
+    """
+    from .config import config
+    url = url or config.job_queue_url
+    with _queues_lock:
+        if url not in _queues:
+            _queues[url] = open_job_queue(url, config.job_max_attempts)
+        return _queues[url]
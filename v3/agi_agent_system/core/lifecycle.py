@@ -0,0 +1,341 @@
+"""세션 수명 관리 모듈
+
+이 모듈은 오래 사용되지 않은 세션을 압축 아카이브로 옮기는 SessionArchive
+클래스를 정의합니다.
+
+- TTL보다 오래 바뀌지 않은 세션의 메모리 파일, 체크포인트 로그, 콜드 아카이브를 세션마다
+  하나의 압축 프레임(zstd, 없으면 gzip 멤버)으로 묶어 세그먼트 파일
+  (archive/segment-*.zst|gz)에 덧붙이고 원본을 지웁니다.
+- archive/index.json에 세션별 세그먼트, 오프셋, 길이를 기록합니다.
+- 아카이브된 세션에 접근하면 MemoryManager가 원본 파일을 그대로 복원합니다
+  (rehydrate). 복원된 프레임의 공간은 세그먼트에 남아 있습니다.
+"""
+
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd가 없으면 gzip 사용
+    zstandard = None
+
+from .config import config
+from .storage import FileLock, atomic_write_json, file_signature, read_json, safe_file_name
+
+# 세그먼트가 이 크기를 넘으면 새 세그먼트에 기록
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+
+CODECS = ("auto", "zstd", "gzip")
+
+_EXTENSIONS = {"zstd": "zst", "gzip": "gz"}
+
+def _resolve_codec(codec: str) -> str:
+    """설정된 압축 방식을 실제 사용할 방식으로 변환"""
+    if codec not in CODECS:
+        raise ValueError(f"알 수 없는 압축 방식: {codec}")
+    if codec == "auto":
+        return "zstd" if zstandard is not None else "gzip"
+    if codec == "zstd" and zstandard is None:
+        raise ValueError("zstd 압축에는 zstandard 패키지가 필요합니다.")
+    return codec
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=9)
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd로 아카이브된 세션을 복원하려면 zstandard 패키지가 필요합니다.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+class SessionArchive:
+    """메모리 디렉토리의 세션 아카이브
+
+    잠금 순서는 항상 세션 파일 잠금 → 색인 잠금입니다.
+
+    Attributes:
+        memory_dir: 메모리 파일 디렉토리
+        path: 아카이브 디렉토리 (memory_dir/archive)
+        index_file: 세션별 위치를 기록하는 색인 파일
+        codec: 새로 아카이브할 때 사용할 압축 방식 ("zstd" 또는 "gzip")
+    """
+
+    def __init__(self, memory_dir: str, codec: Optional[str] = None):
+        """SessionArchive 초기화
+
+        Args:
+            memory_dir: 메모리 파일 디렉토리
+            codec: 압축 방식 ("auto", "zstd", "gzip", 기본값: config.session_archive_codec)
+        """
+        self.memory_dir = Path(memory_dir)
+        self.path = self.memory_dir / "archive"
+        self.index_file = self.path / "index.json"
+        self.codec = _resolve_codec(codec or config.session_archive_codec)
+        self._lock = threading.Lock()
+        self._index: Dict[str, Any] = {"sessions": {}}
+        self._signature = None
+
+    def _session_files(self, session_id: str) -> Dict[str, Path]:
+        """세션에 속한 파일 (메모리 디렉토리 기준 상대 경로 → 경로)"""
+        names = [
+            f"{session_id}.json",
+            f"checkpoints/{safe_file_name(session_id)}.jsonl",
+            f"cold/{session_id}.jsonl.gz"
+        ]
+        return {name: self.memory_dir / name for name in names}
+
+    def _read_index(self) -> Dict[str, Any]:
+        """색인을 반환 (파일이 바뀌지 않았으면 캐시 사용)"""
+        with self._lock:
+            signature = file_signature(self.index_file)
+            if signature != self._signature:
+                self._index = read_json(self.index_file) or {"sessions": {}}
+                self._signature = signature
+            return self._index
+
+    def _write_index(self, index: Dict[str, Any]) -> None:
+        """색인을 저장 (색인 잠금을 보유한 상태에서 호출)"""
+        atomic_write_json(self.index_file, index, fsync=True, indent=None)
+        with self._lock:
+            self._index = index
+            self._signature = file_signature(self.index_file)
+
+    def contains(self, session_id: str) -> bool:
+        """세션이 아카이브되어 있는지 확인
+
+        Args:
+            session_id: 세션 ID
+
+        Returns:
+            bool: 아카이브되어 있으면 True
+        """
+        return session_id in self._read_index()["sessions"]
+
+    def _segment_for(self, index: Dict[str, Any], size: int) -> Path:
+        """프레임을 덧붙일 세그먼트 (마지막 세그먼트가 가득 찼으면 새로 만듦)"""
+        extension = _EXTENSIONS[self.codec]
+        current = index.get("segments", {}).get(self.codec)
+        if current:
+            path = self.path / current
+            if path.exists() and path.stat().st_size + size <= SEGMENT_MAX_BYTES:
+                return path
+        name = f"segment-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}.{extension}"
+        index.setdefault("segments", {})[self.codec] = name
+        return self.path / name
+
+    def archive_session(self, session_id: str, idle_before: Optional[float] = None) -> Optional[Dict[str, int]]:
+        """세션 하나를 아카이브로 옮김
+
+        Args:
+            session_id: 세션 ID
+            idle_before: 이 시각 이후에 바뀐 세션은 건너뜀 (기본값: None, 항상 아카이브)
+
+        Returns:
+            Optional[Dict[str, int]]: {"original_bytes", "archived_bytes"} (건너뛰었으면 None)
+        """
+        files = self._session_files(session_id)
+        memory_file = files[f"{session_id}.json"]
+        with FileLock(memory_file):
+            present = {name: path for name, path in files.items() if path.exists()}
+            if f"{session_id}.json" not in present:
+                return None
+            # 목록을 만든 뒤 다른 쪽이 세션을 썼으면 건너뜀
+            if idle_before is not None and max(path.stat().st_mtime for path in present.values()) > idle_before:
+                return None
+            contents = {name: path.read_bytes() for name, path in present.items()}
+            original_bytes = sum(len(data) for data in contents.values())
+            # 이미 압축된 콜드 아카이브는 base64로 담음
+            payload = json.dumps(
+                {
+                    "session_id": session_id,
+                    "files": {name: data.decode("utf-8") for name, data in contents.items() if not name.endswith(".gz")},
+                    "binary": {
+                        name: base64.b64encode(data).decode("ascii")
+                        for name, data in contents.items() if name.endswith(".gz")
+                    }
+                },
+                ensure_ascii=False,
+                separators=(",", ":")
+            ).encode("utf-8")
+            frame = _compress(payload, self.codec)
+            with FileLock(self.index_file):
+                index = dict(read_json(self.index_file) or {"sessions": {}})
+                segment = self._segment_for(index, len(frame))
+                segment.parent.mkdir(parents=True, exist_ok=True)
+                with open(segment, 'ab') as f:
+                    offset = f.tell()
+                    f.write(frame)
+                    f.flush()
+                    os.fsync(f.fileno())
+                index["sessions"] = dict(index["sessions"])
+                index["sessions"][session_id] = {
+                    "segment": segment.name,
+                    "offset": offset,
+                    "length": len(frame),
+                    "codec": self.codec,
+                    "original_bytes": original_bytes,
+                    "archived_at": time.time()
+                }
+                self._write_index(index)
+            for path in present.values():
+                path.unlink()
+            # 잠금을 보유한 채 지우면 대기 중인 쪽은 새 잠금 파일로 다시 잠금
+            FileLock(memory_file).lock_path.unlink(missing_ok=True)
+        return {"original_bytes": original_bytes, "archived_bytes": len(frame)}
+
+    def _read_frame(self, entry: Dict[str, Any]) -> Dict[str, bytes]:
+        """색인 항목이 가리키는 프레임의 세션 파일 (메모리 디렉토리 기준 상대 경로 → 내용)"""
+        with open(self.path / entry["segment"], 'rb') as f:
+            f.seek(entry["offset"])
+            frame = f.read(entry["length"])
+        payload = json.loads(_decompress(frame, entry["codec"]).decode("utf-8"))
+        contents = {name: text.encode("utf-8") for name, text in payload["files"].items()}
+        contents.update({name: base64.b64decode(data) for name, data in payload.get("binary", {}).items()})
+        return contents
+
+    def read_archived(self, session_id: str, name: str) -> Optional[bytes]:
+        """아카이브된 세션의 파일 하나를 복원하지 않고 읽음 (읽기 전용 조회용)
+
+        Args:
+            session_id: 세션 ID
+            name: 메모리 디렉토리 기준 상대 경로 (예: "<session_id>.json")
+
+        Returns:
+            Optional[bytes]: 파일 내용 (아카이브되어 있지 않거나 파일이 없으면 None)
+        """
+        entry = self._read_index()["sessions"].get(session_id)
+        if entry is None:
+            return None
+        try:
+            return self._read_frame(entry).get(name)
+        except FileNotFoundError:
+            # 읽는 사이에 복원되어 세그먼트가 정리된 경우
+            return None
+
+    def restore_locked(self, session_id: str) -> bool:
+        """아카이브된 세션 파일을 복원 (세션 파일 잠금을 보유한 상태에서 호출)
+
+        Args:
+            session_id: 세션 ID
+
+        Returns:
+            bool: 복원한 경우 True
+        """
+        if not self.contains(session_id):
+            return False
+        with FileLock(self.index_file):
+            index = read_json(self.index_file) or {"sessions": {}}
+            entry = index["sessions"].get(session_id)
+            if entry is None:
+                return False
+            contents = self._read_frame(entry)
+            for name, data in contents.items():
+                path = self.memory_dir / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+            index["sessions"] = {sid: e for sid, e in index["sessions"].items() if sid != session_id}
+            self._write_index(index)
+        return True
+
+    def rehydrate(self, session_id: str) -> bool:
+        """아카이브된 세션 파일을 복원
+
+        Args:
+            session_id: 세션 ID
+
+        Returns:
+            bool: 복원한 경우 True (아카이브되어 있지 않으면 False)
+        """
+        if not self.contains(session_id):
+            return False
+        with FileLock(self.memory_dir / f"{session_id}.json"):
+            if (self.memory_dir / f"{session_id}.json").exists():
+                return False
+            return self.restore_locked(session_id)
+
+    def archive_idle(self, ttl: Optional[float] = None, now: Optional[float] = None) -> Dict[str, Any]:
+        """TTL보다 오래 바뀌지 않은 세션을 모두 아카이브
+
+        Args:
+            ttl: 유휴 기준 시간 (초, 기본값: config.session_ttl, 0이면 아카이브하지 않음)
+            now: 기준 시각 (기본값: 현재 시각)
+
+        Returns:
+            Dict[str, Any]: 정리 보고서 (검사/아카이브한 세션 수, 회수한 바이트 수 등)
+        """
+        ttl = config.session_ttl if ttl is None else ttl
+        idle_before = (time.time() if now is None else now) - ttl
+        report = {
+            "scanned": 0,
+            "archived": 0,
+            "original_bytes": 0,
+            "archived_bytes": 0,
+            "bytes_reclaimed": 0,
+            "codec": self.codec
+        }
+        if ttl <= 0 or not self.memory_dir.is_dir():
+            return report
+        for path in sorted(self.memory_dir.glob("*.json")):
+            if path.name.startswith("."):
+                continue
+            report["scanned"] += 1
+            try:
+                if path.stat().st_mtime > idle_before:
+                    continue
+            except FileNotFoundError:
+                continue
+            result = self.archive_session(path.stem, idle_before=idle_before)
+            if result is None:
+                continue
+            report["archived"] += 1
+            report["original_bytes"] += result["original_bytes"]
+            report["archived_bytes"] += result["archived_bytes"]
+        report["bytes_reclaimed"] = report["original_bytes"] - report["archived_bytes"]
+        return report
+
+_archives: Dict[str, SessionArchive] = {}
+_archives_lock = threading.Lock()
+
+def get_session_archive(memory_dir: Optional[str] = None) -> SessionArchive:
+    """메모리 디렉토리별 공유 세션 아카이브를 반환
+
+    Args:
+        memory_dir: 메모리 파일 디렉토리 (기본값: config.memory_dir)
+
+    Returns:
+        SessionArchive: 세션 아카이브
+    """
+    path = str(Path(memory_dir or config.memory_dir))
+    with _archives_lock:
+        if path not in _archives:
+            _archives[path] = SessionArchive(path)
+        return _archives[path]
+
+def run_archive(memory_dir: Optional[str] = None, ttl: Optional[float] = None) -> Dict[str, Any]:
+    """유휴 세션을 아카이브하고 보고서를 출력 (archive 모드)
+
+    Args:
+        memory_dir: 메모리 파일 디렉토리 (기본값: config.memory_dir)
+        ttl: 유휴 기준 시간 (초, 기본값: config.session_ttl)
+
+    Returns:
+        Dict[str, Any]: 정리 보고서
+    """
+    report = get_session_archive(memory_dir).archive_idle(ttl=ttl)
+    print(
+        f"세션 {report['scanned']}개 중 {report['archived']}개 아카이브 "
+        f"({report['codec']}, {report['original_bytes']} → {report['archived_bytes']} bytes, "
+        f"{report['bytes_reclaimed']} bytes 회수)"
+    )
+    return report
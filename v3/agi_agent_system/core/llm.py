@@ -1,42 +1,376 @@
 """LLM 모델 래퍼 모듈
 
 이 모듈은 LLM 모델을 래핑하여 일관된 인터페이스를 제공합니다.
+LangChain/llama.cpp 스택은 모델이 실제로 필요할 때만 임포트됩니다.
+생성된 모델은 프로세스 내 레지스트리에 보관되어 에이전트와 요청 사이에서
+공유되므로, 같은 모델 파일은 한 번만 로드됩니다. 역할별 생성 설정(온도, 최대
+토큰 수, top_p, 반복 패널티, 시드, 정지 문자열)은 호출 단위로 전달되므로 설정이
+다른 역할도 같은 모델을 공유합니다. 최대 토큰 수와 정지 문자열, JSON 종료 정지
+조건은 llama.cpp 엔진에서 생성을 바로 멈춥니다.
+레지스트리는 config.registry_capacity()개(기본값: 역할과 캐스케이드가 쓰는 모델
+파일 수)까지만 모델을 보관합니다.
 """
 
-from typing import Any, Optional
-from langchain_community.llms import LlamaCpp
-from langchain.callbacks.manager import CallbackManager
-from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+import contextlib
+import mmap
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple
 
 from .config import config
+from .metrics import metrics
+
+# (백엔드, 모델 경로, 스트리밍, 성능 설정) -> 모델 인스턴스 (최근 사용 순)
+_registry: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+_registry_lock = threading.Lock()
+
+class JsonStop:
+    """최상위 JSON 객체가 닫히는 토큰에서 생성을 멈추는 llama.cpp 정지 조건
+    
+    llama.cpp는 토큰을 생성할 때마다 (지금까지의 토큰 ID, 로짓)으로 호출하며,
+    참을 반환하면 생성을 끝냅니다. JSON 뒤에 붙는 설명을 생성하지 않게 합니다.
+    호출마다 새 인스턴스를 사용해야 합니다.
+    """
+    
+    def __init__(self, detokenize: Callable[[List[int]], bytes]):
+        """JsonStop 초기화
+        
+        Args:
+            detokenize: 토큰 ID 목록을 바이트로 바꾸는 함수 (Llama.detokenize)
+        """
+        self.detokenize = detokenize
+        self._seen = None  # 지금까지 확인한 토큰 수 (첫 호출 때 프롬프트 길이로 설정)
+        self._depth = 0
+        self._opened = False
+        self._in_string = False
+        self._escaped = False
+    
+    def __call__(self, input_ids: Any, logits: Any = None) -> bool:
+        if self._seen is None:
+            # llama.cpp 버전에 따라 방금 생성한 토큰이 아직 input_ids에 없을 수 있으므로
+            # 마지막 토큰부터 확인 (그 경우 한 토큰 늦게 멈춤)
+            self._seen = len(input_ids) - 1
+        new_tokens = [int(token) for token in input_ids[self._seen:]]
+        self._seen = len(input_ids)
+        # 구조 문자는 모두 ASCII이고 UTF-8 멀티바이트 문자의 바이트는 0x80 이상이므로 바이트 단위로 훑음
+        for byte in self.detokenize(new_tokens):
+            char = chr(byte)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                self._opened = True
+            elif char in "}]" and self._opened:
+                self._depth -= 1
+                if self._depth == 0:
+                    return True
+        return False
+
+class RoleLLM:
+    """공유 모델에 역할별 생성 설정을 붙인 핸들
+    
+    Attributes:
+        model: 레지스트리의 공유 모델 인스턴스
+        sampling: 호출마다 전달할 생성 인자 (temperature, max_tokens와 설정된 top_p, repeat_penalty, seed, stop)
+        stop_at_json_end: llama.cpp 모델이면 최상위 JSON 객체가 닫힐 때 생성을 멈출지 여부
+    """
+    
+    def __init__(self, model: Any, sampling: Dict[str, Any], stop_at_json_end: bool = False):
+        """RoleLLM 초기화
+        
+        Args:
+            model: 공유 모델 인스턴스
+            sampling: 호출마다 전달할 생성 인자
+            stop_at_json_end: JSON 종료 정지 조건 사용 여부 (기본값: False)
+        """
+        self.model = model
+        self.sampling = sampling
+        self.stop_at_json_end = stop_at_json_end
+    
+    @property
+    def thread_safe(self) -> bool:
+        return getattr(self.model, "thread_safe", False)
+    
+    def invoke(self, prompt: str, **kwargs) -> str:
+        params = {**self.sampling, **kwargs}
+        if self.stop_at_json_end and "stopping_criteria" not in params:
+            criteria = _json_stopping_criteria(self.model)
+            if criteria is not None:
+                params["stopping_criteria"] = criteria
+        return self.model.invoke(prompt, **params)
+    
+    def get_num_tokens(self, text: str) -> int:
+        return self.model.get_num_tokens(text)
+
+def _json_stopping_criteria(model: Any) -> Optional[Any]:
+    """llama.cpp 모델이면 JsonStop을 담은 정지 조건 목록을 반환 (다른 백엔드는 None)"""
+    detokenize = getattr(getattr(model, "client", None), "detokenize", None)
+    if detokenize is None:
+        return None
+    try:
+        from llama_cpp import StoppingCriteriaList
+    except ImportError:
+        return None
+    return StoppingCriteriaList([JsonStop(detokenize)])
+
+# id(모델 인스턴스) -> 호출 직렬화용 잠금
+_model_locks: Dict[int, threading.Lock] = {}
 
 def get_llm(
     model_path: Optional[str] = None,
     temperature: Optional[float] = None,
     max_tokens: Optional[int] = None,
-    streaming: bool = True
-) -> Any:
-    """LLM 모델 인스턴스를 생성하고 반환
+    streaming: bool = True,
+    role: Optional[str] = None
+) -> RoleLLM:
+    """LLM 핸들을 반환 (같은 모델 파일이면 공유 인스턴스를 재사용)
+    
+    Args:
+        model_path: 모델 파일 경로 (기본값: 역할 설정 또는 config.model_path)
+        temperature: 생성 온도 (기본값: 역할 설정 또는 config.temperature)
+        max_tokens: 최대 토큰 수 (기본값: 역할 설정 또는 config.max_tokens)
+        streaming: 스트리밍 출력 사용 여부 (기본값: True)
+        role: 모델과 샘플링 설정을 가져올 에이전트 역할 (기본값: None, 전역 설정)
+        
+    Returns:
+        RoleLLM: 공유 모델과 역할의 생성 설정
+    """
+    profile = config.role_profile(role or "")
+    model = get_model(model_path or profile.model_path, streaming)
+    sampling = {
+        "temperature": profile.temperature if temperature is None else temperature,
+        "max_tokens": profile.max_tokens if max_tokens is None else max_tokens,
+    }
+    # 설정하지 않은 값은 엔진 기본값을 쓰도록 전달하지 않음
+    for name in ("top_p", "repeat_penalty", "seed", "stop"):
+        value = getattr(profile, name)
+        if value is not None:
+            sampling[name] = value
+    return RoleLLM(model, sampling, stop_at_json_end=profile.stop_at_json_end)
+
+def get_model(model_path: Optional[str] = None, streaming: bool = True) -> Any:
+    """레지스트리의 공유 모델 인스턴스를 반환 (없으면 로드)
+    
+    보관 중인 모델이 config.registry_capacity()개를 넘으면 가장 오래 쓰지 않은
+    모델을 레지스트리에서 뺍니다. 해제된 모델은 이를 쥐고 있는 에이전트가
+    모두 사라지면 메모리에서 내려갑니다. 기본 크기는 역할과 캐스케이드가 쓰는
+    모델 파일 수이므로 설정된 모델끼리는 서로 밀어내지 않습니다.
     
     Args:
         model_path: 모델 파일 경로 (기본값: config.model_path)
-        temperature: 생성 온도 (기본값: config.temperature)
-        max_tokens: 최대 토큰 수 (기본값: config.max_tokens)
         streaming: 스트리밍 출력 사용 여부 (기본값: True)
         
+    Returns:
+        Any: 모델 인스턴스
+    """
+    key = (
+        config.llm_backend,
+        model_path or config.model_path,
+        streaming,
+        tuple(sorted(llama_params().items()))
+    )
+    with _registry_lock:
+        if key in _registry:
+            _registry.move_to_end(key)
+            return _registry[key]
+        _registry[key] = _create_llm(key[1], config.temperature, config.max_tokens, streaming)
+        metrics.increment("llm.model_loads")
+        while len(_registry) > config.registry_capacity():
+            _registry.popitem(last=False)
+            metrics.increment("llm.model_evictions")
+        return _registry[key]
+
+def llama_params() -> Dict[str, Any]:
+    """config의 llama.cpp 성능 설정을 llama_cpp.Llama 인자로 변환
+    
+    0으로 설정된 스레드 수는 llama.cpp가 정하도록 인자에서 뺍니다.
+    
+    Returns:
+        Dict[str, Any]: Llama 생성 인자
+    """
+    params = {
+        "n_ctx": config.n_ctx,
+        "n_batch": config.n_batch,
+        "n_gpu_layers": config.n_gpu_layers,
+        "use_mmap": config.use_mmap,
+        "use_mlock": config.use_mlock,
+        "numa": config.numa,
+        "flash_attn": config.flash_attn,
+    }
+    if config.n_threads > 0:
+        params["n_threads"] = config.n_threads
+    if config.n_threads_batch > 0:
+        params["n_threads_batch"] = config.n_threads_batch
+    return params
+
+def _create_llm(model_path: str, temperature: float, max_tokens: int, streaming: bool) -> Any:
+    """설정된 백엔드로 새 LLM 인스턴스를 생성
+    
+    Args:
+        model_path: 모델 파일 경로
+        temperature: 생성 온도
+        max_tokens: 최대 토큰 수
+        streaming: 스트리밍 출력 사용 여부
+        
     Returns:
         Any: LLM 모델 인스턴스
     """
+    if config.llm_backend == "fake":
+        from .fake_llm import FakeLLM
+        return FakeLLM(latency_ms=config.fake_llm_latency_ms)
+    if config.llm_backend == "replay":
+        from .fake_llm import ReplayLLM
+        return ReplayLLM(config.replay_transcripts, latency_ms=config.fake_llm_latency_ms)
+    
+    from langchain_community.llms import LlamaCpp
+    from langchain.callbacks.manager import CallbackManager
+    from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+    
     callback_manager = None
     if streaming:
         callback_manager = CallbackManager([StreamingStdOutCallbackHandler()])
     
+    params = llama_params()
+    # LlamaCpp가 필드로 받지 않는 설정은 model_kwargs로 Llama에 그대로 전달
+    model_kwargs = {name: params.pop(name) for name in ("n_threads_batch", "numa", "flash_attn") if name in params}
     return LlamaCpp(
-        model_path=model_path or config.model_path,
-        temperature=temperature or config.temperature,
-        max_tokens=max_tokens or config.max_tokens,
-        n_ctx=4096,  # 컨텍스트 창 크기 증가
-        n_batch=512,  # 배치 크기 설정
+        model_path=model_path,
+        temperature=temperature,
+        max_tokens=max_tokens,
         callback_manager=callback_manager,
-        verbose=True
-    ) 
\ No newline at end of file
+        verbose=True,
+        model_kwargs=model_kwargs,
+        **params
+    )
+
+def model_lock(llm: Any) -> ContextManager:
+    """모델 호출을 직렬화하는 잠금을 반환
+    
+    llama.cpp 컨텍스트는 스레드 안전하지 않으므로 같은 인스턴스를 공유하는
+    스레드들은 이 잠금 안에서 호출해야 합니다. thread_safe 속성이 참인
+    모델(예: FakeLLM)은 잠그지 않습니다.
+    
+    Args:
+        llm: LLM 모델 인스턴스
+        
+    Returns:
+        ContextManager: 잠금 (또는 아무 일도 하지 않는 컨텍스트)
+    """
+    if isinstance(llm, RoleLLM):
+        # 같은 모델을 공유하는 역할들은 같은 잠금을 사용
+        llm = llm.model
+    if getattr(llm, "thread_safe", False):
+        return contextlib.nullcontext()
+    with _registry_lock:
+        key = id(llm)
+        lock = _model_locks.get(key)
+        if lock is None:
+            lock = _model_locks[key] = threading.Lock()
+            # 잠금은 모델과 수명을 같이함: 레지스트리에서 빠진 모델도 쥐고 있는 에이전트가
+            # 있으면 같은 잠금을 써야 하고, 모델이 해제되면 같은 id를 받은 새 모델이
+            # 예전 잠금을 물려받지 않도록 제거
+            try:
+                weakref.finalize(llm, _model_locks.pop, key, None)
+            except TypeError:
+                pass
+        return lock
+
+def _llama_context(llm: Any) -> Optional[Tuple[Any, Any]]:
+    """llama.cpp 모델이면 (llama_cpp 모듈, 컨텍스트 포인터)를 반환"""
+    if isinstance(llm, RoleLLM):
+        llm = llm.model
+    ctx = getattr(getattr(getattr(llm, "client", None), "_ctx", None), "ctx", None)
+    if ctx is None:
+        return None
+    try:
+        import llama_cpp
+    except ImportError:
+        return None
+    return llama_cpp, ctx
+
+def reset_engine_timings(llm: Any) -> None:
+    """llama.cpp 성능 카운터를 초기화 (model_lock 안에서 호출)
+    
+    Args:
+        llm: LLM 모델 인스턴스
+    """
+    found = _llama_context(llm)
+    if found is None:
+        return
+    llama_cpp, ctx = found
+    with contextlib.suppress(Exception):
+        if hasattr(llama_cpp, "llama_perf_context_reset"):
+            llama_cpp.llama_perf_context_reset(ctx)
+        else:
+            llama_cpp.llama_reset_timings(ctx)
+
+def engine_timings(llm: Any) -> Optional[Dict[str, float]]:
+    """마지막 초기화 이후 llama.cpp가 측정한 프롬프트 평가/생성 시간
+    
+    Args:
+        llm: LLM 모델 인스턴스
+        
+    Returns:
+        Optional[Dict[str, float]]: {"prompt_eval_ms", "generation_ms"}
+        (llama.cpp 모델이 아니거나 카운터를 읽을 수 없으면 None)
+    """
+    found = _llama_context(llm)
+    if found is None:
+        return None
+    llama_cpp, ctx = found
+    try:
+        if hasattr(llama_cpp, "llama_perf_context"):
+            data = llama_cpp.llama_perf_context(ctx)
+        else:
+            data = llama_cpp.llama_get_timings(ctx)
+        return {
+            "prompt_eval_ms": float(data.t_p_eval_ms),
+            "generation_ms": float(data.t_eval_ms),
+        }
+    except Exception:
+        return None
+
+# 모델 파일 경로 -> 읽기 전용 매핑 (pre-fork 마스터가 페이지를 쥐고 있도록 보관)
+_mapped_models: Dict[str, mmap.mmap] = {}
+
+def prefault_model(model_path: str) -> int:
+    """모델 파일을 읽기 전용으로 매핑하고 모든 페이지를 페이지 캐시에 올림
+    
+    llama.cpp는 use_mmap이면 가중치를 파일 매핑으로 읽으므로, fork 전에 마스터가
+    페이지를 올려 두면 워커들이 각자 모델을 열어도 같은 물리 페이지를 공유하고
+    첫 요청에서 디스크를 읽지 않습니다. 매핑은 프로세스가 끝날 때까지 유지됩니다.
+    
+    Args:
+        model_path: 모델 파일 경로
+        
+    Returns:
+        int: 매핑한 바이트 수 (이미 매핑했으면 그 크기)
+    """
+    path = os.path.realpath(model_path)
+    if path in _mapped_models:
+        return len(_mapped_models[path])
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_WILLNEED"):
+        mapped.madvise(mmap.MADV_WILLNEED)
+    # 페이지마다 한 바이트씩 읽어 실제로 올라오게 함
+    for offset in range(0, len(mapped), mmap.PAGESIZE):
+        mapped[offset]
+    _mapped_models[path] = mapped
+    metrics.increment("llm.prefaulted_bytes", len(mapped))
+    return len(mapped)
+
+def clear_llm_registry() -> None:
+    """레지스트리에 보관된 모델 인스턴스를 모두 해제"""
+    with _registry_lock:
+        _registry.clear()
+        _model_locks.clear()
@@ -1,44 +1,135 @@
 """메모리 관리 모듈
 
 이 모듈은 세션별 메모리 관리를 담당하는 MemoryManager 클래스를 정의합니다.
+대화 기록은 태스크마다 최근 항목만 원본으로 유지하고, 오래된 시도는 결정적인
+요약 항목으로 접은 뒤 원본을 압축된 콜드 아카이브(cold/<세션 ID>.jsonl.gz)로
+옮깁니다.
+
+같은 세션을 여러 스레드나 프로세스가 함께 쓸 수 있도록 기록은 세션 파일
+잠금 안에서 임시 파일 교체로 이루어집니다. 마지막으로 읽은 뒤 다른 쪽이
+파일을 바꿨다면 디스크의 내용에 아직 기록하지 않은 변경을 다시 적용해
+병합하므로 동시 추가가 유실되지 않습니다.
+
+변경 사항은 메모리에 모아 두었다가 한 번에 기록합니다 (write-behind).
+기록 시점은 durability 수준으로 정합니다:
+- "sync": 변경마다 즉시 기록하고 디스크에 내림
+- "buffered": 쌓인 변경 수나 경과 시간이 기준을 넘을 때, 노드 경계, 종료 시 기록
+- "manual": flush()/sync() 호출, 노드 경계, 종료 시에만 기록
 """
 
+import atexit
+import difflib
+import gzip
 import json
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, Iterator, List, Optional
 from pathlib import Path
 import uuid
 from datetime import datetime
 
+from .blobs import get_blob_store
+from .config import config
+from .lifecycle import get_session_archive
+from .storage import FileLock, atomic_write_json, file_signature, read_json
+
+# 태스크별로 압축 대상이 되는 대화 주체
+COMPACTABLE_ROLES = ("developer", "critic")
+
+# 개발자 에이전트가 실패한 시도의 코드 앞에 붙이는 표시
+ERROR_CODE_PREFIX = "# ERROR"
+
+DURABILITY_LEVELS = ("sync", "buffered", "manual")
+
+# 아직 기록되지 않은 변경이 있는 MemoryManager (종료 시 기록)
+_pending: set = set()
+_pending_lock = threading.Lock()
+
+@atexit.register
+def flush_all() -> None:
+    """기록되지 않은 변경이 있는 모든 세션 메모리를 기록"""
+    with _pending_lock:
+        managers = list(_pending)
+    for manager in managers:
+        manager.flush()
+
+def _task_id(entry: Dict[str, Any]) -> Optional[Any]:
+    """압축 대상 대화 항목의 태스크 ID (대상이 아니면 None)"""
+    if entry.get("role") not in COMPACTABLE_ROLES or not isinstance(entry.get("content"), dict):
+        return None
+    return entry["content"].get("task_id")
+
+def _code_of(entry: Dict[str, Any]) -> Optional[str]:
+    """개발자 항목의 코드 (없으면 None)"""
+    content = entry.get("content", {}).get("content")
+    return content.get("code") if isinstance(content, dict) else None
+
+def diff_stats(before: str, after: str) -> Dict[str, int]:
+    """두 코드 사이의 추가/삭제 줄 수
+    
+    Args:
+        before: 이전 코드
+        after: 이후 코드
+        
+    Returns:
+        Dict[str, int]: {"added": 추가된 줄 수, "removed": 삭제된 줄 수}
+    """
+    added = removed = 0
+    for line in difflib.ndiff(before.splitlines(), after.splitlines()):
+        if line.startswith("+ "):
+            added += 1
+        elif line.startswith("- "):
+            removed += 1
+    return {"added": added, "removed": removed}
+
 class MemoryManager:
     """세션별 메모리를 관리하는 클래스
     
     Attributes:
         session_id: 세션 ID
         memory_file: 메모리 파일 경로
+        archive_file: 압축된 대화 원본을 보관하는 콜드 아카이브 경로
+        keep_raw: 태스크별로 원본으로 유지할 최근 대화 항목 수 (0이면 압축하지 않음)
+        durability: 기록 시점 ("sync", "buffered", "manual")
         memory: 메모리 데이터
     """
     
-    def __init__(self, session_id: Optional[str] = None, memory_dir: str = "memory"):
+    def __init__(
+        self,
+        session_id: Optional[str] = None,
+        memory_dir: str = "memory",
+        keep_raw: Optional[int] = None,
+        durability: Optional[str] = None
+    ):
         """MemoryManager 초기화
         
         Args:
             session_id: 세션 ID (기본값: None, 자동 생성)
             memory_dir: 메모리 파일 디렉토리 (기본값: "memory")
+            keep_raw: 태스크별 원본 유지 항목 수 (기본값: config.memory_keep_raw)
+            durability: 기록 시점 (기본값: config.memory_durability)
         """
         self.session_id = session_id or str(uuid.uuid4())
         self.memory_dir = Path(memory_dir)
         self.memory_file = self.memory_dir / f"{self.session_id}.json"
+        self.archive_file = self.memory_dir / "cold" / f"{self.session_id}.jsonl.gz"
+        self.keep_raw = config.memory_keep_raw if keep_raw is None else keep_raw
+        self.durability = durability or config.memory_durability
+        if self.durability not in DURABILITY_LEVELS:
+            raise ValueError(f"알 수 없는 durability 수준: {self.durability}")
+        self._lock = threading.RLock()
+        self._dirty = 0
+        self._timer: Optional[threading.Timer] = None
+        # 마지막 기록 이후의 변경 (병합 시 디스크 내용에 다시 적용)
+        self._ops: List[tuple] = []
+        self._signature = None
         self.memory = self._load_memory()
+        # 압축 정책 도입 전에 커진 세션도 로드 시 한 번 정리
+        if self._oversized():
+            self._dirty += 1
+            self.flush()
     
-    def _load_memory(self) -> Dict[str, List[Dict[str, Any]]]:
-        """메모리 파일에서 데이터 로드
-        
-        Returns:
-            Dict[str, List[Dict[str, Any]]]: 메모리 데이터
-        """
-        if self.memory_file.exists():
-            with open(self.memory_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+    def _empty_memory(self) -> Dict[str, Any]:
+        """빈 세션 메모리 구조"""
         return {
             "conversations": [],
             "tasks": [],
@@ -48,11 +139,111 @@ class MemoryManager:
             }
         }
     
-    def _save_memory(self) -> None:
-        """메모리 데이터를 파일에 저장"""
-        self.memory_dir.mkdir(parents=True, exist_ok=True)
-        with open(self.memory_file, 'w', encoding='utf-8') as f:
-            json.dump(self.memory, f, ensure_ascii=False, indent=2)
+    def _load_memory(self) -> Dict[str, List[Dict[str, Any]]]:
+        """메모리 파일에서 데이터 로드
+        
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: 메모리 데이터
+        """
+        if not self.memory_file.exists():
+            # 유휴 기간이 지나 아카이브된 세션은 원본 파일로 복원
+            get_session_archive(str(self.memory_dir)).rehydrate(self.session_id)
+        # 읽기 전에 서명을 잡아 두면 그 사이에 바뀐 경우 다음 기록 때 다시 병합됨
+        self._signature = file_signature(self.memory_file)
+        data = read_json(self.memory_file)
+        return data if data is not None else self._empty_memory()
+    
+    def _apply(self, data: Dict[str, Any], op: tuple) -> None:
+        """변경 하나를 메모리 데이터에 적용"""
+        if op[0] == "append":
+            data.setdefault(op[1], []).append(op[2])
+        elif op[0] == "clear":
+            version = data.get("metadata", {}).get("version", 0)
+            data.clear()
+            data.update(self._empty_memory())
+            data["metadata"]["version"] = version
+    
+    def _oversized(self) -> bool:
+        """원본 항목이 keep_raw를 넘는 태스크가 있는지 확인"""
+        if self.keep_raw <= 0:
+            return False
+        counts: Dict[Any, int] = {}
+        for entry in self.memory.get("conversations", []):
+            task_id = _task_id(entry)
+            if task_id is not None:
+                counts[task_id] = counts.get(task_id, 0) + 1
+        return any(count > self.keep_raw for count in counts.values())
+    
+    def _save_memory(self, fsync: bool = False) -> None:
+        """메모리 데이터를 파일에 저장 (다른 쪽이 먼저 기록했으면 병합)
+        
+        Args:
+            fsync: 디스크에 내릴 때까지 기다릴지 여부 (기본값: False)
+        """
+        with FileLock(self.memory_file):
+            if not self.memory_file.exists():
+                # 로드 후 아카이브되었으면 복원한 뒤 병합
+                get_session_archive(str(self.memory_dir)).restore_locked(self.session_id)
+            if file_signature(self.memory_file) != self._signature:
+                data = read_json(self.memory_file)
+                if data is not None:
+                    for op in self._ops:
+                        self._apply(data, op)
+                    self.memory = data
+            # 압축은 병합된 최신 내용에 대해 잠금 안에서만 수행 (아카이브 중복 방지)
+            self.compact()
+            metadata = self.memory.setdefault("metadata", {})
+            metadata["version"] = metadata.get("version", 0) + 1
+            atomic_write_json(self.memory_file, self.memory, fsync=fsync, indent=None)
+            self._signature = file_signature(self.memory_file)
+            self._ops = []
+    
+    def _mark_dirty(self) -> None:
+        """변경을 기록하고 durability 수준에 따라 저장 시점을 결정 (잠금을 보유한 상태에서 호출)"""
+        self._dirty += 1
+        if self.durability == "sync":
+            self.sync()
+            return
+        if self._dirty == 1:
+            with _pending_lock:
+                _pending.add(self)
+            if self.durability == "buffered" and config.memory_flush_interval > 0:
+                # 첫 변경 후 일정 시간이 지나면 이후 변경과 함께 기록
+                self._timer = threading.Timer(config.memory_flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if self.durability == "buffered" and self._dirty >= config.memory_flush_entries:
+            self.flush()
+    
+    def _write_pending(self, fsync: bool) -> bool:
+        """기록되지 않은 변경을 파일에 씀 (변경이 없으면 아무것도 하지 않음)"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            with _pending_lock:
+                _pending.discard(self)
+            if not self._dirty:
+                return False
+            self._save_memory(fsync=fsync)
+            self._dirty = 0
+            return True
+    
+    def flush(self) -> bool:
+        """기록되지 않은 변경을 파일에 씀
+        
+        Returns:
+            bool: 파일에 쓴 경우 True (변경이 없으면 False)
+        """
+        return self._write_pending(fsync=False)
+    
+    def sync(self) -> bool:
+        """기록되지 않은 변경을 파일에 쓰고 디스크에 내림
+        
+        Returns:
+            bool: 파일에 쓴 경우 True (변경이 없으면 False)
+        """
+        return self._write_pending(fsync=True)
     
     def append(self, key: str, value: Dict[str, Any]) -> None:
         """메모리에 데이터 추가
@@ -61,10 +252,112 @@ class MemoryManager:
             key: 데이터 키 (예: "conversations", "tasks")
             value: 추가할 데이터
         """
-        if key not in self.memory:
-            self.memory[key] = []
-        self.memory[key].append(value)
-        self._save_memory()
+        with self._lock:
+            op = ("append", key, value)
+            self._apply(self.memory, op)
+            self._ops.append(op)
+            self._mark_dirty()
+    
+    def compact(self) -> int:
+        """원본 항목이 keep_raw를 넘는 모든 태스크의 대화를 압축
+        
+        Returns:
+            int: 아카이브로 옮긴 항목 수
+        """
+        task_ids = []
+        for entry in self.memory.get("conversations", []):
+            task_id = _task_id(entry)
+            if task_id is not None and task_id not in task_ids:
+                task_ids.append(task_id)
+        return sum(self._compact_task(task_id) for task_id in task_ids)
+    
+    def _compact_task(self, task_id: Any) -> int:
+        """태스크의 오래된 대화 항목을 요약으로 접고 원본을 아카이브로 이동
+        
+        Args:
+            task_id: 태스크 ID
+            
+        Returns:
+            int: 아카이브로 옮긴 항목 수
+        """
+        conversations = self.memory.get("conversations", [])
+        raw = [i for i, entry in enumerate(conversations) if _task_id(entry) == task_id]
+        if self.keep_raw <= 0 or len(raw) <= self.keep_raw:
+            return 0
+        folded = raw[:-self.keep_raw]
+        archived = [conversations[i] for i in folded]
+        
+        # 원본을 먼저 아카이브에 기록 (gzip 멤버를 이어 붙이는 방식이라 추가 쓰기만 발생)
+        self.archive_file.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.archive_file, 'at', encoding='utf-8') as f:
+            for entry in archived:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        
+        summary_index = next(
+            (
+                i for i, entry in enumerate(conversations)
+                if entry.get("role") == "summary" and entry["content"].get("task_id") == task_id
+            ),
+            None
+        )
+        if summary_index is None:
+            summary = {"role": "summary", "content": {
+                "task_id": task_id,
+                "attempts": 0,
+                "evaluations": 0,
+                "errors": 0,
+                "scores": [],
+                "best_score": None,
+                "code_diffs": [],
+                "last_feedback": None,
+            }}
+        else:
+            summary = conversations[summary_index]
+        content = summary["content"]
+        
+        developer_entries = [i for i in raw if conversations[i].get("role") == "developer"]
+        for i in folded:
+            entry = conversations[i]
+            if entry["role"] == "developer":
+                content["attempts"] += 1
+                # 다음 시도의 코드와 비교한 변경 규모
+                later = [j for j in developer_entries if j > i]
+                code, next_code = _code_of(entry), _code_of(conversations[later[0]]) if later else None
+                # 블롭 참조로 기록된 코드는 원래 문자열로 비교
+                blobs = get_blob_store(str(self.memory_dir))
+                code, next_code = blobs.resolve(code), blobs.resolve(next_code)
+                # 개발자 에이전트는 실패한 시도를 "# ERROR"로 시작하는 코드로 기록
+                if isinstance(code, str) and code.startswith(ERROR_CODE_PREFIX):
+                    content["errors"] += 1
+                if code is not None and next_code is not None:
+                    content["code_diffs"].append(diff_stats(code, next_code))
+            else:
+                evaluation = entry["content"].get("content") or {}
+                content["evaluations"] += 1
+                if isinstance(evaluation.get("score"), (int, float)):
+                    content["scores"].append(evaluation["score"])
+                    content["best_score"] = max(content["scores"])
+                content["last_feedback"] = evaluation.get("feedback", content["last_feedback"])
+        
+        # 요약은 접힌 항목 중 첫 번째 자리에 두고 나머지 접힌 항목은 제거
+        removed = set(folded)
+        if summary_index is None:
+            conversations[folded[0]] = summary
+            removed.discard(folded[0])
+        self.memory["conversations"] = [entry for i, entry in enumerate(conversations) if i not in removed]
+        return len(folded)
+    
+    def load_archive(self) -> Iterator[Dict[str, Any]]:
+        """콜드 아카이브로 옮겨진 원본 대화 항목을 순서대로 반환
+        
+        Returns:
+            Iterator[Dict[str, Any]]: 아카이브된 대화 항목
+        """
+        if not self.archive_file.exists():
+            return
+        with gzip.open(self.archive_file, 'rt', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
     
     def get(self, key: str) -> List[Dict[str, Any]]:
         """메모리에서 데이터 조회
@@ -79,12 +372,8 @@ class MemoryManager:
     
     def clear(self) -> None:
         """메모리 초기화"""
-        self.memory = {
-            "conversations": [],
-            "tasks": [],
-            "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "session_id": self.session_id
-            }
-        }
-        self._save_memory() 
\ No newline at end of file
+        with self._lock:
+            op = ("clear",)
+            self._apply(self.memory, op)
+            self._ops.append(op)
+            self._mark_dirty() 
\ No newline at end of file
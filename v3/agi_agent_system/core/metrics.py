@@ -0,0 +1,167 @@
+"""메트릭 모듈
+
+이 모듈은 프로세스 내 카운터, 게이지와 지연 시간 분포를 수집하는 간단한
+메트릭 레지스트리를 정의합니다.
+"""
+
+import contextlib
+import contextvars
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+# capture()로 현재 컨텍스트의 관측값을 따로 모으는 딕셔너리
+_captured: contextvars.ContextVar[Optional[Dict[str, List[float]]]] = contextvars.ContextVar(
+    "metrics_captured", default=None
+)
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """값 목록의 개수, 평균, 백분위수를 계산
+
+    Args:
+        values: 관측값 목록
+
+    Returns:
+        Dict[str, float]: count, mean, p50, p90, p95, p99, max
+    """
+    if not values:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p90": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def percentile(q: float) -> float:
+        # 선형 보간 백분위수
+        position = (len(ordered) - 1) * q
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": percentile(0.50),
+        "p90": percentile(0.90),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": ordered[-1],
+    }
+
+class MetricsRegistry:
+    """카운터, 게이지, 관측값 분포를 보관하는 레지스트리
+
+    관측값은 이름별로 최근 max_samples개만 유지합니다.
+
+    Attributes:
+        max_samples: 이름별로 유지할 최대 관측값 수
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        """MetricsRegistry 초기화
+
+        Args:
+            max_samples: 이름별로 유지할 최대 관측값 수 (기본값: 10000)
+        """
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """카운터 증가
+
+        Args:
+            name: 카운터 이름
+            value: 증가량 (기본값: 1)
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def adjust(self, name: str, delta: float) -> float:
+        """게이지 값을 바꾸고 최대값을 함께 기록 (예: 처리 중인 요청 수)
+
+        Args:
+            name: 게이지 이름 (최대값은 "<이름>.max")
+            delta: 변화량
+
+        Returns:
+            float: 바뀐 값
+        """
+        with self._lock:
+            value = self._gauges.get(name, 0) + delta
+            self._gauges[name] = value
+            peak = f"{name}.max"
+            self._gauges[peak] = max(self._gauges.get(peak, 0), value)
+            return value
+
+    def gauge(self, name: str) -> float:
+        """게이지 값 조회 (없으면 0)"""
+        with self._lock:
+            return self._gauges.get(name, 0)
+
+    def observe(self, name: str, value: float) -> None:
+        """관측값 기록 (예: 지연 시간 ms)
+
+        Args:
+            name: 분포 이름
+            value: 관측값
+        """
+        with self._lock:
+            if name not in self._samples:
+                self._samples[name] = deque(maxlen=self.max_samples)
+            self._samples[name].append(value)
+            captured = _captured.get()
+            if captured is not None:
+                captured.setdefault(name, []).append(value)
+
+    @contextlib.contextmanager
+    def capture(self) -> Iterator[Dict[str, List[float]]]:
+        """이 컨텍스트(워크플로우 노드 포함)에서 기록된 관측값을 따로 모음
+
+        전역 분포는 최근 max_samples개만 유지하므로, 실행 하나의 관측값이 필요하면
+        전역 분포를 잘라 쓰지 말고 이 컨텍스트로 모읍니다.
+
+        Yields:
+            Dict[str, List[float]]: 이름별 관측값 (컨텍스트 안에서 채워짐)
+        """
+        captured: Dict[str, List[float]] = {}
+        token = _captured.set(captured)
+        try:
+            yield captured
+        finally:
+            _captured.reset(token)
+
+    def counter(self, name: str) -> float:
+        """카운터 값 조회 (없으면 0)"""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def samples(self, name: str) -> List[float]:
+        """관측값 목록 조회 (없으면 빈 목록)"""
+        with self._lock:
+            return list(self._samples.get(name, ()))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """모든 카운터와 분포 요약을 반환
+
+        Returns:
+            Dict[str, Any]: {"counters": {...}, "gauges": {...}, "histograms": {이름: summarize 결과}}
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            samples = {name: list(values) for name, values in self._samples.items()}
+        return {
+            "counters": counters,
+            "gauges": gauges,
+            "histograms": {name: summarize(values) for name, values in samples.items()},
+        }
+
+    def reset(self) -> None:
+        """모든 메트릭 초기화"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._samples.clear()
+
+# 전역 메트릭 레지스트리
+metrics = MetricsRegistry()
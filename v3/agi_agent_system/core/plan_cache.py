@@ -0,0 +1,241 @@
+"""플랜 캐시 모듈
+
+이 모듈은 유사한 목표에 대해 이전에 수락된 태스크 계획을 재사용하기 위한
+의미 기반 플랜 캐시를 정의합니다. 목표 문장은 임베딩되어 NumPy 행렬에
+저장되며, 코사인 유사도로 가장 가까운 계획을 찾습니다.
+
+계획을 LLM 호출 없이 그대로 재사용하는 것은 정규화 키(단어 순서 유지)가 같은
+목표뿐입니다. 유사도만 높은 목표에는 계획을 플래너의 참고 예시로만 제공합니다.
+계획은 모든 태스크가 비평가에게 수락된 뒤에만 추가됩니다.
+
+같은 메모리 디렉토리를 여러 프로세스가 공유하므로, 계획을 추가할 때는 파일 잠금
+안에서 다른 프로세스가 저장한 계획을 병합한 뒤 원자적으로 교체합니다.
+"""
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .config import config
+from .embedding import HashingEmbedder
+from .storage import FileLock, atomic_write_json, read_json
+
+@dataclass
+class PlanMatch:
+    """플랜 캐시 조회 결과
+
+    Attributes:
+        goal: 캐시된 계획의 원래 목표
+        plan: 캐시된 계획 (TaskPlan.dict() 형식)
+        similarity: 조회 목표와의 코사인 유사도
+        is_hit: 계획을 그대로 재사용할 수 있는지 여부 (정규화 키가 같은 경우)
+    """
+    goal: str
+    plan: Dict[str, Any]
+    similarity: float
+    is_hit: bool
+
+class PlanCache:
+    """목표 임베딩으로 색인된 태스크 계획 캐시
+
+    항목 수는 max_size로 제한되며, 가득 차면 가장 오래 사용되지 않은
+    항목을 제거합니다 (LRU).
+
+    Attributes:
+        max_size: 최대 항목 수
+        seed_threshold: 계획을 참고 예시로 제공할 유사도 기준
+        path: 캐시 저장 디렉토리 (None이면 메모리에만 유지)
+    """
+
+    def __init__(
+        self,
+        max_size: int = 256,
+        seed_threshold: float = 0.75,
+        embedder: Optional[HashingEmbedder] = None,
+        path: Optional[str] = None
+    ):
+        """PlanCache 초기화
+
+        Args:
+            max_size: 최대 항목 수 (기본값: 256)
+            seed_threshold: 참고 예시 유사도 기준 (기본값: 0.75)
+            embedder: 목표 임베더 (기본값: HashingEmbedder)
+            path: 캐시 저장 디렉토리 (기본값: None)
+        """
+        self.max_size = max_size
+        self.seed_threshold = seed_threshold
+        self.embedder = embedder or HashingEmbedder()
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((max_size, self.embedder.dim), dtype=np.float32)
+        self._goals: List[str] = []
+        self._keys: List[str] = []
+        self._plans: List[Dict[str, Any]] = []
+        self._last_used = np.zeros(max_size, dtype=np.int64)
+        self._clock = 0
+        self._stats = {"lookups": 0, "hits": 0, "seeds": 0, "misses": 0, "evictions": 0}
+        if self.path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._goals)
+
+    def _tick(self) -> int:
+        """LRU 판단에 사용하는 논리 시계를 증가"""
+        self._clock += 1
+        return self._clock
+
+    def _best(self, vector: np.ndarray) -> Optional[int]:
+        """가장 유사한 항목의 인덱스를 반환"""
+        if not self._goals:
+            return None
+        scores = self._vectors[:len(self._goals)] @ vector
+        return int(np.argmax(scores))
+
+    def lookup(self, goal: str) -> Optional[PlanMatch]:
+        """목표와 같은 계획(적중) 또는 유사한 계획(참고 예시)을 조회
+
+        Args:
+            goal: 조회할 목표
+
+        Returns:
+            Optional[PlanMatch]: 정규화 키가 같은 계획, 없으면 seed_threshold 이상인
+            가장 유사한 계획 (둘 다 없으면 None)
+        """
+        vector = self.embedder.embed(goal)
+        key = self.embedder.normalize(goal)
+        with self._lock:
+            self._stats["lookups"] += 1
+            is_hit = key in self._keys
+            index = self._keys.index(key) if is_hit else self._best(vector)
+            similarity = float(self._vectors[index] @ vector) if index is not None else 0.0
+            if index is None or (not is_hit and similarity < self.seed_threshold):
+                self._stats["misses"] += 1
+                return None
+            self._last_used[index] = self._tick()
+            self._stats["hits" if is_hit else "seeds"] += 1
+            return PlanMatch(
+                goal=self._goals[index],
+                plan=self._plans[index],
+                similarity=similarity,
+                is_hit=is_hit
+            )
+
+    def add(self, goal: str, plan: Dict[str, Any]) -> None:
+        """수락된 계획을 캐시에 추가
+
+        정규화 키가 같은 목표가 이미 있으면 해당 항목을 갱신합니다.
+
+        Args:
+            goal: 목표
+            plan: 태스크 계획 (TaskPlan.dict() 형식)
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if not self.path:
+                self._put(goal, plan)
+                return
+            with FileLock(self.plans_file):
+                # 다른 프로세스가 추가한 계획을 잃지 않도록 최신 파일을 병합한 뒤 저장
+                self._merge(self._read_entries())
+                self._put(goal, plan)
+                self._save()
+
+    def _put(self, goal: str, plan: Dict[str, Any]) -> int:
+        """계획을 넣거나 갱신하고 인덱스를 반환 (잠금을 보유한 상태에서 호출)"""
+        key = self.embedder.normalize(goal)
+        if key in self._keys:
+            index = self._keys.index(key)
+        elif len(self._goals) < self.max_size:
+            index = len(self._goals)
+            self._goals.append(goal)
+            self._keys.append(key)
+            self._plans.append(plan)
+        else:
+            index = int(np.argmin(self._last_used[:len(self._goals)]))
+            self._stats["evictions"] += 1
+        self._goals[index] = goal
+        self._keys[index] = key
+        self._plans[index] = plan
+        self._vectors[index] = self.embedder.embed(goal)
+        self._last_used[index] = self._tick()
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 사용 통계를 반환
+
+        Returns:
+            Dict[str, Any]: 조회/적중/시드/실패/제거 횟수와 적중률
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._goals)
+            stats["hit_rate"] = stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0
+            return stats
+
+    @property
+    def plans_file(self) -> Path:
+        return self.path / "plans.json"
+
+    def _read_entries(self) -> List[Dict[str, Any]]:
+        """저장된 항목을 최근 사용 순서의 역순으로 읽음 (읽을 수 없는 파일은 빈 캐시로 취급)"""
+        try:
+            entries = read_json(self.plans_file)
+        except (OSError, ValueError):
+            return []
+        if not isinstance(entries, list):
+            return []
+        entries = [entry for entry in entries if isinstance(entry, dict) and "goal" in entry and "plan" in entry]
+        return sorted(entries, key=lambda entry: entry.get("last_used", 0))
+
+    def _merge(self, entries: List[Dict[str, Any]]) -> None:
+        """이 인스턴스에 없는 저장된 항목을 추가 (잠금을 보유한 상태에서 호출)"""
+        for entry in entries[-self.max_size:]:
+            if self.embedder.normalize(entry["goal"]) not in self._keys:
+                self._put(entry["goal"], entry["plan"])
+
+    def _save(self) -> None:
+        """캐시를 디렉토리에 저장 (두 잠금을 보유한 상태에서 호출)"""
+        count = len(self._goals)
+        entries = [
+            {"goal": goal, "plan": plan, "last_used": int(last_used)}
+            for goal, plan, last_used in zip(self._goals, self._plans, self._last_used[:count])
+        ]
+        atomic_write_json(self.plans_file, entries, indent=None)
+
+    def _load(self) -> None:
+        """디렉토리에서 캐시를 로드
+
+        목표 문장은 짧으므로 벡터와 정규화 키는 현재 임베더로 다시 계산합니다
+        (임베더의 특징이나 설정이 바뀌어도 저장된 항목을 그대로 쓸 수 있음).
+        """
+        # 최근 사용된 항목을 우선으로 max_size만큼 유지
+        self._merge(self._read_entries())
+
+_plan_caches: Dict[str, PlanCache] = {}
+_plan_caches_lock = threading.Lock()
+
+def get_plan_cache(memory_dir: Optional[str] = None) -> Optional[PlanCache]:
+    """메모리 디렉토리별 공유 플랜 캐시를 반환
+
+    Args:
+        memory_dir: 메모리 파일 디렉토리 (기본값: config.memory_dir)
+
+    Returns:
+        Optional[PlanCache]: 플랜 캐시 (config.plan_cache_size가 0이면 None)
+    """
+    if config.plan_cache_size <= 0:
+        return None
+    path = str(Path(memory_dir or config.memory_dir) / "plan_cache")
+    with _plan_caches_lock:
+        if path not in _plan_caches:
+            _plan_caches[path] = PlanCache(
+                max_size=config.plan_cache_size,
+                seed_threshold=config.plan_cache_seed_threshold,
+                path=path
+            )
+        return _plan_caches[path]
@@ -0,0 +1,88 @@
+"""프로세스 메모리 측정 모듈
+
+이 모듈은 /proc에서 프로세스의 공유/전용 메모리와 시스템 메모리를 읽습니다.
+pre-fork 서버가 시작할 때 워커들이 모델 페이지를 실제로 공유하는지 확인하고,
+남은 메모리로 워커를 몇 개까지 띄울 수 있는지 추정하는 데 씁니다.
+/proc이 없는 플랫폼에서는 빈 결과를 반환합니다.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+# smaps_rollup에서 읽는 항목 (kB)
+_SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+def memory_usage(pid: Union[int, str] = "self") -> Dict[str, int]:
+    """프로세스의 메모리 사용량 (바이트)
+
+    shared는 다른 프로세스와 함께 매핑된 페이지(fork 후 건드리지 않은 페이지,
+    mmap한 모델 파일 등), private은 이 프로세스만 쓰는 페이지입니다.
+
+    Args:
+        pid: 프로세스 ID (기본값: "self")
+
+    Returns:
+        Dict[str, int]: {"rss", "pss", "shared", "private"} (읽을 수 없으면 빈 딕셔너리)
+    """
+    rollup = Path(f"/proc/{pid}/smaps_rollup")
+    path = rollup if rollup.exists() else Path(f"/proc/{pid}/smaps")
+    totals = {name: 0 for name in _SMAPS_FIELDS}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in totals:
+                    totals[name] += int(value.split()[0]) * 1024
+    except (OSError, ValueError):
+        return {}
+    return {
+        "rss": totals["Rss"],
+        "pss": totals["Pss"],
+        "shared": totals["Shared_Clean"] + totals["Shared_Dirty"],
+        "private": totals["Private_Clean"] + totals["Private_Dirty"],
+    }
+
+def system_memory() -> Dict[str, int]:
+    """시스템 메모리 (바이트)
+
+    Returns:
+        Dict[str, int]: {"total", "available"} (읽을 수 없으면 빈 딕셔너리)
+    """
+    values = {}
+    try:
+        with open("/proc/meminfo", 'r', encoding='utf-8') as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                values[name] = int(value.split()[0]) * 1024
+    except (OSError, ValueError):
+        return {}
+    if "MemTotal" not in values:
+        return {}
+    return {"total": values["MemTotal"], "available": values.get("MemAvailable", values.get("MemFree", 0))}
+
+def worker_capacity(workers: Iterable[Dict[str, int]], total: int) -> Optional[int]:
+    """공유 페이지는 한 번, 전용 페이지는 워커마다 든다고 보고 총 메모리에 들어가는 워커 수를 추정
+
+    Args:
+        workers: 워커별 memory_usage 결과
+        total: 시스템 총 메모리 (바이트)
+
+    Returns:
+        Optional[int]: 추정 워커 수 (측정값이 없으면 None)
+    """
+    workers = [usage for usage in workers if usage]
+    if not workers or not total:
+        return None
+    shared = max(usage["shared"] for usage in workers)
+    private = sum(usage["private"] for usage in workers) / len(workers)
+    if private <= 0:
+        return None
+    return max(0, int((total - shared) // private))
+
+def format_bytes(size: float) -> str:
+    """바이트 수를 사람이 읽기 쉬운 단위로 표시"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.1f}{unit}" if unit != "B" else f"{int(size)}B"
+        size /= 1024
+    return f"{size:.1f}GB"
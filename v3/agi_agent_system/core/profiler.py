@@ -0,0 +1,230 @@
+"""프로파일러 모듈
+
+이 모듈은 실행 중인 프로세스를 진단하기 위한 두 가지 프로파일러를 제공합니다:
+- SamplingProfiler: 별도 스레드가 일정 간격으로 모든 스레드의 스택을 샘플링
+  (대상 코드에 훅을 걸지 않으므로 부하가 낮고, 켜지 않으면 비용이 없음)
+- stacks_from_cprofile: 요청 하나를 cProfile로 측정한 결과를 스택으로 변환
+
+결과는 collapsed stacks(flamegraph.pl, speedscope가 읽는 "a;b;c 횟수" 형식)
+또는 speedscope JSON으로 내보낼 수 있습니다.
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# (함수 이름, 파일, 줄 번호)
+Frame = Tuple[str, str, int]
+# 루트에서 말단 순서의 프레임 -> 가중치
+Stacks = Dict[Tuple[Frame, ...], float]
+
+FORMATS = ("collapsed", "speedscope")
+MAX_STACK_DEPTH = 128
+
+def _frame_name(frame: Frame) -> str:
+    name, filename, line = frame
+    return f"{name} ({os.path.basename(filename)}:{line})" if filename else name
+
+def to_collapsed(stacks: Stacks, scale: float = 1.0) -> str:
+    """스택을 collapsed stacks 텍스트로 변환
+
+    Args:
+        stacks: 스택별 가중치
+        scale: 가중치에 곱할 값 (collapsed 형식은 정수 횟수를 사용, 기본값: 1)
+
+    Returns:
+        str: 한 줄에 "프레임;프레임;... 가중치" 하나
+    """
+    lines = []
+    for stack, weight in sorted(stacks.items(), key=lambda item: -item[1]):
+        count = int(round(weight * scale))
+        if count > 0:
+            lines.append(f"{';'.join(_frame_name(frame) for frame in stack)} {count}")
+    return "\n".join(lines) + ("\n" if lines else "")
+
+def to_speedscope(stacks: Stacks, name: str, unit: str = "seconds") -> Dict[str, Any]:
+    """스택을 speedscope 파일 형식(sampled 프로파일)으로 변환
+
+    Args:
+        stacks: 스택별 가중치
+        name: 프로파일 이름
+        unit: 가중치 단위 (기본값: "seconds")
+
+    Returns:
+        Dict[str, Any]: speedscope JSON
+    """
+    frames: "OrderedDict[Frame, int]" = OrderedDict()
+    samples, weights = [], []
+    for stack, weight in stacks.items():
+        samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+        weights.append(weight)
+    total = sum(weights)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "agi-agent-system",
+        "shared": {
+            "frames": [
+                {"name": frame[0], "file": frame[1], "line": frame[2]} if frame[1] else {"name": frame[0]}
+                for frame in frames
+            ]
+        },
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": unit,
+            "startValue": 0,
+            "endValue": total,
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
+
+def render(stacks: Stacks, fmt: str, name: str, scale: float = 1.0) -> Any:
+    """스택을 요청한 형식으로 변환
+
+    Args:
+        stacks: 스택별 가중치 (초)
+        fmt: "collapsed" 또는 "speedscope"
+        name: 프로파일 이름 (speedscope에서 사용)
+        scale: collapsed 형식에서 가중치에 곱할 값 (기본값: 1)
+
+    Returns:
+        Any: collapsed 텍스트 또는 speedscope JSON
+
+    Raises:
+        ValueError: 알 수 없는 형식인 경우
+    """
+    if fmt == "collapsed":
+        return to_collapsed(stacks, scale)
+    if fmt == "speedscope":
+        return to_speedscope(stacks, name)
+    raise ValueError(f"알 수 없는 프로파일 형식: {fmt} (사용 가능: {', '.join(FORMATS)})")
+
+class SamplingProfiler:
+    """모든 스레드의 스택을 주기적으로 샘플링하는 프로파일러
+
+    Attributes:
+        interval: 샘플링 간격 (초)
+        samples: 지금까지 수집한 샘플 수
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """SamplingProfiler 초기화
+
+        Args:
+            interval: 샘플링 간격 (기본값: 0.005초)
+        """
+        self.interval = interval
+        self.samples = 0
+        self._counts: Counter = Counter()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started_at = 0.0
+        self._elapsed = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: Optional[float] = None) -> None:
+        """샘플링을 시작 (이전 결과는 지움)
+
+        Args:
+            duration: 이 시간(초)이 지나면 자동으로 멈춤 (기본값: None, stop까지 계속)
+
+        Raises:
+            RuntimeError: 이미 실행 중인 경우
+        """
+        if self.running:
+            raise RuntimeError("프로파일러가 이미 실행 중입니다.")
+        self._counts = Counter()
+        self.samples = 0
+        self._elapsed = 0.0
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, args=(duration,), name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Stacks:
+        """샘플링을 멈추고 결과를 반환
+
+        Returns:
+            Stacks: 스택별 누적 시간 (초, 샘플 수 × 간격)
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks()
+
+    def stacks(self) -> Stacks:
+        """지금까지 수집한 스택별 누적 시간 (초)"""
+        return {stack: count * self.interval for stack, count in self._counts.items()}
+
+    def status(self) -> Dict[str, Any]:
+        """실행 상태와 수집량"""
+        elapsed = time.perf_counter() - self._started_at if self.running else self._elapsed
+        return {"running": self.running, "interval": self.interval, "samples": self.samples, "elapsed": elapsed}
+
+    def _run(self, duration: Optional[float]) -> None:
+        own = threading.get_ident()
+        names = {}
+        deadline = None if duration is None else self._started_at + duration
+        while not self._stop.wait(self.interval):
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if len(names) != threading.active_count():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                stack.append((f"thread:{names.get(ident, ident)}", "", 0))
+                self._counts[tuple(reversed(stack))] += 1
+            self.samples += 1
+        self._elapsed = time.perf_counter() - self._started_at
+
+def stacks_from_cprofile(*profiles: cProfile.Profile) -> Stacks:
+    """cProfile 결과를 스택별 자체 시간으로 변환
+
+    cProfile은 호출자-피호출자 쌍만 기록하므로, 함수마다 누적 시간이 가장 큰
+    호출자를 따라 올라가 대표 스택을 만듭니다 (flamegraph용 근사치).
+
+    Args:
+        *profiles: 측정이 끝난 cProfile.Profile (여러 스레드에서 측정한 결과는 합침)
+
+    Returns:
+        Stacks: 스택별 자체 시간 (초)
+    """
+    stats = pstats.Stats(*profiles).stats
+
+    def frame(func: Tuple[str, int, str]) -> Frame:
+        filename, line, name = func
+        return (name, "" if filename == "~" else filename, line)
+
+    stacks: Stacks = {}
+    for func, (_, _, tottime, _, callers) in stats.items():
+        if tottime <= 0:
+            continue
+        path = [func]
+        seen = {func}
+        current = callers
+        while current and len(path) < MAX_STACK_DEPTH:
+            caller = max(current, key=lambda key: current[key][3])
+            if caller in seen:
+                break
+            path.append(caller)
+            seen.add(caller)
+            current = stats.get(caller, (0, 0, 0, 0, {}))[4]
+        stack = tuple(frame(f) for f in reversed(path))
+        stacks[stack] = stacks.get(stack, 0.0) + tottime
+    return stacks
@@ -0,0 +1,93 @@
+"""프롬프트 레지스트리 모듈
+
+에이전트를 만들 때마다 출력 파서를 만들고, 형식 지침(출력 모델의 JSON
+스키마 덤프)을 다시 생성하고, 템플릿에서 입력 변수를 찾는 비용을 없애기 위해
+(템플릿, 출력 모델)마다 한 번만 컴파일해 프로세스 안에서 공유합니다.
+
+키는 템플릿 내용의 해시와 출력 모델 클래스이므로 템플릿 문자열을 바꾸거나
+모델 클래스를 다시 정의하면 새 항목이 컴파일됩니다. 컴파일된 프롬프트는
+형식 지침을 미리 채운 값으로 str.format만 호출해 렌더링합니다.
+"""
+
+import hashlib
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple
+
+from langchain.output_parsers import PydanticOutputParser
+from pydantic import BaseModel
+
+from .metrics import metrics
+
+_VARIABLE = re.compile(r'\{([^}]+)\}')
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    """한 번 컴파일해 공유하는 프롬프트
+
+    Attributes:
+        key: 템플릿 해시 (출력 모델 이름 포함)
+        template: 템플릿 문자열
+        input_variables: 템플릿의 입력 변수 (format_instructions 포함)
+        format_instructions: 출력 모델의 형식 지침
+        parser: 출력 모델의 파서 (상태가 없으므로 에이전트와 스레드가 공유)
+    """
+    key: str
+    template: str
+    input_variables: Tuple[str, ...]
+    format_instructions: str
+    parser: PydanticOutputParser = field(compare=False)
+
+    def format(self, **kwargs: Any) -> str:
+        """입력 변수를 채워 프롬프트를 렌더링
+
+        Args:
+            **kwargs: format_instructions를 제외한 입력 변수
+
+        Returns:
+            str: 완성된 프롬프트
+
+        Raises:
+            KeyError: 입력 변수가 빠진 경우
+        """
+        return self.template.format(format_instructions=self.format_instructions, **kwargs)
+
+# (템플릿 해시, 출력 모델) -> 컴파일된 프롬프트
+_registry: Dict[Tuple[str, type], CompiledPrompt] = {}
+_registry_lock = threading.Lock()
+
+def template_hash(template: str) -> str:
+    """템플릿 내용의 해시"""
+    return hashlib.sha256(template.encode('utf-8')).hexdigest()[:16]
+
+def compile_prompt(template: str, output_model: type[BaseModel]) -> CompiledPrompt:
+    """템플릿과 출력 모델의 컴파일된 프롬프트를 반환 (처음 요청할 때 컴파일)
+
+    Args:
+        template: 프롬프트 템플릿 문자열 ({format_instructions} 자리 포함)
+        output_model: 출력을 파싱할 Pydantic 모델
+
+    Returns:
+        CompiledPrompt: 공유 프롬프트
+    """
+    key = (template_hash(template), output_model)
+    with _registry_lock:
+        compiled = _registry.get(key)
+        if compiled is None:
+            parser = PydanticOutputParser(pydantic_object=output_model)
+            compiled = CompiledPrompt(
+                key=f"{output_model.__qualname__}:{key[0]}",
+                template=template,
+                input_variables=tuple(dict.fromkeys(_VARIABLE.findall(template))),
+                format_instructions=parser.get_format_instructions(),
+                parser=parser
+            )
+            _registry[key] = compiled
+            metrics.increment("prompts.compiled")
+        return compiled
+
+def clear_prompt_registry() -> None:
+    """컴파일된 프롬프트를 모두 해제"""
+    with _registry_lock:
+        _registry.clear()
@@ -0,0 +1,146 @@
+"""출력 복구 모듈
+
+이 모듈은 파싱에 실패한 모델 응답을 결정적으로 고쳐 유효한 JSON으로 만드는
+함수를 제공합니다. 작은 모델이 자주 내는 형식 오류를 다시 생성하지 않고
+바로 잡는 데 씁니다.
+
+- 마크다운 코드 펜스(```json ... ```)와 JSON 앞뒤의 설명 문장 제거
+- 문자열 안의 줄바꿈/탭을 이스케이프 (코드 필드에서 흔함)
+- 문자열 밖의 True/False/None을 true/false/null로 변환
+- 닫는 괄호 앞의 쉼표 제거
+- 생성이 중간에 끊겨 닫히지 않은 문자열과 괄호를 닫음
+- "dependencies": ["tasks.1"] 같은 ID 목록을 정수 목록으로 변환
+"""
+
+import json
+import re
+from typing import Any, Iterable, List, Optional
+
+# 값이 정수 ID 목록이어야 하는 키
+ID_LIST_KEYS = ("dependencies",)
+
+_FENCE = re.compile(r"```[a-zA-Z]*\s*\n?(.*?)(?:```|$)", re.DOTALL)
+_CLOSERS = {"{": "}", "[": "]"}
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_WORD = re.compile(r"[^\W\d_]+")
+
+def coerce_ids(values: Iterable[Any]) -> List[int]:
+    """ID 목록을 정수 배열로 변환 ("tasks.1" 같은 문자열은 숫자만 추출, 숫자가 없으면 제외)
+
+    Args:
+        values: 원본 ID 목록
+
+    Returns:
+        List[int]: 정수 ID 목록
+    """
+    result = []
+    for value in values:
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, int):
+            result.append(value)
+        elif isinstance(value, float) and value.is_integer():
+            result.append(int(value))
+        elif isinstance(value, str):
+            digits = ''.join(filter(str.isdigit, value))
+            if digits:
+                result.append(int(digits))
+    return result
+
+def _strip_fences(text: str) -> str:
+    """코드 펜스가 있으면 JSON 객체가 든 첫 펜스 안쪽만 반환"""
+    for match in _FENCE.finditer(text):
+        if "{" in match.group(1):
+            return match.group(1)
+    return text
+
+def _balance(text: str) -> str:
+    """첫 '{'부터 최상위 객체가 닫힐 때까지 훑으며 형식 오류를 고침"""
+    start = text.find("{")
+    if start == -1:
+        return text
+    out: List[str] = []
+    stack: List[str] = []
+    in_string = escaped = False
+    i = start
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            elif char == "\n":
+                char = "\\n"
+            elif char == "\t":
+                char = "\\t"
+            elif char == "\r":
+                char = "\\r"
+            out.append(char)
+            i += 1
+            continue
+        if char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(_CLOSERS[char])
+        elif char in "}]":
+            # 닫는 괄호 앞의 쉼표 제거
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            if stack and stack[-1] == char:
+                stack.pop()
+            out.append(char)
+            if not stack:
+                break
+            i += 1
+            continue
+        elif char.isalpha():
+            word = _WORD.match(text, i).group(0)
+            out.append(_LITERALS.get(word, word))
+            i += len(word)
+            continue
+        out.append(char)
+        i += 1
+    else:
+        # 응답이 끊긴 경우: 열린 문자열, 매달린 쉼표/콜론, 괄호를 차례로 닫음
+        if escaped:
+            out.pop()
+        if in_string:
+            out.append('"')
+        while out and (out[-1].isspace() or out[-1] in ",:"):
+            out.pop()
+        out.extend(reversed(stack))
+    return "".join(out)
+
+def _coerce_id_lists(value: Any) -> Any:
+    """ID_LIST_KEYS에 해당하는 값을 정수 목록으로 바꿈 (중첩 구조 포함)"""
+    if isinstance(value, dict):
+        return {
+            key: coerce_ids(item) if key in ID_LIST_KEYS and isinstance(item, list) else _coerce_id_lists(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_coerce_id_lists(item) for item in value]
+    return value
+
+def repair_json(text: str) -> Optional[str]:
+    """깨진 모델 응답을 결정적으로 고쳐 JSON 문자열로 반환
+
+    Args:
+        text: 모델 응답
+
+    Returns:
+        Optional[str]: 고친 JSON 문자열 (객체를 찾지 못했거나 고칠 수 없으면 None)
+    """
+    candidate = _balance(_strip_fences(text))
+    try:
+        value = json.loads(candidate)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(value, dict):
+        return None
+    return json.dumps(_coerce_id_lists(value), ensure_ascii=False)
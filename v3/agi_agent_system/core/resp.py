@@ -0,0 +1,505 @@
+"""RESP(Redis 직렬화 프로토콜) 모듈
+
+이 모듈은 Redis 호환 서버와 통신하는 최소한의 동기 클라이언트(RespClient)와,
+작업 큐가 사용하는 명령만 구현한 메모리 내 대체 서버(RespServer)를 제공합니다.
+대체 서버는 Redis 없이 한 호스트에서 작업 큐를 시험하거나 테스트할 때 씁니다.
+
+지원 명령 (대체 서버): PING, DEL, HSET, HGET, HGETALL, HINCRBY, RPUSH, LMOVE,
+LREM, LRANGE, LLEN, ZADD (NX), ZREM, ZSCORE, ZRANGEBYSCORE, FLUSHALL,
+WATCH, UNWATCH, MULTI, EXEC, DISCARD
+"""
+
+import bisect
+import socket
+import socketserver
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+class RespError(Exception):
+    """서버가 오류 응답(-ERR ...)을 보낸 경우"""
+
+def encode_command(*args: Any) -> bytes:
+    """명령을 RESP 배열로 인코딩
+
+    Args:
+        *args: 명령과 인자 (bytes가 아니면 str로 변환)
+
+    Returns:
+        bytes: 인코딩된 명령
+    """
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+def _read_reply(reader: Any) -> Any:
+    """RESP 응답 하나를 읽음 (bulk 문자열은 str로 디코딩)"""
+    line = reader.readline()
+    if not line:
+        raise ConnectionError("서버 연결이 끊어졌습니다.")
+    kind, body = line[:1], line[1:-2]
+    if kind == b"+":
+        return body.decode("utf-8")
+    if kind == b"-":
+        raise RespError(body.decode("utf-8"))
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        data = reader.read(length + 2)
+        return data[:-2].decode("utf-8")
+    if kind == b"*":
+        length = int(body)
+        if length < 0:
+            return None
+        return [_read_reply(reader) for _ in range(length)]
+    raise RespError(f"알 수 없는 응답 형식: {line!r}")
+
+class RespClient:
+    """Redis 호환 서버에 명령을 보내는 동기 클라이언트 (스레드 안전)
+
+    Attributes:
+        host: 서버 주소
+        port: 서버 포트
+        db: 데이터베이스 번호
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", timeout: float = 10.0):
+        """RespClient 초기화 (연결은 첫 명령에서 맺음)
+
+        Args:
+            url: redis://[:password@]host:port/db 형식 주소 (기본값: "redis://localhost:6379/0")
+            timeout: 소켓 타임아웃 (초, 기본값: 10)
+        """
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self._password = parsed.password
+        self._timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader: Any = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), timeout=self._timeout)
+        self._reader = self._sock.makefile("rb")
+        if self._password:
+            self._call("AUTH", self._password)
+        if self.db:
+            self._call("SELECT", self.db)
+
+    def _call(self, *args: Any) -> Any:
+        self._sock.sendall(encode_command(*args))
+        return _read_reply(self._reader)
+
+    def execute(self, *args: Any) -> Any:
+        """명령을 보내고 응답을 반환 (연결이 끊어졌으면 한 번 다시 연결)
+
+        Args:
+            *args: 명령과 인자
+
+        Returns:
+            Any: 응답 (str, int, list 또는 None)
+
+        Raises:
+            RespError: 서버가 오류를 응답한 경우
+        """
+        with self._lock:
+            return self._retrying(self._call, *args)
+
+    def transaction(self, watch: Sequence[str],
+                    prepare: Callable[[Callable[..., Any]], Optional[List[Sequence[Any]]]]) -> Optional[List[Any]]:
+        """WATCH한 키가 그동안 바뀌지 않았을 때만 명령들을 MULTI/EXEC로 한꺼번에 실행
+
+        prepare는 인자로 받은 call(*args)로 현재 값을 읽고 실행할 명령 목록을 반환합니다.
+        EXEC 전에 다른 클라이언트가 WATCH한 키를 바꾸면 prepare부터 다시 실행합니다.
+
+        Args:
+            watch: 지켜볼 키 목록 (비어 있으면 MULTI/EXEC만 사용)
+            prepare: 실행할 명령 목록을 반환하는 함수 (None을 반환하면 취소)
+
+        Returns:
+            Optional[List[Any]]: 명령별 응답 (prepare가 취소하면 None)
+
+        Raises:
+            RespError: 서버가 오류를 응답한 경우
+        """
+        with self._lock:
+            while True:
+                committed, replies = self._retrying(self._transaction, watch, prepare)
+                if committed:
+                    return replies
+
+    def _retrying(self, func: Callable[..., Any], *args: Any) -> Any:
+        """연결이 끊어졌으면 한 번 다시 연결해 func를 실행"""
+        for attempt in range(2):
+            try:
+                if self._sock is None:
+                    self._connect()
+                return func(*args)
+            except (ConnectionError, OSError):
+                self._close()
+                if attempt:
+                    raise
+
+    def _transaction(self, watch: Sequence[str],
+                     prepare: Callable[[Callable[..., Any]], Optional[List[Sequence[Any]]]]) -> Tuple[bool, Optional[List[Any]]]:
+        """트랜잭션을 한 번 시도 (WATCH한 키가 바뀌어 EXEC가 취소되면 (False, None))"""
+        try:
+            if watch:
+                self._call("WATCH", *watch)
+            commands = prepare(self._call)
+            if commands is None:
+                if watch:
+                    self._call("UNWATCH")
+                return True, None
+            # MULTI, 명령들, EXEC를 한 번에 보내고 응답을 차례로 읽음 (+OK, +QUEUED..., EXEC 결과)
+            batch = [("MULTI",), *commands, ("EXEC",)]
+            self._sock.sendall(b"".join(encode_command(*command) for command in batch))
+            for _ in range(len(batch) - 1):
+                _read_reply(self._reader)
+            replies = _read_reply(self._reader)
+        except Exception:
+            # 읽지 않은 응답이나 WATCH 상태가 남은 연결은 다시 쓰지 않음
+            self._close()
+            raise
+        return replies is not None, replies
+
+    def _close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+                self._reader = None
+
+    def close(self) -> None:
+        """연결을 닫음"""
+        with self._lock:
+            self._close()
+
+class _Status(str):
+    """단순 문자열 응답 (+OK)"""
+
+def _encode_reply(value: Any) -> bytes:
+    if isinstance(value, _Status):
+        return b"+%s\r\n" % value.encode("utf-8")
+    if isinstance(value, RespError):
+        return b"-%s\r\n" % str(value).encode("utf-8")
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_encode_reply(item) for item in value)
+    data = value.encode("utf-8") if isinstance(value, str) else value
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+def _read_command(reader: Any) -> Optional[List[str]]:
+    line = reader.readline()
+    if not line:
+        return None
+    if line[:1] != b"*":
+        # 인라인 명령 (telnet 등)
+        return line.decode("utf-8").split()
+    args = []
+    for _ in range(int(line[1:-2])):
+        length = int(reader.readline()[1:-2])
+        args.append(reader.read(length + 2)[:-2].decode("utf-8"))
+    return args
+
+# 쓰기 명령 -> 앞에서부터 키인 인자 수 (None이면 모든 인자)
+_WRITE_KEYS: Dict[str, Optional[int]] = {
+    "del": None, "hset": 1, "hincrby": 1, "rpush": 1, "lmove": 2, "lrem": 1, "zadd": 1, "zrem": 1,
+}
+
+class _Store:
+    """대체 서버의 메모리 내 데이터 (명령 하나는 잠금 안에서 원자적으로 실행)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data: Dict[str, Any] = {}
+        # WATCH용 키별 변경 횟수 (FLUSHALL은 epoch를 올려 모든 키를 바뀐 것으로 만듦)
+        self.epoch = 0
+        self.versions: Dict[str, int] = {}
+
+    def _get(self, key: str, kind: type) -> Any:
+        value = self.data.get(key)
+        if value is not None and not isinstance(value, kind):
+            raise RespError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _hash(self, key: str) -> Dict[str, str]:
+        return self.data.setdefault(key, {}) if self._get(key, dict) is None else self.data[key]
+
+    def _list(self, key: str) -> List[str]:
+        return self.data.setdefault(key, []) if self._get(key, list) is None else self.data[key]
+
+    def _zset(self, key: str) -> "_SortedSet":
+        return self.data.setdefault(key, _SortedSet()) if self._get(key, _SortedSet) is None else self.data[key]
+
+    def _drop_empty(self, key: str) -> None:
+        if key in self.data and not len(self.data[key]):
+            del self.data[key]
+
+    def execute(self, name: str, args: List[str]) -> Any:
+        with self.lock:
+            return self._run(name, args)
+
+    def watch(self, keys: Sequence[str]) -> Dict[str, Tuple[int, int]]:
+        """키별 현재 버전 (EXEC에서 비교)"""
+        with self.lock:
+            return {key: self._version(key) for key in keys}
+
+    def execute_all(self, commands: List[Tuple[str, List[str]]], watched: Dict[str, Tuple[int, int]]) -> Optional[List[Any]]:
+        """WATCH한 키가 그대로일 때만 명령들을 한 번에 실행 (바뀌었으면 None)"""
+        with self.lock:
+            if any(self._version(key) != version for key, version in watched.items()):
+                return None
+            return [self._run(name, args) for name, args in commands]
+
+    def _version(self, key: str) -> Tuple[int, int]:
+        return self.epoch, self.versions.get(key, 0)
+
+    def _run(self, name: str, args: List[str]) -> Any:
+        handler = getattr(self, f"cmd_{name.lower()}", None)
+        if handler is None:
+            return RespError(f"ERR unknown command '{name}'")
+        try:
+            reply = handler(*args)
+        except TypeError:
+            return RespError(f"ERR wrong number of arguments for '{name.lower()}' command")
+        except ValueError:
+            return RespError("ERR value is not an integer or out of range")
+        except RespError as e:
+            return e
+        # 값이 실제로 바뀌지 않았어도 쓰기 명령이면 버전을 올림 (WATCH는 보수적으로 취소됨)
+        written = _WRITE_KEYS.get(name.lower(), 0)
+        for key in args if written is None else args[:written]:
+            self.versions[key] = self.versions.get(key, 0) + 1
+        return reply
+
+    def cmd_ping(self, message: Optional[str] = None) -> str:
+        return message if message is not None else _Status("PONG")
+
+    def cmd_select(self, db: str) -> str:
+        return _Status("OK")
+
+    def cmd_flushall(self) -> str:
+        self.data.clear()
+        self.versions.clear()
+        self.epoch += 1
+        return _Status("OK")
+
+    def cmd_del(self, *keys: str) -> int:
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    def cmd_hset(self, key: str, *pairs: str) -> int:
+        if not pairs or len(pairs) % 2:
+            raise TypeError
+        target = self._hash(key)
+        added = 0
+        for field, value in zip(pairs[::2], pairs[1::2]):
+            added += field not in target
+            target[field] = value
+        return added
+
+    def cmd_hget(self, key: str, field: str) -> Optional[str]:
+        return (self._get(key, dict) or {}).get(field)
+
+    def cmd_hgetall(self, key: str) -> List[str]:
+        return [item for pair in (self._get(key, dict) or {}).items() for item in pair]
+
+    def cmd_hincrby(self, key: str, field: str, amount: str) -> int:
+        target = self._hash(key)
+        target[field] = str(int(target.get(field, "0")) + int(amount))
+        return int(target[field])
+
+    def cmd_rpush(self, key: str, *values: str) -> int:
+        if not values:
+            raise TypeError
+        target = self._list(key)
+        target.extend(values)
+        return len(target)
+
+    def cmd_llen(self, key: str) -> int:
+        return len(self._get(key, list) or [])
+
+    def cmd_lrange(self, key: str, start: str, stop: str) -> List[str]:
+        items = self._get(key, list) or []
+        stop_index = int(stop)
+        return items[int(start):None if stop_index == -1 else stop_index + 1]
+
+    def cmd_lmove(self, source: str, destination: str, where_from: str, where_to: str) -> Optional[str]:
+        items = self._get(source, list)
+        if not items:
+            return None
+        value = items.pop(0 if where_from.upper() == "LEFT" else -1)
+        self._drop_empty(source)
+        target = self._list(destination)
+        if where_to.upper() == "LEFT":
+            target.insert(0, value)
+        else:
+            target.append(value)
+        return value
+
+    def cmd_lrem(self, key: str, count: str, value: str) -> int:
+        items = self._get(key, list) or []
+        count = int(count)
+        # count > 0이면 앞에서부터, < 0이면 뒤에서부터 |count|개, 0이면 모두
+        indexes = [index for index, item in enumerate(items) if item == value]
+        if count > 0:
+            indexes = indexes[:count]
+        elif count < 0:
+            indexes = indexes[count:]
+        for index in reversed(indexes):
+            del items[index]
+        self._drop_empty(key)
+        return len(indexes)
+
+    def cmd_zadd(self, key: str, *args: str) -> int:
+        nx = bool(args) and args[0].upper() == "NX"
+        pairs = args[1:] if nx else args
+        if not pairs or len(pairs) % 2:
+            raise TypeError
+        target = self._zset(key)
+        added = 0
+        for score, member in zip(pairs[::2], pairs[1::2]):
+            if nx and member in target.scores:
+                continue
+            added += target.add(member, float(score))
+        return added
+
+    def cmd_zrem(self, key: str, *members: str) -> int:
+        target = self._get(key, _SortedSet)
+        if target is None:
+            return 0
+        removed = sum(target.remove(member) for member in members)
+        self._drop_empty(key)
+        return removed
+
+    def cmd_zscore(self, key: str, member: str) -> Optional[str]:
+        score = (self._get(key, _SortedSet) or _SortedSet()).scores.get(member)
+        return None if score is None else repr(score)
+
+    def cmd_zrangebyscore(self, key: str, low: str, high: str) -> List[str]:
+        target = self._get(key, _SortedSet) or _SortedSet()
+        return target.range(float(low), float(high))
+
+class _SortedSet:
+    def __init__(self):
+        self.scores: Dict[str, float] = {}
+        self.order: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def add(self, member: str, score: float) -> int:
+        added = self.remove(member) == 0
+        self.scores[member] = score
+        bisect.insort(self.order, (score, member))
+        return int(added)
+
+    def remove(self, member: str) -> int:
+        score = self.scores.pop(member, None)
+        if score is None:
+            return 0
+        self.order.pop(bisect.bisect_left(self.order, (score, member)))
+        return 1
+
+    def range(self, low: float, high: float) -> List[str]:
+        start = bisect.bisect_left(self.order, (low, ""))
+        return [member for score, member in self.order[start:] if score <= high]
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        # 연결별 트랜잭션 상태: WATCH한 키의 버전과 MULTI 이후 쌓인 명령
+        self.watched: Dict[str, Tuple[int, int]] = {}
+        self.queued: Optional[List[Tuple[str, List[str]]]] = None
+        while True:
+            try:
+                args = _read_command(self.rfile)
+            except (ValueError, OSError):
+                return
+            if args is None:
+                return
+            if not args:
+                continue
+            reply = self._dispatch(args[0].upper(), args[1:])
+            try:
+                self.wfile.write(_encode_reply(reply))
+            except OSError:
+                return
+
+    def _dispatch(self, name: str, args: List[str]) -> Any:
+        store = self.server.store
+        if name == "MULTI":
+            if self.queued is not None:
+                return RespError("ERR MULTI calls can not be nested")
+            self.queued = []
+            return _Status("OK")
+        if name in ("EXEC", "DISCARD"):
+            if self.queued is None:
+                return RespError(f"ERR {name} without MULTI")
+            commands, watched = self.queued, self.watched
+            self.queued, self.watched = None, {}
+            return store.execute_all(commands, watched) if name == "EXEC" else _Status("OK")
+        if self.queued is not None:
+            if name == "WATCH":
+                return RespError("ERR WATCH inside MULTI is not allowed")
+            self.queued.append((name, args))
+            return _Status("QUEUED")
+        if name == "WATCH":
+            if not args:
+                return RespError("ERR wrong number of arguments for 'watch' command")
+            self.watched.update(store.watch(args))
+            return _Status("OK")
+        if name == "UNWATCH":
+            self.watched = {}
+            return _Status("OK")
+        return store.execute(name, args)
+
+class RespServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """작업 큐가 쓰는 명령만 구현한 메모리 내 Redis 대체 서버
+
+    데이터는 프로세스 메모리에만 있으므로 단일 호스트 시험과 테스트용입니다.
+
+    Attributes:
+        url: 클라이언트가 접속할 redis:// 주소
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """RespServer 초기화 (port가 0이면 빈 포트를 사용)
+
+        Args:
+            host: 바인드 주소 (기본값: "127.0.0.1")
+            port: 포트 (기본값: 0)
+        """
+        super().__init__((host, port), _RespHandler)
+        self.store = _Store()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> "RespServer":
+        """백그라운드 스레드에서 요청을 받기 시작"""
+        self._thread = threading.Thread(target=self.serve_forever, name="resp-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """서버를 멈추고 소켓을 닫음"""
+        self.shutdown()
+        self.server_close()
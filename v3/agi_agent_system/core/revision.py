@@ -0,0 +1,173 @@
+"""코드 수정 적용 모듈
+
+이 모듈은 개발자 에이전트가 수정 모드에서 출력한 편집 블록이나 unified diff를
+기존 코드에 적용하고 결과를 검증합니다. 적용할 수 없으면 PatchError를 발생시키며,
+호출자는 이때 코드 전체를 다시 생성합니다.
+
+편집 블록 형식 (SEARCH가 비어 있으면 코드 끝에 추가):
+
+    <<<<<<< SEARCH
+    기존 줄
+    =======
+    새 줄
+    >>>>>>> REPLACE
+
+응답의 "설명: ..." 줄은 수정 내용에 대한 설명으로 따로 반환합니다.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+_BLOCK = re.compile(
+    r"^<{5,9} ?SEARCH[^\n]*\n(.*?)^={5,9}[ \t]*\n(.*?)^>{5,9} ?REPLACE[^\n]*$",
+    re.DOTALL | re.MULTILINE
+)
+_HUNK = re.compile(r"^@@ -(\d+)(?:,\d+)? \+\d+(?:,\d+)? @@")
+_EXPLANATION = re.compile(r"^\s*설명:\s*(.+)$", re.MULTILINE)
+
+class PatchError(ValueError):
+    """수정 내용을 기존 코드에 적용할 수 없음"""
+
+def parse_edit_blocks(text: str) -> List[Tuple[str, str]]:
+    """응답에서 (SEARCH, REPLACE) 편집 블록 목록을 추출
+
+    Args:
+        text: 모델 응답
+
+    Returns:
+        List[Tuple[str, str]]: 편집 블록 목록 (없으면 빈 목록)
+    """
+    return [(search, replace) for search, replace in _BLOCK.findall(text)]
+
+def apply_edit_blocks(code: str, blocks: List[Tuple[str, str]]) -> str:
+    """편집 블록을 순서대로 적용
+
+    Args:
+        code: 기존 코드
+        blocks: (SEARCH, REPLACE) 목록
+
+    Returns:
+        str: 수정된 코드
+
+    Raises:
+        PatchError: SEARCH가 코드에 없거나 두 번 이상 나오는 경우
+    """
+    for search, replace in blocks:
+        if not search.strip():
+            code = code.rstrip("\n") + "\n" + replace.rstrip("\n")
+            continue
+        count = code.count(search)
+        if count == 0:
+            # 모델이 마지막 줄의 줄바꿈이나 줄 끝 공백을 다르게 쓴 경우
+            search, replace = search.rstrip("\n"), replace.rstrip("\n")
+            count = code.count(search)
+        if count != 1:
+            raise PatchError(f"SEARCH 블록이 기존 코드에 {count}번 나옵니다: {search[:80]!r}")
+        code = code.replace(search, replace, 1)
+    return code
+
+def _parse_hunks(diff: str) -> List[Tuple[int, List[str], List[str]]]:
+    """unified diff를 (기존 시작 줄, 기존 줄들, 새 줄들) 헝크 목록으로 변환"""
+    hunks = []
+    current: Optional[Tuple[int, List[str], List[str]]] = None
+    blanks = 0  # 공백이 지워진 빈 문맥 줄 (헝크 끝에 있으면 diff 뒤의 빈 줄이므로 버림)
+    for line in diff.splitlines():
+        match = _HUNK.match(line)
+        if match:
+            current = (int(match.group(1)), [], [])
+            hunks.append(current)
+            blanks = 0
+            continue
+        if current is None or line.startswith(("---", "+++")):
+            continue
+        if line == "":
+            blanks += 1
+            continue
+        if not line.startswith(("-", "+", " ")):
+            continue
+        current[1].extend([""] * blanks)
+        current[2].extend([""] * blanks)
+        blanks = 0
+        if line.startswith("-"):
+            current[1].append(line[1:])
+        elif line.startswith("+"):
+            current[2].append(line[1:])
+        else:
+            current[1].append(line[1:])
+            current[2].append(line[1:])
+    return hunks
+
+def _find(lines: List[str], old: List[str], hint: int) -> int:
+    """old 줄들이 나오는 위치 중 헝크 헤더의 줄 번호에 가장 가까운 곳 (줄 끝 공백 무시)"""
+    target = [line.rstrip() for line in old]
+    stripped = [line.rstrip() for line in lines]
+    positions = [
+        i for i in range(len(lines) - len(old) + 1)
+        if stripped[i:i + len(old)] == target
+    ]
+    if not positions:
+        raise PatchError(f"diff 헝크가 기존 코드와 맞지 않습니다: {old[:1]!r}")
+    return min(positions, key=lambda i: abs(i - hint))
+
+def apply_unified_diff(code: str, diff: str) -> str:
+    """unified diff를 적용 (줄 번호가 어긋나도 문맥이 맞는 곳에 적용)
+
+    Args:
+        code: 기존 코드
+        diff: unified diff
+
+    Returns:
+        str: 수정된 코드
+
+    Raises:
+        PatchError: 헝크가 없거나 기존 코드와 맞지 않는 경우
+    """
+    hunks = _parse_hunks(diff)
+    if not hunks:
+        raise PatchError("diff 헝크가 없습니다.")
+    lines = code.splitlines()
+    offset = 0
+    for start, old, new in hunks:
+        if not old:
+            index = min(max(start + offset, 0), len(lines))
+        else:
+            index = _find(lines, old, start - 1 + offset)
+        lines[index:index + len(old)] = new
+        offset += len(new) - len(old)
+    return "\n".join(lines) + ("\n" if code.endswith("\n") else "")
+
+def _compiles(code: str) -> bool:
+    try:
+        compile(code, "<revision>", "exec")
+    except (SyntaxError, ValueError):
+        return False
+    return True
+
+def apply_revision(code: str, response: str) -> Tuple[str, Optional[str]]:
+    """수정 모드 응답(편집 블록 또는 unified diff)을 적용하고 검증
+
+    기존 코드가 파이썬으로 컴파일되면 수정된 코드도 컴파일되어야 합니다.
+
+    Args:
+        code: 기존 코드
+        response: 모델 응답
+
+    Returns:
+        Tuple[str, Optional[str]]: (수정된 코드, 응답의 설명 줄 또는 None)
+
+    Raises:
+        PatchError: 수정 내용이 없거나, 적용할 수 없거나, 수정 후 코드가 컴파일되지 않는 경우
+    """
+    blocks = parse_edit_blocks(response)
+    if blocks:
+        revised = apply_edit_blocks(code, blocks)
+    elif re.search(r"^@@ ", response, re.MULTILINE):
+        revised = apply_unified_diff(code, response)
+    else:
+        raise PatchError("응답에 편집 블록이나 diff가 없습니다.")
+    if revised == code:
+        raise PatchError("수정 내용이 코드를 바꾸지 않습니다.")
+    if _compiles(code) and not _compiles(revised):
+        raise PatchError("수정된 코드가 컴파일되지 않습니다.")
+    match = _EXPLANATION.search(_BLOCK.sub("", response))
+    return revised, match.group(1).strip() if match else None
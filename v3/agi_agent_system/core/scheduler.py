@@ -0,0 +1,239 @@
+"""워크플로우 스케줄러 모듈
+
+이 모듈은 동시에 실행되는 워크플로우들이 노드 실행 슬롯을 나눠 쓰도록 하는
+FairScheduler를 정의합니다. 작업은 우선순위 레인(interactive, batch)과
+테넌트(API 키 또는 세션)에 속합니다.
+
+- 레인 사이: interactive가 항상 먼저 슬롯을 받고, 각 레인은 자기 상한까지만 사용
+- 레인 안: 테넌트별 가중치에 따른 가상 시간(start-time fair queueing)이 작은 쪽이 먼저
+- 선점: 슬롯은 노드 하나를 실행하는 동안만 잡으므로, batch 워크플로우는 노드
+  경계(예: 개발자와 비평가 사이)에서 슬롯을 내놓고 다시 줄을 섬
+
+실행 중인 작업의 레인과 테넌트는 컨텍스트 변수로 전달되므로 asyncio.to_thread나
+LangGraph 노드 안에서도 그대로 보입니다.
+"""
+
+import contextvars
+import itertools
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config import config
+from .metrics import metrics
+
+# 우선순위 순서 (앞쪽 레인이 먼저 슬롯을 받음)
+LANES = ("interactive", "batch")
+
+@dataclass
+class Job:
+    """스케줄링 단위인 워크플로우 실행
+
+    Attributes:
+        lane: 우선순위 레인 ("interactive" 또는 "batch")
+        tenant: 공정 분배 단위 (API 키, 세션 ID 등)
+        granted: 지금까지 받은 슬롯 수 (실행한 노드 수)
+    """
+    lane: str = "interactive"
+    tenant: str = "local"
+    granted: int = 0
+
+@dataclass
+class _Waiter:
+    job: Job
+    seq: int
+
+_current_job: contextvars.ContextVar[Optional[Job]] = contextvars.ContextVar("scheduler_job", default=None)
+
+def current_job() -> Optional[Job]:
+    """현재 컨텍스트의 작업 (job_context 밖이면 None)"""
+    return _current_job.get()
+
+@contextmanager
+def job_context(lane: str = "interactive", tenant: str = "local") -> Iterator[Job]:
+    """이 컨텍스트에서 실행되는 워크플로우의 레인과 테넌트를 지정
+
+    Args:
+        lane: 우선순위 레인 (기본값: "interactive")
+        tenant: 테넌트 (기본값: "local")
+
+    Yields:
+        Job: 현재 작업
+
+    Raises:
+        ValueError: 알 수 없는 레인인 경우
+    """
+    if lane not in LANES:
+        raise ValueError(f"레인은 {', '.join(LANES)} 중 하나여야 합니다: {lane}")
+    job = Job(lane=lane, tenant=tenant)
+    token = _current_job.set(job)
+    try:
+        yield job
+    finally:
+        _current_job.reset(token)
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """"tenant=weight,..." 형식의 테넌트 가중치를 파싱
+
+    Args:
+        spec: 가중치 문자열 (예: "team-a=3,team-b=1")
+
+    Returns:
+        Dict[str, float]: 테넌트별 가중치
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 가중치가 0 이하인 경우
+    """
+    weights: Dict[str, float] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        tenant, sep, value = item.rpartition("=")
+        if not sep or not tenant.strip() or float(value) <= 0:
+            raise ValueError(f"테넌트 가중치 형식이 잘못되었습니다: {item}")
+        weights[tenant.strip()] = float(value)
+    return weights
+
+class FairScheduler:
+    """우선순위 레인과 테넌트 가중치 공정 큐로 노드 실행 슬롯을 배분
+
+    메트릭:
+    - scheduler.queue_wait_ms.<lane>: 슬롯을 받기까지 기다린 시간 (분포)
+    - scheduler.queue_depth.<lane>: 기다리는 노드 수 (게이지)
+    - scheduler.running.<lane>: 실행 중인 노드 수 (게이지)
+    - scheduler.yields.<lane>: 노드 경계에서 슬롯을 내놓은 뒤 다시 기다린 횟수
+
+    Attributes:
+        slots: 동시에 실행할 수 있는 전체 노드 수
+        lane_caps: 레인별 동시 실행 상한
+        weights: 테넌트별 가중치 (없는 테넌트는 1)
+    """
+
+    def __init__(self, slots: int, lane_caps: Optional[Dict[str, int]] = None, weights: Optional[Dict[str, float]] = None):
+        """FairScheduler 초기화
+
+        Args:
+            slots: 동시에 실행할 수 있는 전체 노드 수
+            lane_caps: 레인별 동시 실행 상한 (기본값: 모든 레인이 slots)
+            weights: 테넌트별 가중치 (기본값: 모두 1)
+        """
+        self.slots = max(1, slots)
+        self.lane_caps = {lane: max(1, (lane_caps or {}).get(lane, self.slots)) for lane in LANES}
+        self.weights = dict(weights or {})
+        self._cond = threading.Condition()
+        self._waiters: List[_Waiter] = []
+        self._running = {lane: 0 for lane in LANES}
+        self._seq = itertools.count()
+        # 레인별 가상 시계와 (레인, 테넌트)별 다음 시작 시각
+        self._clock = {lane: 0.0 for lane in LANES}
+        self._virtual: Dict[Tuple[str, str], float] = {}
+
+    def _start_tag(self, job: Job) -> float:
+        return max(self._virtual.get((job.lane, job.tenant), 0.0), self._clock[job.lane])
+
+    def _next(self) -> Optional[_Waiter]:
+        """지금 슬롯을 받을 대기자 (없으면 None)"""
+        if sum(self._running.values()) >= self.slots:
+            return None
+        for lane in LANES:
+            if self._running[lane] >= self.lane_caps[lane]:
+                continue
+            candidates = [waiter for waiter in self._waiters if waiter.job.lane == lane]
+            if candidates:
+                return min(candidates, key=lambda waiter: (self._start_tag(waiter.job), waiter.seq))
+        return None
+
+    def _grant(self, waiter: _Waiter) -> None:
+        job = waiter.job
+        start = self._start_tag(job)
+        self._clock[job.lane] = start
+        self._virtual[(job.lane, job.tenant)] = start + 1.0 / self.weights.get(job.tenant, 1.0)
+        # 시계보다 뒤처진 테넌트는 어차피 시계에서 시작하므로 정리
+        for key in [key for key, tag in self._virtual.items() if key[0] == job.lane and tag < start]:
+            del self._virtual[key]
+        self._waiters.remove(waiter)
+        self._running[job.lane] += 1
+        job.granted += 1
+
+    @contextmanager
+    def slot(self, job: Optional[Job] = None) -> Iterator[None]:
+        """노드 하나를 실행할 슬롯을 잡음 (차례가 올 때까지 블록)
+
+        Args:
+            job: 작업 (기본값: 현재 컨텍스트의 작업, 없으면 interactive 레인의 임시 작업)
+        """
+        job = job or current_job() or Job()
+        lane = job.lane
+        start = time.perf_counter()
+        with self._cond:
+            waiter = _Waiter(job, next(self._seq))
+            self._waiters.append(waiter)
+            metrics.adjust(f"scheduler.queue_depth.{lane}", 1)
+            waited = False
+            while self._next() is not waiter:
+                waited = True
+                self._cond.wait()
+            if waited and job.granted:
+                metrics.increment(f"scheduler.yields.{lane}")
+            self._grant(waiter)
+            metrics.adjust(f"scheduler.queue_depth.{lane}", -1)
+            metrics.adjust(f"scheduler.running.{lane}", 1)
+            # 남은 슬롯이 있으면 다음 대기자도 확인하도록 깨움
+            self._cond.notify_all()
+        metrics.observe(f"scheduler.queue_wait_ms.{lane}", (time.perf_counter() - start) * 1000)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._running[lane] -= 1
+                metrics.adjust(f"scheduler.running.{lane}", -1)
+                self._cond.notify_all()
+
+    def status(self) -> Dict[str, Any]:
+        """레인별 실행/대기 상태"""
+        with self._cond:
+            return {
+                "slots": self.slots,
+                "lanes": {
+                    lane: {
+                        "cap": self.lane_caps[lane],
+                        "running": self._running[lane],
+                        "waiting": sum(1 for waiter in self._waiters if waiter.job.lane == lane)
+                    }
+                    for lane in LANES
+                }
+            }
+
+_scheduler: Optional[FairScheduler] = None
+_scheduler_key: Optional[Tuple[Any, ...]] = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> Optional[FairScheduler]:
+    """설정에 맞는 전역 스케줄러 (SCHEDULER_ENABLED=false면 None)
+
+    Returns:
+        Optional[FairScheduler]: 스케줄러 (설정이 바뀌면 새로 만듦)
+    """
+    global _scheduler, _scheduler_key
+    if not config.scheduler_enabled:
+        return None
+    key = (
+        config.scheduler_slots,
+        config.scheduler_interactive_slots,
+        config.scheduler_batch_slots,
+        config.scheduler_tenant_weights
+    )
+    with _scheduler_lock:
+        if _scheduler is None or _scheduler_key != key:
+            _scheduler = FairScheduler(
+                config.scheduler_slots,
+                {"interactive": config.scheduler_interactive_slots, "batch": config.scheduler_batch_slots},
+                parse_weights(config.scheduler_tenant_weights)
+            )
+            _scheduler_key = key
+        return _scheduler
+
+def node_slot() -> Any:
+    """현재 작업으로 노드 실행 슬롯을 잡는 컨텍스트 (스케줄러가 꺼져 있으면 아무것도 안 함)"""
+    scheduler = get_scheduler()
+    return scheduler.slot() if scheduler is not None else nullcontext()
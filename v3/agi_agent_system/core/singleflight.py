@@ -0,0 +1,118 @@
+"""요청 병합(single-flight) 모듈
+
+이 모듈은 같은 작업을 요청한 동시 호출들을 하나의 실행에 붙이는 SingleFlight를
+정의합니다. 처음 도착한 요청만 실제로 실행하고, 실행이 끝나기 전에 같은 키로
+도착한 요청은 그 결과를 함께 받습니다. reuse_window가 0보다 크면 막 끝난
+결과도 그 시간 동안 재사용합니다 (실패한 실행은 재사용하지 않음).
+
+실행은 별도 태스크로 돌기 때문에 처음 요청한 클라이언트가 연결을 끊어도
+붙어 있는 다른 요청은 결과를 받습니다. 하나의 이벤트 루프 안에서만 병합합니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict
+
+from .metrics import metrics
+
+def normalize_goal(goal: str) -> str:
+    """병합 비교용 목표 정규화 (유니코드 정규화, 대소문자, 공백, 끝 문장부호)
+
+    Args:
+        goal: 목표
+
+    Returns:
+        str: 정규화된 목표
+    """
+    goal = unicodedata.normalize("NFKC", goal).casefold()
+    return re.sub(r"\s+", " ", goal).strip().rstrip(".!?。 ")
+
+def coalesce_key(goal: str, **settings: Any) -> str:
+    """정규화된 목표와 결과에 영향을 주는 설정으로 병합 키를 만듦
+
+    Args:
+        goal: 목표
+        **settings: 결과를 바꾸는 요청 설정 (예: session_id, memory_dir, cascade)
+
+    Returns:
+        str: 병합 키
+    """
+    payload = json.dumps({"goal": normalize_goal(goal), **settings}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SingleFlight:
+    """같은 키의 동시 실행을 하나로 병합
+
+    메트릭 (prefix 기본값 "coalesce"):
+    - <prefix>.leaders: 실제로 실행한 요청 수
+    - <prefix>.joined: 진행 중인 실행에 붙은 요청 수
+    - <prefix>.reused: 재사용 구간 안의 완료된 결과를 받은 요청 수
+    - <prefix>.in_flight: 진행 중인 실행 수 (게이지)
+
+    Attributes:
+        reuse_window: 완료된 결과를 재사용할 시간 (초, 0이면 재사용하지 않음)
+        max_recent: 재사용을 위해 보관할 최대 결과 수
+    """
+
+    def __init__(self, reuse_window: float = 0.0, max_recent: int = 1024, prefix: str = "coalesce"):
+        """SingleFlight 초기화
+
+        Args:
+            reuse_window: 완료된 결과를 재사용할 시간 (기본값: 0초)
+            max_recent: 재사용을 위해 보관할 최대 결과 수 (기본값: 1024)
+            prefix: 메트릭 이름 접두사 (기본값: "coalesce")
+        """
+        self.reuse_window = reuse_window
+        self.max_recent = max_recent
+        self.prefix = prefix
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        # 키 -> (만료 시각, 결과), 완료 순
+        self._recent: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    def _expire(self, now: float) -> None:
+        while self._recent and (next(iter(self._recent.values()))[0] <= now or len(self._recent) > self.max_recent):
+            self._recent.popitem(last=False)
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        """실행이 끝나면 진행 중 목록에서 빼고, 성공한 결과는 재사용 구간 동안 보관"""
+        self._in_flight.pop(key, None)
+        metrics.adjust(f"{self.prefix}.in_flight", -1)
+        if task.cancelled() or task.exception() is not None or self.reuse_window <= 0:
+            return
+        self._recent[key] = (time.monotonic() + self.reuse_window, task.result())
+        self._recent.move_to_end(key)
+        self._expire(time.monotonic())
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """키에 해당하는 실행 결과를 반환 (진행 중이거나 막 끝난 실행이 있으면 그 결과)
+
+        Args:
+            key: 병합 키
+            fn: 실행할 코루틴 함수
+
+        Returns:
+            Any: 실행 결과 (같은 키의 요청들은 같은 객체를 받음)
+
+        Raises:
+            Exception: 실행이 실패한 경우 붙어 있던 모든 요청에 같은 예외
+        """
+        self._expire(time.monotonic())
+        if key in self._recent:
+            metrics.increment(f"{self.prefix}.reused")
+            return self._recent[key][1]
+        task = self._in_flight.get(key)
+        if task is not None:
+            metrics.increment(f"{self.prefix}.joined")
+        else:
+            metrics.increment(f"{self.prefix}.leaders")
+            metrics.adjust(f"{self.prefix}.in_flight", 1)
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        # 요청 하나가 취소되어도 공유 실행은 계속
+        return await asyncio.shield(task)
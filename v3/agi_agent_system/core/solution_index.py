@@ -0,0 +1,180 @@
+"""솔루션 색인 모듈
+
+이 모듈은 세션을 넘어 수락된 개발자 솔루션을 재사용하기 위한 검색 색인을
+정의합니다. 태스크 설명 임베딩은 메모리 매핑된 float16 벡터 파일에, 솔루션
+본문은 추가 전용 JSONL 파일에 저장됩니다.
+
+여러 프로세스(pre-fork 워커, 큐 워커, 데몬)가 같은 색인에 추가할 수 있으므로
+추가는 파일 잠금 안에서 항목 수를 다시 읽은 뒤 벡터와 항목을 기록합니다.
+"""
+
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .config import config
+from .embedding import HashingEmbedder
+from .storage import FileLock
+
+@dataclass
+class SolutionMatch:
+    """솔루션 색인 검색 결과
+
+    Attributes:
+        description: 저장된 태스크 설명
+        solution: 저장된 솔루션 (CodeSolution.dict() 형식)
+        score: 저장 당시 비평가 점수
+        similarity: 조회 태스크와의 코사인 유사도
+        exact: 정규화한 태스크 설명(단어 순서 포함)이 같은지 여부
+    """
+    description: str
+    solution: Dict[str, Any]
+    score: float
+    similarity: float
+    exact: bool = False
+
+class SolutionIndex:
+    """태스크 설명 임베딩으로 색인된 수락된 솔루션 저장소
+
+    벡터 파일은 증분 추가 시 일정 단위로 늘어나며, 다른 프로세스가 추가한
+    항목은 다음 검색 시 자동으로 반영됩니다.
+
+    Attributes:
+        path: 색인 디렉토리
+        embedder: 태스크 설명 임베더
+    """
+
+    GROW_ROWS = 1024
+
+    def __init__(self, path: str, embedder: Optional[HashingEmbedder] = None):
+        """SolutionIndex 초기화
+
+        Args:
+            path: 색인 디렉토리
+            embedder: 태스크 설명 임베더 (기본값: HashingEmbedder)
+        """
+        self.path = Path(path)
+        self.embedder = embedder or HashingEmbedder()
+        self.vectors_file = self.path / "vectors.f16"
+        self.entries_file = self.path / "entries.jsonl"
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.memmap] = None
+        self._entries: List[Dict[str, Any]] = []
+        self._entries_offset = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+    def _capacity(self) -> int:
+        """벡터 파일에 할당된 행 수"""
+        if not self.vectors_file.exists():
+            return 0
+        return self.vectors_file.stat().st_size // (self.embedder.dim * 2)
+
+    def _map(self) -> None:
+        """벡터 파일을 메모리 매핑"""
+        rows = self._capacity()
+        self._vectors = np.memmap(
+            self.vectors_file, dtype=np.float16, mode='r+', shape=(rows, self.embedder.dim)
+        ) if rows else None
+
+    def _refresh(self) -> None:
+        """다른 인스턴스가 추가한 항목을 읽어옴 (잠금을 보유한 상태에서 호출)"""
+        if not self.entries_file.exists():
+            return
+        if self.entries_file.stat().st_size == self._entries_offset:
+            return
+        with open(self.entries_file, 'r', encoding='utf-8') as f:
+            f.seek(self._entries_offset)
+            for line in f:
+                # 기록 도중인 마지막 줄은 다음 갱신 때 다시 읽음
+                if not line.endswith("\n"):
+                    break
+                self._entries.append(json.loads(line))
+                self._entries_offset += len(line.encode('utf-8'))
+        self._map()
+
+    def add(self, description: str, solution: Dict[str, Any], score: float) -> None:
+        """수락된 솔루션을 색인에 추가
+
+        Args:
+            description: 태스크 설명
+            solution: 솔루션 (CodeSolution.dict() 형식)
+            score: 비평가 점수
+        """
+        vector = self.embedder.embed(description)
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._lock, FileLock(self.entries_file):
+            # 다른 프로세스가 추가한 항목까지 읽은 뒤 잠금 안에서 다음 행을 정함
+            self._refresh()
+            row = len(self._entries)
+            if row >= self._capacity():
+                with open(self.vectors_file, 'ab') as f:
+                    f.truncate((row + self.GROW_ROWS) * self.embedder.dim * 2)
+                self._map()
+            self._vectors[row] = vector.astype(np.float16)
+            self._vectors.flush()
+            entry = {"description": description, "solution": solution, "score": score}
+            line = json.dumps(entry, ensure_ascii=False) + "\n"
+            with open(self.entries_file, 'a', encoding='utf-8') as f:
+                f.write(line)
+            self._entries.append(entry)
+            self._entries_offset += len(line.encode('utf-8'))
+
+    def search(self, description: str, k: int = 3) -> List[SolutionMatch]:
+        """태스크 설명과 가장 유사한 솔루션 top-k 검색
+
+        Args:
+            description: 태스크 설명
+            k: 반환할 최대 개수 (기본값: 3)
+
+        Returns:
+            List[SolutionMatch]: 유사도 내림차순 검색 결과
+        """
+        vector = self.embedder.embed(description)
+        key = self.embedder.normalize(description)
+        with self._lock:
+            self._refresh()
+            count = len(self._entries)
+            if not count or k <= 0:
+                return []
+            scores = self._vectors[:count].astype(np.float32) @ vector
+            k = min(k, count)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                SolutionMatch(
+                    description=self._entries[i]["description"],
+                    solution=self._entries[i]["solution"],
+                    score=self._entries[i]["score"],
+                    similarity=float(scores[i]),
+                    exact=self.embedder.normalize(self._entries[i]["description"]) == key
+                )
+                for i in top
+            ]
+
+_solution_indexes: Dict[str, SolutionIndex] = {}
+_solution_indexes_lock = threading.Lock()
+
+def get_solution_index(memory_dir: Optional[str] = None) -> Optional[SolutionIndex]:
+    """메모리 디렉토리별 공유 솔루션 색인을 반환
+
+    Args:
+        memory_dir: 메모리 파일 디렉토리 (기본값: config.memory_dir)
+
+    Returns:
+        Optional[SolutionIndex]: 솔루션 색인 (config.solution_index_enabled가 False이면 None)
+    """
+    if not config.solution_index_enabled:
+        return None
+    path = str(Path(memory_dir or config.memory_dir) / "solution_index")
+    with _solution_indexes_lock:
+        if path not in _solution_indexes:
+            _solution_indexes[path] = SolutionIndex(path)
+        return _solution_indexes[path]
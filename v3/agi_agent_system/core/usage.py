@@ -0,0 +1,112 @@
+"""토큰 사용량 원장 모듈
+
+이 모듈은 세션 메모리의 "usage" 항목에 기록된 LLM 호출별 사용량을
+세션 전체, 에이전트, 태스크, 반복 단위로 집계합니다.
+
+원장 항목 형식:
+    {"agent", "task_id", "iteration", "prompt_tokens", "completion_tokens",
+     "prompt_eval_ms", "generation_ms", "timestamp"}
+
+prompt_eval_ms는 llama.cpp가 측정한 프롬프트 평가 시간이며, 측정할 수 없는
+백엔드에서는 0이고 호출 시간 전체가 generation_ms에 기록됩니다.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+FIELDS = ("prompt_tokens", "completion_tokens", "prompt_eval_ms", "generation_ms")
+
+def usage_entry(
+    agent: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    prompt_eval_ms: float,
+    generation_ms: float,
+    task_id: Optional[Any] = None,
+    iteration: Optional[int] = None,
+    timestamp: Optional[str] = None
+) -> Dict[str, Any]:
+    """원장 항목 하나를 만듦
+
+    Args:
+        agent: 호출한 에이전트 역할
+        prompt_tokens: 프롬프트 토큰 수
+        completion_tokens: 생성 토큰 수
+        prompt_eval_ms: 프롬프트 평가 시간 (ms)
+        generation_ms: 생성 시간 (ms)
+        task_id: 태스크 ID (기본값: None, 계획 단계)
+        iteration: 태스크 안의 반복 번호 (기본값: None)
+        timestamp: 호출 시각 (기본값: None)
+
+    Returns:
+        Dict[str, Any]: 원장 항목
+    """
+    return {
+        "agent": agent,
+        "task_id": task_id,
+        "iteration": iteration,
+        "prompt_tokens": int(prompt_tokens),
+        "completion_tokens": int(completion_tokens),
+        "prompt_eval_ms": round(prompt_eval_ms, 3),
+        "generation_ms": round(generation_ms, 3),
+        "timestamp": timestamp,
+    }
+
+def _empty() -> Dict[str, Any]:
+    return {"calls": 0, **{field: 0 for field in FIELDS}, "max_prompt_tokens": 0}
+
+def _add(bucket: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    bucket["calls"] += 1
+    for field in FIELDS:
+        bucket[field] += entry.get(field, 0)
+    bucket["max_prompt_tokens"] = max(bucket["max_prompt_tokens"], entry.get("prompt_tokens", 0))
+
+def summarize_usage(entries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """원장 항목을 집계
+
+    Args:
+        entries: 원장 항목 목록
+
+    Returns:
+        Dict[str, Any]: {"total", "by_agent", "by_task", "by_iteration"}
+        각 값은 {"calls", "prompt_tokens", "completion_tokens", "prompt_eval_ms",
+        "generation_ms", "max_prompt_tokens"}이며, by_task/by_iteration의 키는
+        태스크 ID("plan"은 계획 단계)와 "<태스크 ID>/<반복>"입니다.
+    """
+    total = _empty()
+    by_agent: Dict[str, Dict[str, Any]] = {}
+    by_task: Dict[str, Dict[str, Any]] = {}
+    by_iteration: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        task = "plan" if entry.get("task_id") is None else str(entry["task_id"])
+        buckets: List[Dict[str, Any]] = [
+            total,
+            by_agent.setdefault(entry.get("agent", "agent"), _empty()),
+            by_task.setdefault(task, _empty()),
+        ]
+        if entry.get("iteration") is not None:
+            buckets.append(by_iteration.setdefault(f"{task}/{entry['iteration']}", _empty()))
+        for bucket in buckets:
+            _add(bucket, entry)
+    for bucket in [total, *by_agent.values(), *by_task.values(), *by_iteration.values()]:
+        for field in ("prompt_eval_ms", "generation_ms"):
+            bucket[field] = round(bucket[field], 3)
+    return {"total": total, "by_agent": by_agent, "by_task": by_task, "by_iteration": by_iteration}
+
+def format_usage(summary: Dict[str, Any]) -> str:
+    """집계 결과를 사람이 읽을 수 있는 표로 변환
+
+    Args:
+        summary: summarize_usage가 반환한 집계
+
+    Returns:
+        str: 전체와 에이전트별 사용량 표
+    """
+    header = f"{'':<12}{'calls':>7}{'prompt':>10}{'completion':>12}{'max prompt':>12}{'eval ms':>11}{'gen ms':>11}"
+    lines = [header]
+    rows = [("total", summary["total"]), *sorted(summary["by_agent"].items())]
+    for name, bucket in rows:
+        lines.append(
+            f"{name:<12}{bucket['calls']:>7}{bucket['prompt_tokens']:>10}{bucket['completion_tokens']:>12}"
+            f"{bucket['max_prompt_tokens']:>12}{bucket['prompt_eval_ms']:>11.1f}{bucket['generation_ms']:>11.1f}"
+        )
+    return "\n".join(lines)
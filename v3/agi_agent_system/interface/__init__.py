@@ -3,9 +3,20 @@
 이 패키지는 시스템의 사용자 인터페이스 컴포넌트들을 포함합니다:
 - cli: 명령줄 인터페이스
 - api: API 인터페이스
+
+API 스택(FastAPI, uvicorn)은 run_api에 처음 접근할 때만 임포트됩니다.
 """
 
-from .cli import run_cli
-from .api import run_api
+import importlib
+
+_LAZY_ATTRS = {
+    'run_cli': '.cli',
+    'run_api': '.api',
+}
+
+__all__ = ['run_cli', 'run_api']
 
-__all__ = ['run_cli', 'run_api'] 
\ No newline at end of file
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        return getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,207 @@
+"""관리자 API 모듈
+
+이 모듈은 실행 중인 API 워커를 진단하는 관리자 전용 엔드포인트를 제공합니다.
+ADMIN_TOKEN이 설정되어 있을 때만 활성화되며, 요청은 X-Admin-Token 헤더로
+인증합니다. 비활성화 상태에서는 엔드포인트가 404를 반환하고, 요청 프로파일링
+미들웨어는 헤더를 확인하지 않고 바로 다음 앱을 호출합니다.
+
+- POST /admin/profiler/start?seconds=N: 샘플링 프로파일러를 N초 동안 실행
+- GET /admin/profiler: 실행 상태
+- POST /admin/profiler/stop?format=collapsed|speedscope: 멈추고 결과 반환
+- GET /admin/profiles/{profile_id}?format=...: X-Profile 헤더를 붙인 요청의 cProfile 결과
+"""
+
+import contextvars
+import cProfile
+import hmac
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from ..core.config import config
+from ..core.profiler import FORMATS, SamplingProfiler, Stacks, render, stacks_from_cprofile
+
+# 요청별 cProfile 결과 (최근 config.profile_keep개)
+_profiles: "OrderedDict[str, Stacks]" = OrderedDict()
+_profiles_lock = threading.Lock()
+# cProfile은 한 번에 하나만 활성화
+_cprofile_lock = threading.Lock()
+_sampler: Optional[SamplingProfiler] = None
+# 측정 중인 요청의 스레드별 cProfile (요청 컨텍스트를 따라 스레드풀로 전달됨)
+_request_profiles: contextvars.ContextVar[Optional[List[cProfile.Profile]]] = contextvars.ContextVar(
+    "request_profiles", default=None
+)
+
+def run_profiled(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """함수를 실행 (측정 중인 요청이면 이 스레드에서도 cProfile로 측정)
+
+    cProfile은 스레드 단위로 동작하므로 asyncio.to_thread로 넘긴 작업은
+    이 함수로 감싸야 요청 프로파일에 포함됩니다.
+
+    Args:
+        fn: 실행할 함수
+        *args: 함수 인자
+        **kwargs: 함수 키워드 인자
+
+    Returns:
+        Any: 함수 반환값
+    """
+    profiles = _request_profiles.get()
+    if profiles is None:
+        return fn(*args, **kwargs)
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profile.disable()
+        profiles.append(profile)
+
+def _authorized(token: Optional[str]) -> bool:
+    return bool(config.admin_token) and token is not None and hmac.compare_digest(token, config.admin_token)
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """관리자 토큰 확인 (관리자 API가 꺼져 있으면 404, 토큰이 틀리면 403)"""
+    if not config.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not _authorized(x_admin_token):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 올바르지 않습니다.")
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+def _respond(stacks: Stacks, fmt: str, name: str, scale: float) -> Response:
+    """스택을 요청한 형식의 응답으로 변환"""
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format은 {', '.join(FORMATS)} 중 하나여야 합니다.")
+    result = render(stacks, fmt, name, scale)
+    if fmt == "collapsed":
+        return PlainTextResponse(result)
+    return JSONResponse(result)
+
+@router.post("/profiler/start")
+async def start_profiler(seconds: float = 30.0, interval: Optional[float] = None) -> Dict[str, Any]:
+    """샘플링 프로파일러를 시작
+
+    Args:
+        seconds: 실행 시간 (초, config.profiler_max_seconds 이하)
+        interval: 샘플링 간격 (기본값: config.profiler_interval)
+
+    Returns:
+        Dict[str, Any]: 프로파일러 상태
+
+    Raises:
+        HTTPException: 인자가 범위를 벗어났거나(400) 이미 실행 중인 경우(409)
+    """
+    global _sampler
+    if not 0 < seconds <= config.profiler_max_seconds:
+        raise HTTPException(status_code=400, detail=f"seconds는 0보다 크고 {config.profiler_max_seconds} 이하여야 합니다.")
+    interval = interval or config.profiler_interval
+    if interval <= 0:
+        raise HTTPException(status_code=400, detail="interval은 0보다 커야 합니다.")
+    if _sampler is not None and _sampler.running:
+        raise HTTPException(status_code=409, detail="프로파일러가 이미 실행 중입니다.")
+    _sampler = SamplingProfiler(interval)
+    _sampler.start(duration=seconds)
+    return _sampler.status()
+
+@router.get("/profiler")
+async def profiler_status() -> Dict[str, Any]:
+    """샘플링 프로파일러 상태"""
+    if _sampler is None:
+        return {"running": False, "interval": config.profiler_interval, "samples": 0, "elapsed": 0.0}
+    return _sampler.status()
+
+@router.post("/profiler/stop")
+async def stop_profiler(format: str = "collapsed") -> Response:
+    """샘플링 프로파일러를 멈추고 결과를 반환 (이미 끝났으면 마지막 결과)
+
+    Args:
+        format: "collapsed" 또는 "speedscope" (기본값: "collapsed")
+
+    Returns:
+        Response: collapsed 텍스트(샘플 수) 또는 speedscope JSON(초)
+
+    Raises:
+        HTTPException: 프로파일러를 시작한 적이 없는 경우(404)
+    """
+    if _sampler is None:
+        raise HTTPException(status_code=404, detail="프로파일러를 시작한 적이 없습니다.")
+    stacks = _sampler.stop()
+    return _respond(stacks, format, "sampling profile", 1 / _sampler.interval)
+
+@router.get("/profiles/{profile_id}")
+async def request_profile(profile_id: str, format: str = "collapsed") -> Response:
+    """X-Profile 헤더를 붙인 요청의 cProfile 결과
+
+    Args:
+        profile_id: 응답의 X-Profile-Id 헤더 값
+        format: "collapsed" 또는 "speedscope" (기본값: "collapsed")
+
+    Returns:
+        Response: collapsed 텍스트(마이크로초) 또는 speedscope JSON(초)
+
+    Raises:
+        HTTPException: 결과가 없는 경우(404)
+    """
+    with _profiles_lock:
+        stacks = _profiles.get(profile_id)
+    if stacks is None:
+        raise HTTPException(status_code=404, detail=f"프로파일을 찾을 수 없습니다: {profile_id}")
+    return _respond(stacks, format, f"request {profile_id}", 1e6)
+
+def _store_profile(profile_id: str, stacks: Stacks) -> None:
+    with _profiles_lock:
+        _profiles[profile_id] = stacks
+        while len(_profiles) > max(1, config.profile_keep):
+            _profiles.popitem(last=False)
+
+class RequestProfilingMiddleware:
+    """X-Profile 헤더와 관리자 토큰이 있는 요청을 cProfile로 측정하는 ASGI 미들웨어
+
+    결과는 응답의 X-Profile-Id 헤더 값으로 /admin/profiles/{id}에서 조회합니다.
+    이벤트 루프 스레드와 run_profiled로 감싼 스레드풀 작업을 측정하므로 같은 시간에
+    이벤트 루프에서 처리된 다른 요청도 포함될 수 있고, 이미 측정 중인 요청이 있으면
+    프로파일 없이 처리합니다.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not config.admin_token:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers", []))
+        token = headers.get(b"x-admin-token")
+        if (
+            b"x-profile" not in headers
+            or not _authorized(token.decode("latin-1") if token else None)
+            or not _cprofile_lock.acquire(blocking=False)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+
+        async def send_with_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profile = cProfile.Profile()
+        profiles = [profile]
+        context_token = _request_profiles.set(profiles)
+        try:
+            profile.enable()
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                profile.disable()
+                _request_profiles.reset(context_token)
+            _store_profile(profile_id, stacks_from_cprofile(*profiles))
+        finally:
+            _cprofile_lock.release()
@@ -3,20 +3,116 @@
 이 모듈은 시스템의 API 인터페이스를 제공합니다.
 """
 
+import asyncio
+import json
+import time
+import uuid
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
 from typing import Dict, Any, Optional
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from pydantic import BaseModel
 
+from ..core.config import config
+from ..core.jobqueue import get_job_queue
+from ..core.lifecycle import get_session_archive
 from ..core.memory import MemoryManager
-from ..workflow.agent_graph import run_workflow
+from ..core.metrics import metrics
+from ..core.scheduler import LANES, current_job, job_context
+from ..core.singleflight import SingleFlight, coalesce_key
+from ..core.storage import read_json
+from ..core.usage import summarize_usage
+from ..workflow.agent_graph import resume_workflow, run_workflow
+from .admin import RequestProfilingMiddleware, router as admin_router, run_profiled
+from .cli import collect_results
 
-app = FastAPI(title="AGI 에이전트 시스템 API")
+async def archive_idle_sessions(interval: float) -> None:
+    """주기적으로 유휴 세션을 아카이브하는 백그라운드 작업
+
+    Args:
+        interval: 실행 주기 (초)
+    """
+    archive = get_session_archive(config.memory_dir)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            report = await asyncio.to_thread(archive.archive_idle)
+            if report["archived"]:
+                print(f"유휴 세션 {report['archived']}개 아카이브 ({report['bytes_reclaimed']} bytes 회수)")
+        except Exception as e:
+            print(f"세션 아카이브 중 오류 발생: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 수명 동안 세션 아카이브 작업을 실행 (app.state.archive_sessions가 False인 워커는 제외)"""
+    task = None
+    if getattr(app.state, "archive_sessions", True) and config.session_ttl > 0 and config.session_archive_interval > 0:
+        task = asyncio.create_task(archive_idle_sessions(config.session_archive_interval))
+    yield
+    if task is not None:
+        task.cancel()
+
+class RequestMetricsMiddleware:
+    """요청 수, 처리 중인 요청 수, 경로별 지연 시간과 오류를 메트릭에 기록하는 ASGI 미들웨어
+    
+    - api.requests, api.errors (5xx): 카운터
+    - api.in_flight (및 api.in_flight.max): 게이지
+    - api.latency_ms.<메서드> <경로 템플릿>: 분포
+    """
+    
+    def __init__(self, app: Any):
+        self.app = app
+    
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        start = time.perf_counter()
+        metrics.increment("api.requests")
+        metrics.adjust("api.in_flight", 1)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.adjust("api.in_flight", -1)
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            metrics.observe(f"api.latency_ms.{scope['method']} {path}", (time.perf_counter() - start) * 1000)
+            if status >= 500:
+                metrics.increment("api.errors")
+
+app = FastAPI(title="AGI 에이전트 시스템 API", lifespan=lifespan)
+# 같은 목표의 동시 요청 병합 (coalesce.* 메트릭)
+coalescer = SingleFlight(reuse_window=config.coalesce_window)
+resume_flights = SingleFlight(prefix="coalesce.resume")
+app.include_router(admin_router)
+app.add_middleware(RequestProfilingMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
+
+class CascadePolicy(BaseModel):
+    """목표별 캐스케이드 정책 모델 (지정하지 않은 항목은 설정값 사용)"""
+    enabled: Optional[bool] = None
+    escalation_score: Optional[float] = None
+    max_small_attempts: Optional[int] = None
 
 class GoalRequest(BaseModel):
     """목표 요청 모델"""
     goal: str
     session_id: Optional[str] = None
     memory_dir: str = "memory"
+    cascade: Optional[CascadePolicy] = None
+
+class ResumeRequest(BaseModel):
+    """재개 요청 모델"""
+    memory_dir: str = "memory"
 
 class TaskResult(BaseModel):
     """태스크 결과 모델"""
@@ -27,59 +123,273 @@ class TaskResult(BaseModel):
     score: float
     feedback: str
     improvements: list[str]
+    tier: Optional[str] = None
 
 class WorkflowResponse(BaseModel):
     """워크플로우 응답 모델"""
     session_id: str
     results: list[TaskResult]
 
+def _to_response(memory: MemoryManager, final_state: Dict[str, Any]) -> WorkflowResponse:
+    """최종 상태를 응답 모델로 변환"""
+    return WorkflowResponse(
+        session_id=memory.session_id,
+        results=[TaskResult(**result) for result in collect_results(final_state)]
+    )
+
+def _job(priority: Optional[str], api_key: Optional[str], session_id: Optional[str]) -> Any:
+    """요청의 우선순위 레인과 테넌트로 스케줄러 작업 컨텍스트를 만듦
+
+    테넌트는 X-API-Key, 없으면 세션 ID, 둘 다 없으면 "anonymous"입니다.
+
+    Raises:
+        HTTPException: 알 수 없는 우선순위인 경우(400)
+    """
+    lane = priority or "interactive"
+    if lane not in LANES:
+        raise HTTPException(status_code=400, detail=f"X-Priority는 {', '.join(LANES)} 중 하나여야 합니다.")
+    return job_context(lane, api_key or session_id or "anonymous")
+
+def _run_goal(request: GoalRequest) -> WorkflowResponse:
+    """목표를 실행하고 응답을 만듦 (스레드풀에서 실행)"""
+    memory = MemoryManager(session_id=request.session_id, memory_dir=request.memory_dir)
+    final_state = run_workflow(
+        request.goal,
+        memory,
+        cascade=request.cascade.dict() if request.cascade else None
+    )
+    return _to_response(memory, final_state)
+
+def _resume_session(session_id: str, memory_dir: str) -> WorkflowResponse:
+    """세션을 재개하고 응답을 만듦 (스레드풀에서 실행)"""
+    memory = MemoryManager(session_id=session_id, memory_dir=memory_dir)
+    return _to_response(memory, resume_workflow(memory))
+
+def _job_queue() -> Any:
+    """설정된 작업 큐 (JOB_QUEUE_URL이 없으면 503)"""
+    if not config.job_queue_url:
+        raise HTTPException(status_code=503, detail="작업 큐가 설정되지 않았습니다 (JOB_QUEUE_URL).")
+    return get_job_queue()
+
+def _job_payload(kind: str, **fields: Any) -> Dict[str, Any]:
+    """작업 내용에 현재 요청의 레인과 테넌트를 붙임"""
+    job = current_job()
+    return {"kind": kind, **fields, "lane": job.lane if job else "interactive", "tenant": job.tenant if job else None}
+
+async def _wait_for_job(job_id: str) -> Dict[str, Any]:
+    """작업이 끝날 때까지 기다려 작업 기록을 반환
+
+    Raises:
+        LookupError: 재개할 체크포인트가 없어 실패한 경우
+        RuntimeError: 작업이 실패한 경우
+        TimeoutError: JOB_WAIT_TIMEOUT 안에 끝나지 않은 경우
+    """
+    queue = get_job_queue()
+    deadline = time.monotonic() + config.job_wait_timeout
+    while True:
+        job = await asyncio.to_thread(queue.get, job_id)
+        if job["status"] == "done":
+            return job
+        if job["status"] == "failed":
+            raise (LookupError if job["error_type"] == "LookupError" else RuntimeError)(job["error"])
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"작업 {job_id}이(가) {config.job_wait_timeout:g}초 안에 끝나지 않았습니다.")
+        await asyncio.sleep(config.job_poll_interval)
+
+async def _run_queued(kind: str, **fields: Any) -> WorkflowResponse:
+    """작업을 큐에 넣고 워커가 실행한 결과로 응답을 만듦"""
+    job_id = await asyncio.to_thread(get_job_queue().enqueue, _job_payload(kind, **fields))
+    job = await _wait_for_job(job_id)
+    return WorkflowResponse(**job["result"])
+
 @app.post("/run", response_model=WorkflowResponse)
-async def run_workflow_api(request: GoalRequest) -> Dict[str, Any]:
+async def run_workflow_api(
+    request: GoalRequest,
+    x_priority: Optional[str] = Header(None),
+    x_api_key: Optional[str] = Header(None)
+) -> WorkflowResponse:
     """워크플로우 실행 API
     
+    워크플로우는 스레드풀에서 실행되어 이벤트 루프를 막지 않습니다.
+    정규화한 목표와 설정(session_id, memory_dir, cascade)이 같은 요청이 이미
+    실행 중이면 그 실행에 붙어 같은 결과를 받고, COALESCE_WINDOW초 안에 끝난
+    결과는 다시 실행하지 않고 재사용합니다. 노드 실행은 X-Priority 레인과
+    X-API-Key 테넌트 기준으로 스케줄링됩니다. JOB_QUEUE_URL이 설정되어 있으면
+    직접 실행하지 않고 작업 큐에 넣은 뒤 워커가 기록한 결과를 기다립니다.
+    
     Args:
         request: 목표 요청
+        x_priority: 우선순위 레인 ("interactive" 또는 "batch", 기본값: "interactive")
+        x_api_key: 공정 분배 단위로 쓰는 API 키 (없으면 세션 ID)
         
     Returns:
-        Dict[str, Any]: 워크플로우 실행 결과
+        WorkflowResponse: 워크플로우 실행 결과
         
     Raises:
-        HTTPException: 실행 중 오류 발생 시
+        HTTPException: 우선순위가 잘못되었거나(400) 실행 중 오류 발생 시(500), 큐 작업 대기 시간 초과 시(504)
     """
+    job = _job(x_priority, x_api_key, request.session_id)
     try:
-        # 메모리 관리자 초기화
-        memory = MemoryManager(
-            session_id=request.session_id,
-            memory_dir=request.memory_dir
-        )
+        if config.job_queue_url:
+            # 재시도한 워커가 체크포인트에서 이어가도록 세션 ID를 미리 정함
+            execute = partial(
+                _run_queued,
+                "run",
+                goal=request.goal,
+                session_id=request.session_id or str(uuid.uuid4()),
+                memory_dir=request.memory_dir,
+                cascade=request.cascade.dict() if request.cascade else None
+            )
+        else:
+            execute = partial(asyncio.to_thread, run_profiled, _run_goal, request)
+        with job:
+            if not config.coalesce_enabled:
+                return await execute()
+            key = coalesce_key(
+                request.goal,
+                session_id=request.session_id,
+                memory_dir=request.memory_dir,
+                cascade=request.cascade.dict() if request.cascade else None
+            )
+            return await coalescer.do(key, execute)
+    except TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/sessions/{session_id}/resume", response_model=WorkflowResponse)
+async def resume_workflow_api(
+    session_id: str,
+    request: Optional[ResumeRequest] = None,
+    x_priority: Optional[str] = Header(None),
+    x_api_key: Optional[str] = Header(None)
+) -> WorkflowResponse:
+    """중단된 세션을 마지막으로 완료된 노드 다음부터 재개하는 API
+    
+    같은 세션의 재개 요청이 이미 실행 중이면 그 실행에 붙습니다.
+    
+    Args:
+        session_id: 재개할 세션 ID
+        request: 재개 요청 (기본값: None, 기본 메모리 디렉토리 사용)
+        x_priority: 우선순위 레인 ("interactive" 또는 "batch", 기본값: "interactive")
+        x_api_key: 공정 분배 단위로 쓰는 API 키 (없으면 세션 ID)
         
-        # 워크플로우 실행
-        final_state = run_workflow(request.goal, memory)
+    Returns:
+        WorkflowResponse: 워크플로우 실행 결과
         
-        # 결과 변환
-        results = []
-        for task, result, evaluation in zip(
-            final_state["tasks"],
-            final_state["results"],
-            final_state["evaluations"]
-        ):
-            results.append(TaskResult(
-                task_id=task.task_id,
-                description=task.description,
-                code=result["code"],
-                explanation=result["explanation"],
-                score=evaluation["score"],
-                feedback=evaluation["feedback"],
-                improvements=evaluation["improvements"]
-            ))
+    Raises:
+        HTTPException: 우선순위가 잘못되었거나(400) 체크포인트가 없거나(404) 실행 중 오류 발생 시(500),
+            큐 작업 대기 시간 초과 시(504)
+    """
+    request = request or ResumeRequest()
+    job = _job(x_priority, x_api_key, session_id)
+    try:
+        if config.job_queue_url:
+            execute = partial(_run_queued, "resume", session_id=session_id, memory_dir=request.memory_dir)
+        else:
+            execute = partial(asyncio.to_thread, run_profiled, _resume_session, session_id, request.memory_dir)
+        with job:
+            if not config.coalesce_enabled:
+                return await execute()
+            # 재개는 완료된 결과를 재사용하지 않도록 진행 중인 실행에만 붙음
+            return await resume_flights.do(f"{request.memory_dir}\0{session_id}", execute)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/jobs", status_code=202)
+async def submit_job_api(
+    request: GoalRequest,
+    x_priority: Optional[str] = Header(None),
+    x_api_key: Optional[str] = Header(None)
+) -> Dict[str, Any]:
+    """목표를 작업 큐에 넣고 바로 작업 ID를 반환하는 API (결과는 GET /jobs/{job_id})
+    
+    Args:
+        request: 목표 요청
+        x_priority: 우선순위 레인 ("interactive" 또는 "batch", 기본값: "interactive")
+        x_api_key: 공정 분배 단위로 쓰는 API 키 (없으면 세션 ID)
         
-        return WorkflowResponse(
-            session_id=memory.session_id,
-            results=results
+    Returns:
+        Dict[str, Any]: {"job_id", "session_id", "status"}
+        
+    Raises:
+        HTTPException: 우선순위가 잘못되었거나(400) 작업 큐가 설정되지 않은 경우(503)
+    """
+    queue = _job_queue()
+    session_id = request.session_id or str(uuid.uuid4())
+    with _job(x_priority, x_api_key, session_id):
+        payload = _job_payload(
+            "run",
+            goal=request.goal,
+            session_id=session_id,
+            memory_dir=request.memory_dir,
+            cascade=request.cascade.dict() if request.cascade else None
         )
+    job_id = await asyncio.to_thread(queue.enqueue, payload)
+    return {"job_id": job_id, "session_id": session_id, "status": "queued"}
+
+@app.get("/jobs/{job_id}")
+async def job_status_api(job_id: str) -> Dict[str, Any]:
+    """작업 상태와 (끝났으면) 결과를 반환하는 API
+    
+    Args:
+        job_id: 작업 ID
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    Returns:
+        Dict[str, Any]: 작업 기록 ({"id", "status", "attempts", "result", "error", ...})
+        
+    Raises:
+        HTTPException: 작업이 없거나(404) 작업 큐가 설정되지 않은 경우(503)
+    """
+    job = await asyncio.to_thread(_job_queue().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job
+
+def _read_session(session_id: str, memory_dir: str) -> Optional[Dict[str, Any]]:
+    """세션 메모리를 부작용 없이 읽음
+
+    MemoryManager와 달리 아카이브된 세션을 복원하거나 압축해 다시 쓰지 않고,
+    세션 파일이 없으면 아카이브에서 바로 읽습니다.
+    """
+    name = f"{session_id}.json"
+    data = read_json(Path(memory_dir) / name)
+    if data is None:
+        archived = get_session_archive(memory_dir).read_archived(session_id, name)
+        data = json.loads(archived) if archived is not None else None
+    return data
+
+@app.get("/sessions/{session_id}/usage")
+async def session_usage_api(session_id: str, memory_dir: str = "memory") -> Dict[str, Any]:
+    """세션의 토큰 사용량 원장을 에이전트/태스크/반복별로 집계해 반환하는 API
+    
+    Args:
+        session_id: 세션 ID
+        memory_dir: 메모리 파일 디렉토리 (기본값: "memory")
+        
+    Returns:
+        Dict[str, Any]: {"session_id", "total", "by_agent", "by_task", "by_iteration"}
+        
+    Raises:
+        HTTPException: 세션이 없는 경우(404)
+    """
+    data = await asyncio.to_thread(_read_session, session_id, memory_dir)
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"세션을 찾을 수 없습니다: {session_id}")
+    return {"session_id": session_id, **summarize_usage(data.get("usage", []))}
+
+@app.get("/metrics")
+async def metrics_api() -> Dict[str, Any]:
+    """프로세스 메트릭 (카운터, 게이지, 분포 요약)
+    
+    Returns:
+        Dict[str, Any]: {"counters", "gauges", "histograms"}
+    """
+    return metrics.snapshot()
 
 def run_api(host: str = "0.0.0.0", port: int = 8000) -> None:
     """API 서버 실행
@@ -0,0 +1,267 @@
+"""배치 실행 인터페이스 모듈
+
+이 모듈은 파일에 담긴 여러 목표를 공유 모델 위에서 동시에 실행하는
+배치 러너를 제공합니다. 결과는 목표가 끝날 때마다 JSONL로 기록되므로
+중단된 배치는 같은 출력 파일로 다시 실행하면 이어서 진행됩니다.
+
+입력 형식:
+- .jsonl: 한 줄에 {"goal": "...", "id": "선택", "session_id": "선택", "tenant": "선택"}
+- 그 외: 한 줄에 목표 하나 (빈 줄과 #으로 시작하는 줄은 무시)
+
+배치 목표는 스케줄러의 batch 레인에서 실행되며, tenant가 같은 목표끼리
+공정 분배 몫을 나눠 씁니다 (기본값: "batch").
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from ..core.config import ROLES
+from ..core.memory import MemoryManager
+from ..core.metrics import metrics, summarize
+from ..core.scheduler import job_context
+
+def load_goals(input_path: str) -> List[Dict[str, Any]]:
+    """입력 파일에서 목표 목록을 읽음
+
+    id가 없는 목표는 목표 문장의 해시로 id를 정하므로 파일 순서가 바뀌어도
+    재개 시 같은 목표로 인식됩니다.
+
+    Args:
+        input_path: 입력 파일 경로 (.jsonl 또는 텍스트)
+
+    Returns:
+        List[Dict[str, Any]]: {"id", "goal", "session_id"} 목록 (목표별 캐스케이드 정책이나 테넌트가 있으면 "cascade", "tenant" 포함)
+    """
+    goals = []
+    seen: Dict[str, int] = {}
+    is_jsonl = Path(input_path).suffix == ".jsonl"
+    with open(input_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or (not is_jsonl and line.startswith("#")):
+                continue
+            item = json.loads(line) if is_jsonl else {"goal": line}
+            goal_id = item.get("id")
+            if goal_id is None:
+                digest = hashlib.sha1(item["goal"].encode("utf-8")).hexdigest()[:12]
+                # 같은 목표가 여러 번 나오면 순번으로 구분
+                seen[digest] = seen.get(digest, 0) + 1
+                goal_id = digest if seen[digest] == 1 else f"{digest}-{seen[digest]}"
+            goal = {"id": str(goal_id), "goal": item["goal"], "session_id": item.get("session_id")}
+            if item.get("cascade") is not None:
+                goal["cascade"] = item["cascade"]
+            if item.get("tenant") is not None:
+                goal["tenant"] = str(item["tenant"])
+            goals.append(goal)
+    return goals
+
+def load_completed(output_path: str) -> Set[str]:
+    """출력 파일에서 이미 성공한 목표 id를 읽음
+
+    실패한 목표와 기록 도중 잘린 마지막 줄은 재실행 대상이 됩니다.
+
+    Args:
+        output_path: 결과 JSONL 파일 경로
+
+    Returns:
+        Set[str]: 성공한 목표 id 집합
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok":
+                completed.add(record["id"])
+    return completed
+
+class BatchRunner:
+    """목표 목록을 동시에 실행하고 결과를 JSONL로 기록하는 러너
+
+    Attributes:
+        output_path: 결과 JSONL 파일 경로
+        concurrency: 동시에 실행할 목표 수
+        memory_dir: 메모리 파일 디렉토리
+    """
+
+    def __init__(self, output_path: str, concurrency: int = 1, memory_dir: str = "memory"):
+        """BatchRunner 초기화
+
+        Args:
+            output_path: 결과 JSONL 파일 경로
+            concurrency: 동시에 실행할 목표 수 (기본값: 1)
+            memory_dir: 메모리 파일 디렉토리 (기본값: "memory")
+        """
+        self.output_path = output_path
+        self.concurrency = max(1, concurrency)
+        self.memory_dir = memory_dir
+        self._write_lock = threading.Lock()
+        self._records: List[Dict[str, Any]] = []
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """결과 한 줄을 기록하고 디스크에 내림"""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._write_lock:
+            with open(self.output_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._records.append(record)
+
+    def _run_goal(self, item: Dict[str, Any]) -> None:
+        """목표 하나를 실행하고 결과와 단계별, 역할별 LLM 지연 시간을 기록"""
+        from .cli import collect_results
+
+        stage_ms: Dict[str, List[float]] = {}
+        start = last = time.perf_counter()
+
+        def on_step(node: str, state: Dict[str, Any]) -> None:
+            nonlocal last
+            now = time.perf_counter()
+            stage_ms.setdefault(node, []).append((now - last) * 1000)
+            last = now
+
+        record = {"id": item["id"], "goal": item["goal"]}
+        # 역할별 LLM 지연 시간은 전역 분포(최근 max_samples개)가 아니라 이 목표에서 직접 모음
+        with metrics.capture() as samples:
+            try:
+                memory = MemoryManager(
+                    session_id=item.get("session_id") or f"batch-{item['id']}",
+                    memory_dir=self.memory_dir
+                )
+                # 배치 목표는 batch 레인에서 실행되어 interactive 요청에 노드 경계마다 차례를 넘김
+                with job_context("batch", item.get("tenant") or "batch"):
+                    final_state = self._execute(item, memory, on_step)
+                record.update(status="ok", session_id=memory.session_id, results=collect_results(final_state))
+            except Exception as e:
+                record.update(status="error", error=str(e))
+        record["elapsed_ms"] = (time.perf_counter() - start) * 1000
+        record["stage_ms"] = stage_ms
+        record["llm_ms"] = {
+            role: samples[f"llm.latency_ms.{role}"] for role in ROLES if f"llm.latency_ms.{role}" in samples
+        }
+        self._write(record)
+
+    def _execute(
+        self,
+        item: Dict[str, Any],
+        memory: MemoryManager,
+        on_step: Callable[[str, Dict[str, Any]], None]
+    ) -> Dict[str, Any]:
+        """목표를 실행하고 최종 상태를 반환
+
+        세션 ID를 목표 id로 정한 목표(batch-<id>)는 중단된 배치에서 실행 중이던 것일 수
+        있으므로, 체크포인트가 있으면 완료된 노드 다음부터 이어서 실행합니다.
+        """
+        from ..workflow.agent_graph import resume_workflow, run_workflow
+
+        if not item.get("session_id"):
+            try:
+                final_state = resume_workflow(memory, on_step=on_step)
+                metrics.increment("batch.resumed")
+                return final_state
+            except LookupError:
+                pass
+        return run_workflow(item["goal"], memory, on_step=on_step, cascade=item.get("cascade"))
+
+    def run(self, goals: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """아직 성공하지 않은 목표를 실행하고 처리량 보고서를 반환
+
+        Args:
+            goals: load_goals가 반환한 목표 목록
+
+        Returns:
+            Dict[str, Any]: 처리량, 토큰 속도, 단계별 지연 시간 백분위수 보고서
+        """
+        completed = load_completed(self.output_path)
+        pending = [item for item in goals if item["id"] not in completed]
+        Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
+
+        tokens_before = metrics.counter("llm.completion_tokens")
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            list(executor.map(self._run_goal, pending))
+        wall_s = time.perf_counter() - start
+        completion_tokens = metrics.counter("llm.completion_tokens") - tokens_before
+
+        stage_samples: Dict[str, List[float]] = {}
+        llm_samples: Dict[str, List[float]] = {role: [] for role in ROLES}
+        for record in self._records:
+            for stage, samples in record["stage_ms"].items():
+                stage_samples.setdefault(stage, []).extend(samples)
+            for role, samples in record["llm_ms"].items():
+                llm_samples[role].extend(samples)
+        succeeded = sum(1 for record in self._records if record["status"] == "ok")
+        return {
+            "total_goals": len(goals),
+            "skipped": len(goals) - len(pending),
+            "processed": len(self._records),
+            "succeeded": succeeded,
+            "failed": len(self._records) - succeeded,
+            "concurrency": self.concurrency,
+            "wall_seconds": wall_s,
+            "goals_per_hour": len(self._records) / wall_s * 3600 if wall_s > 0 else 0.0,
+            "completion_tokens": completion_tokens,
+            "tokens_per_second": completion_tokens / wall_s if wall_s > 0 else 0.0,
+            "goal_latency_ms": summarize([record["elapsed_ms"] for record in self._records]),
+            "stage_latency_ms": {stage: summarize(samples) for stage, samples in stage_samples.items()},
+            "llm_latency_ms": {role: summarize(samples) for role, samples in llm_samples.items()},
+        }
+
+def print_report(report: Dict[str, Any]) -> None:
+    """배치 보고서를 출력
+
+    Args:
+        report: BatchRunner.run이 반환한 보고서
+    """
+    print("\n=== 배치 결과 ===")
+    print(f"목표: {report['total_goals']}개 (이전 실행에서 완료: {report['skipped']}개)")
+    print(f"처리: {report['processed']}개 (성공 {report['succeeded']}, 실패 {report['failed']})")
+    print(f"소요 시간: {report['wall_seconds']:.1f}초, 동시 실행 수: {report['concurrency']}")
+    print(f"처리량: {report['goals_per_hour']:.1f} goals/hour, {report['tokens_per_second']:.1f} tokens/sec")
+    print("단계별 지연 시간 (ms):")
+    for stage, summary in report["stage_latency_ms"].items():
+        print(
+            f"- {stage}: p50 {summary['p50']:.1f}, p90 {summary['p90']:.1f}, "
+            f"p99 {summary['p99']:.1f} (n={summary['count']})"
+        )
+    print("역할별 LLM 호출 지연 시간 (ms):")
+    for role, summary in report["llm_latency_ms"].items():
+        if summary["count"]:
+            print(f"- {role}: p50 {summary['p50']:.1f}, p90 {summary['p90']:.1f} (n={summary['count']})")
+
+def run_batch(
+    input_path: str,
+    output_path: str,
+    concurrency: int = 1,
+    memory_dir: str = "memory",
+    report_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """배치 실행
+
+    Args:
+        input_path: 목표 입력 파일 경로
+        output_path: 결과 JSONL 파일 경로 (재실행 시 이어서 진행)
+        concurrency: 동시에 실행할 목표 수 (기본값: 1)
+        memory_dir: 메모리 파일 디렉토리 (기본값: "memory")
+        report_path: 보고서를 저장할 JSON 파일 경로 (기본값: None)
+
+    Returns:
+        Dict[str, Any]: 배치 보고서
+    """
+    report = BatchRunner(output_path, concurrency=concurrency, memory_dir=memory_dir).run(load_goals(input_path))
+    print_report(report)
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
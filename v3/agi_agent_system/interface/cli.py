@@ -4,10 +4,10 @@
 """
 
 import argparse
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from ..core.memory import MemoryManager
-from ..workflow.agent_graph import run_workflow
+from ..core.usage import format_usage, summarize_usage
 
 def parse_args() -> argparse.Namespace:
     """명령줄 인자 파싱
@@ -19,8 +19,13 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--goal",
         type=str,
-        required=True,
-        help="달성할 목표"
+        help="달성할 목표 (--resume을 쓰지 않으면 필수)"
+    )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        metavar="SESSION_ID",
+        help="중단된 세션을 마지막으로 완료된 노드 다음부터 재개"
     )
     parser.add_argument(
         "--session-id",
@@ -33,45 +38,166 @@ def parse_args() -> argparse.Namespace:
         default="memory",
         help="메모리 파일 디렉토리 (기본값: memory)"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="상주 데몬에 목표를 전달해 실행 (데몬이 없으면 자동 시작)"
+    )
+    add_cascade_args(parser)
+    args = parser.parse_args()
+    if not args.goal and not args.resume:
+        parser.error("--goal 또는 --resume 인자가 필요합니다.")
+    return args
+
+def add_cascade_args(parser: argparse.ArgumentParser) -> None:
+    """목표별 캐스케이드 정책 인자를 추가
+    
+    Args:
+        parser: 인자 파서
+    """
+    parser.add_argument(
+        "--cascade",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="작은 모델로 먼저 생성하고 필요할 때 큰 모델로 올림 (기본값: CASCADE_ENABLED)"
+    )
+    parser.add_argument(
+        "--escalation-score",
+        type=float,
+        help="작은 모델 결과의 점수가 이보다 낮으면 큰 모델로 올림 (기본값: CASCADE_ESCALATION_SCORE)"
+    )
+
+def cascade_from_args(args: argparse.Namespace) -> Optional[Dict[str, Any]]:
+    """명령줄 인자에서 목표별 캐스케이드 정책을 만듦
+    
+    Args:
+        args: 파싱된 인자
+        
+    Returns:
+        Optional[Dict[str, Any]]: 지정한 항목만 담은 정책 (지정하지 않았으면 None)
+    """
+    policy = {"enabled": args.cascade, "escalation_score": args.escalation_score}
+    policy = {key: value for key, value in policy.items() if value is not None}
+    return policy or None
+
+def collect_results(final_state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """최종 상태에서 태스크별 결과 목록을 추출
+    
+    Args:
+        final_state: 워크플로우 최종 상태
+        
+    Returns:
+        List[Dict[str, Any]]: 태스크별 결과 (task_id, description, code, explanation, score, feedback, improvements, tier)
+    """
+    results = []
+    for task, result, evaluation in zip(
+        final_state["tasks"],
+        final_state["results"],
+        final_state["evaluations"]
+    ):
+        results.append({
+            "task_id": task.task_id,
+            "description": task.description,
+            "code": result["code"],
+            "explanation": result["explanation"],
+            "score": evaluation["score"],
+            "feedback": evaluation["feedback"],
+            "improvements": evaluation["improvements"],
+            "tier": result.get("tier")
+        })
+    return results
 
-def run_cli(goal: Optional[str] = None, session_id: Optional[str] = None, memory_dir: str = "memory") -> None:
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """태스크별 결과를 출력
+    
+    Args:
+        results: collect_results가 반환한 결과 목록
+    """
+    print("\n=== 최종 결과 ===")
+    for i, result in enumerate(results):
+        print(f"\n태스크 {i+1}: {result['description']}")
+        print(f"코드:\n{result['code']}")
+        print(f"설명: {result['explanation']}")
+        print(f"평가 점수: {result['score']}")
+        print(f"피드백: {result['feedback']}")
+        if result['improvements']:
+            print("개선 사항:")
+            for improvement in result['improvements']:
+                print(f"- {improvement}")
+
+def print_usage(summary: Dict[str, Any]) -> None:
+    """세션의 토큰 사용량 요약을 출력
+    
+    Args:
+        summary: summarize_usage가 반환한 집계
+    """
+    if not summary["total"]["calls"]:
+        return
+    print("\n=== 토큰 사용량 ===")
+    print(format_usage(summary))
+
+def run_cli(
+    goal: Optional[str] = None,
+    session_id: Optional[str] = None,
+    memory_dir: str = "memory",
+    use_daemon: bool = False,
+    resume: Optional[str] = None,
+    cascade: Optional[Dict[str, Any]] = None
+) -> None:
     """명령줄 인터페이스 실행
     
     Args:
         goal: 달성할 목표 (기본값: None)
         session_id: 세션 ID (기본값: None)
         memory_dir: 메모리 파일 디렉토리 (기본값: "memory")
+        use_daemon: 상주 데몬에 전달해 실행할지 여부 (기본값: False)
+        resume: 재개할 세션 ID (기본값: None)
+        cascade: 이 목표에만 적용할 캐스케이드 정책 (기본값: None, 설정값 사용)
     """
     # 인자가 제공되지 않은 경우 명령줄에서 파싱
-    if goal is None:
+    if goal is None and resume is None:
         args = parse_args()
         goal = args.goal
         session_id = args.session_id
         memory_dir = args.memory_dir
+        use_daemon = args.daemon
+        resume = args.resume
+        cascade = cascade_from_args(args)
+    
+    if resume:
+        from ..workflow.agent_graph import resume_workflow
+        memory = MemoryManager(session_id=resume, memory_dir=memory_dir)
+        final_state = resume_workflow(memory)
+        print_results(collect_results(final_state))
+        print_usage(summarize_usage(memory.get("usage")))
+        return
+    
+    if use_daemon:
+        from .daemon import request_goal
+        response = request_goal(
+            goal,
+            session_id=session_id,
+            memory_dir=memory_dir,
+            cascade=cascade,
+            on_event=lambda event: print(f"[{event['node']}] 완료", flush=True)
+        )
+        print_results(response["results"])
+        if response.get("usage"):
+            print_usage(response["usage"])
+        return
+    
+    # LangGraph/LLM 스택은 실제로 워크플로우를 실행할 때만 임포트
+    from ..workflow.agent_graph import run_workflow
     
     # 메모리 관리자 초기화
     memory = MemoryManager(session_id=session_id, memory_dir=memory_dir)
     
     # 워크플로우 실행
-    final_state = run_workflow(goal, memory)
+    final_state = run_workflow(goal, memory, cascade=cascade)
     
     # 결과 출력
-    print("\n=== 최종 결과 ===")
-    for i, (task, result, evaluation) in enumerate(zip(
-        final_state["tasks"],
-        final_state["results"],
-        final_state["evaluations"]
-    )):
-        print(f"\n태스크 {i+1}: {task.description}")
-        print(f"코드:\n{result['code']}")
-        print(f"설명: {result['explanation']}")
-        print(f"평가 점수: {evaluation['score']}")
-        print(f"피드백: {evaluation['feedback']}")
-        if evaluation['improvements']:
-            print("개선 사항:")
-            for improvement in evaluation['improvements']:
-                print(f"- {improvement}")
+    print_results(collect_results(final_state))
+    print_usage(summarize_usage(memory.get("usage")))
 
 if __name__ == "__main__":
     run_cli() 
\ No newline at end of file
@@ -0,0 +1,390 @@
+"""데몬 인터페이스 모듈
+
+이 모듈은 모델, 컴파일된 그래프, 세션 메모리를 메모리에 올려 둔 채
+유닉스 소켓으로 목표를 받아 실행하는 상주 데몬과, 목표를 데몬에 전달하고
+진행 상황을 스트리밍으로 받는 얇은 클라이언트를 제공합니다.
+
+프로토콜은 줄 단위 JSON입니다. 클라이언트는 요청 한 줄을 보내고, 데몬은
+노드가 끝날 때마다 {"event": "node", ...}를, 마지막에 {"event": "result", ...}
+또는 {"event": "error", ...}를 보냅니다.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..core.config import config
+from ..core.memory import MemoryManager
+
+try:
+    import fcntl
+except ImportError:  # Windows에서는 시작 잠금 없이 소켓 확인만 사용
+    fcntl = None
+
+# 이 모듈이 속한 패키지 이름 (임포트 경로에 따라 "v3.agi_agent_system" 또는 "agi_agent_system")
+PACKAGE = __name__.rsplit(".", 2)[0]
+
+def package_env(env: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """작업 디렉토리와 무관하게 `python -m <PACKAGE>.main`을 실행할 수 있는 자식 프로세스 환경
+
+    최상위 패키지의 상위 디렉토리를 PYTHONPATH 앞에 추가합니다.
+
+    Args:
+        env: 기반 환경 변수 (기본값: os.environ)
+
+    Returns:
+        Dict[str, str]: 자식 프로세스 환경 변수
+    """
+    root = Path(__file__).resolve().parents[len(PACKAGE.split(".")) + 1]
+    env = dict(os.environ if env is None else env)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(root), env.get("PYTHONPATH")]))
+    return env
+
+# 다른 데몬이 이미 실행 중이거나 시작 중이라 종료할 때의 종료 코드 (start_daemon이 구분)
+ALREADY_RUNNING_EXIT = 3
+
+class DaemonRunningError(RuntimeError):
+    """같은 소켓에 다른 데몬이 이미 실행 중이거나 시작 중인 경우"""
+
+def _lock_instance(socket_path: str) -> Optional[int]:
+    """소켓 옆 .lock 파일을 잠가 데몬이 하나만 시작되게 함
+
+    잠금은 모델을 로드하기 전에 잡고 데몬이 끝날 때까지 유지하므로, 동시에 자동 시작된
+    두 번째 데몬은 모델을 로드하지 않고 바로 종료됩니다.
+
+    Args:
+        socket_path: 유닉스 소켓 경로
+
+    Returns:
+        Optional[int]: 잠금 파일 디스크립터 (fcntl이 없으면 None)
+
+    Raises:
+        DaemonRunningError: 다른 데몬이 이미 잠금을 보유한 경우
+    """
+    if fcntl is None:
+        return None
+    fd = os.open(f"{socket_path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        raise DaemonRunningError(f"이미 실행 중이거나 시작 중인 데몬이 있습니다: {socket_path}")
+    return fd
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """요청마다 스레드를 쓰는 유닉스 소켓 서버"""
+    daemon_threads = True
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """요청 한 줄을 읽어 데몬에 넘기고 이벤트를 줄 단위로 돌려보냄"""
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+
+        connected = True
+
+        def send(event: Dict[str, Any]) -> None:
+            nonlocal connected
+            # 클라이언트가 먼저 끊어도 실행 중인 워크플로우는 끝까지 진행
+            if not connected:
+                return
+            try:
+                self.wfile.write(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+            except OSError:
+                connected = False
+
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            send({"event": "error", "detail": f"잘못된 요청: {e}"})
+            return
+        self.server.agent_daemon.handle(request, send)
+
+class AgentDaemon:
+    """모델과 그래프를 상주시킨 채 목표를 실행하는 데몬
+
+    Attributes:
+        socket_path: 유닉스 소켓 경로
+        idle_timeout: 유휴 종료 시간 (초, 0이면 종료하지 않음)
+        max_sessions: 메모리에 유지할 세션(메모리 관리자와 컴파일된 그래프) 수
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        idle_timeout: Optional[float] = None,
+        max_sessions: int = 32
+    ):
+        """AgentDaemon 초기화
+
+        Args:
+            socket_path: 유닉스 소켓 경로 (기본값: config.daemon_socket)
+            idle_timeout: 유휴 종료 시간 (기본값: config.daemon_idle_timeout)
+            max_sessions: 유지할 세션 수 (기본값: 32)
+        """
+        self.socket_path = socket_path or config.daemon_socket
+        self.idle_timeout = config.daemon_idle_timeout if idle_timeout is None else idle_timeout
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[Tuple[str, str], MemoryManager]" = OrderedDict()
+        # llama.cpp 모델은 스레드 안전하지 않으므로 워크플로우 실행을 직렬화
+        self._run_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._active = 0
+        self._last_activity = time.monotonic()
+        self._server: Optional[_DaemonServer] = None
+
+    def warm_up(self) -> None:
+        """모델과 LangGraph 스택을 미리 로드"""
+        from ..core.config import ROLES
+        from ..core.llm import get_llm
+        from ..workflow import agent_graph  # noqa: F401
+        for role in ROLES:
+            get_llm(role=role)
+
+    def _session(self, session_id: Optional[str], memory_dir: str) -> MemoryManager:
+        """세션의 메모리 관리자를 반환 (없으면 생성, 그래프는 세션 사이에 공유)"""
+        if session_id is not None and (memory_dir, session_id) in self._sessions:
+            self._sessions.move_to_end((memory_dir, session_id))
+            return self._sessions[(memory_dir, session_id)]
+        memory = MemoryManager(session_id=session_id, memory_dir=memory_dir)
+        self._sessions[(memory_dir, memory.session_id)] = memory
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return memory
+
+    def handle(self, request: Dict[str, Any], send: Callable[[Dict[str, Any]], None]) -> None:
+        """요청 하나를 처리
+
+        Args:
+            request: 요청 ({"goal", "session_id", "memory_dir"} 또는 {"command": "ping"|"shutdown"})
+            send: 이벤트를 클라이언트로 보내는 함수
+        """
+        with self._state_lock:
+            self._active += 1
+        try:
+            command = request.get("command", "run")
+            if command == "ping":
+                send({"event": "pong", "pid": os.getpid()})
+            elif command == "shutdown":
+                send({"event": "bye"})
+                threading.Thread(target=self.shutdown, daemon=True).start()
+            elif command == "run":
+                self._run(request, send)
+            else:
+                send({"event": "error", "detail": f"알 수 없는 명령: {command}"})
+        except Exception as e:
+            send({"event": "error", "detail": str(e)})
+        finally:
+            with self._state_lock:
+                self._active -= 1
+                self._last_activity = time.monotonic()
+
+    def _run(self, request: Dict[str, Any], send: Callable[[Dict[str, Any]], None]) -> None:
+        """목표를 실행하며 노드 진행 상황과 최종 결과를 전송"""
+        from ..workflow.agent_graph import run_workflow
+        from .cli import collect_results
+        from ..core.usage import summarize_usage
+
+        def on_step(node: str, state: Dict[str, Any]) -> None:
+            send({
+                "event": "node",
+                "node": node,
+                "current_task_index": state.get("current_task_index"),
+                "iterations": state.get("iterations")
+            })
+
+        with self._run_lock:
+            memory = self._session(request.get("session_id"), request.get("memory_dir", "memory"))
+            final_state = run_workflow(request["goal"], memory, on_step=on_step, cascade=request.get("cascade"))
+        send({
+            "event": "result",
+            "session_id": memory.session_id,
+            "results": collect_results(final_state),
+            "usage": summarize_usage(memory.get("usage"))
+        })
+
+    def _watch_idle(self) -> None:
+        """유휴 시간이 제한을 넘으면 데몬을 종료"""
+        interval = min(1.0, self.idle_timeout / 4)
+        while self._server is not None:
+            time.sleep(interval)
+            with self._state_lock:
+                idle = self._active == 0 and time.monotonic() - self._last_activity > self.idle_timeout
+            if idle:
+                self.shutdown()
+                return
+
+    def serve_forever(self) -> None:
+        """소켓을 열고 종료될 때까지 요청을 처리
+
+        Raises:
+            DaemonRunningError: 다른 데몬이 이미 실행 중이거나 시작 중인 경우
+        """
+        path = Path(self.socket_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 모델 로드 전에 잠금을 잡아 동시에 시작된 데몬끼리 소켓 확인을 함께 통과하지 않게 함
+        lock_fd = _lock_instance(self.socket_path)
+        try:
+            if path.exists():
+                if _ping(self.socket_path):
+                    raise DaemonRunningError(f"이미 실행 중인 데몬이 있습니다: {self.socket_path}")
+                # 비정상 종료로 남은 소켓 파일 정리
+                path.unlink()
+
+            self.warm_up()
+            self._server = _DaemonServer(self.socket_path, _RequestHandler)
+            self._server.agent_daemon = self
+            os.chmod(self.socket_path, 0o600)
+            self._last_activity = time.monotonic()
+            if self.idle_timeout > 0:
+                threading.Thread(target=self._watch_idle, daemon=True).start()
+            try:
+                self._server.serve_forever()
+            finally:
+                self._server.server_close()
+                self._server = None
+                if path.exists():
+                    path.unlink()
+        finally:
+            # 잠금 파일은 지우지 않음 (지우면 다음 데몬이 다른 inode를 잠글 수 있음)
+            if lock_fd is not None:
+                os.close(lock_fd)
+
+    def shutdown(self) -> None:
+        """요청 처리 루프를 멈춤"""
+        server = self._server
+        if server is not None:
+            server.shutdown()
+
+def run_daemon(socket_path: Optional[str] = None, idle_timeout: Optional[float] = None) -> None:
+    """데몬 실행
+
+    Args:
+        socket_path: 유닉스 소켓 경로 (기본값: config.daemon_socket)
+        idle_timeout: 유휴 종료 시간 (기본값: config.daemon_idle_timeout)
+    """
+    try:
+        AgentDaemon(socket_path=socket_path, idle_timeout=idle_timeout).serve_forever()
+    except DaemonRunningError as e:
+        # 동시에 자동 시작한 클라이언트가 먼저 시작한 데몬을 기다리도록 정해진 코드로 종료
+        print(e, file=sys.stderr)
+        sys.exit(ALREADY_RUNNING_EXIT)
+
+def _connect(socket_path: str) -> socket.socket:
+    """데몬 소켓에 연결"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+def _ping(socket_path: str) -> bool:
+    """데몬이 응답하는지 확인"""
+    try:
+        with _connect(socket_path) as sock:
+            sock.sendall(b'{"command": "ping"}\n')
+            return sock.makefile("rb").readline() != b""
+    except OSError:
+        return False
+
+def start_daemon(socket_path: Optional[str] = None, timeout: float = 300.0) -> None:
+    """백그라운드에 데몬을 시작하고 응답할 때까지 대기
+
+    Args:
+        socket_path: 유닉스 소켓 경로 (기본값: config.daemon_socket)
+        timeout: 모델 로드를 기다릴 최대 시간 (초, 기본값: 300)
+
+    동시에 자동 시작된 다른 데몬이 먼저 시작 잠금을 잡으면 이 자식 프로세스는
+    ALREADY_RUNNING_EXIT로 바로 종료되므로, 그 경우 그 데몬이 응답할 때까지 계속 기다립니다.
+
+    Raises:
+        RuntimeError: 데몬 프로세스가 응답하기 전에 종료된 경우 (다른 데몬이 시작 중이라 종료한 경우 제외)
+        TimeoutError: 제한 시간 안에 데몬이 응답하지 않은 경우
+    """
+    socket_path = socket_path or config.daemon_socket
+    with open(f"{socket_path}.log", "ab") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", f"{PACKAGE}.main", "--mode", "daemon", "--socket", socket_path],
+            env=package_env(),
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if _ping(socket_path):
+            return
+        if process.poll() not in (None, ALREADY_RUNNING_EXIT):
+            raise RuntimeError(f"데몬이 시작 중 종료되었습니다. 로그: {socket_path}.log")
+        time.sleep(0.1)
+    raise TimeoutError(f"데몬이 {timeout}초 안에 시작되지 않았습니다: {socket_path}")
+
+def request_goal(
+    goal: str,
+    session_id: Optional[str] = None,
+    memory_dir: str = "memory",
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+    socket_path: Optional[str] = None,
+    autostart: bool = True,
+    cascade: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """데몬에 목표를 전달하고 결과를 받음
+
+    Args:
+        goal: 달성할 목표
+        session_id: 세션 ID (기본값: None)
+        memory_dir: 메모리 파일 디렉토리 (기본값: "memory")
+        on_event: 노드 진행 이벤트마다 호출되는 콜백 (기본값: None)
+        socket_path: 유닉스 소켓 경로 (기본값: config.daemon_socket)
+        autostart: 데몬이 없으면 자동으로 시작할지 여부 (기본값: True)
+        cascade: 이 목표에만 적용할 캐스케이드 정책 (기본값: None, 데몬 설정값 사용)
+
+    Returns:
+        Dict[str, Any]: 결과 이벤트 ({"session_id", "results", "usage"})
+
+    Raises:
+        RuntimeError: 데몬이 오류를 보고한 경우
+    """
+    socket_path = socket_path or config.daemon_socket
+    request = {
+        "command": "run",
+        "goal": goal,
+        "session_id": session_id,
+        # 데몬의 작업 디렉토리와 무관하게 같은 위치를 쓰도록 절대 경로로 전달
+        "memory_dir": str(Path(memory_dir).resolve()),
+        "cascade": cascade
+    }
+    try:
+        sock = _connect(socket_path)
+    except OSError:
+        if not autostart:
+            raise
+        start_daemon(socket_path)
+        sock = _connect(socket_path)
+
+    with sock:
+        sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        for line in sock.makefile("rb"):
+            event = json.loads(line)
+            if event["event"] == "node":
+                if on_event:
+                    on_event(event)
+            elif event["event"] == "result":
+                return event
+            elif event["event"] == "error":
+                raise RuntimeError(f"데몬 오류: {event['detail']}")
+    raise RuntimeError("데몬이 결과 없이 연결을 종료했습니다.")
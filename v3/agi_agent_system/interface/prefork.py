@@ -0,0 +1,264 @@
+"""pre-fork API 서버 모듈
+
+uvicorn의 --workers는 워커를 새 인터프리터로 띄우므로 워커마다 파이썬 스택과
+모델 상태를 따로 올립니다. 이 모듈의 서버는 마스터가 한 번만 준비한 뒤
+fork해서 워커들이 페이지를 copy-on-write로 공유하게 합니다.
+
+1. 마스터: API/LangGraph/llama.cpp 스택을 임포트하고, 역할별 GGUF 모델 파일을
+   읽기 전용으로 매핑해 페이지 캐시에 올린 뒤(prefault_model) gc.freeze()
+2. 마스터: 리스닝 소켓을 열고 워커를 fork
+3. 워커: 자기 모델 인스턴스(llama.cpp 컨텍스트와 KV 캐시)를 만들고 준비 완료를
+   알린 뒤 같은 소켓으로 uvicorn을 실행 (유휴 세션 아카이브 작업은 0번 워커만 실행)
+4. 마스터: 모든 워커가 준비되면 프로세스별 공유/전용 RSS와 이 머신에 들어가는
+   워커 수 추정치를 출력하고, 죽은 워커를 다시 띄움
+
+llama.cpp 컨텍스트는 스레드를 쓰고 fork 후 안전하지 않으므로 마스터는 모델
+인스턴스를 만들지 않습니다. use_mmap이면 워커의 모델은 마스터가 올려 둔 같은
+파일 페이지를 가리키므로 가중치는 물리 메모리에 한 번만 올라갑니다.
+"""
+
+import gc
+import json
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from ..core.config import ROLES, config
+from ..core.llm import prefault_model
+from ..core.procmem import format_bytes, memory_usage, system_memory, worker_capacity
+
+def prepare_master() -> Dict[str, int]:
+    """fork 전에 마스터에서 공유할 상태를 준비
+
+    Returns:
+        Dict[str, int]: 모델 파일별 페이지 캐시에 올린 바이트 수
+    """
+    from . import api  # noqa: F401  API, LangGraph, 에이전트 스택
+    prefaulted = {}
+    if config.llm_backend == "llama_cpp":
+        try:
+            import langchain_community.llms  # noqa: F401
+            import llama_cpp  # noqa: F401
+        except ImportError:
+            pass
+        if not config.use_mmap:
+            print("경고: LLM_USE_MMAP=false이면 워커마다 가중치를 따로 읽으므로 공유되지 않습니다.")
+        for path in config.model_paths():
+            if os.path.exists(path):
+                prefaulted[path] = prefault_model(path)
+    # 이후 GC가 마스터에서 만든 객체를 건드려 페이지가 복사되지 않도록 고정
+    gc.collect()
+    gc.freeze()
+    return prefaulted
+
+def _warm_worker() -> None:
+    """워커 프로세스에서 역할별 모델 인스턴스(컨텍스트)를 만듦"""
+    from ..core.llm import get_llm
+    for role in ROLES:
+        get_llm(role=role)
+
+def _serve_worker(sock: socket.socket, ready_fd: int, log_level: str, slot: int) -> None:
+    """fork된 워커: 모델을 준비하고 준비 완료를 알린 뒤 uvicorn 실행 (반환하지 않음)"""
+    import uvicorn
+    from .api import app
+
+    code = 0
+    try:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        # 워커들이 같은 메모리 디렉토리를 아카이브하지 않도록 한 슬롯에서만 실행
+        app.state.archive_sessions = slot == 0
+        _warm_worker()
+        os.write(ready_fd, f"{os.getpid()}\n".encode())
+        os.close(ready_fd)
+        server = uvicorn.Server(uvicorn.Config(app, log_level=log_level))
+        server.run(sockets=[sock])
+    except BaseException as e:
+        print(f"워커 {os.getpid()} 오류: {e}", file=sys.stderr)
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+def memory_report(master_pid: int, worker_pids: List[int]) -> Dict[str, Any]:
+    """마스터와 워커의 공유/전용 RSS 보고서
+
+    Args:
+        master_pid: 마스터 프로세스 ID
+        worker_pids: 워커 프로세스 ID 목록
+
+    Returns:
+        Dict[str, Any]: {"master", "workers", "system", "estimated_workers"}
+    """
+    workers = {pid: memory_usage(pid) for pid in worker_pids}
+    system = system_memory()
+    return {
+        "master": memory_usage(master_pid),
+        "workers": {str(pid): usage for pid, usage in workers.items()},
+        "system": system,
+        "estimated_workers": worker_capacity(workers.values(), system.get("total", 0))
+    }
+
+def print_memory_report(report: Dict[str, Any]) -> None:
+    """메모리 보고서를 표로 출력"""
+    print(f"{'프로세스':<16} {'RSS':>10} {'공유':>10} {'전용':>10} {'PSS':>10}")
+    rows = [("master", report["master"])] + [(f"worker {pid}", usage) for pid, usage in report["workers"].items()]
+    for name, usage in rows:
+        if not usage:
+            print(f"{name:<16} (측정 불가)")
+            continue
+        print(
+            f"{name:<16} {format_bytes(usage['rss']):>10} {format_bytes(usage['shared']):>10} "
+            f"{format_bytes(usage['private']):>10} {format_bytes(usage['pss']):>10}"
+        )
+    if report["estimated_workers"] is not None:
+        print(
+            f"시스템 메모리 {format_bytes(report['system']['total'])}에 들어가는 워커 수 추정: "
+            f"{report['estimated_workers']}개 (공유 페이지 1회 + 워커별 전용 페이지)"
+        )
+
+class PreforkServer:
+    """모델 페이지를 공유하는 워커들을 fork하고 관리하는 마스터
+
+    Attributes:
+        host: 바인드 주소
+        port: 포트 (0이면 빈 포트, 실제 포트는 열린 뒤 이 속성에 기록)
+        workers: 워커 수
+        ready_timeout: 워커가 모델을 준비하기를 기다리는 최대 시간 (초)
+    """
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 8000, workers: int = 2, ready_timeout: float = 600.0):
+        """PreforkServer 초기화
+
+        Args:
+            host: 바인드 주소 (기본값: "0.0.0.0")
+            port: 포트 (기본값: 8000)
+            workers: 워커 수 (기본값: 2)
+            ready_timeout: 워커 준비 대기 시간 (기본값: 600초)
+        """
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.ready_timeout = ready_timeout
+        self._sock: Optional[socket.socket] = None
+        self._children: Dict[int, int] = {}  # pid -> 슬롯 번호
+        self._stopping = False
+
+    def _spawn(self, slot: int) -> int:
+        """워커 하나를 fork하고 준비 완료를 알려 올 파이프의 읽기 쪽을 반환"""
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            _serve_worker(self._sock, write_fd, "warning", slot)
+        os.close(write_fd)
+        self._children[pid] = slot
+        return read_fd
+
+    def _wait_ready(self, fds: List[int]) -> None:
+        """모든 워커가 준비 완료를 알릴 때까지 대기
+
+        Raises:
+            RuntimeError: 워커가 준비 전에 종료했거나 시간이 초과된 경우
+        """
+        deadline = time.monotonic() + self.ready_timeout
+        pending = list(fds)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError(f"워커가 {self.ready_timeout:g}초 안에 준비되지 않았습니다.")
+            readable, _, _ = select.select(pending, [], [], remaining)
+            for fd in readable:
+                data = os.read(fd, 64)
+                os.close(fd)
+                pending.remove(fd)
+                if not data:
+                    raise RuntimeError("워커가 준비 중에 종료했습니다.")
+
+    def _terminate(self, *_: Any) -> None:
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def serve(self, report_path: Optional[str] = None) -> Dict[str, Any]:
+        """워커를 띄우고 메모리 보고서를 출력한 뒤 종료 신호를 받을 때까지 워커를 관리
+
+        Args:
+            report_path: 메모리 보고서를 저장할 JSON 파일 (기본값: None)
+
+        Returns:
+            Dict[str, Any]: 시작 시 메모리 보고서
+        """
+        prefaulted = prepare_master()
+        for path, size in prefaulted.items():
+            print(f"모델 페이지 적재: {path} ({format_bytes(size)})")
+        self._sock = socket.socket(socket.AF_INET6 if ":" in self.host else socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((self.host, self.port))
+        self._sock.listen(2048)
+        self._sock.set_inheritable(True)
+        self.port = self._sock.getsockname()[1]
+
+        signal.signal(signal.SIGTERM, self._terminate)
+        signal.signal(signal.SIGINT, self._terminate)
+        try:
+            self._wait_ready([self._spawn(slot) for slot in range(self.workers)])
+        except RuntimeError:
+            self._terminate()
+            self._reap_all()
+            raise
+        report = memory_report(os.getpid(), list(self._children))
+        print(f"pre-fork 서버 시작: http://{self.host}:{self.port} (워커 {self.workers}개)")
+        print_memory_report(report)
+        if report_path:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        sys.stdout.flush()
+        self._supervise()
+        return report
+
+    def _supervise(self) -> None:
+        """죽은 워커를 다시 띄우고, 종료 신호를 받으면 모든 워커가 끝날 때까지 대기"""
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            slot = self._children.pop(pid, None)
+            if slot is None or self._stopping:
+                continue
+            print(f"워커 {pid}이(가) 종료되어 다시 시작합니다 (상태 {status})", file=sys.stderr)
+            try:
+                self._wait_ready([self._spawn(slot)])
+            except RuntimeError as e:
+                print(f"워커 재시작 실패: {e}", file=sys.stderr)
+        self._sock.close()
+
+    def _reap_all(self) -> None:
+        for pid in list(self._children):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+            self._children.pop(pid, None)
+
+def run_prefork(host: str = "0.0.0.0", port: int = 8000, workers: int = 2, report_path: Optional[str] = None) -> None:
+    """pre-fork API 서버 실행
+
+    Args:
+        host: 호스트 주소 (기본값: "0.0.0.0")
+        port: 포트 번호 (기본값: 8000, 0이면 빈 포트)
+        workers: 워커 수 (기본값: 2)
+        report_path: 시작 시 메모리 보고서를 저장할 JSON 파일 (기본값: None)
+    """
+    PreforkServer(host=host, port=port, workers=workers).serve(report_path=report_path)
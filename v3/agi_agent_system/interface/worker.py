@@ -0,0 +1,202 @@
+"""워커 인터페이스 모듈
+
+이 모듈은 공유 작업 큐(JOB_QUEUE_URL)에서 워크플로우 작업을 꺼내 실행하고
+결과를 큐에 다시 기록하는 워커(`--mode worker`)를 제공합니다. 여러 호스트의
+워커가 같은 큐와 같은 메모리 디렉토리(공유 파일 시스템)를 쓰면 어느 워커든
+어느 세션이든 이어서 처리할 수 있으므로 sticky 세션이 필요 없습니다.
+
+작업을 실행하는 동안에는 임대를 JOB_LEASE/3마다 연장합니다. 워커가 죽으면
+임대가 만료된 작업은 다른 워커가 다시 가져가고, 재시도한 작업은 세션
+체크포인트가 있으면 마지막으로 완료된 노드 다음부터 이어서 실행합니다.
+
+작업 내용 (payload):
+- {"kind": "run", "goal", "session_id", "memory_dir", "cascade", "lane", "tenant"}
+- {"kind": "resume", "session_id", "memory_dir", "lane", "tenant"}
+"""
+
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ..core.config import config
+from ..core.jobqueue import JobQueue, get_job_queue
+from ..core.memory import MemoryManager
+from ..core.metrics import metrics
+from ..core.scheduler import job_context
+
+def execute_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """작업 하나를 실행하고 결과를 반환
+
+    Args:
+        job: 작업 기록 (JobQueue.claim의 반환값)
+
+    Returns:
+        Dict[str, Any]: {"session_id", "results"}
+
+    Raises:
+        LookupError: 재개할 체크포인트가 없는 경우
+    """
+    from ..workflow.agent_graph import resume_workflow, run_workflow
+    from .cli import collect_results
+
+    payload = job["payload"]
+    memory = MemoryManager(session_id=payload.get("session_id"), memory_dir=payload.get("memory_dir", "memory"))
+    with job_context(payload.get("lane") or "interactive", payload.get("tenant") or memory.session_id):
+        if payload.get("kind") == "resume":
+            final_state = resume_workflow(memory)
+        else:
+            final_state = None
+            if job["attempts"] > 1 and config.checkpoint_enabled:
+                # 이전 시도가 남긴 체크포인트가 있으면 완료된 노드는 다시 실행하지 않음
+                try:
+                    final_state = resume_workflow(memory)
+                    metrics.increment("jobs.resumed")
+                except LookupError:
+                    pass
+            if final_state is None:
+                final_state = run_workflow(payload["goal"], memory, cascade=payload.get("cascade"))
+    return {"session_id": memory.session_id, "results": collect_results(final_state)}
+
+class Worker:
+    """작업 큐에서 작업을 꺼내 실행하는 워커
+
+    Attributes:
+        queue: 작업 큐
+        worker_id: 임대 소유자로 기록되는 워커 ID
+        concurrency: 동시에 실행할 작업 수
+        lease: 임대 시간 (초)
+        poll_interval: 큐가 비어 있을 때 다시 확인하는 간격 (초)
+    """
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        worker_id: Optional[str] = None,
+        concurrency: int = 1,
+        lease: Optional[float] = None,
+        poll_interval: Optional[float] = None
+    ):
+        """Worker 초기화
+
+        Args:
+            queue: 작업 큐 (기본값: None, JOB_QUEUE_URL)
+            worker_id: 워커 ID (기본값: None, "호스트-PID")
+            concurrency: 동시에 실행할 작업 수 (기본값: 1)
+            lease: 임대 시간 (기본값: config.job_lease)
+            poll_interval: 큐 확인 간격 (기본값: config.job_poll_interval)
+        """
+        self.queue = queue or get_job_queue()
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.concurrency = max(1, concurrency)
+        self.lease = lease or config.job_lease
+        self.poll_interval = poll_interval or config.job_poll_interval
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {"claimed": 0, "completed": 0, "failed": 0, "retried": 0, "lost": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _heartbeat(self, job_id: str, done: threading.Event) -> None:
+        """작업이 끝날 때까지 임대를 연장 (임대를 잃으면 멈춤)"""
+        while not done.wait(self.lease / 3):
+            if not self.queue.extend(job_id, self.worker_id, self.lease):
+                return
+
+    def process(self, job: Dict[str, Any]) -> str:
+        """작업 하나를 임대를 연장하며 실행하고 결과를 기록
+
+        Args:
+            job: 작업 기록
+
+        Returns:
+            str: "completed", "retried", "failed" 또는 "lost" (실행 중 임대를 잃음)
+        """
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job["id"], done), daemon=True)
+        heartbeat.start()
+        try:
+            try:
+                result = execute_job(job)
+            except Exception as e:
+                # 재개할 체크포인트가 없는 작업은 다시 시도해도 같으므로 바로 실패
+                status = self.queue.fail(
+                    job["id"], self.worker_id, str(e), type(e).__name__, retry=not isinstance(e, LookupError)
+                )
+                outcome = {"queued": "retried", "failed": "failed"}.get(status, "lost")
+            else:
+                outcome = "completed" if self.queue.complete(job["id"], self.worker_id, result) else "lost"
+        finally:
+            done.set()
+            heartbeat.join()
+        self._count(outcome)
+        return outcome
+
+    def _loop(self, max_jobs: Optional[int], idle_exit: Optional[float]) -> None:
+        idle_since = time.monotonic()
+        while not self._stop.is_set():
+            with self._lock:
+                if max_jobs is not None and self._stats["claimed"] >= max_jobs:
+                    return
+                job = self.queue.claim(self.worker_id, self.lease)
+                if job is not None:
+                    self._stats["claimed"] += 1
+            if job is None:
+                if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                    return
+                self._stop.wait(self.poll_interval)
+                continue
+            self.process(job)
+            idle_since = time.monotonic()
+
+    def run(self, max_jobs: Optional[int] = None, idle_exit: Optional[float] = None) -> Dict[str, int]:
+        """stop이 호출되거나 종료 조건을 만날 때까지 작업을 처리
+
+        Args:
+            max_jobs: 가져올 최대 작업 수 (기본값: None, 제한 없음)
+            idle_exit: 큐가 이 시간(초) 동안 비어 있으면 종료 (기본값: None, 계속 대기)
+
+        Returns:
+            Dict[str, int]: {"claimed", "completed", "failed", "retried", "lost"}
+        """
+        threads = [
+            threading.Thread(target=self._loop, args=(max_jobs, idle_exit), name=f"worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return dict(self._stats)
+
+    def stop(self) -> None:
+        """새 작업을 가져오지 않도록 함 (실행 중인 작업은 끝까지 진행)"""
+        self._stop.set()
+
+def run_worker(queue_url: Optional[str] = None, concurrency: int = 1, worker_id: Optional[str] = None) -> None:
+    """워커 실행 (SIGTERM/SIGINT를 받으면 실행 중인 작업을 마치고 종료)
+
+    Args:
+        queue_url: 작업 큐 주소 (기본값: config.job_queue_url)
+        concurrency: 동시에 실행할 작업 수 (기본값: 1)
+        worker_id: 워커 ID (기본값: None, "호스트-PID")
+    """
+    from ..core.config import ROLES
+    from ..core.llm import get_llm
+
+    worker = Worker(get_job_queue(queue_url), worker_id=worker_id, concurrency=concurrency)
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: worker.stop())
+    # 첫 작업이 모델 로드를 기다리지 않도록 미리 로드
+    for role in ROLES:
+        get_llm(role=role)
+    print(f"워커 {worker.worker_id} 시작 (동시 작업 {worker.concurrency}개)")
+    stats = worker.run()
+    print(
+        f"워커 종료: 완료 {stats['completed']}개, 재시도 {stats['retried']}개, "
+        f"실패 {stats['failed']}개, 임대 상실 {stats['lost']}개"
+    )
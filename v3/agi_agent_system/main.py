@@ -4,10 +4,6 @@
 """
 
 import argparse
-from typing import Optional
-
-from .interface.cli import run_cli
-from .interface.api import run_api
 
 def parse_args():
     """명령줄 인자 파싱
@@ -19,7 +15,7 @@ def parse_args():
     parser.add_argument(
         "--mode",
         type=str,
-        choices=["cli", "api"],
+        choices=["cli", "api", "daemon", "batch", "archive", "tune", "loadtest", "worker"],
         default="cli",
         help="실행 모드 (기본값: cli)"
     )
@@ -28,6 +24,12 @@ def parse_args():
         type=str,
         help="달성할 목표 (cli 모드에서만 사용)"
     )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        metavar="SESSION_ID",
+        help="중단된 세션을 마지막으로 완료된 노드 다음부터 재개 (cli 모드에서만 사용)"
+    )
     parser.add_argument(
         "--session-id",
         type=str,
@@ -51,21 +53,198 @@ def parse_args():
         default=8000,
         help="API 서버 포트 (api 모드에서만 사용, 기본값: 8000)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="API 워커 수, 2 이상이면 모델 페이지를 공유하는 pre-fork 서버로 실행 (api 모드에서만 사용, 기본값: 1)"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="상주 데몬에 목표를 전달해 실행 (cli 모드에서만 사용, 데몬이 없으면 자동 시작)"
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        help="데몬 유닉스 소켓 경로 (기본값: DAEMON_SOCKET 환경 변수 또는 임시 디렉토리)"
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        help="데몬 유휴 종료 시간(초), 0이면 종료하지 않음 (daemon 모드에서만 사용, 기본값: 600)"
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        help="목표 입력 파일 (.jsonl 또는 한 줄에 목표 하나인 텍스트, batch/loadtest 모드에서만 사용)"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="결과 JSONL 파일, 다시 실행하면 완료된 목표를 건너뜀 (batch 모드에서만 사용)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="동시에 실행할 목표 수 (batch, worker 모드와 closed-loop loadtest에서 사용, 기본값: 1)"
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        help="보고서를 저장할 JSON 파일 (batch, archive, tune, loadtest 모드와 pre-fork api 모드에서만 사용)"
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        help="튜닝 결과를 기록할 프로파일 경로 (tune 모드에서만 사용, 기본값: LLM_PROFILE)"
+    )
+    parser.add_argument(
+        "--ttl",
+        type=float,
+        help="이 시간(초) 동안 바뀌지 않은 세션을 아카이브 (archive 모드에서만 사용, 기본값: SESSION_TTL)"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        help="부하를 보낼 API 서버 주소 (loadtest 모드에서만 사용, 기본값: 같은 프로세스의 앱)"
+    )
+    parser.add_argument(
+        "--arrival",
+        choices=["closed", "open"],
+        default="closed",
+        help="요청 도착 방식 (loadtest 모드에서만 사용, 기본값: closed)"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="open-loop에서 초당 시나리오 수 (loadtest 모드에서만 사용, 기본값: 1)"
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        help="실행할 시나리오 수 (loadtest 모드에서만 사용, --duration이 없으면 기본값: 20)"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        help="부하를 보낼 시간(초) (loadtest 모드에서만 사용)"
+    )
+    parser.add_argument(
+        "--transcripts",
+        type=str,
+        help="replay 백엔드로 재생할 기록된 응답 파일 (loadtest 모드에서만 사용)"
+    )
+    parser.add_argument(
+        "--queue",
+        type=str,
+        help="작업 큐 주소 (worker 모드에서만 사용, 기본값: JOB_QUEUE_URL)"
+    )
+    parser.add_argument(
+        "--worker-id",
+        type=str,
+        help="임대 소유자로 기록할 워커 ID (worker 모드에서만 사용, 기본값: 호스트-PID)"
+    )
+    parser.add_argument(
+        "--cascade",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="작은 모델로 먼저 생성하고 필요할 때 큰 모델로 올림 (cli 모드에서만 사용, 기본값: CASCADE_ENABLED)"
+    )
+    parser.add_argument(
+        "--escalation-score",
+        type=float,
+        help="작은 모델 결과의 점수가 이보다 낮으면 큰 모델로 올림 (cli 모드에서만 사용, 기본값: CASCADE_ESCALATION_SCORE)"
+    )
     return parser.parse_args()
 
 def main():
     """메인 함수"""
     args = parse_args()
     
+    # 인터페이스는 선택된 모드에 필요한 것만 임포트 (API 스택은 api 모드에서만)
     if args.mode == "cli":
-        if not args.goal:
-            raise ValueError("cli 모드에서는 --goal 인자가 필요합니다.")
+        if not args.goal and not args.resume:
+            raise ValueError("cli 모드에서는 --goal 또는 --resume 인자가 필요합니다.")
+        if args.daemon and args.socket:
+            from .core.config import config
+            config.daemon_socket = args.socket
+        from .interface.cli import cascade_from_args, run_cli
         run_cli(
             goal=args.goal,
             session_id=args.session_id,
-            memory_dir=args.memory_dir
+            memory_dir=args.memory_dir,
+            use_daemon=args.daemon,
+            resume=args.resume,
+            cascade=cascade_from_args(args)
+        )
+    elif args.mode == "batch":
+        if not args.input or not args.output:
+            raise ValueError("batch 모드에서는 --input과 --output 인자가 필요합니다.")
+        from .interface.batch import run_batch
+        run_batch(
+            input_path=args.input,
+            output_path=args.output,
+            concurrency=args.concurrency,
+            memory_dir=args.memory_dir,
+            report_path=args.report
+        )
+    elif args.mode == "archive":
+        from .core.lifecycle import run_archive
+        report = run_archive(memory_dir=args.memory_dir, ttl=args.ttl)
+        if args.report:
+            import json
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+    elif args.mode == "tune":
+        from .benchmarks.tune import run_tune
+        report = run_tune(profile_path=args.profile)
+        if args.report:
+            import json
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+    elif args.mode == "loadtest":
+        from .benchmarks.load import run_loadtest
+        run_loadtest(
+            url=args.url,
+            report_path=args.report,
+            goals_path=args.input,
+            transcripts=args.transcripts,
+            memory_dir=args.memory_dir if args.url else None,
+            arrival=args.arrival,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            requests=args.requests if args.requests is not None or args.duration is not None else 20,
+            duration=args.duration
+        )
+    elif args.mode == "worker":
+        from .core.config import config
+        if not (args.queue or config.job_queue_url):
+            raise ValueError("worker 모드에서는 --queue 인자나 JOB_QUEUE_URL 환경 변수가 필요합니다.")
+        from .interface.worker import run_worker
+        run_worker(
+            queue_url=args.queue,
+            concurrency=args.concurrency,
+            worker_id=args.worker_id
+        )
+    elif args.mode == "daemon":
+        from .interface.daemon import run_daemon
+        run_daemon(
+            socket_path=args.socket,
+            idle_timeout=args.idle_timeout
+        )
+    elif args.workers > 1:  # pre-fork api 모드
+        from .interface.prefork import run_prefork
+        run_prefork(
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            report_path=args.report
         )
     else:  # api 모드
+        from .interface.api import run_api
         run_api(
             host=args.host,
             port=args.port
@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+import unittest
+from collections import deque
+from unittest.mock import patch
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.agents.critic import CriticAgent
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.core.metrics import metrics
+    from v3.agi_agent_system.interface.batch import BatchRunner, load_completed, load_goals
+except ImportError:
+    from ..agents.critic import CriticAgent
+    from ..core.config import config
+    from ..core.metrics import metrics
+    from ..interface.batch import BatchRunner, load_completed, load_goals
+
+class TestBatchInput(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _file(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_text_goals_get_stable_unique_ids(self):
+        goals = load_goals(self._file("goals.txt", "goal a\n\n# comment\ngoal b\ngoal a\n"))
+        self.assertEqual([item["goal"] for item in goals], ["goal a", "goal b", "goal a"])
+        self.assertEqual(len({item["id"] for item in goals}), 3)
+        self.assertEqual(goals[0]["id"], load_goals(self._file("other.txt", "goal a\n"))[0]["id"])
+
+    def test_jsonl_goals_keep_explicit_ids(self):
+        goals = load_goals(self._file("goals.jsonl", '{"id": "x", "goal": "goal a", "session_id": "s"}\n'))
+        self.assertEqual(goals, [{"id": "x", "goal": "goal a", "session_id": "s"}])
+
+    def test_completed_ignores_failures_and_truncated_lines(self):
+        path = self._file("out.jsonl", '{"id": "a", "status": "ok"}\n{"id": "b", "status": "error"}\n{"id": "c", "sta')
+        self.assertEqual(load_completed(path), {"a"})
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmp.name, "out.jsonl")
+        self.patcher = patch.multiple(config, llm_backend="fake", plan_cache_size=0, solution_index_enabled=False)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.tmp.cleanup()
+
+    def _runner(self):
+        return BatchRunner(self.output, concurrency=2, memory_dir=os.path.join(self.tmp.name, "memory"))
+
+    def test_run_writes_results_and_reports(self):
+        goals = [{"id": str(i), "goal": f"goal {i}", "session_id": None} for i in range(3)]
+        report = self._runner().run(goals)
+        self.assertEqual(report["succeeded"], 3)
+        self.assertIn("developer", report["stage_latency_ms"])
+        self.assertGreater(report["completion_tokens"], 0)
+        with open(self.output, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(sorted(record["id"] for record in records), ["0", "1", "2"])
+
+    def test_llm_latency_covers_this_run_when_global_samples_are_full(self):
+        # 전역 분포가 이미 가득 차 있으면 길이로 자른 구간은 비어 있음
+        full = deque([0.0] * metrics.max_samples, maxlen=metrics.max_samples)
+        goals = [{"id": str(i), "goal": f"goal {i}", "session_id": None} for i in range(3)]
+        with patch.dict(metrics._samples, {"llm.latency_ms.planner": full}):
+            report = self._runner().run(goals)
+        self.assertEqual(report["llm_latency_ms"]["planner"]["count"], 3)
+        with open(self.output, encoding='utf-8') as f:
+            self.assertTrue(all(len(json.loads(line)["llm_ms"]["planner"]) == 1 for line in f))
+
+    def test_resume_skips_completed_goals(self):
+        with open(self.output, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"id": "0", "status": "ok"}) + "\n")
+        goals = [{"id": str(i), "goal": f"goal {i}", "session_id": None} for i in range(3)]
+        report = self._runner().run(goals)
+        self.assertEqual(report["skipped"], 1)
+        self.assertEqual(report["processed"], 2)
+
+    def test_interrupted_goal_resumes_from_checkpoint(self):
+        goals = [{"id": "0", "goal": "make a todo app", "session_id": None}]
+        original = CriticAgent.run
+        calls = {"count": 0}
+
+        def run(agent, state):
+            calls["count"] += 1
+            if calls["count"] == 2:
+                raise RuntimeError("중단")
+            return original(agent, state)
+
+        with patch.object(CriticAgent, "run", run):
+            self.assertEqual(self._runner().run(goals)["failed"], 1)
+        calls_before, resumed_before = metrics.counter("llm.calls"), metrics.counter("batch.resumed")
+        report = self._runner().run(goals)
+        self.assertEqual(report["succeeded"], 1)
+        self.assertEqual(metrics.counter("batch.resumed") - resumed_before, 1)
+        # 완료된 planner, developer, critic, developer는 다시 실행하지 않음
+        self.assertEqual(metrics.counter("llm.calls") - calls_before, 1)
+
+if __name__ == '__main__':
+    unittest.main()
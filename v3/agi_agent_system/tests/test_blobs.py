@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.core.blobs import MAX_DELTA_DEPTH, BlobStore, is_blob_ref
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.core.memory import MemoryManager
+    from v3.agi_agent_system.workflow.agent_graph import run_workflow
+except ImportError:
+    from ..core.blobs import MAX_DELTA_DEPTH, BlobStore, is_blob_ref
+    from ..core.config import config
+    from ..core.memory import MemoryManager
+    from ..workflow.agent_graph import run_workflow
+
+def module_code(version):
+    lines = [
+        f"def helper_{hashlib.md5(str(i).encode()).hexdigest()[:10]}(value):\n"
+        f"    return value * {i} + {version if i == 7 else 0}  # {hashlib.sha1(str(i).encode()).hexdigest()}"
+        for i in range(40)
+    ]
+    return "\n\n".join(lines)
+
+class TestBlobStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = BlobStore(self.tmp.name, min_chars=32, delta=True)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _blob_files(self):
+        return [name for _, _, names in os.walk(self.tmp.name) for name in names]
+
+    def _size(self, ref):
+        return os.path.getsize(self.store._file(ref["$blob"]))
+
+    def test_same_content_is_stored_once(self):
+        first = self.store.put(module_code(1))
+        second = self.store.put(module_code(1))
+        self.assertEqual(first, second)
+        self.assertEqual(len(self._blob_files()), 1)
+        self.assertEqual(BlobStore(self.tmp.name).get(first), module_code(1))
+
+    def test_next_iteration_is_stored_as_small_delta(self):
+        plain = BlobStore(os.path.join(self.tmp.name, "plain"), delta=False)
+        base = self.store.put(module_code(1))
+        delta = self.store.put(module_code(2), base=base)
+        self.assertLess(self._size(delta) * 3, plain._file(plain.put(module_code(2))["$blob"]).stat().st_size)
+        # 캐시 없이 새로 읽어도 기준 블롭을 따라 복원
+        self.assertEqual(BlobStore(self.tmp.name).get(delta), module_code(2))
+
+    def test_delta_chain_depth_is_bounded(self):
+        ref = self.store.put(module_code(0))
+        for version in range(1, MAX_DELTA_DEPTH + 3):
+            ref = self.store.put(module_code(version), base=ref)
+            self.assertLessEqual(self.store._depth(ref["$blob"]), MAX_DELTA_DEPTH)
+        self.assertEqual(BlobStore(self.tmp.name).get(ref), module_code(MAX_DELTA_DEPTH + 2))
+
+    def test_externalize_and_resolve_round_trip(self):
+        value = {"code": module_code(1), "explanation": "짧음", "test_cases": [module_code(3), "x"], "score": 0.5}
+        stored = self.store.externalize(value)
+        self.assertTrue(is_blob_ref(stored["code"]))
+        self.assertTrue(is_blob_ref(stored["test_cases"][0]))
+        self.assertEqual(stored["explanation"], "짧음")
+        self.assertEqual(self.store.resolve(stored), value)
+
+class TestWorkflowBlobs(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patcher = patch.multiple(
+            config, llm_backend="fake", plan_cache_size=0, solution_index_enabled=False, blob_min_chars=16
+        )
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.tmp.cleanup()
+
+    def test_memory_holds_references_and_final_state_is_resolved(self):
+        memory = MemoryManager(session_id="s", memory_dir=self.tmp.name)
+        final_state = run_workflow("make a todo app", memory)
+        self.assertEqual(final_state["results"][0]["code"], "def solve():\n    return True")
+        memory.flush()
+        with open(memory.memory_file, encoding='utf-8') as f:
+            conversations = json.load(f)["conversations"]
+        developer = [entry["content"]["content"] for entry in conversations if entry["role"] == "developer"]
+        self.assertEqual(len(developer), 2)
+        self.assertTrue(all(is_blob_ref(content["code"]) for content in developer))
+        # 두 태스크의 같은 코드는 같은 블롭 하나를 가리킴
+        self.assertEqual(developer[0]["code"], developer[1]["code"])
+
+if __name__ == '__main__':
+    unittest.main()
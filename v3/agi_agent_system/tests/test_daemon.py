@@ -0,0 +1,110 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.interface import daemon
+except ImportError:
+    from ..core.config import config
+    from ..interface import daemon
+
+class TestAgentDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp.name, "d.sock")
+        self.memory_dir = os.path.join(self.tmp.name, "memory")
+        self.patcher = patch.multiple(config, llm_backend="fake", plan_cache_size=0, solution_index_enabled=False)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.tmp.cleanup()
+
+    def _start(self, idle_timeout=0):
+        agent_daemon = daemon.AgentDaemon(socket_path=self.socket_path, idle_timeout=idle_timeout)
+        thread = threading.Thread(target=agent_daemon.serve_forever, daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 10
+        while not daemon._ping(self.socket_path):
+            self.assertLess(time.monotonic(), deadline, "daemon did not start")
+            time.sleep(0.05)
+        return agent_daemon, thread
+
+    def test_goal_streams_events_and_reuses_session(self):
+        agent_daemon, thread = self._start()
+        events = []
+        response = daemon.request_goal(
+            "make a todo api", session_id="s1", memory_dir=self.memory_dir,
+            on_event=events.append, socket_path=self.socket_path, autostart=False
+        )
+        self.assertEqual(response["session_id"], "s1")
+        self.assertEqual(len(response["results"]), 2)
+        self.assertEqual(events[0]["node"], "planner")
+        self.assertIn("critic", [event["node"] for event in events])
+
+        daemon.request_goal("another goal", session_id="s1", memory_dir=self.memory_dir,
+                            socket_path=self.socket_path, autostart=False)
+        self.assertEqual(len(agent_daemon._sessions), 1)
+
+        agent_daemon.shutdown()
+        thread.join(5)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_idle_shutdown(self):
+        _, thread = self._start(idle_timeout=0.2)
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_no_daemon_without_autostart_raises(self):
+        with self.assertRaises(OSError):
+            daemon.request_goal("goal", socket_path=self.socket_path, autostart=False)
+
+    def test_second_daemon_exits_before_loading_models(self):
+        lock_fd = daemon._lock_instance(self.socket_path)
+        try:
+            second = daemon.AgentDaemon(socket_path=self.socket_path, idle_timeout=0)
+            with patch.object(second, "warm_up") as warm_up:
+                with self.assertRaises(daemon.DaemonRunningError):
+                    second.serve_forever()
+            warm_up.assert_not_called()
+        finally:
+            os.close(lock_fd)
+
+    def test_start_waits_for_concurrently_started_daemon(self):
+        first = daemon.AgentDaemon(socket_path=self.socket_path, idle_timeout=0)
+        first.warm_up = lambda: time.sleep(0.5)
+        thread = threading.Thread(target=first.serve_forever, daemon=True)
+        thread.start()
+        # 이 클라이언트가 띄운 데몬은 먼저 시작한 데몬의 잠금을 보고 바로 종료
+        lost = MagicMock()
+        lost.poll.return_value = daemon.ALREADY_RUNNING_EXIT
+        with patch.object(daemon.subprocess, "Popen", return_value=lost):
+            daemon.start_daemon(self.socket_path, timeout=10)
+        first.shutdown()
+        thread.join(5)
+
+        failed = MagicMock()
+        failed.poll.return_value = 1
+        with patch.object(daemon.subprocess, "Popen", return_value=failed):
+            with self.assertRaises(RuntimeError):
+                daemon.start_daemon(self.socket_path, timeout=10)
+
+    def test_autostart_spawns_daemon(self):
+        env = {"LLM_BACKEND": "fake", "DAEMON_IDLE_TIMEOUT": "5", "PLAN_CACHE_SIZE": "0"}
+        with patch.dict(os.environ, env):
+            response = daemon.request_goal("make a todo api", memory_dir=self.memory_dir, socket_path=self.socket_path)
+        self.assertEqual(len(response["results"]), 2)
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.connect(self.socket_path)
+            sock.sendall(b'{"command": "shutdown"}\n')
+            self.assertEqual(json.loads(sock.makefile("rb").readline())["event"], "bye")
+
+if __name__ == '__main__':
+    unittest.main()
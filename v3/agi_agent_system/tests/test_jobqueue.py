@@ -0,0 +1,216 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.core.jobqueue import RedisJobQueue, SQLiteJobQueue, get_job_queue, open_job_queue
+    from v3.agi_agent_system.core.llm import clear_llm_registry
+    from v3.agi_agent_system.core.resp import RespServer
+    from v3.agi_agent_system.interface import api
+    from v3.agi_agent_system.interface.worker import Worker
+except ImportError:
+    from ..core.config import config
+    from ..core.jobqueue import RedisJobQueue, SQLiteJobQueue, get_job_queue, open_job_queue
+    from ..core.llm import clear_llm_registry
+    from ..core.resp import RespServer
+    from ..interface import api
+    from ..interface.worker import Worker
+
+class QueueContract:
+    """두 구현이 공유하는 작업 큐 동작"""
+
+    def make_queue(self, max_attempts=3):
+        raise NotImplementedError
+
+    def test_claim_and_complete(self):
+        queue = self.make_queue()
+        first, second = queue.enqueue({"goal": "a"}), queue.enqueue({"goal": "b"})
+        self.assertEqual(queue.enqueue({"goal": "a"}, job_id=first), first)
+        self.assertEqual(queue.depth(), 2)
+        job = queue.claim("w1", lease=30)
+        self.assertEqual((job["id"], job["payload"], job["attempts"]), (first, {"goal": "a"}, 1))
+        self.assertEqual(queue.claim("w2", lease=30)["id"], second)
+        self.assertIsNone(queue.claim("w3", lease=30))
+        self.assertFalse(queue.complete(first, "w2", {"ok": False}))
+        self.assertTrue(queue.complete(first, "w1", {"ok": True}))
+        record = queue.get(first)
+        self.assertEqual((record["status"], record["result"]), ("done", {"ok": True}))
+
+    def test_expired_lease_is_retried_then_failed(self):
+        queue = self.make_queue(max_attempts=2)
+        job_id = queue.enqueue({"goal": "a"})
+        queue.claim("crashed", lease=0.01)
+        time.sleep(0.05)
+        job = queue.claim("w2", lease=0.01)
+        self.assertEqual((job["id"], job["attempts"]), (job_id, 2))
+        # 임대를 잃은 워커는 결과를 기록하지 못함
+        self.assertFalse(queue.extend(job_id, "crashed", 30))
+        time.sleep(0.05)
+        self.assertIsNone(queue.claim("w3", lease=30))
+        record = queue.get(job_id)
+        self.assertEqual((record["status"], record["error_type"]), ("failed", "LeaseExpired"))
+
+    def test_fail_requeues_until_attempts_run_out(self):
+        queue = self.make_queue(max_attempts=2)
+        job_id = queue.enqueue({"goal": "a"})
+        queue.claim("w", lease=30)
+        self.assertEqual(queue.fail(job_id, "w", "boom", "RuntimeError"), "queued")
+        queue.claim("w", lease=30)
+        self.assertEqual(queue.fail(job_id, "w", "boom", "RuntimeError"), "failed")
+        self.assertEqual(queue.get(job_id)["error"], "boom")
+        self.assertIsNone(queue.get("missing"))
+
+class TestSQLiteJobQueue(QueueContract, unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.queues = []
+
+    def tearDown(self):
+        for queue in self.queues:
+            queue.close()
+        self.tmp.cleanup()
+
+    def make_queue(self, max_attempts=3):
+        queue = SQLiteJobQueue(os.path.join(self.tmp.name, "jobs.db"), max_attempts)
+        self.queues.append(queue)
+        return queue
+
+    def test_open_by_url(self):
+        path = os.path.join(self.tmp.name, "q.db")
+        self.queues.append(open_job_queue(f"sqlite:///{path}"))
+        self.assertIsInstance(self.queues[-1], SQLiteJobQueue)
+        self.assertEqual(self.queues[-1].path, path)
+        with self.assertRaises(ValueError):
+            open_job_queue("amqp://localhost")
+
+class TestRedisJobQueue(QueueContract, unittest.TestCase):
+    def setUp(self):
+        self.server = RespServer().start()
+        self.queues = []
+
+    def tearDown(self):
+        for queue in self.queues:
+            queue.close()
+        self.server.stop()
+
+    def make_queue(self, max_attempts=3):
+        queue = open_job_queue(self.server.url, max_attempts)
+        self.assertIsInstance(queue, RedisJobQueue)
+        self.queues.append(queue)
+        return queue
+
+    def test_orphaned_claim_gets_a_lease(self):
+        queue = self.make_queue()
+        job_id = queue.enqueue({"goal": "a"})
+        # 워커가 LMOVE 직후 임대를 기록하기 전에 죽은 상황
+        queue.client.execute("LMOVE", queue._queue, queue._processing, "LEFT", "RIGHT")
+        self.assertIsNone(queue.claim("w", lease=0.01))
+        time.sleep(0.05)
+        self.assertEqual(queue.claim("w", lease=30)["id"], job_id)
+
+    def test_stale_lease_on_finished_job_is_dropped(self):
+        queue = self.make_queue()
+        job_id = queue.enqueue({"goal": "a"})
+        queue.claim("w", lease=30)
+        self.assertTrue(queue.complete(job_id, "w", {"ok": True}))
+        # 회수가 LRANGE로 본 작업이 그사이 끝나 임대만 다시 생긴 상황
+        queue.client.execute("ZADD", queue._leases, 0, job_id)
+        queue._next_reap = 0.0
+        self.assertIsNone(queue.claim("w2", lease=30))
+        self.assertEqual(queue.get(job_id)["status"], "done")
+        self.assertEqual(queue.depth(), 0)
+        self.assertIsNone(queue.client.execute("ZSCORE", queue._leases, job_id))
+
+    def test_reaps_once_per_interval(self):
+        queue = RedisJobQueue(self.server.url, reap_interval=60)
+        self.queues.append(queue)
+        for goal in "abc":
+            queue.enqueue({"goal": goal})
+        with patch.object(queue, "_reap", wraps=queue._reap) as reap:
+            for _ in range(3):
+                queue.claim("w", lease=30)
+        self.assertEqual(reap.call_count, 1)
+
+    def test_transaction_retries_when_watched_key_changes(self):
+        queue, other = self.make_queue(), self.make_queue()
+        reads = []
+
+        def prepare(call):
+            value = call("HGET", "counter", "n")
+            reads.append(value)
+            if len(reads) == 1:
+                other.client.execute("HSET", "counter", "n", "changed")
+            return [("HSET", "counter", "n", f"{value}+1")]
+
+        queue.client.execute("HSET", "counter", "n", "0")
+        self.assertEqual(queue.client.transaction(["counter"], prepare), [0])
+        self.assertEqual(reads, ["0", "changed"])
+        self.assertEqual(queue.client.execute("HGET", "counter", "n"), "changed+1")
+
+class TestWorker(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = RespServer().start()
+        self.patcher = patch.multiple(
+            config, llm_backend="fake", plan_cache_size=0, solution_index_enabled=False,
+            job_queue_url=self.server.url, job_poll_interval=0.01, coalesce_enabled=False
+        )
+        self.patcher.start()
+        clear_llm_registry()
+
+    def tearDown(self):
+        clear_llm_registry()
+        self.patcher.stop()
+        get_job_queue(self.server.url).close()
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def test_api_enqueues_and_worker_serves_result(self):
+        worker = Worker(get_job_queue(), worker_id="w1", concurrency=2)
+        thread = threading.Thread(target=worker.run)
+        thread.start()
+        try:
+            client = TestClient(api.app)
+            response = client.post("/run", json={"goal": "make a todo app", "memory_dir": self.tmp.name})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()["results"]), 2)
+            submitted = client.post("/jobs", json={"goal": "make a cli", "memory_dir": self.tmp.name}, headers={"X-Priority": "batch"})
+            self.assertEqual(submitted.status_code, 202)
+            job_id = submitted.json()["job_id"]
+            deadline = time.monotonic() + 10
+            while client.get(f"/jobs/{job_id}").json()["status"] != "done" and time.monotonic() < deadline:
+                time.sleep(0.01)
+            job = client.get(f"/jobs/{job_id}").json()
+            self.assertEqual(job["status"], "done")
+            self.assertEqual(job["payload"]["lane"], "batch")
+            self.assertEqual(job["result"]["session_id"], submitted.json()["session_id"])
+            self.assertEqual(client.get("/jobs/missing").status_code, 404)
+        finally:
+            worker.stop()
+            thread.join(timeout=10)
+
+    def test_job_from_crashed_worker_is_finished_by_another(self):
+        queue = get_job_queue()
+        job_id = queue.enqueue({"kind": "run", "goal": "make a todo app", "session_id": "s", "memory_dir": self.tmp.name})
+        queue.claim("crashed", lease=0.01)
+        time.sleep(0.05)
+        stats = Worker(queue, worker_id="w2", lease=30).run(max_jobs=1)
+        self.assertEqual((stats["claimed"], stats["completed"]), (1, 1))
+        record = queue.get(job_id)
+        self.assertEqual((record["status"], record["attempts"], record["worker"]), ("done", 2, "w2"))
+        self.assertEqual(record["result"]["session_id"], "s")
+
+    def test_resume_without_checkpoint_fails_without_retry(self):
+        queue = get_job_queue()
+        job_id = queue.enqueue({"kind": "resume", "session_id": "missing", "memory_dir": self.tmp.name})
+        stats = Worker(queue, worker_id="w").run(max_jobs=1)
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(queue.get(job_id)["error_type"], "LookupError")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import gc
+import os
+import sys
+import tempfile
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.core import llm as llm_module
+    from v3.agi_agent_system.core import config as config_module
+    from v3.agi_agent_system.core.config import ROLE_PRESETS, RoleProfile, config
+    from v3.agi_agent_system.core.fake_llm import FakeLLM
+    from v3.agi_agent_system.core.llm import JsonStop, RoleLLM, clear_llm_registry, get_llm, model_lock
+    from v3.agi_agent_system.core.memory import MemoryManager
+    from v3.agi_agent_system.core.metrics import metrics
+    from v3.agi_agent_system.workflow.agent_graph import get_workflow, run_workflow
+except ImportError:
+    from ..core import llm as llm_module
+    from ..core import config as config_module
+    from ..core.config import ROLE_PRESETS, RoleProfile, config
+    from ..core.fake_llm import FakeLLM
+    from ..core.llm import JsonStop, RoleLLM, clear_llm_registry, get_llm, model_lock
+    from ..core.memory import MemoryManager
+    from ..core.metrics import metrics
+    from ..workflow.agent_graph import get_workflow, run_workflow
+
+class TestRoleRouting(unittest.TestCase):
+    def setUp(self):
+        self.patcher = patch.multiple(
+            config,
+            llm_backend="fake",
+            plan_cache_size=0,
+            solution_index_enabled=False,
+            roles={
+                "planner": RoleProfile(model_path="small.gguf", temperature=0.1),
+                "critic": RoleProfile(model_path="small.gguf", max_tokens=256),
+            },
+            llm_registry_size=2
+        )
+        self.patcher.start()
+        clear_llm_registry()
+
+    def tearDown(self):
+        clear_llm_registry()
+        self.patcher.stop()
+
+    def test_roles_share_models_by_path(self):
+        planner, critic, developer = (get_llm(role=role) for role in ("planner", "critic", "developer"))
+        self.assertIs(planner.model, critic.model)
+        self.assertIsNot(planner.model, developer.model)
+        self.assertEqual(planner.sampling, {"temperature": 0.1, "max_tokens": config.max_tokens})
+        self.assertEqual(critic.sampling, {"temperature": config.temperature, "max_tokens": 256})
+
+    def test_shared_model_uses_one_lock(self):
+        model = MagicMock(thread_safe=False)
+        self.assertIs(model_lock(RoleLLM(model, {"temperature": 0.1})), model_lock(RoleLLM(model, {"temperature": 0.9})))
+
+    def test_registry_is_bounded(self):
+        evictions = metrics.counter("llm.model_evictions")
+        for path in ("a.gguf", "b.gguf", "c.gguf"):
+            get_llm(model_path=path)
+        self.assertEqual(len(llm_module._registry), 2)
+        self.assertEqual(metrics.counter("llm.model_evictions") - evictions, 1)
+
+    def test_default_registry_holds_every_configured_model(self):
+        loads, evictions = metrics.counter("llm.model_loads"), metrics.counter("llm.model_evictions")
+        roles = {"planner": RoleProfile(model_path="p.gguf"), "critic": RoleProfile(model_path="c.gguf")}
+        with patch.multiple(config, roles=roles, llm_registry_size=0, cascade_model_path="tiny.gguf"), \
+                tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(config.registry_capacity(), 4)
+            # 요청마다 새 세션이어도 그래프와 모델은 프로세스에서 한 번만 준비
+            for session_id in ("s1", "s2", "s3"):
+                run_workflow("make a todo app", MemoryManager(session_id=session_id, memory_dir=tmp))
+            self.assertIs(get_workflow(tmp), get_workflow(tmp))
+        self.assertEqual(metrics.counter("llm.model_loads") - loads, 3)
+        self.assertEqual(metrics.counter("llm.model_evictions") - evictions, 0)
+
+    def test_lock_is_released_with_model(self):
+        model = type("Model", (), {"thread_safe": False})()
+        key = id(model)
+        self.assertIs(model_lock(model), model_lock(model))
+        self.assertIn(key, llm_module._model_locks)
+        del model
+        gc.collect()
+        self.assertNotIn(key, llm_module._model_locks)
+
+    def test_sampling_is_passed_per_call(self):
+        model = MagicMock()
+        RoleLLM(model, {"temperature": 0.2, "max_tokens": 64}).invoke("p", max_tokens=8)
+        model.invoke.assert_called_once_with("p", temperature=0.2, max_tokens=8)
+
+    def test_latency_is_recorded_per_role(self):
+        before = {role: len(metrics.samples(f"llm.latency_ms.{role}")) for role in ("planner", "developer", "critic")}
+        with tempfile.TemporaryDirectory() as tmp:
+            run_workflow("make a todo app", MemoryManager(session_id="s", memory_dir=tmp))
+        counts = {role: len(metrics.samples(f"llm.latency_ms.{role}")) - before[role] for role in before}
+        self.assertEqual(counts, {"planner": 1, "developer": 2, "critic": 2})
+
+class TestGenerationProfiles(unittest.TestCase):
+    def test_presets_bound_planner_and_critic(self):
+        with patch.dict(os.environ, {"CRITIC_MAX_TOKENS": "300", "CRITIC_STOP": "[]", "CRITIC_SEED": "7"}):
+            critic = config_module._load_role_profile("critic")
+            planner = config_module._load_role_profile("planner")
+            developer = config_module._load_role_profile("developer")
+        self.assertEqual((critic.max_tokens, critic.stop, critic.seed, critic.temperature), (300, [], 7, 0.1))
+        self.assertEqual(planner.stop, ROLE_PRESETS["planner"].stop)
+        self.assertIsNot(planner.stop, ROLE_PRESETS["planner"].stop)
+        self.assertTrue(planner.stop_at_json_end)
+        self.assertEqual(developer, RoleProfile())
+
+    def test_profile_is_passed_to_engine(self):
+        with patch.multiple(config, llm_backend="fake", roles={"critic": ROLE_PRESETS["critic"]}):
+            clear_llm_registry()
+            critic, developer = get_llm(role="critic"), get_llm(role="developer")
+        clear_llm_registry()
+        preset = ROLE_PRESETS["critic"]
+        self.assertEqual(critic.sampling, {
+            "temperature": preset.temperature, "max_tokens": preset.max_tokens, "top_p": preset.top_p,
+            "repeat_penalty": preset.repeat_penalty, "stop": preset.stop
+        })
+        self.assertEqual(set(developer.sampling), {"temperature", "max_tokens"})
+        # 가짜 백엔드도 엔진처럼 정지 문자열에서 멈춤
+        self.assertEqual(FakeLLM().invoke("평가 결과:", stop=[', "feedback"']), '{"score": 0.9')
+
+    def test_json_stop_ends_at_closing_brace(self):
+        pieces = ['설명 "{" ', '{"a": "}', ' {[", "b": [1, ', '{"c": 2}]', '}', '\n부연 설명']
+        stop = JsonStop(lambda ids: "".join(pieces[i] for i in ids).encode())
+        prompt = [0] * 5
+        generated = []
+        for token in range(len(pieces)):
+            generated.append(token)
+            if stop(prompt + generated, None):
+                break
+        self.assertEqual("".join(pieces[i] for i in generated), '설명 "{" {"a": "} {[", "b": [1, {"c": 2}]}')
+
+    def test_json_stop_is_attached_only_for_llama_models(self):
+        llama = MagicMock()
+        fake_llama_cpp = types.SimpleNamespace(StoppingCriteriaList=list)
+        with patch.dict(sys.modules, {"llama_cpp": fake_llama_cpp}):
+            RoleLLM(llama, {"max_tokens": 8}, stop_at_json_end=True).invoke("p")
+            RoleLLM(FakeLLM(), {"max_tokens": 8}, stop_at_json_end=True).invoke("평가 결과:")
+        criteria = llama.invoke.call_args.kwargs["stopping_criteria"]
+        self.assertIsInstance(criteria[0], JsonStop)
+        self.assertIs(criteria[0].detokenize, llama.client.detokenize)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.benchmarks.load import load_goal_mix, record_transcripts, run_loadtest
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.core.fake_llm import ReplayLLM
+    from v3.agi_agent_system.core.memory import MemoryManager
+    from v3.agi_agent_system.workflow.agent_graph import run_workflow
+except ImportError:
+    from ..benchmarks.load import load_goal_mix, record_transcripts, run_loadtest
+    from ..core.config import config
+    from ..core.fake_llm import ReplayLLM
+    from ..core.memory import MemoryManager
+    from ..workflow.agent_graph import run_workflow
+
+class TestLoadTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patcher = patch.multiple(config, plan_cache_size=0, solution_index_enabled=False)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.tmp.cleanup()
+
+    def test_goal_mix_file(self):
+        path = os.path.join(self.tmp.name, "goals.jsonl")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"goal": "a", "weight": 3}\n{"goal": "b"}\n')
+        self.assertEqual(load_goal_mix(path), [("a", 3.0), ("b", 1.0)])
+
+    def test_closed_loop_report(self):
+        report_path = os.path.join(self.tmp.name, "load.json")
+        report = run_loadtest(report_path=report_path, arrival="closed", concurrency=2, requests=4)
+        self.assertEqual(report["scenarios"], 4)
+        self.assertEqual(report["error_rate"], 0.0)
+        self.assertEqual(report["endpoints"]["POST /run"]["count"], 4)
+        self.assertEqual(report["endpoints"]["GET /sessions/{session_id}/usage"]["count"], 4)
+        self.assertEqual(report["server"]["counters"]["api.requests"], 9)
+        self.assertGreaterEqual(report["server"]["gauges"]["api.in_flight.max"], 1)
+        with open(report_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["requests"], report["requests"])
+
+    def test_open_loop_with_replayed_transcripts(self):
+        with patch.object(config, "llm_backend", "fake"):
+            run_workflow("make a todo app", MemoryManager(session_id="s", memory_dir=self.tmp.name))
+        transcripts = os.path.join(self.tmp.name, "transcripts.jsonl")
+        # 계획 1개 + 태스크 2개의 코드/평가
+        self.assertEqual(record_transcripts(self.tmp.name, transcripts), 5)
+        replay = ReplayLLM(transcripts)
+        self.assertIn("def solve", replay.invoke("...\n코드 솔루션:"))
+
+        report = run_loadtest(transcripts=transcripts, arrival="open", rate=500, requests=3, session_ratio=0)
+        self.assertEqual(report["target"], "in-process (replay)")
+        self.assertEqual(report["endpoints"]["POST /run"]["count"], 3)
+        self.assertNotIn("GET /sessions/{session_id}/usage", report["endpoints"])
+        self.assertEqual(report["error_rate"], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
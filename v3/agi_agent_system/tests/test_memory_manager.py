@@ -0,0 +1,142 @@
+import json
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.core.memory import MemoryManager, diff_stats, flush_all
+except ImportError:
+    from ..core.config import config
+    from ..core.memory import MemoryManager, diff_stats, flush_all
+
+def developer_entry(task_id, code):
+    return {"role": "developer", "content": {"task_id": task_id, "content": {"code": code, "explanation": ""}}}
+
+def critic_entry(task_id, score):
+    return {"role": "critic", "content": {"task_id": task_id, "content": {"score": score, "feedback": f"f{score}"}}}
+
+class TestMemoryCompaction(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _memory(self, keep_raw=2):
+        return MemoryManager(session_id="s", memory_dir=self.tmp.name, keep_raw=keep_raw)
+
+    def _attempts(self, memory, task_id, count):
+        for i in range(count):
+            memory.append("conversations", developer_entry(task_id, "\n".join(f"line {j}" for j in range(i + 1))))
+            memory.append("conversations", critic_entry(task_id, 0.1 * (i + 1)))
+
+    def test_old_attempts_fold_into_summary(self):
+        memory = self._memory()
+        memory.append("conversations", {"role": "planner", "content": {"task_id": 1}})
+        self._attempts(memory, 1, 3)
+        memory.flush()
+        conversations = memory.get("conversations")
+        self.assertEqual([entry["role"] for entry in conversations], ["planner", "summary", "developer", "critic"])
+        summary = conversations[1]["content"]
+        self.assertEqual(summary["attempts"], 2)
+        self.assertEqual(summary["evaluations"], 2)
+        self.assertEqual(summary["best_score"], 0.2)
+        self.assertEqual(summary["code_diffs"], [{"added": 1, "removed": 0}, {"added": 1, "removed": 0}])
+        self.assertEqual(summary["last_feedback"], "f0.2")
+
+    def test_developer_errors_are_counted(self):
+        memory = self._memory(keep_raw=1)
+        # DeveloperAgent가 LLM 응답을 파싱하지 못했을 때 기록하는 결과
+        memory.append("conversations", {"role": "developer", "content": {"task_id": 1, "content": {
+            "code": "# ERROR: Could not parse LLM response.",
+            "explanation": "DeveloperAgent: Error parsing LLM response for task 1.",
+            "test_cases": []
+        }}})
+        memory.append("conversations", critic_entry(1, 0.0))
+        memory.append("conversations", developer_entry(1, "line 0"))
+        memory.flush()
+        summary = memory.get("conversations")[0]["content"]
+        self.assertEqual(summary["attempts"], 1)
+        self.assertEqual(summary["errors"], 1)
+
+    def test_raw_entries_move_to_cold_archive(self):
+        memory = self._memory()
+        self._attempts(memory, 1, 3)
+        self._attempts(memory, 2, 1)
+        memory.flush()
+        archived = list(memory.load_archive())
+        self.assertEqual(len(archived), 4)
+        self.assertEqual(archived[0], developer_entry(1, "line 0"))
+        # 다른 태스크의 최근 항목은 그대로 유지
+        self.assertEqual(sum(1 for entry in memory.get("conversations") if entry["role"] != "summary"), 4)
+
+    def test_oversized_session_is_compacted_on_load(self):
+        memory = self._memory(keep_raw=0)
+        self._attempts(memory, 1, 5)
+        memory.flush()
+        self.assertEqual(len(memory.get("conversations")), 10)
+        reloaded = self._memory()
+        self.assertEqual(len(reloaded.get("conversations")), 3)
+        with open(reloaded.memory_file, encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)["conversations"]), 3)
+
+    def test_diff_stats(self):
+        self.assertEqual(diff_stats("a\nb\nc", "a\nc\nd\ne"), {"added": 2, "removed": 1})
+
+class TestWriteBehind(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _memory(self, durability):
+        return MemoryManager(session_id="s", memory_dir=self.tmp.name, durability=durability)
+
+    def _saved(self, memory):
+        with open(memory.memory_file, encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_buffered_appends_coalesce_into_one_write(self):
+        memory = self._memory("buffered")
+        with patch.object(memory, "_save_memory", wraps=memory._save_memory) as save:
+            for task_id in range(10):
+                memory.append("tasks", {"task_id": task_id})
+            self.assertEqual(save.call_count, 0)
+            self.assertTrue(memory.flush())
+            self.assertFalse(memory.flush())
+            self.assertEqual(save.call_count, 1)
+        self.assertEqual(len(self._saved(memory)["tasks"]), 10)
+
+    def test_buffered_flushes_on_entry_threshold(self):
+        with patch.object(config, "memory_flush_entries", 3):
+            memory = self._memory("buffered")
+            for task_id in range(3):
+                memory.append("tasks", {"task_id": task_id})
+        self.assertEqual(len(self._saved(memory)["tasks"]), 3)
+
+    def test_buffered_flushes_after_interval(self):
+        with patch.object(config, "memory_flush_interval", 0.05):
+            memory = self._memory("buffered")
+            memory.append("tasks", {"task_id": 1})
+            deadline = time.time() + 2
+            while not memory.memory_file.exists() and time.time() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(len(self._saved(memory)["tasks"]), 1)
+
+    def test_sync_writes_every_change(self):
+        memory = self._memory("sync")
+        memory.append("tasks", {"task_id": 1})
+        self.assertEqual(len(self._saved(memory)["tasks"]), 1)
+
+    def test_manual_waits_for_shutdown_flush(self):
+        memory = self._memory("manual")
+        memory.append("tasks", {"task_id": 1})
+        self.assertFalse(memory.memory_file.exists())
+        flush_all()
+        self.assertEqual(len(self._saved(memory)["tasks"]), 1)
+
+if __name__ == '__main__':
+    unittest.main()
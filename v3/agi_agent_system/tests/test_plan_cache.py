@@ -0,0 +1,180 @@
+import json
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.core import fake_llm
+    from v3.agi_agent_system.core.embedding import HashingEmbedder
+    from v3.agi_agent_system.core.fake_llm import FakeLLM, prompt_kind
+    from v3.agi_agent_system.core.llm import clear_llm_registry
+    from v3.agi_agent_system.core.plan_cache import PlanCache, get_plan_cache
+    from v3.agi_agent_system.core.memory import MemoryManager
+    from v3.agi_agent_system.agents import base as agent_base
+    from v3.agi_agent_system.agents.planner import PlannerAgent
+    from v3.agi_agent_system.workflow.agent_graph import run_workflow
+except ImportError:
+    from ..core.config import config
+    from ..core import fake_llm
+    from ..core.embedding import HashingEmbedder
+    from ..core.fake_llm import FakeLLM, prompt_kind
+    from ..core.llm import clear_llm_registry
+    from ..core.plan_cache import PlanCache, get_plan_cache
+    from ..core.memory import MemoryManager
+    from ..agents import base as agent_base
+    from ..agents.planner import PlannerAgent
+    from ..workflow.agent_graph import run_workflow
+
+PLAN = {"tasks": [{"task_id": 1, "description": "Define todo model", "priority": 5, "dependencies": []}]}
+
+fake_respond = FakeLLM._respond
+
+def rejecting_respond(self, prompt):
+    """모든 코드를 거절하는 가짜 비평가"""
+    if prompt_kind(prompt) != "evaluation":
+        return fake_respond(self, prompt)
+    self.calls += 1
+    return json.dumps({"score": 0.2, "feedback": "부족함", "improvements": [], "is_success": False})
+
+class TestPlanCache(unittest.TestCase):
+    def test_same_normalized_goal_hits(self):
+        cache = PlanCache(max_size=4)
+        cache.add("build a REST API for todos", PLAN)
+        match = cache.lookup("Create the REST API for todo")
+        self.assertIsNotNone(match)
+        self.assertTrue(match.is_hit)
+        self.assertEqual(match.plan, PLAN)
+
+    def test_similar_goal_only_seeds(self):
+        cache = PlanCache(max_size=4)
+        cache.add("build a REST API for todos", PLAN)
+        match = cache.lookup("create a todo REST API")
+        self.assertIsNotNone(match)
+        self.assertFalse(match.is_hit)
+        self.assertEqual(match.plan, PLAN)
+
+    def test_word_order_changes_meaning(self):
+        embedder = HashingEmbedder()
+        for first, second in (
+            ("convert celsius to fahrenheit", "convert fahrenheit to celsius"),
+            ("implement a stack using a queue", "implement a queue using a stack"),
+        ):
+            self.assertLess(float(embedder.embed(first) @ embedder.embed(second)), 0.9)
+            cache = PlanCache(max_size=4)
+            cache.add(first, PLAN)
+            match = cache.lookup(second)
+            self.assertTrue(match is None or not match.is_hit)
+
+    def test_unrelated_goal_misses(self):
+        cache = PlanCache(max_size=4)
+        cache.add("build a REST API for todos", PLAN)
+        self.assertIsNone(cache.lookup("write a snake game in pygame"))
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_lru_eviction(self):
+        cache = PlanCache(max_size=2)
+        cache.add("build a REST API for todos", PLAN)
+        cache.add("write a snake game in pygame", PLAN)
+        cache.lookup("build a REST API for todos")
+        cache.add("parse csv files into sqlite", PLAN)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertIsNone(cache.lookup("write a snake game in pygame"))
+        self.assertIsNotNone(cache.lookup("build a REST API for todos"))
+
+    def test_hit_rate(self):
+        cache = PlanCache(max_size=4)
+        cache.add("build a REST API for todos", PLAN)
+        cache.lookup("build a REST API for todos")
+        cache.lookup("write a snake game in pygame")
+        self.assertAlmostEqual(cache.stats()["hit_rate"], 0.5)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            PlanCache(max_size=4, path=tmp).add("build a REST API for todos", PLAN)
+            reloaded = PlanCache(max_size=4, path=tmp)
+            self.assertEqual(len(reloaded), 1)
+            self.assertTrue(reloaded.lookup("build the REST API for todos").is_hit)
+
+    def test_writers_merge_each_others_plans(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first, second = PlanCache(max_size=4, path=tmp), PlanCache(max_size=4, path=tmp)
+            first.add("build a REST API for todos", PLAN)
+            second.add("write a snake game in pygame", PLAN)
+            reloaded = PlanCache(max_size=4, path=tmp)
+            self.assertEqual(len(reloaded), 2)
+            self.assertTrue(reloaded.lookup("build a REST API for todos").is_hit)
+
+    def test_corrupt_file_is_treated_as_empty(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PlanCache(max_size=4, path=tmp)
+            with open(cache.plans_file, 'w', encoding='utf-8') as f:
+                f.write('[{"goal": "build a RE')
+            self.assertEqual(len(PlanCache(max_size=4, path=tmp)), 0)
+            cache.add("build a REST API for todos", PLAN)
+            self.assertEqual(len(PlanCache(max_size=4, path=tmp)), 1)
+
+class TestPlannerWithPlanCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.memory = MemoryManager(memory_dir=self.tmp.name)
+        self.llm = MagicMock()
+        self.llm.invoke.return_value = json.dumps(PLAN)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _planner(self, cache):
+        with patch.object(agent_base, "get_llm", return_value=self.llm):
+            return PlannerAgent(self.memory, plan_cache=cache)
+
+    def test_cache_hit_skips_llm(self):
+        cache = PlanCache(max_size=4)
+        cache.add("build a REST API for todos", PLAN)
+        state = self._planner(cache).run({"goal": "Build the REST API for todos"})
+        self.llm.invoke.assert_not_called()
+        self.assertEqual(state["tasks"][0].description, "Define todo model")
+
+    def test_miss_calls_llm_without_storing_plan(self):
+        cache = PlanCache(max_size=4)
+        self._planner(cache).run({"goal": "build a REST API for todos"})
+        self.llm.invoke.assert_called_once()
+        # 파싱된 계획은 태스크가 수락되기 전까지 캐시에 넣지 않음
+        self.assertEqual(len(cache), 0)
+
+    def test_seed_passes_reference_plan(self):
+        cache = PlanCache(max_size=4, seed_threshold=0.5)
+        cache.add("build a REST API for todos", PLAN)
+        self._planner(cache).run({"goal": "create a todo REST API"})
+        prompt = self.llm.invoke.call_args[0][0]
+        self.assertIn("Define todo model", prompt)
+
+class TestPlanCacheAdmission(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patcher = patch.multiple(config, llm_backend="fake", plan_cache_size=4, solution_index_enabled=False)
+        self.patcher.start()
+        clear_llm_registry()
+
+    def tearDown(self):
+        clear_llm_registry()
+        self.patcher.stop()
+        self.tmp.cleanup()
+
+    def _run(self, respond):
+        with patch.object(fake_llm.FakeLLM, "_respond", respond):
+            run_workflow("make a todo app", MemoryManager(session_id="s", memory_dir=self.tmp.name))
+        return get_plan_cache(self.tmp.name)
+
+    def test_plan_is_cached_after_all_tasks_are_accepted(self):
+        cache = self._run(fake_respond)
+        self.assertTrue(cache.lookup("make a todo app").is_hit)
+
+    def test_rejected_plan_is_not_cached(self):
+        with patch.object(config, "max_iterations", 1):
+            cache = self._run(rejecting_respond)
+        self.assertEqual(len(cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+import httpx
+from fastapi import FastAPI
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.core.llm import prefault_model
+    from v3.agi_agent_system.core.procmem import format_bytes, memory_usage, worker_capacity
+    from v3.agi_agent_system.interface import api, prefork
+    from v3.agi_agent_system.interface.daemon import PACKAGE, package_env
+except ImportError:
+    from ..core.config import config
+    from ..core.llm import prefault_model
+    from ..core.procmem import format_bytes, memory_usage, worker_capacity
+    from ..interface import api, prefork
+    from ..interface.daemon import PACKAGE, package_env
+
+HAS_PROC = os.path.exists("/proc/self/smaps_rollup") or os.path.exists("/proc/self/smaps")
+
+class TestProcessMemory(unittest.TestCase):
+    @unittest.skipUnless(HAS_PROC, "requires /proc")
+    def test_memory_usage_splits_shared_and_private(self):
+        usage = memory_usage()
+        self.assertGreater(usage["rss"], 0)
+        self.assertEqual(usage["rss"], usage["shared"] + usage["private"])
+        self.assertEqual(memory_usage(pid=2 ** 30), {})
+
+    def test_worker_capacity(self):
+        gb = 1024 ** 3
+        workers = [{"shared": 40 * gb, "private": 2 * gb}, {"shared": 40 * gb, "private": 2 * gb}]
+        # 64GB: 공유 가중치 40GB는 한 번, 워커마다 전용 2GB
+        self.assertEqual(worker_capacity(workers, 64 * gb), 12)
+        self.assertIsNone(worker_capacity([{}], 64 * gb))
+        self.assertEqual(format_bytes(1536 * 1024), "1.5MB")
+
+    def test_prefault_model_maps_file_once(self):
+        with tempfile.NamedTemporaryFile(suffix=".gguf") as f:
+            f.write(b"\0" * 10000)
+            f.flush()
+            self.assertEqual(prefault_model(f.name), 10000)
+            self.assertEqual(prefault_model(f.name), 10000)
+
+class TestSessionArchiveTask(unittest.TestCase):
+    def _archive_started(self, archive_sessions):
+        started = []
+
+        async def fake_archive(interval):
+            started.append(interval)
+
+        async def run_lifespan():
+            app = FastAPI()
+            if archive_sessions is not None:
+                app.state.archive_sessions = archive_sessions
+            async with api.lifespan(app):
+                await asyncio.sleep(0)
+
+        with patch.multiple(config, session_ttl=60, session_archive_interval=5), \
+                patch.object(api, "archive_idle_sessions", fake_archive):
+            asyncio.run(run_lifespan())
+        return started
+
+    def test_only_designated_worker_archives(self):
+        self.assertEqual(self._archive_started(None), [5])
+        self.assertEqual(self._archive_started(True), [5])
+        self.assertEqual(self._archive_started(False), [])
+
+@unittest.skipUnless(HAS_PROC and hasattr(os, "fork"), "requires fork and /proc")
+class TestPreforkServer(unittest.TestCase):
+    def test_workers_serve_and_report_memory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            report_path = os.path.join(tmp, "memory.json")
+            process = subprocess.Popen(
+                [sys.executable, "-m", f"{PACKAGE}.main", "--mode", "api", "--workers", "2",
+                 "--host", "127.0.0.1", "--port", "0", "--report", report_path],
+                env=package_env({**os.environ, "LLM_BACKEND": "fake", "PYTHONWARNINGS": "ignore"}),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+            try:
+                url = None
+                deadline = time.monotonic() + 60
+                while url is None and time.monotonic() < deadline:
+                    line = process.stdout.readline()
+                    self.assertNotEqual(line, "", "prefork server exited")
+                    if "pre-fork" in line:
+                        url = line.split()[3]
+                self.assertIsNotNone(url)
+                for _ in range(20):
+                    response = httpx.get(f"{url}/metrics")
+                    self.assertEqual(response.status_code, 200)
+                with open(report_path, encoding='utf-8') as f:
+                    report = json.load(f)
+                self.assertEqual(len(report["workers"]), 2)
+                for usage in report["workers"].values():
+                    # fork 전에 임포트한 스택은 워커들이 공유
+                    self.assertGreater(usage["shared"], usage["private"])
+            finally:
+                process.send_signal(signal.SIGTERM)
+                self.assertEqual(process.wait(timeout=30), 0)
+                process.stdout.close()
+
+if __name__ == '__main__':
+    unittest.main()
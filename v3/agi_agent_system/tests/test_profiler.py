@@ -0,0 +1,100 @@
+import cProfile
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.core.profiler import SamplingProfiler, stacks_from_cprofile, to_collapsed, to_speedscope
+    from v3.agi_agent_system.interface.api import app
+except ImportError:
+    from ..core.config import config
+    from ..core.profiler import SamplingProfiler, stacks_from_cprofile, to_collapsed, to_speedscope
+    from ..interface.api import app
+
+def busy_leaf(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+def busy_root(seconds):
+    busy_leaf(seconds)
+
+class TestProfiler(unittest.TestCase):
+    def test_sampling_profiler_sees_other_threads(self):
+        profiler = SamplingProfiler(interval=0.001)
+        worker = threading.Thread(target=busy_root, args=(0.3,), name="busy")
+        worker.start()
+        profiler.start(duration=0.2)
+        worker.join()
+        collapsed = to_collapsed(profiler.stop(), scale=1000)
+        self.assertGreater(profiler.samples, 0)
+        self.assertRegex(collapsed, r"thread:busy;.*busy_root \(test_profiler.py:\d+\);busy_leaf")
+        self.assertNotIn("sampling-profiler", collapsed)
+
+    def test_cprofile_stacks_follow_callers(self):
+        profile = cProfile.Profile()
+        profile.enable()
+        busy_root(0.02)
+        profile.disable()
+        stacks = stacks_from_cprofile(profile)
+        leaf = [stack for stack in stacks if stack[-1][0] == "busy_leaf"]
+        self.assertEqual(len(leaf), 1)
+        self.assertEqual(leaf[0][-2][0], "busy_root")
+
+    def test_speedscope_shares_frames(self):
+        frame_a, frame_b = ("a", "x.py", 1), ("b", "x.py", 5)
+        document = to_speedscope({(frame_a,): 1.0, (frame_a, frame_b): 2.0}, "p")
+        self.assertEqual(len(document["shared"]["frames"]), 2)
+        self.assertEqual(document["profiles"][0]["samples"], [[0], [0, 1]])
+        self.assertEqual(document["profiles"][0]["endValue"], 3.0)
+
+class TestAdminApi(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patcher = patch.multiple(
+            config, llm_backend="fake", plan_cache_size=0, solution_index_enabled=False, admin_token="secret"
+        )
+        self.patcher.start()
+        self.client = TestClient(app)
+        self.admin = {"X-Admin-Token": "secret"}
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.tmp.cleanup()
+
+    def test_admin_is_hidden_when_disabled(self):
+        with patch.object(config, "admin_token", ""):
+            self.assertEqual(self.client.get("/admin/profiler", headers=self.admin).status_code, 404)
+        self.assertEqual(self.client.get("/admin/profiler", headers={"X-Admin-Token": "wrong"}).status_code, 403)
+
+    def test_request_profile_header(self):
+        response = self.client.post(
+            "/run",
+            json={"goal": "make a todo app", "memory_dir": self.tmp.name},
+            headers={**self.admin, "X-Profile": "1"}
+        )
+        self.assertEqual(response.status_code, 200)
+        profile_id = response.headers["X-Profile-Id"]
+        collapsed = self.client.get(f"/admin/profiles/{profile_id}", headers=self.admin)
+        self.assertIn("run_workflow", collapsed.text)
+        speedscope = self.client.get(f"/admin/profiles/{profile_id}?format=speedscope", headers=self.admin).json()
+        self.assertEqual(speedscope["profiles"][0]["type"], "sampled")
+        # 토큰 없이 헤더만 붙이면 측정하지 않음
+        plain = self.client.post("/run", json={"goal": "make a todo app", "memory_dir": self.tmp.name}, headers={"X-Profile": "1"})
+        self.assertNotIn("X-Profile-Id", plain.headers)
+
+    def test_sampling_profiler_start_and_stop(self):
+        started = self.client.post("/admin/profiler/start?seconds=5&interval=0.001", headers=self.admin)
+        self.assertTrue(started.json()["running"])
+        self.assertEqual(self.client.post("/admin/profiler/start", headers=self.admin).status_code, 409)
+        time.sleep(0.05)
+        stopped = self.client.post("/admin/profiler/stop?format=speedscope", headers=self.admin).json()
+        self.assertTrue(stopped["profiles"][0]["samples"])
+        self.assertFalse(self.client.get("/admin/profiler", headers=self.admin).json()["running"])
+
+if __name__ == '__main__':
+    unittest.main()
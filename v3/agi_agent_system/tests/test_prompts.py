@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.agents.critic import CriticAgent
+    from v3.agi_agent_system.agents.planner import PLANNER_PROMPT, PlannerAgent, TaskPlan
+    from v3.agi_agent_system.benchmarks import prompts as prompts_benchmark
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.core.llm import clear_llm_registry
+    from v3.agi_agent_system.core.memory import MemoryManager
+    from v3.agi_agent_system.core.metrics import metrics
+    from v3.agi_agent_system.core.prompts import clear_prompt_registry, compile_prompt
+except ImportError:
+    from ..agents.critic import CriticAgent
+    from ..agents.planner import PLANNER_PROMPT, PlannerAgent, TaskPlan
+    from ..benchmarks import prompts as prompts_benchmark
+    from ..core.config import config
+    from ..core.llm import clear_llm_registry
+    from ..core.memory import MemoryManager
+    from ..core.metrics import metrics
+    from ..core.prompts import clear_prompt_registry, compile_prompt
+
+class TestPromptRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patcher = patch.multiple(config, llm_backend="fake", plan_cache_size=0, solution_index_enabled=False)
+        self.patcher.start()
+        clear_llm_registry()
+        clear_prompt_registry()
+
+    def tearDown(self):
+        clear_llm_registry()
+        self.patcher.stop()
+        self.tmp.cleanup()
+
+    def test_agents_share_compiled_prompt(self):
+        compiled = metrics.counter("prompts.compiled")
+        memory = MemoryManager(session_id="s", memory_dir=self.tmp.name)
+        first, second = PlannerAgent(memory), PlannerAgent(memory)
+        self.assertIs(first.prompt_template, second.prompt_template)
+        self.assertIs(first.output_parser, second.output_parser)
+        self.assertIsNot(CriticAgent(memory).output_parser, first.output_parser)
+        self.assertEqual(metrics.counter("prompts.compiled") - compiled, 2)
+
+    def test_changed_template_is_recompiled(self):
+        original = compile_prompt(PLANNER_PROMPT, TaskPlan)
+        changed = compile_prompt(PLANNER_PROMPT + "\n", TaskPlan)
+        self.assertIsNot(original, changed)
+        self.assertNotEqual(original.key, changed.key)
+        self.assertIs(compile_prompt(PLANNER_PROMPT, TaskPlan), original)
+        self.assertEqual(original.input_variables, ("goal", "reference_plan", "format_instructions"))
+
+    def test_renders_like_prompt_template(self):
+        for name, (template, output_model, inputs) in prompts_benchmark.TEMPLATES.items():
+            expected = prompts_benchmark.uncached_setup(template, output_model).format(**inputs)
+            self.assertEqual(compile_prompt(template, output_model).format(**inputs), expected, name)
+        with self.assertRaises(KeyError):
+            compile_prompt(PLANNER_PROMPT, TaskPlan).format(goal="목표")
+
+    def test_benchmark_reports_each_template(self):
+        report = prompts_benchmark.run_benchmark(number=10, repeat=1)
+        self.assertEqual(set(report), {"planner", "developer", "critic"})
+        for timing in report.values():
+            self.assertEqual(set(timing), {"setup_uncached_us", "setup_cached_us", "render_langchain_us", "render_compiled_us"})
+            self.assertTrue(all(value > 0 for value in timing.values()))
+
+if __name__ == '__main__':
+    unittest.main()
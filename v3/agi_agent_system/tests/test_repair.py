@@ -0,0 +1,125 @@
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.core import fake_llm
+    from v3.agi_agent_system.core.fake_llm import FakeLLM, prompt_kind
+    from v3.agi_agent_system.core.llm import clear_llm_registry
+    from v3.agi_agent_system.core.memory import MemoryManager
+    from v3.agi_agent_system.core.metrics import metrics
+    from v3.agi_agent_system.core.repair import coerce_ids, repair_json
+    from v3.agi_agent_system.interface.cli import collect_results
+    from v3.agi_agent_system.workflow.agent_graph import run_workflow
+except ImportError:
+    from ..core.config import config
+    from ..core import fake_llm
+    from ..core.fake_llm import FakeLLM, prompt_kind
+    from ..core.llm import clear_llm_registry
+    from ..core.memory import MemoryManager
+    from ..core.metrics import metrics
+    from ..core.repair import coerce_ids, repair_json
+    from ..interface.cli import collect_results
+    from ..workflow.agent_graph import run_workflow
+
+fake_respond = FakeLLM._respond
+
+CODE = {"code": "def solve():\n    return True", "explanation": "설명", "test_cases": ["assert solve() is True"]}
+
+def fenced_respond(self, prompt):
+    """코드 펜스와 설명 문장, 끝 쉼표가 붙은 코드 응답"""
+    if prompt_kind(prompt) != "code":
+        return fake_respond(self, prompt)
+    self.calls += 1
+    body = json.dumps(CODE, ensure_ascii=False, indent=2)[:-1] + ",\n}"
+    return f"코드입니다:\n```json\n{body}\n```\n도움이 되었길 바랍니다."
+
+def quoted_respond(self, prompt):
+    """결정적으로 고칠 수 없는 작은따옴표 JSON, 복구 프롬프트에는 올바른 JSON"""
+    kind = prompt_kind(prompt)
+    if kind == "code":
+        self.calls += 1
+        return str(CODE)
+    if kind == "repair":
+        self.calls += 1
+        return json.dumps(CODE, ensure_ascii=False)
+    return fake_respond(self, prompt)
+
+def truncated_respond(self, prompt):
+    """생성이 끊기고 의존성을 문자열로 쓴 계획 응답"""
+    if prompt_kind(prompt) != "plan":
+        return fake_respond(self, prompt)
+    self.calls += 1
+    return (
+        '{"tasks": [{"task_id": 1, "description": "설계", "priority": 5, "dependencies": [],},'
+        ' {"task_id": 2, "description": "구현", "priority": 4, "dependencies": ["tasks.1"]}, {"task_id": 3,'
+        ' "priority": 3, "dependencies": [2], "description": "테스트 작성'
+    )
+
+class TestRepairJson(unittest.TestCase):
+    def test_strips_fences_and_trailing_commas(self):
+        text = '설명\n```json\n{"a": [1, 2,], "b": {"c": True,},}\n```\n끝'
+        self.assertEqual(json.loads(repair_json(text)), {"a": [1, 2], "b": {"c": True}})
+
+    def test_escapes_newlines_and_closes_truncated_output(self):
+        text = '{"code": "def f():\n\treturn 1", "test_cases": ["assert f() == 1", "assert f'
+        self.assertEqual(json.loads(repair_json(text)), {"code": "def f():\n\treturn 1", "test_cases": ["assert f() == 1", "assert f"]})
+        self.assertEqual(json.loads(repair_json('{"a": 1, "b": 2, ')), {"a": 1, "b": 2})
+
+    def test_coerces_dependency_ids(self):
+        text = '{"tasks": [{"task_id": 2, "dependencies": ["tasks.1", 3, "없음"]}]}'
+        self.assertEqual(json.loads(repair_json(text))["tasks"][0]["dependencies"], [1, 3])
+        self.assertEqual(coerce_ids(["task 12", 4.0, True]), [12, 4])
+
+    def test_returns_none_without_object(self):
+        self.assertIsNone(repair_json("JSON이 아닌 응답"))
+        self.assertIsNone(repair_json("{'code': 'x'}"))
+
+class TestOutputRepair(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patcher = patch.multiple(
+            config, llm_backend="fake", plan_cache_size=0, solution_index_enabled=False, max_iterations=2
+        )
+        self.patcher.start()
+        clear_llm_registry()
+
+    def tearDown(self):
+        clear_llm_registry()
+        self.patcher.stop()
+        self.tmp.cleanup()
+
+    def _run(self, respond):
+        with patch.object(fake_llm.FakeLLM, "_respond", respond):
+            final_state = run_workflow("make a todo app", MemoryManager(session_id="s", memory_dir=self.tmp.name))
+        return final_state, collect_results(final_state)
+
+    def test_deterministic_repair_needs_no_extra_call(self):
+        repaired, calls = metrics.counter("repair.deterministic.developer"), metrics.counter("llm.calls.developer")
+        _, results = self._run(fenced_respond)
+        self.assertEqual([result["code"] for result in results], [CODE["code"]] * 2)
+        self.assertEqual(metrics.counter("repair.deterministic.developer") - repaired, 2)
+        self.assertEqual(metrics.counter("llm.calls.developer") - calls, 2)
+
+    def test_llm_repair_reemits_json(self):
+        repaired, calls = metrics.counter("repair.llm.developer"), metrics.counter("llm.calls.developer")
+        _, results = self._run(quoted_respond)
+        self.assertEqual([result["code"] for result in results], [CODE["code"]] * 2)
+        self.assertEqual(metrics.counter("repair.llm.developer") - repaired, 2)
+        self.assertEqual(metrics.counter("llm.calls.developer") - calls, 4)
+
+    def test_planner_repairs_truncated_plan(self):
+        final_state, _ = self._run(truncated_respond)
+        tasks = final_state["tasks"]
+        self.assertEqual([task.description for task in tasks], ["설계", "구현", "테스트 작성"])
+        self.assertEqual(tasks[1].dependencies, [1])
+
+    def test_disabled_repair_records_error(self):
+        with patch.object(config, "output_repair_enabled", False):
+            _, results = self._run(fenced_respond)
+        self.assertTrue(all(result["code"].startswith("# ERROR") for result in results))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.core import fake_llm
+    from v3.agi_agent_system.core.fake_llm import FakeLLM, prompt_kind
+    from v3.agi_agent_system.core.llm import clear_llm_registry
+    from v3.agi_agent_system.core.memory import MemoryManager
+    from v3.agi_agent_system.core.metrics import metrics
+    from v3.agi_agent_system.core.revision import PatchError, apply_revision
+    from v3.agi_agent_system.workflow.agent_graph import run_workflow
+except ImportError:
+    from ..core.config import config
+    from ..core import fake_llm
+    from ..core.fake_llm import FakeLLM, prompt_kind
+    from ..core.llm import clear_llm_registry
+    from ..core.memory import MemoryManager
+    from ..core.metrics import metrics
+    from ..core.revision import PatchError, apply_revision
+    from ..workflow.agent_graph import run_workflow
+
+CODE = "def area(w, h):\n    result = w * h\n\n    return result\n\ndef perimeter(w, h):\n    return 2 * (w + h)\n"
+
+fake_respond = FakeLLM._respond
+
+def reviewing_respond(self, prompt):
+    """피드백이 반영되기 전의 코드에는 낮은 점수를 주는 가짜 비평가"""
+    kind = prompt_kind(prompt)
+    if kind != "evaluation" or "피드백 반영" in prompt.split("코드 설명:")[0]:
+        return fake_respond(self, prompt)
+    self.calls += 1
+    return json.dumps({"score": 0.4, "feedback": "주석이 없음", "improvements": ["주석 추가"], "is_success": False})
+
+def broken_revision_respond(self, prompt):
+    """수정 모드에서 기존 코드에 없는 줄을 고치려는 개발자"""
+    if prompt_kind(prompt) == "revision":
+        self.calls += 1
+        return "<<<<<<< SEARCH\nnot in code\n=======\nx\n>>>>>>> REPLACE"
+    return reviewing_respond(self, prompt)
+
+class TestApplyRevision(unittest.TestCase):
+    def test_edit_blocks(self):
+        response = (
+            "```\n<<<<<<< SEARCH\n    result = w * h\n=======\n    result = abs(w * h)\n>>>>>>> REPLACE\n"
+            "<<<<<<< SEARCH\n    return 2 * (w + h)\n=======\n    return 2 * abs(w + h)\n>>>>>>> REPLACE\n```\n"
+            "설명: 음수 처리"
+        )
+        revised, explanation = apply_revision(CODE, response)
+        self.assertEqual(revised, CODE.replace("w * h", "abs(w * h)").replace("(w + h)", "abs(w + h)"))
+        self.assertEqual(explanation, "음수 처리")
+
+    def test_unified_diff_with_shifted_line_numbers(self):
+        diff = "--- a/code.py\n+++ b/code.py\n@@ -9,2 +9,2 @@ def perimeter\n def perimeter(w, h):\n-    return 2 * (w + h)\n+    return (w + h) * 2\n"
+        revised, explanation = apply_revision(CODE, diff)
+        self.assertEqual(revised, CODE.replace("2 * (w + h)", "(w + h) * 2"))
+        self.assertIsNone(explanation)
+
+    def test_rejects_unappliable_edits(self):
+        ambiguous = "<<<<<<< SEARCH\n(w, h):\n=======\n(w, h=1):\n>>>>>>> REPLACE"
+        broken = "<<<<<<< SEARCH\n    return result\n=======\n    return (result\n>>>>>>> REPLACE"
+        for response in (ambiguous, broken, "코드를 다시 썼습니다.", "@@ -1,1 +1,1 @@\n-missing\n+line\n"):
+            with self.assertRaises(PatchError):
+                apply_revision(CODE, response)
+
+class TestRevisionMode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patcher = patch.multiple(
+            config, llm_backend="fake", plan_cache_size=0, solution_index_enabled=False,
+            max_iterations=3, revision_min_chars=0
+        )
+        self.patcher.start()
+        clear_llm_registry()
+
+    def tearDown(self):
+        clear_llm_registry()
+        self.patcher.stop()
+        self.tmp.cleanup()
+
+    def _run(self, respond):
+        with patch.object(fake_llm.FakeLLM, "_respond", respond):
+            final_state = run_workflow("make a todo app", MemoryManager(session_id="s", memory_dir=self.tmp.name))
+        return [final_state["results"][i] for i in range(len(final_state["tasks"]))]
+
+    def test_retry_applies_edits_to_previous_code(self):
+        applied = metrics.counter("revision.applied")
+        results = self._run(reviewing_respond)
+        self.assertEqual([result["code"] for result in results], ["def solve():\n    return True\n# 피드백 반영"] * 2)
+        self.assertEqual([result["source"] for result in results], ["revision"] * 2)
+        self.assertEqual(results[0]["explanation"], "가짜 백엔드가 피드백을 반영했습니다.")
+        self.assertEqual(metrics.counter("revision.applied") - applied, 2)
+
+    def test_unappliable_revision_falls_back_to_regeneration(self):
+        fallbacks = metrics.counter("revision.fallbacks")
+        results = self._run(broken_revision_respond)
+        self.assertTrue(all(result["code"] == "def solve():\n    return True" for result in results))
+        self.assertTrue(all("source" not in result for result in results))
+        # 태스크마다 두 번의 재시도 모두 수정에 실패하고 전체를 다시 생성
+        self.assertEqual(metrics.counter("revision.fallbacks") - fallbacks, 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import patch
+import httpx
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.core.llm import clear_llm_registry
+    from v3.agi_agent_system.core.metrics import metrics
+    from v3.agi_agent_system.core.singleflight import SingleFlight, coalesce_key, normalize_goal
+    from v3.agi_agent_system.interface import api
+except ImportError:
+    from ..core.config import config
+    from ..core.llm import clear_llm_registry
+    from ..core.metrics import metrics
+    from ..core.singleflight import SingleFlight, coalesce_key, normalize_goal
+    from ..interface import api
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+
+    async def work(self, result="done", delay=0.05, fail=False):
+        self.calls += 1
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("boom")
+        return result
+
+    def test_goal_normalization(self):
+        self.assertEqual(normalize_goal("  Make a  TODO app. "), normalize_goal("make a todo app"))
+        self.assertEqual(coalesce_key("Make a TODO app", memory_dir="m"), coalesce_key("make a todo app", memory_dir="m"))
+        self.assertNotEqual(coalesce_key("make a todo app", memory_dir="m"), coalesce_key("make a todo app", memory_dir="n"))
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight(prefix="test.flight")
+        joined = metrics.counter("test.flight.joined")
+
+        async def scenario():
+            return await asyncio.gather(*(flight.do("k", self.work) for _ in range(3)))
+
+        self.assertEqual(asyncio.run(scenario()), ["done"] * 3)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(metrics.counter("test.flight.joined") - joined, 2)
+
+    def test_completed_result_is_reused_within_window(self):
+        async def scenario(window):
+            flight = SingleFlight(reuse_window=window, prefix="test.flight")
+            await flight.do("k", self.work)
+            return await flight.do("k", lambda: self.work("again"))
+
+        self.assertEqual(asyncio.run(scenario(60)), "done")
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(asyncio.run(scenario(0)), "again")
+
+    def test_failure_reaches_all_callers_and_is_not_reused(self):
+        flight = SingleFlight(reuse_window=60, prefix="test.flight")
+
+        async def scenario():
+            results = await asyncio.gather(
+                *(flight.do("k", lambda: self.work(fail=True)) for _ in range(2)), return_exceptions=True
+            )
+            retry = await flight.do("k", self.work)
+            return results, retry
+
+        results, retry = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(retry, "done")
+        self.assertEqual(self.calls, 2)
+
+class TestApiCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patcher = patch.multiple(
+            config, llm_backend="fake", plan_cache_size=0, solution_index_enabled=False, fake_llm_latency_ms=20
+        )
+        self.patcher.start()
+        clear_llm_registry()
+
+    def tearDown(self):
+        clear_llm_registry()
+        self.patcher.stop()
+        self.tmp.cleanup()
+
+    def test_duplicate_goals_run_once(self):
+        leaders, planner_calls = metrics.counter("coalesce.leaders"), metrics.counter("llm.calls.planner")
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=api.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                body = {"goal": "make a todo app", "memory_dir": self.tmp.name}
+                duplicate = {"goal": "Make a TODO app.", "memory_dir": self.tmp.name}
+                return await asyncio.gather(client.post("/run", json=body), client.post("/run", json=duplicate))
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(metrics.counter("coalesce.leaders") - leaders, 1)
+        self.assertEqual(metrics.counter("llm.calls.planner") - planner_calls, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.benchmarks import importtime
+except ImportError:
+    from ..benchmarks import importtime
+
+class TestStartupImports(unittest.TestCase):
+    def _imported_heavy_modules(self, module):
+        modules = importtime.parse_importtime(
+            importtime._run(["-X", "importtime", "-c", f"import {module}"]).stderr
+        )
+        return {name.split(".")[0] for name in modules} & set(importtime.HEAVY_MODULES)
+
+    def test_main_does_not_import_heavy_stacks(self):
+        self.assertEqual(self._imported_heavy_modules("agi_agent_system.main"), set())
+
+    def test_cli_does_not_import_heavy_stacks(self):
+        self.assertEqual(self._imported_heavy_modules("agi_agent_system.interface.cli"), set())
+
+    def test_help_exits_cleanly(self):
+        result = importtime._run(["-m", "agi_agent_system.main", "--help"])
+        self.assertIn("--mode", result.stdout)
+
+class TestParseImportTime(unittest.TestCase):
+    def test_parse(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   argparse\n"
+            "import time:        30 |        150 | agi_agent_system.main\n"
+        )
+        modules = importtime.parse_importtime(stderr)
+        self.assertEqual(modules["agi_agent_system.main"], {"self_us": 30, "cumulative_us": 150})
+        self.assertEqual(len(modules), 2)
+
+if __name__ == '__main__':
+    unittest.main()
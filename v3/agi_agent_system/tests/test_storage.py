@@ -0,0 +1,90 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import unittest
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.core.memory import MemoryManager
+    from v3.agi_agent_system.core.storage import atomic_write_json, read_json
+except ImportError:
+    from ..core.memory import MemoryManager
+    from ..core.storage import atomic_write_json, read_json
+
+WORKERS = 8
+APPENDS = 25
+
+def hammer(memory_dir, worker, durability):
+    """같은 세션에 항목을 추가하는 작업자 (스레드/프로세스 공용)"""
+    memory = MemoryManager(session_id="shared", memory_dir=memory_dir, keep_raw=0, durability=durability)
+    for i in range(APPENDS):
+        memory.append("tasks", {"worker": worker, "i": i})
+    memory.flush()
+
+class TestConcurrentSessionStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _assert_all_appends_kept(self, workers):
+        data = read_json(os.path.join(self.tmp.name, "shared.json"))
+        seen = {(task["worker"], task["i"]) for task in data["tasks"]}
+        self.assertEqual(len(data["tasks"]), workers * APPENDS)
+        self.assertEqual(seen, {(w, i) for w in range(workers) for i in range(APPENDS)})
+        self.assertEqual([name for name in os.listdir(self.tmp.name) if name.endswith(".tmp")], [])
+
+    def _run_threads(self, durability):
+        threads = [
+            threading.Thread(target=hammer, args=(self.tmp.name, worker, durability))
+            for worker in range(WORKERS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_threads_with_sync_durability(self):
+        self._run_threads("sync")
+        self._assert_all_appends_kept(WORKERS)
+
+    def test_threads_with_buffered_durability(self):
+        self._run_threads("buffered")
+        self._assert_all_appends_kept(WORKERS)
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "fork가 필요합니다")
+    def test_processes_with_sync_durability(self):
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(target=hammer, args=(self.tmp.name, worker, "sync"))
+            for worker in range(WORKERS // 2)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+        self._assert_all_appends_kept(WORKERS // 2)
+
+    def test_stale_instance_merges_instead_of_overwriting(self):
+        first = MemoryManager(session_id="s", memory_dir=self.tmp.name, durability="manual")
+        second = MemoryManager(session_id="s", memory_dir=self.tmp.name, durability="manual")
+        first.append("tasks", {"task_id": 1})
+        second.append("tasks", {"task_id": 2})
+        first.flush()
+        second.flush()
+        self.assertEqual(second.get("tasks"), [{"task_id": 1}, {"task_id": 2}])
+        self.assertEqual(second.memory["metadata"]["version"], 2)
+
+    def test_atomic_write_replaces_file(self):
+        path = os.path.join(self.tmp.name, "data.json")
+        atomic_write_json(path, {"a": 1})
+        atomic_write_json(path, {"a": 2}, fsync=True)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {"a": 2})
+        self.assertEqual(os.listdir(self.tmp.name), ["data.json"])
+
+if __name__ == '__main__':
+    unittest.main()
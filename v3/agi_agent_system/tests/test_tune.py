@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.benchmarks.tune import candidate_threads, run_tune, tune
+    from v3.agi_agent_system.core import config as config_module
+    from v3.agi_agent_system.core.llm import llama_params
+except ImportError:
+    from ..benchmarks.tune import candidate_threads, run_tune, tune
+    from ..core import config as config_module
+    from ..core.llm import llama_params
+
+def synthetic_measure(n_threads, n_threads_batch, n_batch):
+    """생성은 6스레드, 프롬프트 평가는 8스레드/배치 256에서 가장 빠른 머신"""
+    return {
+        "gen_tps": 20.0 - abs(n_threads - 6),
+        "prompt_tps": 200.0 - 5 * abs(n_threads_batch - 8) - abs(n_batch - 256) / 64,
+    }
+
+class TestTune(unittest.TestCase):
+    def test_candidate_threads(self):
+        self.assertEqual(candidate_threads(12), [1, 2, 4, 6, 8, 12])
+        self.assertEqual(candidate_threads(1), [1])
+
+    def test_tune_picks_fastest_settings(self):
+        report = tune(synthetic_measure, [2, 4, 6, 8], [128, 256, 1024], n_batch=512)
+        self.assertEqual(report["settings"], {"n_threads": 6, "n_threads_batch": 8, "n_batch": 256})
+        # 1단계 4회 + 2단계 3회
+        self.assertEqual(len(report["results"]), 7)
+
+    def test_profile_becomes_config_default(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            run_tune(path, [4, 6, 8], [256], measure=synthetic_measure)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f)["machine"]["cpu_count"], os.cpu_count())
+            with patch.dict(os.environ, {"LLM_PROFILE": path, "LLM_N_BATCH": "64"}):
+                loaded = config_module.load_config()
+        self.assertEqual((loaded.n_threads, loaded.n_threads_batch), (6, 8))
+        # 환경 변수가 프로파일보다 우선
+        self.assertEqual(loaded.n_batch, 64)
+
+    def test_llama_params_follow_config(self):
+        with patch.multiple(config_module.config, n_threads=0, n_threads_batch=4, n_gpu_layers=0, flash_attn=True):
+            params = llama_params()
+        self.assertNotIn("n_threads", params)
+        self.assertEqual(params["n_threads_batch"], 4)
+        self.assertEqual(params["n_gpu_layers"], 0)
+        self.assertTrue(params["flash_attn"])
+
+if __name__ == '__main__':
+    unittest.main()
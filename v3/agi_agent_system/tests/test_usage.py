@@ -0,0 +1,118 @@
+import asyncio
+import sys
+import tempfile
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+# Try to make imports robust for different execution contexts
+try:
+    from v3.agi_agent_system.agents.base import BaseAgent
+    from v3.agi_agent_system.agents.planner import PLANNER_PROMPT, TaskPlan
+    from v3.agi_agent_system.core.config import config
+    from v3.agi_agent_system.core.lifecycle import get_session_archive
+    from v3.agi_agent_system.core.llm import engine_timings, model_lock
+    from v3.agi_agent_system.core.memory import MemoryManager
+    from v3.agi_agent_system.core.usage import format_usage, summarize_usage, usage_entry
+    from v3.agi_agent_system.interface.api import session_usage_api
+    from v3.agi_agent_system.workflow.agent_graph import run_workflow
+except ImportError:
+    from ..agents.base import BaseAgent
+    from ..agents.planner import PLANNER_PROMPT, TaskPlan
+    from ..core.config import config
+    from ..core.lifecycle import get_session_archive
+    from ..core.llm import engine_timings, model_lock
+    from ..core.memory import MemoryManager
+    from ..core.usage import format_usage, summarize_usage, usage_entry
+    from ..interface.api import session_usage_api
+    from ..workflow.agent_graph import run_workflow
+
+class CountingModel:
+    """토큰 수를 고정값으로 세고, 셀 때 자기 잠금을 쥐고 있었는지 기록하는 모델"""
+    thread_safe = False
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.locked = []
+
+    def invoke(self, prompt):
+        return "response"
+
+    def get_num_tokens(self, text):
+        self.locked.append(model_lock(self).locked())
+        return self.tokens
+
+class TestUsageSummary(unittest.TestCase):
+    def test_entries_are_grouped(self):
+        summary = summarize_usage([
+            usage_entry("planner", 100, 20, 5.0, 10.0),
+            usage_entry("developer", 300, 50, 15.0, 40.0, task_id=1, iteration=0),
+            usage_entry("critic", 400, 30, 20.0, 25.0, task_id=1, iteration=0),
+            usage_entry("developer", 500, 50, 25.0, 40.0, task_id=1, iteration=1),
+        ])
+        self.assertEqual(summary["total"]["calls"], 4)
+        self.assertEqual(summary["total"]["prompt_tokens"], 1300)
+        self.assertEqual(summary["by_agent"]["developer"]["max_prompt_tokens"], 500)
+        self.assertEqual(set(summary["by_task"]), {"plan", "1"})
+        self.assertEqual(summary["by_iteration"]["1/0"]["completion_tokens"], 80)
+        self.assertIn("developer", format_usage(summary))
+
+    def test_llama_cpp_timings_are_read_from_context(self):
+        llama_cpp = types.SimpleNamespace(
+            llama_perf_context=lambda ctx: types.SimpleNamespace(t_p_eval_ms=12.5, t_eval_ms=80.0)
+        )
+        llm = MagicMock()
+        llm.client._ctx.ctx = object()
+        with patch.dict(sys.modules, {"llama_cpp": llama_cpp}):
+            self.assertEqual(engine_timings(llm), {"prompt_eval_ms": 12.5, "generation_ms": 80.0})
+        self.assertIsNone(engine_timings(object()))
+
+class TestSessionLedger(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patcher = patch.multiple(config, llm_backend="fake", plan_cache_size=0, solution_index_enabled=False)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.tmp.cleanup()
+
+    def test_calls_are_attributed_to_task_and_iteration(self):
+        memory = MemoryManager(session_id="s", memory_dir=self.tmp.name)
+        run_workflow("make a todo app", memory)
+        entries = memory.get("usage")
+        self.assertEqual(
+            [(entry["agent"], entry["task_id"], entry["iteration"]) for entry in entries],
+            [("planner", None, None), ("developer", 1, 0), ("critic", 1, 0), ("developer", 2, 0), ("critic", 2, 0)]
+        )
+        self.assertTrue(all(entry["prompt_tokens"] > 0 and entry["completion_tokens"] > 0 for entry in entries))
+
+    def test_tokens_are_counted_by_invoked_model_under_its_lock(self):
+        memory = MemoryManager(session_id="s", memory_dir=self.tmp.name)
+        agent = BaseAgent(memory, PLANNER_PROMPT, TaskPlan, llm=CountingModel(1000))
+        small = CountingModel(7)
+        agent._invoke_llm("prompt", llm=small)
+        entry = memory.get("usage")[-1]
+        self.assertEqual((entry["prompt_tokens"], entry["completion_tokens"]), (7, 7))
+        self.assertEqual(small.locked, [True, True])
+        self.assertEqual(agent.llm.locked, [])
+
+    def test_usage_endpoint_reads_session_memory(self):
+        run_workflow("make a todo app", MemoryManager(session_id="s", memory_dir=self.tmp.name))
+        usage = asyncio.run(session_usage_api("s", memory_dir=self.tmp.name))
+        self.assertEqual(usage["total"]["calls"], 5)
+        self.assertEqual(usage["by_agent"]["critic"]["calls"], 2)
+        self.assertEqual(set(usage["by_task"]), {"plan", "1", "2"})
+
+    def test_usage_endpoint_does_not_restore_archived_session(self):
+        memory = MemoryManager(session_id="s", memory_dir=self.tmp.name)
+        run_workflow("make a todo app", memory)
+        archive = get_session_archive(self.tmp.name)
+        self.assertIsNotNone(archive.archive_session("s"))
+        usage = asyncio.run(session_usage_api("s", memory_dir=self.tmp.name))
+        self.assertEqual(usage["total"]["calls"], 5)
+        # 조회는 아카이브된 세션을 라이브 저장소로 옮기지 않음
+        self.assertFalse(memory.memory_file.exists())
+        self.assertTrue(archive.contains("s"))
+
+if __name__ == '__main__':
+    unittest.main()
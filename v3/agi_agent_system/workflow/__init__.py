@@ -2,8 +2,19 @@
 
 이 패키지는 에이전트 실행 흐름을 관리하는 컴포넌트들을 포함합니다:
 - agent_graph: 에이전트 실행 흐름 관리
+
+LangGraph 스택은 run_workflow에 처음 접근할 때만 임포트됩니다.
 """
 
-from .agent_graph import run_workflow
+import importlib
+
+_LAZY_ATTRS = {
+    'run_workflow': '.agent_graph',
+}
+
+__all__ = ['run_workflow']
 
-__all__ = ['run_workflow'] 
\ No newline at end of file
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        return getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,26 @@
 """에이전트 실행 흐름 관리 모듈
 
 이 모듈은 에이전트들의 실행 흐름을 관리합니다.
+체크포인트가 켜져 있으면 노드가 끝날 때마다 상태가 세션 ID 단위로 기록되어
+중단된 실행을 resume_workflow로 이어갈 수 있습니다.
+
+컴파일된 그래프는 세션에 묶이지 않으므로 체크포인터마다 프로세스에서 한 번만
+구성합니다 (get_workflow). 세션의 에이전트는 실행 설정으로 노드에 전달합니다.
 """
 
-from typing import Dict, Any, Callable, TypedDict, List
-from langgraph.graph import Graph, StateGraph
-from langgraph.prebuilt import ToolNode
-from pydantic import BaseModel
+import threading
+from typing import Dict, Any, Callable, TypedDict, List, Optional
+from langgraph.config import get_config
+from langgraph.graph import StateGraph
 
 from ..agents import PlannerAgent, DeveloperAgent, CriticAgent
+from ..agents.developer import cascade_policy
+from ..core.blobs import get_blob_store
+from ..core.checkpoint import get_checkpointer
 from ..core.llm import get_llm
 from ..core.memory import MemoryManager
 from ..core.config import config
+from ..core.scheduler import node_slot
 
 class WorkflowState(TypedDict):
     """워크플로우 상태"""
@@ -21,33 +30,55 @@ class WorkflowState(TypedDict):
     iterations: int
     results: List[Dict[str, Any]]
     evaluations: List[Dict[str, Any]]
+    cascade: Dict[str, Any]
 
 def should_continue(state: WorkflowState) -> str:
-    """다음 단계 결정
+    """비평 후 다음 단계 결정
+    
+    조건부 엣지 함수에서 변경한 상태는 그래프에 반영되지 않으므로
+    태스크 이동은 advance_task 노드에서 처리합니다.
     
     Args:
         state: 현재 상태
         
     Returns:
-        str: 다음 단계 ("developer" 또는 "end")
+        str: 다음 단계 ("developer" 또는 "advance")
     """
-    current_task = state["tasks"][state["current_task_index"]]
     current_evaluation = state["evaluations"][-1]
     
-    # 성공했거나 최대 반복 횟수에 도달한 경우
+    # 성공했거나 최대 반복 횟수에 도달한 경우 다음 태스크로 이동
     if current_evaluation["is_success"] or state["iterations"] >= config.max_iterations:
-        # 다음 태스크로 이동
-        state["current_task_index"] += 1
-        state["iterations"] = 0
-        
-        # 모든 태스크가 완료되었는지 확인
-        if state["current_task_index"] >= len(state["tasks"]):
-            return "end"
-        return "developer"
+        return "advance"
     
     # 실패한 경우 개발자에게 다시 요청
     return "developer"
 
+def advance_task(state: WorkflowState) -> WorkflowState:
+    """다음 태스크로 이동
+    
+    Args:
+        state: 현재 상태
+        
+    Returns:
+        WorkflowState: 업데이트된 상태
+    """
+    state["current_task_index"] += 1
+    state["iterations"] = 0
+    return state
+
+def has_next_task(state: WorkflowState) -> str:
+    """남은 태스크가 있는지 확인
+    
+    Args:
+        state: 현재 상태
+        
+    Returns:
+        str: 다음 단계 ("developer" 또는 "end")
+    """
+    if state["current_task_index"] >= len(state["tasks"]):
+        return "end"
+    return "developer"
+
 def end_workflow(state: WorkflowState) -> WorkflowState:
     """워크플로우 종료
     
@@ -59,29 +90,123 @@ def end_workflow(state: WorkflowState) -> WorkflowState:
     """
     return state
 
-def run_workflow(goal: str, memory: MemoryManager) -> Dict[str, Any]:
-    """에이전트 실행 흐름 전체를 관리
+def changed_only(node: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """노드가 실제로 바꾼 상태 키만 반환하도록 감싸기
+    
+    에이전트는 상태 전체를 반환하지만, 바뀌지 않은 키까지 쓰면 체크포인트에
+    매번 모든 채널이 기록되므로 바뀐 키만 그래프에 전달합니다. 노드에는 상태의
+    얕은 복사본을 넘겨 채널 값이 제자리에서 바뀌지 않도록 합니다.
+    
+    Args:
+        node: 상태를 받아 상태를 반환하는 노드 함수
+        
+    Returns:
+        Callable[[Dict[str, Any]], Dict[str, Any]]: 바뀐 키만 반환하는 노드 함수
+    """
+    def wrapper(state: Dict[str, Any]) -> Dict[str, Any]:
+        # 에이전트는 리스트를 제자리에서 수정하므로 채널 값 대신 얕은 복사본을 넘김
+        # (채널 값은 백그라운드에서 기록 중인 체크포인트와 공유됨)
+        working = {key: list(value) if isinstance(value, list) else value for key, value in state.items()}
+        after = node(working)
+        return {key: value for key, value in after.items() if key not in state or state[key] != value}
+    return wrapper
+
+def session_agents(memory: MemoryManager) -> Dict[str, Any]:
+    """세션 메모리에 연결된 역할별 에이전트
+    
+    모델과 프롬프트는 프로세스에서 공유하므로 에이전트를 만드는 비용은 작습니다.
     
     Args:
-        goal: 목표
         memory: 메모리 관리자 인스턴스
         
     Returns:
-        Dict[str, Any]: 최종 상태
+        Dict[str, Any]: 역할 이름 -> 에이전트
     """
-    # 에이전트 초기화
-    planner = PlannerAgent(memory)
-    developer = DeveloperAgent(memory)
-    critic = CriticAgent(memory)
+    return {
+        "planner": PlannerAgent(memory),
+        "developer": DeveloperAgent(memory),
+        "critic": CriticAgent(memory)
+    }
+
+def agent_node(role: str, bound: Optional[Dict[str, Any]] = None) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """실행 설정의 세션 에이전트(없으면 bound)로 역할을 실행하는 노드
+    
+    노드가 끝날 때마다 세션 메모리의 쌓인 변경을 기록합니다. 체크포인트보다
+    메모리 기록이 먼저 끝나므로 재개한 세션의 메모리에 완료된 노드의 대화가
+    빠지지 않습니다.
+    
+    Args:
+        role: 에이전트 역할 ("planner", "developer", "critic")
+        bound: 그래프에 묶인 에이전트 (기본값: None, 실행 설정의 에이전트만 사용)
+        
+    Returns:
+        Callable[[Dict[str, Any]], Dict[str, Any]]: 노드 함수
+    """
+    def node(state: Dict[str, Any]) -> Dict[str, Any]:
+        agents = get_config().get("configurable", {}).get("agents") or bound
+        if agents is None:
+            raise LookupError("실행 설정에 세션 에이전트가 없습니다.")
+        agent = agents[role]
+        result = agent.run(state)
+        agent.memory.flush()
+        return result
+    return node
+
+def scheduled(node: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """노드를 실행하는 동안만 스케줄러 슬롯을 잡도록 감싸기
+    
+    슬롯을 노드 단위로 잡았다 놓으므로 batch 워크플로우는 개발자와 비평가 사이
+    같은 노드 경계에서 기다리는 interactive 노드에 차례를 넘깁니다. 레인과 테넌트는
+    호출한 쪽의 job_context에서 가져옵니다.
+    
+    Args:
+        node: 상태를 받아 상태를 반환하는 노드 함수
+        
+    Returns:
+        Callable[[Dict[str, Any]], Dict[str, Any]]: 노드 함수
+    """
+    def wrapper(state: Dict[str, Any]) -> Dict[str, Any]:
+        with node_slot():
+            return node(state)
+    return wrapper
+
+def _run_config(memory: MemoryManager, agents: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """세션 ID를 체크포인트 스레드로 사용하는 실행 설정 (agents가 있으면 노드에 전달)"""
+    configurable: Dict[str, Any] = {"thread_id": memory.session_id}
+    if agents is not None:
+        configurable["agents"] = agents
+    # 태스크 수 x 반복 횟수만큼 노드가 실행되므로 기본 재귀 한도(25)를 넉넉히 설정
+    return {"recursion_limit": 10000, "configurable": configurable}
+
+def build_workflow(
+    memory: Optional[MemoryManager] = None,
+    checkpointer: Optional[Any] = None,
+    memory_dir: Optional[str] = None
+) -> Any:
+    """에이전트 그래프를 구성하고 컴파일
+    
+    memory를 주면 그 세션의 에이전트에 묶인 그래프를, 주지 않으면 실행 설정으로
+    세션 에이전트를 받는 공유 그래프를 만듭니다.
+    
+    Args:
+        memory: 그래프를 묶을 메모리 관리자 인스턴스 (기본값: None, 공유 그래프)
+        checkpointer: LangGraph 체크포인터 (기본값: None, 메모리 디렉토리의 파일 체크포인터)
+        memory_dir: 체크포인터를 찾을 메모리 디렉토리 (기본값: memory의 디렉토리 또는 config.memory_dir)
+        
+    Returns:
+        Any: 컴파일된 그래프 (여러 번 실행 가능)
+    """
+    bound = session_agents(memory) if memory is not None else None
     
     # 그래프 노드 정의
     workflow = StateGraph(WorkflowState)
     
     # 노드 추가
-    workflow.add_node("planner", planner.run)
-    workflow.add_node("developer", developer.run)
-    workflow.add_node("critic", critic.run)
-    workflow.add_node("end", end_workflow)
+    workflow.add_node("planner", changed_only(scheduled(agent_node("planner", bound))))
+    workflow.add_node("developer", changed_only(scheduled(agent_node("developer", bound))))
+    workflow.add_node("critic", changed_only(scheduled(agent_node("critic", bound))))
+    workflow.add_node("advance", changed_only(advance_task))
+    workflow.add_node("end", changed_only(end_workflow))
     
     # 엣지 추가
     workflow.add_edge("planner", "developer")
@@ -89,6 +214,14 @@ def run_workflow(goal: str, memory: MemoryManager) -> Dict[str, Any]:
     workflow.add_conditional_edges(
         "critic",
         should_continue,
+        {
+            "developer": "developer",
+            "advance": "advance"
+        }
+    )
+    workflow.add_conditional_edges(
+        "advance",
+        has_next_task,
         {
             "developer": "developer",
             "end": "end"
@@ -99,7 +232,88 @@ def run_workflow(goal: str, memory: MemoryManager) -> Dict[str, Any]:
     workflow.set_entry_point("planner")
     
     # 그래프 컴파일
-    app = workflow.compile()
+    if checkpointer is None:
+        if memory_dir is None and memory is not None:
+            memory_dir = str(memory.memory_dir)
+        checkpointer = get_checkpointer(memory_dir)
+    return workflow.compile(checkpointer=checkpointer)
+
+# 체크포인터 -> 공유 그래프 (체크포인트가 꺼져 있으면 None 키)
+_workflows: Dict[Any, Any] = {}
+_workflows_lock = threading.Lock()
+
+def get_workflow(memory_dir: Optional[str] = None) -> Any:
+    """메모리 디렉토리의 체크포인터를 쓰는 공유 그래프 (프로세스에서 한 번만 컴파일)
+    
+    Args:
+        memory_dir: 메모리 파일 디렉토리 (기본값: config.memory_dir)
+        
+    Returns:
+        Any: 세션 에이전트를 실행 설정으로 받는 컴파일된 그래프
+    """
+    checkpointer = get_checkpointer(memory_dir)
+    with _workflows_lock:
+        if checkpointer not in _workflows:
+            _workflows[checkpointer] = build_workflow(checkpointer=checkpointer, memory_dir=memory_dir)
+        return _workflows[checkpointer]
+
+def _execute(
+    app: Any,
+    graph_input: Optional[Dict[str, Any]],
+    memory: MemoryManager,
+    on_step: Optional[Callable[[str, Dict[str, Any]], None]],
+    initial_state: Dict[str, Any],
+    agents: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """그래프를 실행하고 최종 상태를 반환 (graph_input이 None이면 체크포인트에서 재개)
+    
+    노드 사이의 상태는 긴 출력을 블롭 참조로 담고, 반환하는 최종 상태에서만 풉니다.
+    """
+    run_config = _run_config(memory, agents)
+    blobs = get_blob_store(str(memory.memory_dir))
+    try:
+        if on_step is None:
+            return blobs.resolve(app.invoke(graph_input, config=run_config))
+        
+        final_state = initial_state
+        for mode, chunk in app.stream(graph_input, config=run_config, stream_mode=["updates", "values"]):
+            if mode == "updates":
+                # 노드는 바뀐 키만 반환하므로 직전 상태에 합쳐서 전달
+                for node, update in chunk.items():
+                    final_state = {**final_state, **(update or {})}
+                    on_step(node, final_state)
+            else:
+                final_state = chunk
+        return blobs.resolve(final_state)
+    finally:
+        # 실행이 끝난 세션의 체크포인트는 메모리에 두지 않음 (재개 시 로그에서 다시 읽음)
+        if app.checkpointer is not None:
+            app.checkpointer.release(memory.session_id)
+
+def run_workflow(
+    goal: str,
+    memory: MemoryManager,
+    app: Optional[Any] = None,
+    on_step: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    cascade: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """에이전트 실행 흐름 전체를 관리
+    
+    같은 세션의 이전 실행 체크포인트는 새 목표를 시작할 때 지웁니다.
+    
+    Args:
+        goal: 목표
+        memory: 메모리 관리자 인스턴스
+        app: 세션에 묶인 컴파일된 그래프 (기본값: None, 공유 그래프에 세션 에이전트 전달)
+        on_step: 노드가 끝날 때마다 (노드 이름, 상태)로 호출되는 콜백 (기본값: None)
+        cascade: 이 목표에만 적용할 캐스케이드 정책 (기본값: None, 설정값 사용)
+        
+    Returns:
+        Dict[str, Any]: 최종 상태
+    """
+    agents = None
+    if app is None:
+        app, agents = get_workflow(str(memory.memory_dir)), session_agents(memory)
     
     # 초기 상태 설정
     initial_state = {
@@ -108,10 +322,49 @@ def run_workflow(goal: str, memory: MemoryManager) -> Dict[str, Any]:
         "current_task_index": 0,
         "iterations": 0,
         "results": [],
-        "evaluations": []
+        "evaluations": [],
+        "cascade": cascade_policy(cascade)
     }
     
+    if app.checkpointer is not None:
+        app.checkpointer.delete_thread(memory.session_id)
+    
     # 워크플로우 실행
-    final_state = app.invoke(initial_state)
+    return _execute(app, initial_state, memory, on_step, initial_state, agents)
+
+def resume_workflow(
+    memory: MemoryManager,
+    app: Optional[Any] = None,
+    on_step: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """중단된 세션을 마지막으로 완료된 노드 다음부터 이어서 실행
+    
+    완료된 노드는 다시 실행하지 않으므로 LLM 호출도 반복되지 않습니다.
+    이미 끝난 세션이면 저장된 최종 상태를 그대로 반환합니다.
+    
+    Args:
+        memory: 재개할 세션의 메모리 관리자 인스턴스
+        app: 세션에 묶인 컴파일된 그래프 (기본값: None, 공유 그래프에 세션 에이전트 전달)
+        on_step: 노드가 끝날 때마다 (노드 이름, 상태)로 호출되는 콜백 (기본값: None)
+        
+    Returns:
+        Dict[str, Any]: 최종 상태
+        
+    Raises:
+        LookupError: 세션의 체크포인트가 없는 경우
+    """
+    agents = None
+    if app is None:
+        app, agents = get_workflow(str(memory.memory_dir)), session_agents(memory)
+    if app.checkpointer is None:
+        raise LookupError("체크포인트가 비활성화되어 있어 재개할 수 없습니다.")
+    
+    snapshot = app.get_state(_run_config(memory))
+    if not snapshot.values:
+        app.checkpointer.release(memory.session_id)
+        raise LookupError(f"세션 {memory.session_id}의 체크포인트가 없습니다.")
+    if not snapshot.next:
+        app.checkpointer.release(memory.session_id)
+        return get_blob_store(str(memory.memory_dir)).resolve(snapshot.values)
     
-    return final_state 
\ No newline at end of file
+    return _execute(app, None, memory, on_step, snapshot.values, agents)
@@ -6,7 +6,7 @@ from .agents.planner import planner_node
 from .agents.developer import developer_node
 from .agents.critic import critic_node
 from .config import config
-from .memory import load_memory, save_memory
+from .memory import flush_memory, update_memory
 
 class AgentState(TypedDict):
     """에이전트 상태를 정의하는 타입"""
@@ -44,6 +44,21 @@ def should_continue(state: AgentState) -> str:
     # 실패한 경우 developer에게 피드백 전달
     return "developer"
 
+def flush_after(node):
+    """노드가 끝날 때마다 쌓인 메모리 변경을 기록하도록 감싸는 함수
+    
+    Args:
+        node: 상태를 받아 상태를 반환하는 노드 함수
+        
+    Returns:
+        노드 함수
+    """
+    def wrapper(state: AgentState) -> AgentState:
+        result = node(state)
+        flush_memory()
+        return result
+    return wrapper
+
 def create_graph() -> StateGraph:
     """LangGraph 상태 흐름을 구성하는 함수
     
@@ -54,9 +69,9 @@ def create_graph() -> StateGraph:
     workflow = StateGraph(AgentState)
     
     # 노드 추가
-    workflow.add_node("planner", planner_node)
-    workflow.add_node("developer", developer_node)
-    workflow.add_node("critic", critic_node)
+    workflow.add_node("planner", flush_after(planner_node))
+    workflow.add_node("developer", flush_after(developer_node))
+    workflow.add_node("critic", flush_after(critic_node))
     
     # 엣지 추가
     workflow.add_edge("planner", "developer")
@@ -84,9 +99,7 @@ def run_graph(goal: str) -> Dict[str, Any]:
         Dict[str, Any]: 최종 실행 결과
     """
     # 메모리 초기화
-    memory = load_memory()
-    memory["iterations"] = 0
-    save_memory(memory)
+    update_memory("iterations", 0)
     
     # 그래프 생성 및 컴파일
     graph = create_graph()
@@ -1,10 +1,9 @@
 from typing import Dict, Any
-from langchain.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 
 from ..model import get_llm
 from ..memory import append_to_memory
+from ..prompts import get_prompt
 from ..config import config
 
 class CodeEvaluation(BaseModel):
@@ -59,17 +58,11 @@ def critic_node(state: Dict[str, Any]) -> Dict[str, Any]:
         if "results" in state and i < len(state["results"]):
             previous_results.append(f"태스크 {i+1}: {state['results'][i]}")
     
-    # 출력 파서 설정
-    parser = PydanticOutputParser(pydantic_object=CodeEvaluation)
-    
-    # 프롬프트 템플릿 설정
-    prompt = PromptTemplate(
-        template=CRITIC_PROMPT,
-        input_variables=["task_description", "code", "explanation", "test_cases", "previous_results"],
-        partial_variables={
-            "format_instructions": parser.get_format_instructions(),
-            "success_threshold": config.success_threshold
-        }
+    # 프롬프트 템플릿과 출력 파서 (처음 호출할 때 한 번만 생성, 설정값은 호출마다 전달)
+    prompt, parser = get_prompt(
+        CRITIC_PROMPT,
+        CodeEvaluation,
+        ("task_description", "code", "explanation", "test_cases", "previous_results", "success_threshold")
     )
     
     # LLM 호출
@@ -79,7 +72,8 @@ def critic_node(state: Dict[str, Any]) -> Dict[str, Any]:
         code=current_result["code"],
         explanation=current_result["explanation"],
         test_cases="\n".join(current_result["test_cases"]),
-        previous_results="\n".join(previous_results) if previous_results else "없음"
+        previous_results="\n".join(previous_results) if previous_results else "없음",
+        success_threshold=config.success_threshold
     ))
     
     # 응답 파싱
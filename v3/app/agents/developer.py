@@ -1,10 +1,9 @@
 from typing import Dict, Any
-from langchain.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 
 from ..model import get_llm
 from ..memory import append_to_memory
+from ..prompts import get_prompt
 
 class CodeSolution(BaseModel):
     """코드 솔루션을 정의하는 모델"""
@@ -47,15 +46,8 @@ def developer_node(state: Dict[str, Any]) -> Dict[str, Any]:
         if "results" in state and i < len(state["results"]):
             previous_results.append(f"태스크 {i+1}: {state['results'][i]}")
     
-    # 출력 파서 설정
-    parser = PydanticOutputParser(pydantic_object=CodeSolution)
-    
-    # 프롬프트 템플릿 설정
-    prompt = PromptTemplate(
-        template=DEVELOPER_PROMPT,
-        input_variables=["task_description", "previous_results"],
-        partial_variables={"format_instructions": parser.get_format_instructions()}
-    )
+    # 프롬프트 템플릿과 출력 파서 (처음 호출할 때 한 번만 생성)
+    prompt, parser = get_prompt(DEVELOPER_PROMPT, CodeSolution, ("task_description", "previous_results"))
     
     # LLM 호출
     llm = get_llm()
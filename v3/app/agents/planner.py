@@ -1,12 +1,11 @@
 from typing import Dict, Any, List
-from langchain.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 import json
 import re
 
 from ..model import get_llm
 from ..memory import append_to_memory
+from ..prompts import get_prompt
 
 class SubTask(BaseModel):
     """하위 태스크를 정의하는 모델"""
@@ -98,15 +97,8 @@ def planner_node(state: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: 업데이트된 상태
     """
-    # 출력 파서 설정
-    parser = PydanticOutputParser(pydantic_object=TaskPlan)
-    
-    # 프롬프트 템플릿 설정
-    prompt = PromptTemplate(
-        template=PLANNER_PROMPT,
-        input_variables=["goal"],
-        partial_variables={"format_instructions": parser.get_format_instructions()}
-    )
+    # 프롬프트 템플릿과 출력 파서 (처음 호출할 때 한 번만 생성)
+    prompt, parser = get_prompt(PLANNER_PROMPT, TaskPlan, ("goal",))
     
     # LLM 호출
     llm = get_llm()
@@ -29,6 +29,18 @@ class Config(BaseModel):
         default=Path("memory.json"),
         description="메모리 파일 경로"
     )
+    memory_durability: str = Field(
+        default="buffered",
+        description="메모리 기록 시점 (sync: 변경마다, buffered: 기준 충족/노드 경계/종료 시, manual: 명시적 호출/노드 경계/종료 시)"
+    )
+    memory_flush_entries: int = Field(
+        default=64,
+        description="buffered 수준에서 이만큼 변경이 쌓이면 기록"
+    )
+    memory_flush_interval: float = Field(
+        default=1.0,
+        description="buffered 수준에서 첫 변경 후 기록까지 기다릴 최대 시간 (초)"
+    )
     
     # API 설정
     api_host: str = Field(
@@ -1,23 +1,28 @@
-import json
-from typing import Dict, Any, Optional
+import atexit
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 from .config import config
+from .storage import FileLock, atomic_write_json, file_signature, read_json
 
-def load_memory() -> Dict[str, Any]:
-    """메모리 파일에서 데이터를 로드하는 함수
-    
-    Returns:
-        Dict[str, Any]: 메모리 데이터
-    """
-    try:
-        if config.memory_path.exists():
-            with open(config.memory_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except Exception as e:
-        print(f"메모리 로드 중 오류 발생: {e}")
-    
-    # 기본 메모리 구조 반환
+# 파싱된 메모리를 프로세스에 상주시키고 변경을 모아서 기록 (write-behind)
+# - memory_durability="sync": 변경마다 즉시 기록하고 디스크에 내림
+# - memory_durability="buffered": 변경 수/경과 시간 기준, 노드 경계, 종료 시 기록
+# - memory_durability="manual": flush_memory()/sync_memory(), 노드 경계, 종료 시에만 기록
+# 기록은 파일 잠금 안에서 이루어지며, 다른 프로세스가 먼저 기록했으면 디스크 내용에
+# 아직 기록하지 않은 변경(_ops)을 다시 적용해 병합함
+_lock = threading.RLock()
+_memory: Optional[Dict[str, Any]] = None
+_memory_path: Optional[Path] = None
+_signature = None
+_version = 0
+_ops: List[Tuple[Any, ...]] = []
+_dirty = 0
+_timer: Optional[threading.Timer] = None
+
+def _default_memory() -> Dict[str, Any]:
+    """기본 메모리 구조를 반환하는 함수"""
     return {
         "conversations": [],  # 대화 기록
         "tasks": [],         # 태스크 목록
@@ -25,41 +30,150 @@ def load_memory() -> Dict[str, Any]:
         "iterations": 0      # 현재 반복 횟수
     }
 
+def _read_memory(path: Path) -> Dict[str, Any]:
+    """메모리 파일을 읽는 함수 (없거나 읽을 수 없으면 기본 구조)"""
+    try:
+        data = read_json(path)
+        if data is not None:
+            return data
+    except Exception as e:
+        print(f"메모리 로드 중 오류 발생: {e}")
+    return _default_memory()
+
+def _apply(memory: Dict[str, Any], op: Tuple[Any, ...]) -> Dict[str, Any]:
+    """변경 하나를 메모리 데이터에 적용하는 함수"""
+    if op[0] == "append":
+        memory.setdefault(op[1], []).append(op[2])
+    elif op[0] == "set":
+        memory[op[1]] = op[2]
+    elif op[0] == "replace":
+        memory = dict(op[1])
+    return memory
+
+def _change(op: Tuple[Any, ...]) -> None:
+    """상주 메모리에 변경을 적용하고 기록 대기열에 추가하는 함수 (잠금을 보유한 상태에서 호출)"""
+    global _memory
+    _memory = _apply(_resident(), op)
+    _ops.append(op)
+    _mark_dirty()
+
+def _resident() -> Dict[str, Any]:
+    """상주 메모리를 반환하는 함수 (처음 접근하거나 경로가 바뀌면 파일에서 로드)"""
+    global _memory, _memory_path, _signature, _version
+    if _memory is None or _memory_path != config.memory_path:
+        if _memory is not None:
+            # 경로가 바뀌기 전에 이전 파일의 변경을 기록
+            _write_pending(fsync=False)
+        _memory_path = config.memory_path
+        # 읽기 전에 서명을 잡아 두면 그 사이에 바뀐 경우 다음 기록 때 다시 병합됨
+        _signature = file_signature(_memory_path)
+        _memory = _read_memory(_memory_path)
+        _version = _memory.get("version", 0)
+    return _memory
+
+def _write_pending(fsync: bool) -> bool:
+    """쌓인 변경을 파일에 기록하는 함수 (잠금을 보유한 상태에서 호출)"""
+    global _memory, _signature, _version, _dirty, _timer
+    if _timer is not None:
+        _timer.cancel()
+        _timer = None
+    if not _dirty or _memory is None:
+        return False
+    try:
+        with FileLock(_memory_path):
+            if file_signature(_memory_path) != _signature:
+                merged = _read_memory(_memory_path)
+                _version = merged.get("version", 0)
+                for op in _ops:
+                    merged = _apply(merged, op)
+                _memory = merged
+            _version += 1
+            _memory["version"] = _version
+            atomic_write_json(_memory_path, _memory, fsync=fsync)
+            _signature = file_signature(_memory_path)
+        _ops.clear()
+        _dirty = 0
+        return True
+    except Exception as e:
+        print(f"메모리 저장 중 오류 발생: {e}")
+        return False
+
+def _mark_dirty() -> None:
+    """변경을 기록하고 durability 설정에 따라 저장 시점을 결정 (잠금을 보유한 상태에서 호출)"""
+    global _dirty, _timer
+    _dirty += 1
+    if config.memory_durability == "sync":
+        _write_pending(fsync=True)
+        return
+    if config.memory_durability != "buffered":
+        return
+    if _dirty >= config.memory_flush_entries:
+        _write_pending(fsync=False)
+    elif _timer is None and config.memory_flush_interval > 0:
+        # 첫 변경 후 일정 시간이 지나면 이후 변경과 함께 기록
+        _timer = threading.Timer(config.memory_flush_interval, flush_memory)
+        _timer.daemon = True
+        _timer.start()
+
+def flush_memory() -> bool:
+    """쌓인 변경을 메모리 파일에 기록하는 함수
+
+    Returns:
+        bool: 파일에 기록한 경우 True (변경이 없으면 False)
+    """
+    with _lock:
+        return _write_pending(fsync=False)
+
+def sync_memory() -> bool:
+    """쌓인 변경을 메모리 파일에 기록하고 디스크에 내리는 함수
+
+    Returns:
+        bool: 파일에 기록한 경우 True (변경이 없으면 False)
+    """
+    with _lock:
+        return _write_pending(fsync=True)
+
+# 프로세스 종료 시 남은 변경 기록
+atexit.register(flush_memory)
+
+def load_memory() -> Dict[str, Any]:
+    """메모리 데이터를 반환하는 함수
+
+    파일은 처음 호출할 때만 읽고 이후에는 상주 메모리를 반환합니다.
+
+    Returns:
+        Dict[str, Any]: 메모리 데이터
+    """
+    with _lock:
+        return _resident()
+
 def save_memory(memory: Dict[str, Any]) -> None:
-    """메모리 데이터를 파일에 저장하는 함수
-    
+    """메모리 데이터를 저장하는 함수
+
+    상주 메모리를 교체하고, 파일 기록은 durability 설정에 따라 이루어집니다.
+
     Args:
         memory (Dict[str, Any]): 저장할 메모리 데이터
     """
-    try:
-        # 메모리 디렉토리가 없으면 생성
-        config.memory_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(config.memory_path, 'w', encoding='utf-8') as f:
-            json.dump(memory, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        print(f"메모리 저장 중 오류 발생: {e}")
+    with _lock:
+        _change(("replace", memory))
 
 def update_memory(key: str, value: Any) -> None:
     """메모리의 특정 키 값을 업데이트하는 함수
-    
+
     Args:
         key (str): 업데이트할 키
         value (Any): 새로운 값
     """
-    memory = load_memory()
-    memory[key] = value
-    save_memory(memory)
+    with _lock:
+        _change(("set", key, value))
 
 def append_to_memory(key: str, value: Any) -> None:
     """메모리의 특정 키에 값을 추가하는 함수
-    
+
     Args:
         key (str): 추가할 키
         value (Any): 추가할 값
     """
-    memory = load_memory()
-    if key not in memory:
-        memory[key] = []
-    memory[key].append(value)
-    save_memory(memory) 
\ No newline at end of file
+    with _lock:
+        _change(("append", key, value))
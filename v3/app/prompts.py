@@ -0,0 +1,26 @@
+from functools import lru_cache
+from typing import Tuple
+from langchain.prompts import PromptTemplate
+from langchain.output_parsers import PydanticOutputParser
+
+@lru_cache(maxsize=None)
+def get_prompt(template: str, output_model: type, input_variables: Tuple[str, ...]) -> Tuple[PromptTemplate, PydanticOutputParser]:
+    """노드 프롬프트와 출력 파서를 (템플릿, 출력 모델)마다 한 번만 생성해 재사용하는 함수
+    
+    템플릿 문자열 자체가 캐시 키에 포함되므로 템플릿을 바꾸면 새로 생성됩니다.
+    
+    Args:
+        template (str): 프롬프트 템플릿 ({format_instructions} 자리 포함)
+        output_model (type): 출력을 파싱할 Pydantic 모델
+        input_variables (Tuple[str, ...]): 호출마다 채울 입력 변수
+        
+    Returns:
+        Tuple[PromptTemplate, PydanticOutputParser]: 형식 지침이 채워진 프롬프트와 출력 파서
+    """
+    parser = PydanticOutputParser(pydantic_object=output_model)
+    prompt = PromptTemplate(
+        template=template,
+        input_variables=list(input_variables),
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+    return prompt, parser
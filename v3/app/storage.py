@@ -0,0 +1,133 @@
+# 여러 스레드와 프로세스가 같은 JSON 파일을 안전하게 갱신하기 위한 도구
+# (파일 잠금, 임시 파일 교체, 변경 감지 서명)
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows에서는 프로세스 내 잠금만 사용
+    fcntl = None
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_lock = threading.Lock()
+
+def _thread_lock(path: Path) -> threading.Lock:
+    """경로별 프로세스 내 잠금을 반환"""
+    key = str(path.resolve())
+    with _thread_locks_lock:
+        if key not in _thread_locks:
+            _thread_locks[key] = threading.Lock()
+        return _thread_locks[key]
+
+class FileLock:
+    """데이터 파일 옆의 .lock 파일로 구현한 배타 잠금
+
+    Attributes:
+        path: 보호할 데이터 파일 경로
+        lock_path: 잠금 파일 경로
+    """
+
+    def __init__(self, path: Path):
+        """FileLock 초기화
+
+        Args:
+            path: 보호할 데이터 파일 경로
+        """
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> "FileLock":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = _thread_lock(self.path)
+        self._local.acquire()
+        try:
+            self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+        except BaseException:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            self._local.release()
+            raise
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        finally:
+            self._fd = None
+            self._local.release()
+
+def file_signature(path: Path) -> Optional[Tuple[int, int, int, int]]:
+    """파일이 바뀌었는지 비교하기 위한 서명 (파일이 없으면 None)
+
+    atomic_write_json은 매번 새 파일로 교체하므로 inode와 변경 시각이 달라집니다.
+
+    Args:
+        path: 파일 경로
+
+    Returns:
+        Optional[Tuple[int, int, int, int]]: (inode, 크기, 수정 시각, 변경 시각)
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns)
+
+def read_json(path: Path) -> Optional[Any]:
+    """JSON 파일을 읽음 (파일이 없으면 None)
+
+    Args:
+        path: 파일 경로
+
+    Returns:
+        Optional[Any]: 파싱된 데이터
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def atomic_write_json(path: Path, data: Any, fsync: bool = False, indent: Optional[int] = 2) -> None:
+    """JSON 파일을 원자적으로 교체
+
+    같은 디렉토리의 임시 파일에 쓴 뒤 os.replace로 교체하므로, 쓰는 도중
+    중단되어도 기존 파일이 깨지지 않습니다.
+
+    Args:
+        path: 파일 경로
+        data: 저장할 데이터
+        fsync: 파일과 디렉토리를 디스크에 내릴지 여부 (기본값: False)
+        indent: JSON 들여쓰기 (기본값: 2)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        # 이름 교체까지 디스크에 남도록 디렉토리도 내림
+        fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
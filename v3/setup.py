@@ -14,7 +14,8 @@ setup(
         "pydantic>=2.0.0",
         "fastapi>=0.100.0",
         "uvicorn>=0.23.0",
-        "python-dotenv>=1.0.0"
+        "python-dotenv>=1.0.0",
+        "numpy>=1.24.0"
     ],
     entry_points={
         "console_scripts": [